@@ -11,6 +11,11 @@ from typing import Any, Dict, Iterable, List, Optional, Tuple
 
 import requests
 
+# 단독 스크립트 실행(python basketball/nba/bootstrap_nba.py)에서도 services/ 를 import 할 수 있게 레포 루트를 경로에 추가
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from services.apisports_client import apisports_get  # noqa: E402
+
 # DB driver: psycopg (v3) 우선, 없으면 psycopg2
 try:
     import psycopg  # type: ignore
@@ -38,7 +43,7 @@ def _http_get_json(base: str, path: str, api_key: str, timeout: int = 30, retrie
     last_err: Optional[str] = None
     for i in range(retries + 1):
         try:
-            r = requests.get(url, headers=headers, timeout=timeout)
+            r = apisports_get("nba", url, headers=headers, timeout=timeout)
             if r.status_code == 429 or (500 <= r.status_code <= 599):
                 # rate limit or server error
                 last_err = f"HTTP {r.status_code}"
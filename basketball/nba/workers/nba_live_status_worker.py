@@ -15,6 +15,11 @@ import faulthandler
 import signal
 import traceback
 
+# 단독 스크립트 실행(python basketball/nba/workers/nba_live_status_worker.py)에서도 services/ 를 import 할 수 있게 레포 루트를 경로에 추가
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "..")))
+
+from services.apisports_client import apisports_get  # noqa: E402
+
 log = logging.getLogger("nba_live_status_worker")
 
 # ✅ 치명 크래시(세그폴트/abort 등)도 stderr로 덤프
@@ -212,11 +217,13 @@ def _headers() -> Dict[str, str]:
 def _get(path: str, params: Dict[str, Any]) -> Dict[str, Any]:
     url = f"{BASE_URL}{path}"
     try:
-        r = requests.get(
+        r = apisports_get(
+            "nba",
             url,
             headers=_headers(),
             params=params,
             timeout=45,
+            retry_after_default=60.0,
         )
     except requests.Timeout as e:
         # ✅ timeout은 재시도 가치가 큼
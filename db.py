@@ -1,5 +1,8 @@
 # db.py
 import os
+import threading
+import time
+from contextlib import contextmanager
 from typing import Any, Sequence, Mapping, Optional, List, Dict
 
 import psycopg
@@ -49,6 +52,30 @@ def get_connection():
     """
     return pool.connection()
 
+# ─────────────────────────────────────────
+# 커넥션 대기 시간 측정 (스레드별 누적)
+# - 병렬 블록 실행기(matchdetail/block_executor.py)가
+#   "블록 실행 시간" vs "풀에서 커넥션 기다린 시간"을 나눠 보려고 사용
+# ─────────────────────────────────────────
+
+_conn_stats = threading.local()
+
+
+def conn_wait_seconds() -> float:
+    """
+    현재 스레드가 지금까지 pool 에서 커넥션을 기다린 누적 시간(초).
+    구간 측정은 전/후 값을 빼서 쓴다.
+    """
+    return float(getattr(_conn_stats, "wait", 0.0))
+
+
+@contextmanager
+def _pooled_connection():
+    t0 = time.perf_counter()
+    with pool.connection() as conn:
+        _conn_stats.wait = conn_wait_seconds() + (time.perf_counter() - t0)
+        yield conn
+
 # ─────────────────────────────────────────
 # fetch_all / fetch_one / execute 헬퍼
 # ─────────────────────────────────────────
@@ -60,7 +87,7 @@ def fetch_all(query: str, params: ParamsType = None) -> List[Dict[str, Any]]:
     """
     SELECT 계열에서 여러 row를 dict 리스트로 받고 싶을 때 사용.
     """
-    with pool.connection() as conn:
+    with _pooled_connection() as conn:
         with conn.cursor() as cur:
             cur.execute(query, params or ())
             rows = cur.fetchall()
@@ -75,7 +102,7 @@ def fetch_one(query: str, params: ParamsType = None) -> Optional[Dict[str, Any]]
     SELECT 한 row만 필요할 때 사용.
     없으면 None 반환.
     """
-    with pool.connection() as conn:
+    with _pooled_connection() as conn:
         with conn.cursor() as cur:
             cur.execute(query, params or ())
             row = cur.fetchone()
@@ -90,10 +117,25 @@ def execute(query: str, params: ParamsType = None) -> None:
     INSERT / UPDATE / DELETE 용.
     반환값은 신경 안 쓰고, 에러만 나지 않으면 된다고 가정.
     """
-    with pool.connection() as conn:
+    with _pooled_connection() as conn:
         with conn.cursor() as cur:
             cur.execute(query, params or ())
 
+def execute_batches(batches: Sequence[Any]) -> None:
+    """
+    여러 테이블 쓰기를 커넥션 1개 + 트랜잭션 1개로 묶어서 실행.
+    batches: [(query, [params, params, ...]), ...]  (순서대로 실행, 빈 params 리스트는 skip)
+
+    - executemany 는 psycopg3 파이프라인 모드로 나가서 row 수만큼 왕복하지 않는다.
+    - 하나라도 실패하면 전체 롤백 → 호출 측이 row 단위로 재시도할지 결정.
+    """
+    with _pooled_connection() as conn:
+        with conn.transaction():
+            with conn.cursor() as cur:
+                for query, params_seq in batches:
+                    if params_seq:
+                        cur.executemany(query, params_seq)
+
 def close_pool():
     try:
         pool.close()
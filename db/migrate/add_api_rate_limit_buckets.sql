@@ -0,0 +1,13 @@
+-- db/migrate/add_api_rate_limit_buckets.sql
+--
+-- API-Sports 프로세스 간 공유 토큰버킷 (services/apisports_client.py, RATE_LIMIT_SHARED=1 일 때만 사용)
+-- - 버킷(football / hockey / nba) 당 1행, UPDATE ... RETURNING 으로 원자적으로 차감
+-- - ts / blocked_until 은 epoch 초 (429 Retry-After 정지 시각)
+-- - 공유 모드 첫 호출 시 자동 생성도 됨
+
+CREATE TABLE IF NOT EXISTS api_rate_limit_buckets (
+    bucket        TEXT PRIMARY KEY,
+    tokens        DOUBLE PRECISION NOT NULL,
+    ts            DOUBLE PRECISION NOT NULL,
+    blocked_until DOUBLE PRECISION NOT NULL DEFAULT 0
+);
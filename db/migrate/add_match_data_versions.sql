@@ -0,0 +1,15 @@
+-- db/migrate/add_match_data_versions.sql
+--
+-- 매치디테일 블록 캐시(matchdetail/block_cache.py)용 데이터 버전
+-- - scope='fixture' : 워커가 matches / match_events / match_team_stats / match_lineups 를 쓰면 +1
+-- - scope='league'  : FINISHED 경기가 (재)기록되면 그 리그 +1
+-- - scope='team'    : 같은 조건으로 두 팀 +1 (예측 스냅샷 유효성, services/match_predictions_store.py)
+-- - 워커가 처음 뜰 때도 services/match_data_version.ensure_match_data_versions_table() 로 생성
+
+CREATE TABLE IF NOT EXISTS match_data_versions (
+    scope        TEXT NOT NULL,
+    scope_id     BIGINT NOT NULL,
+    version      BIGINT NOT NULL DEFAULT 1,
+    updated_utc  TIMESTAMPTZ DEFAULT now(),
+    PRIMARY KEY (scope, scope_id)
+);
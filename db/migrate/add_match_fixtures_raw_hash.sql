@@ -0,0 +1,32 @@
+-- db/migrate/add_match_fixtures_raw_hash.sql
+--
+-- match_fixtures_raw.data_hash = md5(data_json) (services/fixture_write_skip.py)
+-- - live_status_worker 가 live=all 응답이 직전과 같으면 fixtures/matches/raw 업서트를 건너뛰는 데 사용
+-- - BEFORE INSERT/UPDATE OF data_json 트리거로 채우므로 어떤 writer 가 써도 항상 동기화
+-- - NULL 허용 컬럼이라 테이블 rewrite 없음. 기존 row 는 다음 write 때 채워짐 (backfill 불필요)
+-- - 워커가 처음 뜰 때도 ensure_match_fixtures_raw_hash_column() 로 동일하게 처리
+
+BEGIN;
+
+ALTER TABLE match_fixtures_raw ADD COLUMN IF NOT EXISTS data_hash TEXT;
+
+CREATE OR REPLACE FUNCTION match_fixtures_raw_set_data_hash()
+RETURNS TRIGGER AS $$
+BEGIN
+  NEW.data_hash := md5(NEW.data_json::text);
+  RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DO $$
+BEGIN
+  IF NOT EXISTS (
+    SELECT 1 FROM pg_trigger WHERE tgname = 'trg_match_fixtures_raw_data_hash'
+  ) THEN
+    CREATE TRIGGER trg_match_fixtures_raw_data_hash
+    BEFORE INSERT OR UPDATE OF data_json ON match_fixtures_raw
+    FOR EACH ROW EXECUTE FUNCTION match_fixtures_raw_set_data_hash();
+  END IF;
+END$$;
+
+COMMIT;
@@ -0,0 +1,19 @@
+-- db/migrate/add_match_live_poll_state.sql
+--
+-- match_live_poll_state: live_status_worker fixture 별 next-due 저장 (services/live_poll_scheduler.py)
+-- - kind = events / stats / lineups / postmatch (PollScheduler 이름)
+-- - 워커 재시작 직후 warm_load() 로 한 번에 읽어서, 모든 라이브 경기를 동시에 다시 부르는 폭주 방지
+-- - hockey_live_poll_state / nba_live_poll_state 와 같은 역할 (축구는 fixture × kind 1줄)
+-- - 워커가 처음 뜰 때도 ensure_live_poll_state_table() 로 동일하게 처리
+
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS match_live_poll_state (
+    fixture_id  INTEGER     NOT NULL,
+    kind        TEXT        NOT NULL,
+    next_due_at TIMESTAMPTZ NOT NULL,
+    updated_at  TIMESTAMPTZ NOT NULL DEFAULT now(),
+    PRIMARY KEY (fixture_id, kind)
+);
+
+COMMIT;
@@ -0,0 +1,18 @@
+-- db/migrate/add_match_prediction_snapshots.sql
+--
+-- 예정 경기 insights_overall + ai_predictions 미리 계산 결과 (services/match_predictions_store.py)
+-- - football/workers/predictions_precompute.py 가 채운다 (실행 시 ensure 로도 생성)
+-- - 매치디테일 번들은 header_sig / 데이터 버전(fixture / league / 두 팀 team 버전 합)으로 유효성 판단
+
+CREATE TABLE IF NOT EXISTS match_prediction_snapshots (
+    fixture_id       BIGINT PRIMARY KEY,
+    header_sig       TEXT NOT NULL,
+    fixture_version  BIGINT NOT NULL DEFAULT 0,
+    league_version   BIGINT NOT NULL DEFAULT 0,
+    team_version     BIGINT NOT NULL DEFAULT 0,
+    home_id          INTEGER,
+    away_id          INTEGER,
+    insights_json    TEXT,
+    ai_json          TEXT,
+    computed_utc     TIMESTAMPTZ NOT NULL DEFAULT now()
+);
@@ -0,0 +1,43 @@
+-- db/migrate/add_matches_kickoff_utc.sql
+--
+-- matches.kickoff_utc (TIMESTAMPTZ) + 트리거
+-- - date_utc 는 운영 DB 에서 TEXT 라 date_utc::timestamptz 조건이 인덱스를 못 탄다.
+--   (text -> timestamptz 캐스팅은 IMMUTABLE 이 아니라 expression index 도 불가)
+-- - kickoff_utc 는 BEFORE INSERT/UPDATE 트리거로 date_utc 와 항상 동기화
+-- - 기존 row 는 backfill_matches_kickoff_utc.py 로 배치 채움 (대형 테이블에서 긴 락 방지)
+-- - 워커 시작 시 ensure_matches_kickoff_column() 은 nullable 컬럼 추가만 한다
+--   (트리거 / backfill / 인덱스는 여기와 backfill 스크립트에서만 → 워커가 matches 쓰기를 막지 않음)
+--
+-- 실행 순서:
+--   1) psql "$DATABASE_URL" -f db/migrate/add_matches_kickoff_utc.sql
+--   2) python db/migrate/backfill_matches_kickoff_utc.py
+--      (인덱스는 2) 마지막에 CREATE INDEX CONCURRENTLY 로 생성 → API 는 인덱스가 생긴 뒤부터 kickoff_utc 사용)
+
+BEGIN;
+
+ALTER TABLE matches ADD COLUMN IF NOT EXISTS kickoff_utc TIMESTAMPTZ;
+
+CREATE OR REPLACE FUNCTION matches_set_kickoff_utc()
+RETURNS TRIGGER AS $$
+BEGIN
+  BEGIN
+    NEW.kickoff_utc := NULLIF(NEW.date_utc::text, '')::timestamptz;
+  EXCEPTION WHEN others THEN
+    NEW.kickoff_utc := NULL;
+  END;
+  RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DO $$
+BEGIN
+  IF NOT EXISTS (
+    SELECT 1 FROM pg_trigger WHERE tgname = 'trg_matches_kickoff_utc'
+  ) THEN
+    CREATE TRIGGER trg_matches_kickoff_utc
+    BEFORE INSERT OR UPDATE OF date_utc ON matches
+    FOR EACH ROW EXECUTE FUNCTION matches_set_kickoff_utc();
+  END IF;
+END$$;
+
+COMMIT;
@@ -0,0 +1,28 @@
+-- db/migrate/add_postmatch_backfill_queue.sql
+--
+-- postmatch_backfill_queue: football/workers/postmatch_backfill 의 경기별 백필 작업 큐
+-- - (fixture_id, resource) 1줄, resource = events / lineups / team_stats / player_stats
+-- - state: pending → running → done | failed (attempts / last_error 기록)
+-- - 재시작 시 pending + 오래된 running 부터 이어서 처리 (FOR UPDATE SKIP LOCKED)
+-- - 실행 시 ensure_postmatch_backfill_queue_table() 로도 동일하게 처리
+
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS postmatch_backfill_queue (
+    fixture_id  INTEGER     NOT NULL,
+    resource    TEXT        NOT NULL,
+    do_main     BOOLEAN     NOT NULL DEFAULT TRUE,
+    do_raw      BOOLEAN     NOT NULL DEFAULT TRUE,
+    state       TEXT        NOT NULL DEFAULT 'pending',
+    attempts    INTEGER     NOT NULL DEFAULT 0,
+    last_error  TEXT,
+    created_at  TIMESTAMPTZ NOT NULL DEFAULT now(),
+    updated_at  TIMESTAMPTZ NOT NULL DEFAULT now(),
+    PRIMARY KEY (fixture_id, resource)
+);
+
+CREATE INDEX IF NOT EXISTS idx_postmatch_backfill_queue_open
+ON postmatch_backfill_queue (state, updated_at)
+WHERE state IN ('pending', 'running');
+
+COMMIT;
@@ -0,0 +1,21 @@
+-- db/migrate/add_schedule_sync_state.sql
+--
+-- schedule_sync_state: football/workers/schedule_sync.py 증분 모드(SCHEDULE_SYNC_INCREMENTAL=1) 상태
+-- - (league_id, KST 날짜) 창마다 목록 응답 해시 / 경기별 해시 / 다음 확인 시각
+-- - next_due_at 이 안 된 창은 API 호출 없이 건너뜀, 해시가 같으면 DB 쓰기 없음
+-- - schedule_sync 실행 시 ensure_schedule_sync_state_table() 로도 동일하게 처리
+
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS schedule_sync_state (
+    league_id      INTEGER     NOT NULL,
+    date_kst       TEXT        NOT NULL,
+    resp_hash      TEXT        NOT NULL,
+    fixture_hashes JSONB       NOT NULL DEFAULT '{}'::jsonb,
+    fixture_count  INTEGER     NOT NULL DEFAULT 0,
+    synced_at      TIMESTAMPTZ NOT NULL DEFAULT now(),
+    next_due_at    TIMESTAMPTZ NOT NULL DEFAULT now(),
+    PRIMARY KEY (league_id, date_kst)
+);
+
+COMMIT;
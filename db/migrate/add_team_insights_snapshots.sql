@@ -0,0 +1,24 @@
+-- db/migrate/add_team_insights_snapshots.sql
+--
+-- 팀 insights 스냅샷 (services/insights_snapshot.py)
+-- - (team, league 집합, last_n, season) 단위 side insights 결과
+-- - live_status_worker.py role=insights 가 FT 트리거(ft_triggers.insights_consumed_utc)를 소비하며 갱신
+-- - last_requested_utc: API 조회 시각 (하루 1회 갱신), INSIGHTS_SNAPSHOT_IDLE_DAYS 동안 조회가 없으면 워커가 삭제
+-- - 워커가 처음 뜰 때도 ensure_team_insights_snapshots_table() / ensure_ft_triggers_table() 로 생성
+
+CREATE TABLE IF NOT EXISTS team_insights_snapshots (
+    team_id          INTEGER NOT NULL,
+    season           INTEGER NOT NULL,
+    league_key       TEXT NOT NULL,
+    last_n           INTEGER NOT NULL,
+    base_league_id   INTEGER NOT NULL,
+    league_ids       INTEGER[] NOT NULL,
+    payload_json     TEXT NOT NULL,
+    latest_date_utc  TIMESTAMPTZ,
+    version_sum      BIGINT NOT NULL DEFAULT 0,
+    updated_utc      TIMESTAMPTZ DEFAULT now(),
+    last_requested_utc TIMESTAMPTZ DEFAULT now(),
+    PRIMARY KEY (team_id, season, league_key, last_n)
+);
+
+ALTER TABLE ft_triggers ADD COLUMN IF NOT EXISTS insights_consumed_utc text;
@@ -0,0 +1,52 @@
+# db/migrate/backfill_matches_kickoff_utc.py
+#
+# 목적:
+# - add_matches_kickoff_utc.sql 적용 후, 기존 matches row 의 kickoff_utc 를 배치로 채우고
+#   마지막에 kickoff 인덱스를 만든다 (CREATE INDEX CONCURRENTLY).
+# - batch 마다 커밋(autocommit)이라 운영 중에 돌려도 긴 락이 없다.
+# - 워커는 컬럼만 추가하고 backfill/인덱스는 하지 않는다 → 배포 단계에서 이 스크립트를 1회 실행.
+#
+# 사용:
+#   python db/migrate/backfill_matches_kickoff_utc.py [batch_size]
+#
+# 환경변수:
+#   - DATABASE_URL
+
+import os
+import sys
+import time
+
+# 레포 루트(db.py, services/)를 import 경로에 추가
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from db import execute  # noqa: E402
+from services.matches_kickoff import (  # noqa: E402
+    MATCHES_KICKOFF_COLUMN_DDL,
+    MATCHES_KICKOFF_TRIGGER_FUNCTION_SQL,
+    MATCHES_KICKOFF_TRIGGER_SQL,
+    backfill_matches_kickoff_utc,
+    create_matches_kickoff_indexes,
+)
+
+
+def main() -> int:
+    batch_size = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+
+    t0 = time.time()
+
+    # SQL 마이그레이션을 안 돌렸어도 동작하도록 idempotent 하게 한 번 더
+    execute(MATCHES_KICKOFF_COLUMN_DDL)
+    execute(MATCHES_KICKOFF_TRIGGER_FUNCTION_SQL)
+    execute(MATCHES_KICKOFF_TRIGGER_SQL)
+
+    n = backfill_matches_kickoff_utc(batch_size=batch_size, verbose=True)
+    print(f"[backfill_matches_kickoff_utc] rows={n} ({time.time() - t0:.1f}s)", flush=True)
+
+    create_matches_kickoff_indexes(verbose=True)
+
+    print(f"[backfill_matches_kickoff_utc] done ({time.time() - t0:.1f}s)", flush=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
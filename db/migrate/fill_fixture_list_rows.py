@@ -0,0 +1,45 @@
+# db/migrate/fill_fixture_list_rows.py
+#
+# 목적:
+# - fixture_list_rows 테이블 생성 + matches 전체로 채움 + 인덱스 (수동 복구에도 사용).
+# - DDL / SELECT 정의는 services/fixture_list_rows.py 의 것을 그대로 쓴다 (별도 .sql 없음).
+# - idx_fixture_list_rows_kickoff 를 채움 이후 마지막에 만든다
+#   → API 는 이 인덱스가 생긴 뒤에야 projection 을 읽는다 (fixture_list_rows_ready).
+#
+# 사용:
+#   python db/migrate/fill_fixture_list_rows.py
+#
+# 환경변수:
+#   - DATABASE_URL
+
+import os
+import sys
+import time
+
+# 레포 루트(db.py, services/)를 import 경로에 추가
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from db import execute  # noqa: E402
+from services.fixture_list_rows import (  # noqa: E402
+    FIXTURE_LIST_ROWS_INDEXES,
+    ensure_fixture_list_rows_table,
+    refresh_all_fixture_list_rows,
+)
+
+
+def main() -> int:
+    t0 = time.time()
+
+    ensure_fixture_list_rows_table()
+    refresh_all_fixture_list_rows()
+
+    # 마지막 인덱스(kickoff)가 "채움 완료" 표시
+    for ddl in FIXTURE_LIST_ROWS_INDEXES:
+        execute(ddl)
+
+    print(f"[fill_fixture_list_rows] done ({time.time() - t0:.1f}s)", flush=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -54,12 +54,21 @@ CREATE TABLE matches (
     home_id         INTEGER NOT NULL,
     away_id         INTEGER NOT NULL,
     home_ft         INTEGER,
-    away_ft         INTEGER
+    away_ft         INTEGER,
+    kickoff_utc     TIMESTAMPTZ
 );
 
 CREATE INDEX idx_matches_league_season_date
     ON matches(league_id, season, date_utc);
 
+-- 날짜 범위 조회용 (kickoff_utc 는 add_matches_kickoff_utc.sql 트리거가 date_utc 와 동기화)
+CREATE INDEX idx_matches_league_season_kickoff
+    ON matches(league_id, season, kickoff_utc);
+CREATE INDEX idx_matches_league_kickoff
+    ON matches(league_id, kickoff_utc);
+CREATE INDEX idx_matches_kickoff_utc
+    ON matches(kickoff_utc);
+
 CREATE TABLE fixtures (
     fixture_id      INTEGER PRIMARY KEY,
     league_id       INTEGER,
@@ -2,7 +2,7 @@
 #
 # 목적:
 # - fixture_id 리스트(ids.txt)를 받아서
-#   1) /fixtures?id= 로 원본을 다시 받아 match_fixtures_raw 저장
+#   1) /fixtures?ids= (20개 묶음, 실패/누락 id 는 id= 단건 재시도) 로 원본을 다시 받아 match_fixtures_raw 저장
 #   2) matches + fixtures 테이블도 최신화(스코어/라운드/venue/status_long 등 포함)
 #
 # 사용:
@@ -20,6 +20,9 @@ from typing import Any, Dict, Optional
 import requests
 
 from db import execute
+from services.fixture_list_rows import refresh_fixture_list_rows
+from services.fixtures_by_ids import iter_fixtures_by_ids
+from services.match_data_version import bump_match_data_versions
 
 BASE_URL = "https://v3.football.api-sports.io/fixtures"
 
@@ -74,6 +77,12 @@ def fetch_fixture_by_id(fixture_id: int) -> Optional[Dict[str, Any]]:
     return first if isinstance(first, dict) else None
 
 
+def _get_fixtures(params: Dict[str, Any]) -> Dict[str, Any]:
+    data = _safe_get(BASE_URL, params=params, timeout=25)
+    time.sleep(0.09)  # 레이트리밋 완화 (호출 단위)
+    return data
+
+
 # ─────────────────────────────────────
 #  DB UPSERTS
 # ─────────────────────────────────────
@@ -248,28 +257,33 @@ def main() -> None:
     ok = 0
     fail = 0
 
+    fids = []
     for i in range(start_idx, total):
-        s = ids[i]
         try:
-            fid = int(s)
-            fx = fetch_fixture_by_id(fid)
-            if not fx:
-                fail += 1
-                continue
-
+            fids.append(int(ids[i]))
+        except ValueError:
+            fail += 1
+            print(f"[ERR] idx={i+1}/{total} fixture_id={ids[i]} err=invalid id", file=sys.stderr)
+
+    done = start_idx
+    for fid, fx in iter_fixtures_by_ids(fids, _get_fixtures, tag="backfill_raw_by_ids"):
+        done += 1
+        if (done - start_idx) % 100 == 0:
+            print(f"[progress] idx={done}/{total} ok={ok} fail={fail} (start={start_idx})")
+        if not fx:
+            fail += 1
+            continue
+        try:
             # raw 저장 + matches/fixtures 미러링
             upsert_match_fixtures_raw(fid, fx)
             upsert_match_row(fx)
             upsert_fixture_row(fx)
-
+            refresh_fixture_list_rows([fid])
+            bump_match_data_versions([fid])
             ok += 1
-            if (i + 1) % 100 == 0:
-                print(f"[progress] idx={i+1}/{total} ok={ok} fail={fail} (start={start_idx})")
-            time.sleep(0.09)  # 레이트리밋 완화
         except Exception as e:
             fail += 1
-            print(f"[ERR] idx={i+1}/{total} fixture_id={s} err={e}", file=sys.stderr)
-            time.sleep(0.25)
+            print(f"[ERR] idx={done}/{total} fixture_id={fid} err={e}", file=sys.stderr)
 
     print(f"[done] total={total} start={start_idx} ok={ok} fail={fail}")
 
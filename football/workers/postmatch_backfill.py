@@ -19,12 +19,31 @@ import sys
 import json
 import time
 import datetime as dt
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Set, Tuple
 import re
 
 import requests
 
 from db import fetch_one, fetch_all, execute
+from services.apisports_client import apisports_get
+from services.match_events_sync import copy_match_events_for_fixture
+from services.fixtures_by_ids import fetch_fixtures_by_ids
+from services.team_meta import missing_team_ids, resolve_team_meta
+from services.fixture_write_skip import fixture_content_hash
+from services.fixture_list_rows import (
+    refresh_fixture_list_rows,
+    refresh_fixture_list_rows_for_teams,
+)
+from services.match_data_version import (
+    bump_match_data_versions,
+    ensure_match_data_versions_table,
+)
+from football.workers.postmatch_backfill_queue import (
+    POSTMATCH_BACKFILL_WORKERS,
+    enqueue_postmatch_tasks,
+    ensure_postmatch_backfill_queue_table,
+    start_postmatch_backfill_queue,
+)
 
 BASE_URL = "https://v3.football.api-sports.io"
 
@@ -53,20 +72,19 @@ def _chunked(xs: List[int], size: int) -> List[List[int]]:
 
 
 def _missing_team_ids(team_ids: List[int]) -> List[int]:
-    if not team_ids:
-        return []
-    rows = fetch_all(
-        "SELECT id FROM teams WHERE id = ANY(%s)",
-        (team_ids,),
-    )
-    existing = {int(r["id"]) for r in (rows or []) if r and r.get("id") is not None}
-    return [tid for tid in team_ids if int(tid) not in existing]
+    # ✅ 프로세스 캐시 (services/team_meta) — 이미 확인된 id 는 다시 조회하지 않음
+    return missing_team_ids(team_ids)
+
+
+# leagues row + logo 가 있다고 확인된 league_id (프로세스 캐시)
+_KNOWN_LEAGUE_IDS: Set[int] = set()
 
 
 def _missing_league_ids_or_logo(league_ids: List[int]) -> List[int]:
     """
     leagues row가 없거나, logo가 비어있는 league_id만 리턴
     """
+    league_ids = [int(lid) for lid in league_ids if int(lid) not in _KNOWN_LEAGUE_IDS]
     if not league_ids:
         return []
     rows = fetch_all(
@@ -84,35 +102,11 @@ def _missing_league_ids_or_logo(league_ids: List[int]) -> List[int]:
         logo = have.get(int(lid))
         if logo is None or logo == "":
             out.append(int(lid))
+        else:
+            _KNOWN_LEAGUE_IDS.add(int(lid))
     return out
 
 
-def _upsert_team_from_api(team_obj: Dict[str, Any]) -> None:
-    """
-    API /teams response element: {"team": {...}, "venue": {...}} 형태
-    teams 테이블 스키마: id, name, country, logo
-    """
-    t = team_obj.get("team") or {}
-    tid = t.get("id")
-    if tid is None:
-        return
-    name = t.get("name")
-    country = t.get("country")
-    logo = t.get("logo")
-
-    execute(
-        """
-        INSERT INTO teams (id, name, country, logo)
-        VALUES (%s,%s,%s,%s)
-        ON CONFLICT (id) DO UPDATE SET
-            name = COALESCE(NULLIF(EXCLUDED.name,''), teams.name),
-            country = COALESCE(NULLIF(EXCLUDED.country,''), teams.country),
-            logo = COALESCE(NULLIF(EXCLUDED.logo,''), teams.logo)
-        """,
-        (int(tid), name, country, logo),
-    )
-
-
 def _upsert_league_from_api(league_resp0: Dict[str, Any]) -> None:
     """
     API /leagues?id=xxx response[0] 형태:
@@ -145,60 +139,23 @@ def _upsert_league_from_api(league_resp0: Dict[str, Any]) -> None:
 
 def backfill_teams_meta(team_ids: List[int]) -> None:
     """
-    team_ids 중 teams 테이블에 없는 것만 /teams?id= 로 채운다.
-    """
-    team_ids = sorted({int(x) for x in (team_ids or []) if x is not None})
-    missing = _missing_team_ids(team_ids)
-    if not missing:
-        return
-
-    print(f"[meta] missing teams: {len(missing)}")
-
-    # API-Sports는 id 파라미터에 여러 개를 콤마로 받는 경우가 많음.
-    # 안전하게 20개씩 쪼개 호출.
-    for batch in _chunked(missing, 20):
-        try:
-            data = _safe_get("/teams", params={"id": ",".join(map(str, batch))})
-            resp = data.get("response") or []
-            for r in resp:
-                if isinstance(r, dict):
-                    _upsert_team_from_api(r)
-        except Exception as e:
-            print(f"[meta] teams batch failed ids={batch}: {e}", file=sys.stderr)
-
-def backfill_teams_meta_single(team_ids: List[int]) -> None:
-    """
-    team_ids 중 teams 테이블에 없는 것만 /teams?id= "단건" 호출로 채운다.
-    - 일부 환경에서 /teams?id=1,2,3 (콤마 다건)이 API 에러를 내는 케이스가 있어서 단건이 안전.
+    team_ids 중 teams 테이블에 없는 것만 채운다.
+    - /teams?league=&season= 묶음 호출 우선 (한 콜에 리그 팀 전부 + 기존 팀 이름/로고 갱신)
+    - 묶음에 안 걸리는 팀만 /teams?id= 단건 (콤마 다건은 API 에러 케이스가 있어 안 씀)
     """
-    team_ids = sorted({int(x) for x in (team_ids or []) if x is not None})
-    missing = _missing_team_ids(team_ids)
-    if not missing:
+    changed = resolve_team_meta(
+        team_ids,
+        lambda params: _safe_get("/teams", params=params),
+        tag="meta",
+    )
+    if not changed:
         return
 
-    print(f"[meta] missing teams(single): {len(missing)}")
-
-    ok = 0
-    fail = 0
-    for tid in missing:
-        try:
-            data = _safe_get("/teams", params={"id": int(tid)})
-            resp = data.get("response") or []
-            inserted = False
-            for r in resp:
-                if isinstance(r, dict):
-                    _upsert_team_from_api(r)
-                    ok += 1
-                    inserted = True
-                    break
-            if not inserted:
-                fail += 1
-        except Exception as e:
-            fail += 1
-            print(f"[meta] team fetch failed id={tid}: {e}", file=sys.stderr)
-
-    print(f"[meta] teams(single) done ok={ok} fail={fail}")
-
+    # 팀 메타가 없어서(또는 이름/로고가 바뀌어서) 리스트 projection 에서 빠져/틀려 있던 경기 복구
+    try:
+        refresh_fixture_list_rows_for_teams(changed)
+    except Exception as e:
+        print(f"[meta] fixture_list_rows refresh failed: {e}", file=sys.stderr)
 
 
 def backfill_leagues_meta(league_ids: List[int]) -> None:
@@ -570,7 +527,7 @@ def _safe_get(path: str, *, params: Dict[str, Any], timeout: int = 25, max_retry
     last_err: Optional[Exception] = None
     for i in range(max_retry):
         try:
-            resp = requests.get(url, headers=_get_headers(), params=params, timeout=timeout)
+            resp = apisports_get("football", url, headers=_get_headers(), params=params, timeout=timeout)
             if resp.status_code in (429, 500, 502, 503, 504):
                 time.sleep(0.7 * (i + 1))
                 continue
@@ -747,6 +704,17 @@ def fetch_fixture_by_id(fixture_id: int) -> Optional[Dict[str, Any]]:
     return None
 
 
+def fetch_fixtures_by_ids_from_api(fixture_ids: List[int]) -> Dict[int, Dict[str, Any]]:
+    """
+    /fixtures?ids= 묶음(20개) 조회. 실패/누락 id 는 단건 재시도, 그래도 없으면 결과에서 빠짐.
+    """
+    return fetch_fixtures_by_ids(
+        fixture_ids,
+        lambda params: _safe_get("/fixtures", params=params),
+        tag="postmatch_backfill",
+    )
+
+
 def fetch_events_from_api(fixture_id: int) -> List[Dict[str, Any]]:
     data = _safe_get("/fixtures/events", params={"fixture": fixture_id})
     rows = data.get("response", []) or []
@@ -1606,7 +1574,14 @@ def upsert_match_row(fx: Dict[str, Any], league_id: int, season: int) -> None:
 
     league_round = (fx.get("league") or {}).get("round")
 
-    execute(
+    # 리그 / 팀 버전 판단용 이전 상태 (FINISHED 전환 / 스코어 변경)
+    prev = fetch_one(
+        "SELECT status_group, home_ft, away_ft FROM matches WHERE fixture_id = %s",
+        (int(fid),),
+    )
+
+    # 내용이 같으면 UPDATE 자체를 건너뛴다 → RETURNING 이 없으면 "변경 없음"
+    written = fetch_one(
         """
         INSERT INTO matches (
             fixture_id, league_id, season, date_utc, status, status_group,
@@ -1642,6 +1617,21 @@ def upsert_match_row(fx: Dict[str, Any], league_id: int, season: int) -> None:
             venue_name = EXCLUDED.venue_name,
             venue_city = EXCLUDED.venue_city,
             league_round = EXCLUDED.league_round
+        WHERE
+            (matches.league_id, matches.season, matches.date_utc, matches.status, matches.status_group,
+             matches.home_id, matches.away_id, matches.home_ft, matches.away_ft, matches.elapsed,
+             matches.home_ht, matches.away_ht, matches.referee, matches.fixture_timezone,
+             matches.fixture_timestamp, matches.status_short, matches.status_long,
+             matches.status_elapsed, matches.status_extra, matches.venue_id, matches.venue_name,
+             matches.venue_city, matches.league_round)
+            IS DISTINCT FROM
+            (EXCLUDED.league_id, EXCLUDED.season, EXCLUDED.date_utc, EXCLUDED.status, EXCLUDED.status_group,
+             EXCLUDED.home_id, EXCLUDED.away_id, EXCLUDED.home_ft, EXCLUDED.away_ft, EXCLUDED.elapsed,
+             EXCLUDED.home_ht, EXCLUDED.away_ht, EXCLUDED.referee, EXCLUDED.fixture_timezone,
+             EXCLUDED.fixture_timestamp, EXCLUDED.status_short, EXCLUDED.status_long,
+             EXCLUDED.status_elapsed, EXCLUDED.status_extra, EXCLUDED.venue_id, EXCLUDED.venue_name,
+             EXCLUDED.venue_city, EXCLUDED.league_round)
+        RETURNING fixture_id
         """,
         (
             int(fid), int(league_id), int(season), date_utc, status_short, status_group,
@@ -1653,6 +1643,26 @@ def upsert_match_row(fx: Dict[str, Any], league_id: int, season: int) -> None:
             venue_id, venue_name, venue_city, league_round,
         ),
     )
+    if not written:
+        return
+
+    # /api/fixtures 리스트 projection 동기화(best-effort)
+    try:
+        refresh_fixture_list_rows([int(fid)])
+    except Exception as e:
+        print(f"    ! fixture {fid}: fixture_list_rows 갱신 실패: {e}", file=sys.stderr)
+
+    # 매치디테일 블록 캐시 데이터 버전 bump(best-effort)
+    # - 리그 / 팀 버전은 FINISHED 전환 또는 종료 경기 스코어 변경 때만 (live_status_worker 와 같은 규칙)
+    league_changed = status_group == "FINISHED" and (
+        not prev
+        or prev.get("status_group") != "FINISHED"
+        or (prev.get("home_ft"), prev.get("away_ft")) != (home_ft, away_ft)
+    )
+    try:
+        bump_match_data_versions([int(fid)], league_fixture_ids=[int(fid)] if league_changed else [])
+    except Exception as e:
+        print(f"    ! fixture {fid}: match_data_versions bump 실패: {e}", file=sys.stderr)
 
 
 def upsert_match_events_raw(fixture_id: int, events: List[Dict[str, Any]], fetched_at: dt.datetime) -> None:
@@ -1769,120 +1779,51 @@ def upsert_generic_raw_snapshot(table_name: str, fixture_id: int, payload: Any,
     )
 
 
-def replace_match_events_for_fixture(fixture_id: int, events: List[Dict[str, Any]]) -> int:
+def _raw_snapshot_changed(table_name: str, fixture_id: int, payload: Any) -> bool:
     """
-    match_events를 fixture_id 단위로 '싹 교체'한다. (API 스냅샷 미러링)
-
-    정책(live 최신):
-    - events가 빈 배열([])이면 DB를 건드리지 않는다(삭제/삽입 모두 안 함).
-    - role != live 이고 DB matches.status_group 이 INPLAY면 레이스 차단을 위해 스킵한다.
+    새 payload 의 내용 해시가 저장된 raw 스냅샷과 다르면 True.
+    (raw 테이블/컬럼이 없거나 조회 실패, 아직 스냅샷이 없으면 True → 예전처럼 bump)
     """
-    cols = set(_get_table_columns("match_events"))
-    if not cols:
-        return 0
-
-    if not events:
-        return 0
-
-    # ✅ 레이스 차단: backfill/watchdog/postmatch 경로에서 INPLAY 이벤트를 건드리지 않는다.
+    cols = set(_get_table_columns(table_name))
+    col_data = "data_json" if "data_json" in cols else ("raw_json" if "raw_json" in cols else ("data" if "data" in cols else None))
+    if not col_data:
+        return True
     try:
-        role = (os.environ.get("LIVE_WORKER_ROLE") or "live").strip().lower()
-        rows = fetch_all(
-            """
-            SELECT status_group
-            FROM matches
-            WHERE fixture_id = %s
-            LIMIT 1
-            """,
-            (fixture_id,),
-        )
-        if rows:
-            sg = (rows[0].get("status_group") or "").strip().upper()
-            if (role != "live") and (sg == "INPLAY"):
-                return 0
+        row = fetch_one(f"SELECT {col_data} AS d FROM {table_name} WHERE fixture_id = %s", (int(fixture_id),))
     except Exception:
-        pass
-
-    def has(c: str) -> bool:
-        return c.lower() in cols
-
-    col_extra = "extra" if has("extra") else ("time_extra" if has("time_extra") else None)
-
-    inserted = 0
-
-    # ✅ events가 있을 때만 삭제 후 교체
-    execute("DELETE FROM match_events WHERE fixture_id = %s", (fixture_id,))
-
-    for ev in events:
-        if not isinstance(ev, dict):
-            continue
-
-        time_obj = ev.get("time") or {}
-        team_obj = ev.get("team") or {}
-        player_obj = ev.get("player") or {}
-        assist_obj = ev.get("assist") or {}
-
-        minute = safe_int(time_obj.get("elapsed")) or 0
-        extra = safe_int(time_obj.get("extra"))
-
-        type_raw = safe_text(ev.get("type"))
-        detail_raw = safe_text(ev.get("detail"))
-        comments_raw = safe_text(ev.get("comments"))
-
-        team_id = safe_int(team_obj.get("id"))
-        player_id = safe_int(player_obj.get("id"))
-        player_name = safe_text(player_obj.get("name"))
-
-        assist_id = safe_int(assist_obj.get("id"))
-        assist_name = safe_text(assist_obj.get("name"))
-
-        # SUB: player=OUT, assist=IN 이 흔함
-        player_in_id = assist_id
-        player_in_name = assist_name
-
-        ins_cols: List[str] = []
-        ins_vals: List[Any] = []
-
-        def add(c: str, v: Any) -> None:
-            if has(c):
-                ins_cols.append(c)
-                ins_vals.append(v)
-
-        add("fixture_id", fixture_id)
-        add("minute", minute)
-
-        if col_extra:
-            ins_cols.append(col_extra)
-            ins_vals.append(extra)
-
-        add("type", type_raw)
-        add("detail", detail_raw)
-        add("comments", comments_raw)
-
-        add("team_id", team_id)
+        return True
+    if not row or row.get("d") is None:
+        return True
 
-        add("player_id", player_id)
-        add("player_name", player_name)
+    old = row["d"]
+    if isinstance(old, (str, bytes)):
+        try:
+            old = json.loads(old)
+        except Exception:
+            return True
 
-        add("assist_player_id", assist_id)
-        add("assist_name", assist_name)
+    # text / jsonb 컬럼 어느 쪽이든 같은 비교가 되도록 정렬된 JSON 으로 해시
+    def _h(v: Any) -> str:
+        return fixture_content_hash(json.dumps(v, ensure_ascii=False, sort_keys=True, separators=(",", ":")))
 
-        add("player_in_id", player_in_id)
-        add("player_in_name", player_in_name)
+    return _h(old) != _h(payload if payload is not None else [])
 
-        if not ins_cols:
-            continue
 
-        col_sql = ", ".join(ins_cols)
-        ph_sql = ", ".join(["%s"] * len(ins_cols))
-
-        execute(
-            f"INSERT INTO match_events ({col_sql}) VALUES ({ph_sql})",
-            tuple(ins_vals),
-        )
-        inserted += 1
+def replace_match_events_for_fixture(fixture_id: int, events: List[Dict[str, Any]]) -> int:
+    """
+    match_events를 fixture_id 단위로 '싹 교체'한다. (API 스냅샷 미러링)
 
-    return inserted
+    정책(live 최신):
+    - events가 빈 배열([])이면 DB를 건드리지 않는다(삭제/삽입 모두 안 함).
+    - role != live 이고 DB matches.status_group 이 INPLAY면 레이스 차단을 위해 스킵한다.
+    - backfill 은 전체 재적재라 DELETE + COPY 한 트랜잭션 (services/match_events_sync.py)
+    """
+    role = (os.environ.get("LIVE_WORKER_ROLE") or "live").strip().lower()
+    return copy_match_events_for_fixture(
+        fixture_id,
+        events,
+        skip_if_inplay=(role != "live"),
+    )
 
 
 def upsert_match_events(fixture_id: int, events: List[Dict[str, Any]]) -> None:
@@ -2156,6 +2097,114 @@ def has_team_stats(fixture_id: int) -> bool:
 def has_player_stats(fixture_id: int) -> bool:
     return _has_any_row("match_player_stats", fixture_id)
 
+# ─────────────────────────────────────
+#  백필 계획 (set 기반): fixture 목록 → 리소스별 "없음" 매트릭스
+# ─────────────────────────────────────
+
+# backfill_postmatch_for_fixture kwarg → (테이블, raw 여부)
+# raw 테이블이 없으면 "이미 있다고 치고" 제외 (_has_any_row_if_table_exists 와 동일)
+_PLAN_TABLES: Dict[str, Tuple[str, bool]] = {
+    "do_events": ("match_events", False),
+    "do_events_raw": ("match_events_raw", False),
+    "do_lineups": ("match_lineups", False),
+    "do_lineups_raw": ("match_lineups_raw", True),
+    "do_team_stats": ("match_team_stats", False),
+    "do_team_stats_raw": ("match_team_stats_raw", True),
+    "do_player_stats": ("match_player_stats", False),
+    "do_player_stats_raw": ("match_player_stats_raw", True),
+}
+
+
+def _need_flags_single(fixture_id: int, force: bool) -> Dict[str, bool]:
+    """
+    예전 경기별 has_* 경로 (plan 에 없는 fixture fallback).
+    """
+    return {
+        "do_events": force or (not has_match_events(fixture_id)),
+        "do_events_raw": force or (not has_match_events_raw(fixture_id)),
+        "do_lineups": force or (not has_lineups(fixture_id)),
+        "do_lineups_raw": force or (not has_lineups_raw(fixture_id)),
+        "do_team_stats": force or (not has_team_stats(fixture_id)),
+        "do_team_stats_raw": force or (not has_team_stats_raw(fixture_id)),
+        "do_player_stats": force or (not has_player_stats(fixture_id)),
+        "do_player_stats_raw": force or (not has_player_stats_raw(fixture_id)),
+    }
+
+
+def plan_postmatch_backfill(fixture_ids: List[int], *, force: bool = False) -> Dict[int, Dict[str, bool]]:
+    """
+    fixture_id -> {do_events: bool, ..., do_player_stats_raw: bool}
+
+    경기마다 has_* 8번(= 시즌이면 수천 번 왕복) 대신 청크당 쿼리 1번 (UNION ALL + fixture_id = ANY).
+    """
+    ids = sorted({int(f) for f in fixture_ids})
+    if not ids:
+        return {}
+    if force:
+        return {fid: {k: True for k in _PLAN_TABLES} for fid in ids}
+
+    present: Dict[str, Set[int]] = {k: set() for k in _PLAN_TABLES}
+    parts: List[str] = []
+    keys: List[str] = []
+    for key, (table, is_optional_raw) in _PLAN_TABLES.items():
+        if is_optional_raw and not _table_exists(table):
+            present[key] = set(ids)
+            continue
+        parts.append(f"SELECT %s::text AS k, fixture_id FROM {table} WHERE fixture_id = ANY(%s) GROUP BY fixture_id")
+        keys.append(key)
+
+    if parts:
+        for chunk in _chunked(ids, 2000):
+            params: List[Any] = []
+            for key in keys:
+                params.extend([key, chunk])
+            rows = fetch_all(" UNION ALL ".join(parts), tuple(params))
+            for r in rows or []:
+                present[str(r["k"])].add(int(r["fixture_id"]))
+
+    return {fid: {k: fid not in present[k] for k in _PLAN_TABLES} for fid in ids}
+
+
+def _finished_fixture_ids(fixtures: List[Dict[str, Any]]) -> List[int]:
+    out: List[int] = []
+    for fx in fixtures or []:
+        b = _extract_fixture_basic(fx)
+        if b and (b.get("status_group") or "").strip() == "FINISHED":
+            out.append(int(b["fixture_id"]))
+    return out
+
+
+def _full_fixtures_or_empty(fixtures: List[Dict[str, Any]]) -> Dict[int, Dict[str, Any]]:
+    """
+    목록 응답(fx) 대신 저장할 full 응답을 ids= 묶음으로 미리 받아 둠. 실패하면 {} → 목록 응답 그대로 저장.
+    """
+    ids: List[int] = []
+    for fx in fixtures or []:
+        b = _extract_fixture_basic(fx)
+        if b:
+            ids.append(int(b["fixture_id"]))
+    try:
+        return fetch_fixtures_by_ids_from_api(ids)
+    except Exception as e:
+        print(f"    ! fixtures ids= 조회 실패 → 목록 응답 사용: {e}", file=sys.stderr)
+        return {}
+
+
+def _plan_or_empty(fixtures: List[Dict[str, Any]], force: bool) -> Dict[int, Dict[str, bool]]:
+    """
+    리그(+시즌/날짜) 단위 백필 계획. 실패하면 {} → 경기별 has_* fallback.
+    """
+    ids = _finished_fixture_ids(fixtures)
+    try:
+        plan = plan_postmatch_backfill(ids, force=force)
+    except Exception as e:
+        print(f"    ! backfill plan 실패 → 경기별 확인: {e}", file=sys.stderr)
+        return {}
+    missing = sum(1 for flags in plan.values() if any(flags.values()))
+    print(f"    * backfill plan: finished={len(ids)} need_backfill={missing}")
+    return plan
+
+
 def has_standings(league_id: int, season: int) -> bool:
     row = fetch_one(
         """
@@ -2175,91 +2224,136 @@ def has_standings(league_id: int, season: int) -> bool:
 #  한 경기 상세 백필
 # ─────────────────────────────────────
 
-def backfill_postmatch_for_fixture(
+# 리소스 = 큐 작업 단위 (postmatch_backfill_queue.resource)
+POSTMATCH_RESOURCES = ("events", "lineups", "team_stats", "player_stats")
+
+
+def backfill_postmatch_resource(
     fixture_id: int,
+    resource: str,
     *,
-    do_events: bool,
-    do_events_raw: bool,
-    do_lineups: bool,
-    do_lineups_raw: bool,
-    do_team_stats: bool,
-    do_team_stats_raw: bool,
-    do_player_stats: bool,
-    do_player_stats_raw: bool,
+    do_main: bool,
+    do_raw: bool,
+    fetched_at: Optional[dt.datetime] = None,
 ) -> None:
-    fetched_at = now_utc()
+    """
+    한 경기의 리소스 1개 백필 (API 1회 + 정규화 테이블 / raw 스냅샷).
+    API 호출 실패는 예외로 올린다 → 큐 러너가 재시도 (빈 raw 스냅샷을 남겨 "이미 있음"으로 굳지 않게).
+    """
+    fetched_at = fetched_at or now_utc()
+    # 블록 캐시 데이터 버전은 내용이 바뀐 경우에만 bump (raw 스냅샷을 덮어쓰기 전에 비교)
+    changed = True
 
-    # events / events_raw
-    if do_events or do_events_raw:
-        try:
-            events = fetch_events_from_api(fixture_id)
-        except Exception as e:
-            print(f"    ! fixture {fixture_id}: events 호출 에러: {e}", file=sys.stderr)
-            events = []
+    if resource == "events":
+        events = fetch_events_from_api(fixture_id)
+        if do_main:
+            changed = _raw_snapshot_changed("match_events_raw", fixture_id, events)
 
-        if do_events_raw:
+        if do_raw:
             try:
                 upsert_match_events_raw(fixture_id, events, fetched_at)
             except Exception:
                 pass
 
-        if do_events:
+        if do_main:
             try:
                 replace_match_events_for_fixture(fixture_id, events)
             except Exception:
                 pass
 
-    # lineups / lineups_raw
-    if do_lineups or do_lineups_raw:
-        try:
-            lineups = fetch_lineups_from_api(fixture_id)
-        except Exception as e:
-            print(f"    ! fixture {fixture_id}: lineups 호출 에러: {e}", file=sys.stderr)
-            lineups = []
+            # 리스트 레드카드 집계 갱신
+            try:
+                refresh_fixture_list_rows([fixture_id])
+            except Exception:
+                pass
 
-        if do_lineups_raw:
+    elif resource == "lineups":
+        lineups = fetch_lineups_from_api(fixture_id)
+        if do_main:
+            changed = _raw_snapshot_changed("match_lineups_raw", fixture_id, lineups)
+
+        if do_raw:
             try:
                 upsert_generic_raw_snapshot("match_lineups_raw", fixture_id, lineups, fetched_at)
             except Exception:
                 pass
 
-        if do_lineups and lineups:
+        if do_main and lineups:
             upsert_match_lineups(fixture_id, lineups)
 
-    # team stats / team_stats_raw
-    if do_team_stats or do_team_stats_raw:
-        try:
-            stats = fetch_team_stats_from_api(fixture_id)
-        except Exception as e:
-            print(f"    ! fixture {fixture_id}: statistics 호출 에러: {e}", file=sys.stderr)
-            stats = []
+    elif resource == "team_stats":
+        stats = fetch_team_stats_from_api(fixture_id)
+        if do_main:
+            changed = _raw_snapshot_changed("match_team_stats_raw", fixture_id, stats)
 
-        if do_team_stats_raw:
+        if do_raw:
             try:
                 upsert_generic_raw_snapshot("match_team_stats_raw", fixture_id, stats, fetched_at)
             except Exception:
                 pass
 
-        if do_team_stats and stats:
+        if do_main and stats:
             upsert_match_team_stats(fixture_id, stats)
 
-    # player stats / player_stats_raw
-    if do_player_stats or do_player_stats_raw:
-        try:
-            players_stats = fetch_player_stats_from_api(fixture_id)
-        except Exception as e:
-            print(f"    ! fixture {fixture_id}: players 호출 에러: {e}", file=sys.stderr)
-            players_stats = []
+    elif resource == "player_stats":
+        players_stats = fetch_player_stats_from_api(fixture_id)
 
-        if do_player_stats_raw:
+        if do_raw:
             try:
                 upsert_generic_raw_snapshot("match_player_stats_raw", fixture_id, players_stats, fetched_at)
             except Exception:
                 pass
 
-        if do_player_stats and players_stats:
+        if do_main and players_stats:
             upsert_match_player_stats(fixture_id, players_stats)
 
+    else:
+        raise ValueError(f"unknown postmatch resource: {resource}")
+
+    # events / lineups / stats 내용이 바뀌었으면 매치디테일 블록 캐시 fixture 버전 bump(best-effort)
+    # - 상태/스코어는 안 바뀌므로 리그 / 팀 버전은 건드리지 않는다
+    if do_main and changed and resource in ("events", "lineups", "team_stats"):
+        try:
+            bump_match_data_versions([fixture_id], league_fixture_ids=[])
+        except Exception as e:
+            print(f"    ! fixture {fixture_id}: match_data_versions bump 실패: {e}", file=sys.stderr)
+
+
+def _postmatch_queue_handler(fixture_id: int, resource: str, do_main: bool, do_raw: bool) -> None:
+    backfill_postmatch_resource(fixture_id, resource, do_main=do_main, do_raw=do_raw)
+
+
+def backfill_postmatch_for_fixture(
+    fixture_id: int,
+    *,
+    do_events: bool,
+    do_events_raw: bool,
+    do_lineups: bool,
+    do_lineups_raw: bool,
+    do_team_stats: bool,
+    do_team_stats_raw: bool,
+    do_player_stats: bool,
+    do_player_stats_raw: bool,
+) -> None:
+    """
+    순차 경로 (POSTMATCH_BACKFILL_WORKERS=0 또는 단건 호출용).
+    """
+    fetched_at = now_utc()
+    plan = {
+        "events": (do_events, do_events_raw),
+        "lineups": (do_lineups, do_lineups_raw),
+        "team_stats": (do_team_stats, do_team_stats_raw),
+        "player_stats": (do_player_stats, do_player_stats_raw),
+    }
+    for resource in POSTMATCH_RESOURCES:
+        do_main, do_raw = plan[resource]
+        if not (do_main or do_raw):
+            continue
+        try:
+            backfill_postmatch_resource(fixture_id, resource, do_main=do_main, do_raw=do_raw, fetched_at=fetched_at)
+        except Exception as e:
+            print(f"    ! fixture {fixture_id}: {resource} 호출 에러: {e}", file=sys.stderr)
+
 
 
 
@@ -2273,6 +2367,7 @@ def main() -> None:
     try:
         ensure_ft_triggers_table()
         ensure_competition_structure_tables()
+        ensure_match_data_versions_table()
     except Exception:
         pass
 
@@ -2432,7 +2527,6 @@ def main() -> None:
                 backfill_leagues_meta(sorted(seen_league_ids))
             if seen_team_ids:
                 backfill_teams_meta(sorted(seen_team_ids))
-                backfill_teams_meta_single(sorted(seen_team_ids))
         except Exception as me:
             print(f"[meta] backfill failed: {me}", file=sys.stderr)
 
@@ -2585,7 +2679,6 @@ def main() -> None:
                 backfill_leagues_meta(sorted(seen_league_ids))
             if seen_team_ids:
                 backfill_teams_meta(sorted(seen_team_ids))
-                backfill_teams_meta_single(sorted(seen_team_ids))
         except Exception as me:
             print(f"[meta] backfill failed: {me}", file=sys.stderr)
 
@@ -2608,6 +2701,44 @@ def main() -> None:
     seen_team_ids: set[int] = set()
     seen_league_ids: set[int] = set()
 
+    # ✅ 경기별 무거운 백필은 큐(postmatch_backfill_queue)에 넣고 백그라운드 러너가 동시 처리
+    #    - 지난 실행에서 남은 작업(크래시 등)도 러너가 먼저 이어서 처리
+    #    - POSTMATCH_BACKFILL_WORKERS=0 이면 예전처럼 순차
+    finish_queue = None
+    if POSTMATCH_BACKFILL_WORKERS > 0:
+        try:
+            ensure_postmatch_backfill_queue_table()
+            finish_queue = start_postmatch_backfill_queue(_postmatch_queue_handler)
+        except Exception as qe:
+            print(f"[backfill_queue] unavailable → sequential: {qe}", file=sys.stderr)
+            finish_queue = None
+
+    def _submit_postmatch(fixture_id: int, **flags: bool) -> None:
+        if finish_queue is not None:
+            try:
+                enqueue_postmatch_tasks(
+                    fixture_id,
+                    [
+                        ("events", flags["do_events"], flags["do_events_raw"]),
+                        ("lineups", flags["do_lineups"], flags["do_lineups_raw"]),
+                        ("team_stats", flags["do_team_stats"], flags["do_team_stats_raw"]),
+                        ("player_stats", flags["do_player_stats"], flags["do_player_stats_raw"]),
+                    ],
+                )
+                return
+            except Exception as qe:
+                print(f"    ! fixture {fixture_id}: enqueue 실패 → 바로 처리: {qe}", file=sys.stderr)
+        backfill_postmatch_for_fixture(fixture_id, **flags)
+
+    def _finish_postmatch_queue() -> None:
+        if finish_queue is None:
+            return
+        qs = finish_queue()
+        print(
+            f"[postmatch_backfill] queue fixtures={qs.get('fixtures_done', 0)} "
+            f"({qs.get('fixtures_per_min', 0)}/min) failed_tasks={qs.get('tasks_failed', 0)}"
+        )
+
     # ─────────────────────────────────────
     #  ✅ 시즌 모드: league + season 전체(FT) 백필
     # ─────────────────────────────────────
@@ -2657,6 +2788,9 @@ def main() -> None:
                 fixtures = fetch_fixtures_for_season(int(lid), int(target_season))
                 print(f"  - season={target_season} league {lid}: fixtures={len(fixtures)}")
 
+                backfill_plan = _plan_or_empty(fixtures, force)
+                full_by_id = _full_fixtures_or_empty(fixtures)
+
                 for fx in fixtures:
                     basic = _extract_fixture_basic(fx)
                     if basic is None:
@@ -2677,7 +2811,7 @@ def main() -> None:
                     season = int(target_season)
 
                     # ✅ 모든 상태에서 fixtures/matches/raw 업서트 (기존 정책 유지)
-                    fx_full = fetch_fixture_by_id(fixture_id) or fx
+                    fx_full = full_by_id.get(fixture_id) or fx
 
                     try:
                         upsert_match_fixtures_raw(fixture_id, fx_full, now_utc())
@@ -2697,14 +2831,15 @@ def main() -> None:
                     except Exception:
                         pass
 
-                    need_events = force or (not has_match_events(fixture_id))
-                    need_events_raw = force or (not has_match_events_raw(fixture_id))
-                    need_lineups = force or (not has_lineups(fixture_id))
-                    need_team_stats = force or (not has_team_stats(fixture_id))
-                    need_player_stats = force or (not has_player_stats(fixture_id))
-                    need_lineups_raw = force or (not has_lineups_raw(fixture_id))
-                    need_team_stats_raw = force or (not has_team_stats_raw(fixture_id))
-                    need_player_stats_raw = force or (not has_player_stats_raw(fixture_id))
+                    need = backfill_plan.get(fixture_id) or _need_flags_single(fixture_id, force)
+                    need_events = need["do_events"]
+                    need_events_raw = need["do_events_raw"]
+                    need_lineups = need["do_lineups"]
+                    need_team_stats = need["do_team_stats"]
+                    need_player_stats = need["do_player_stats"]
+                    need_lineups_raw = need["do_lineups_raw"]
+                    need_team_stats_raw = need["do_team_stats_raw"]
+                    need_player_stats_raw = need["do_player_stats_raw"]
 
                     if not (
                         need_events or need_events_raw
@@ -2737,7 +2872,7 @@ def main() -> None:
                         todo.append("player_stats_raw")
 
                     print(f"    * fixture {fixture_id}: backfill={'+'.join(todo)}")
-                    backfill_postmatch_for_fixture(
+                    _submit_postmatch(
                         fixture_id,
                         do_events=need_events,
                         do_events_raw=need_events_raw,
@@ -2754,6 +2889,7 @@ def main() -> None:
             except Exception as e:
                 print(f"  ! season={target_season} league {lid} 처리 중 에러: {e}", file=sys.stderr)
 
+        _finish_postmatch_queue()
         print(f"[postmatch_backfill] 완료. 신규={total_new}, 스킵={total_skipped}")
         # ✅ meta backfill (teams/leagues)
         try:
@@ -2761,7 +2897,6 @@ def main() -> None:
                 backfill_leagues_meta(sorted(seen_league_ids))
             if seen_team_ids:
                 backfill_teams_meta(sorted(seen_team_ids))
-                backfill_teams_meta_single(sorted(seen_team_ids))
         except Exception as me:
             print(f"[meta] backfill failed: {me}", file=sys.stderr)
 
@@ -2858,6 +2993,9 @@ def main() -> None:
                             # ✅ 성공/실패와 무관하게 '이번 실행에서 더 이상 같은 키로 과호출' 방지
                             fetched_standings_keys.add(skey)
 
+                backfill_plan = _plan_or_empty(fixtures, force)
+                full_by_id = _full_fixtures_or_empty(fixtures)
+
                 for fx in fixtures:
                     basic = _extract_fixture_basic(fx)
                     if basic is None:
@@ -2879,7 +3017,7 @@ def main() -> None:
                         continue
 
                     # ✅ 모든 상태(NS/INPLAY/FINISHED 포함)에서 fixtures/matches/raw는 항상 업서트
-                    fx_full = fetch_fixture_by_id(fixture_id) or fx
+                    fx_full = full_by_id.get(fixture_id) or fx
 
                     try:
                         upsert_match_fixtures_raw(fixture_id, fx_full, now_utc())
@@ -2899,14 +3037,15 @@ def main() -> None:
                     except Exception:
                         pass
 
-                    need_events = force or (not has_match_events(fixture_id))
-                    need_events_raw = force or (not has_match_events_raw(fixture_id))
-                    need_lineups = force or (not has_lineups(fixture_id))
-                    need_team_stats = force or (not has_team_stats(fixture_id))
-                    need_player_stats = force or (not has_player_stats(fixture_id))
-                    need_lineups_raw = force or (not has_lineups_raw(fixture_id))
-                    need_team_stats_raw = force or (not has_team_stats_raw(fixture_id))
-                    need_player_stats_raw = force or (not has_player_stats_raw(fixture_id))
+                    need = backfill_plan.get(fixture_id) or _need_flags_single(fixture_id, force)
+                    need_events = need["do_events"]
+                    need_events_raw = need["do_events_raw"]
+                    need_lineups = need["do_lineups"]
+                    need_team_stats = need["do_team_stats"]
+                    need_player_stats = need["do_player_stats"]
+                    need_lineups_raw = need["do_lineups_raw"]
+                    need_team_stats_raw = need["do_team_stats_raw"]
+                    need_player_stats_raw = need["do_player_stats_raw"]
 
                     if not (
                         need_events or need_events_raw
@@ -2939,7 +3078,7 @@ def main() -> None:
                         todo.append("player_stats_raw")
 
                     print(f"    * fixture {fixture_id}: backfill={'+'.join(todo)}")
-                    backfill_postmatch_for_fixture(
+                    _submit_postmatch(
                         fixture_id,
                         do_events=need_events,
                         do_events_raw=need_events_raw,
@@ -2956,13 +3095,14 @@ def main() -> None:
             except Exception as e:
                 print(f"  ! date={target_date} league {lid} 처리 중 에러: {e}", file=sys.stderr)
 
+    _finish_postmatch_queue()
+
     # ✅ meta backfill (teams/leagues)
     try:
         if seen_league_ids:
             backfill_leagues_meta(sorted(seen_league_ids))
         if seen_team_ids:
             backfill_teams_meta(sorted(seen_team_ids))
-            backfill_teams_meta_single(sorted(seen_team_ids))
     except Exception as me:
         print(f"[meta] backfill failed: {me}", file=sys.stderr)
 
@@ -0,0 +1,303 @@
+# src/football/workers/postmatch_backfill_queue.py
+#
+# postmatch_backfill 의 경기별 무거운 백필(events / lineups / team_stats / player_stats)을
+# DB 큐(postmatch_backfill_queue) + 스레드 풀로 실행한다.
+#
+# 배경:
+# - 예전엔 main() 이 경기마다 4개 리소스를 순서대로 불렀다 (시즌 전체 = 수 시간, 크래시 나면 처음부터).
+#
+# 여기서:
+# - (fixture_id, resource) 1줄 = 작업 1개. state: pending → running → done | failed
+# - main() 의 fixture 루프는 enqueue 만 하고, 백그라운드 러너가 동시에 꺼내서 처리
+#   (API 호출은 services/apisports_client 공용 "football" 버킷이 레이트리밋)
+# - 꺼내기는 FOR UPDATE SKIP LOCKED → 프로세스를 여러 개 띄워도 같은 작업을 두 번 잡지 않음
+# - 재시작하면 남은 pending + 오래된 running(크래시로 멈춘 것)부터 이어서 처리
+# - 실패는 POSTMATCH_BACKFILL_MAX_ATTEMPTS 까지 재시도 후 failed (last_error 기록)
+# - 진행 로그: done / failed / pending + 경기 처리 속도(fixtures/min)
+#
+# ENV:
+#   POSTMATCH_BACKFILL_WORKERS (4)          : 동시 작업 수 (0 이면 큐 없이 예전처럼 순차)
+#   POSTMATCH_BACKFILL_MAX_ATTEMPTS (3)
+#   POSTMATCH_BACKFILL_STALE_SEC (600)      : running 이 이보다 오래되면 죽은 작업으로 보고 다시 잡음
+#   POSTMATCH_BACKFILL_PROGRESS_SEC (30)
+#
+# 마이그레이션: db/migrate/add_postmatch_backfill_queue.sql (실행 시 ensure 로도 동일 처리)
+
+import os
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from db import execute, fetch_all, fetch_one
+
+
+POSTMATCH_BACKFILL_WORKERS = int(os.environ.get("POSTMATCH_BACKFILL_WORKERS", "4"))
+POSTMATCH_BACKFILL_MAX_ATTEMPTS = int(os.environ.get("POSTMATCH_BACKFILL_MAX_ATTEMPTS", "3"))
+POSTMATCH_BACKFILL_STALE_SEC = int(os.environ.get("POSTMATCH_BACKFILL_STALE_SEC", "600"))
+POSTMATCH_BACKFILL_PROGRESS_SEC = float(os.environ.get("POSTMATCH_BACKFILL_PROGRESS_SEC", "30"))
+
+# handler(fixture_id, resource, do_main, do_raw) — 실패면 예외
+TaskHandler = Callable[[int, str, bool, bool], None]
+
+
+# ─────────────────────────────────────
+#  DDL
+# ─────────────────────────────────────
+
+POSTMATCH_BACKFILL_QUEUE_DDL = """
+CREATE TABLE IF NOT EXISTS postmatch_backfill_queue (
+    fixture_id  INTEGER     NOT NULL,
+    resource    TEXT        NOT NULL,
+    do_main     BOOLEAN     NOT NULL DEFAULT TRUE,
+    do_raw      BOOLEAN     NOT NULL DEFAULT TRUE,
+    state       TEXT        NOT NULL DEFAULT 'pending',
+    attempts    INTEGER     NOT NULL DEFAULT 0,
+    last_error  TEXT,
+    created_at  TIMESTAMPTZ NOT NULL DEFAULT now(),
+    updated_at  TIMESTAMPTZ NOT NULL DEFAULT now(),
+    PRIMARY KEY (fixture_id, resource)
+)
+"""
+
+POSTMATCH_BACKFILL_QUEUE_INDEX_DDL = """
+CREATE INDEX IF NOT EXISTS idx_postmatch_backfill_queue_open
+ON postmatch_backfill_queue (state, updated_at)
+WHERE state IN ('pending', 'running')
+"""
+
+
+def ensure_postmatch_backfill_queue_table() -> None:
+    execute(POSTMATCH_BACKFILL_QUEUE_DDL)
+    execute(POSTMATCH_BACKFILL_QUEUE_INDEX_DDL)
+
+
+# ─────────────────────────────────────
+#  enqueue / claim / 결과 기록
+# ─────────────────────────────────────
+
+def enqueue_postmatch_tasks(fixture_id: int, tasks: List[Tuple[str, bool, bool]]) -> int:
+    """
+    tasks: [(resource, do_main, do_raw)]
+    이미 pending/running 이면 그대로 두고, done/failed 면 다시 pending (호출 측이 "아직 필요"라고 판단한 경우).
+    """
+    n = 0
+    for resource, do_main, do_raw in tasks:
+        if not (do_main or do_raw):
+            continue
+        execute(
+            """
+            INSERT INTO postmatch_backfill_queue (fixture_id, resource, do_main, do_raw, state, attempts)
+            VALUES (%s, %s, %s, %s, 'pending', 0)
+            ON CONFLICT (fixture_id, resource) DO UPDATE SET
+                do_main    = EXCLUDED.do_main,
+                do_raw     = EXCLUDED.do_raw,
+                state      = 'pending',
+                attempts   = 0,
+                last_error = NULL,
+                updated_at = now()
+            WHERE postmatch_backfill_queue.state IN ('done', 'failed')
+            """,
+            (int(fixture_id), resource, bool(do_main), bool(do_raw)),
+        )
+        n += 1
+    return n
+
+
+def _claim(limit: int) -> List[Dict[str, Any]]:
+    if limit <= 0:
+        return []
+    return fetch_all(
+        """
+        UPDATE postmatch_backfill_queue q
+        SET state = 'running', attempts = q.attempts + 1, updated_at = now()
+        FROM (
+            SELECT fixture_id, resource
+            FROM postmatch_backfill_queue
+            WHERE state = 'pending'
+               OR (state = 'running' AND updated_at < now() - make_interval(secs => %s))
+            ORDER BY fixture_id, resource
+            LIMIT %s
+            FOR UPDATE SKIP LOCKED
+        ) c
+        WHERE q.fixture_id = c.fixture_id AND q.resource = c.resource
+        RETURNING q.fixture_id, q.resource, q.do_main, q.do_raw, q.attempts
+        """,
+        (POSTMATCH_BACKFILL_STALE_SEC, int(limit)),
+    ) or []
+
+
+def _mark_done(fixture_id: int, resource: str) -> None:
+    execute(
+        """
+        UPDATE postmatch_backfill_queue
+        SET state = 'done', last_error = NULL, updated_at = now()
+        WHERE fixture_id = %s AND resource = %s
+        """,
+        (int(fixture_id), resource),
+    )
+
+
+def _mark_failed(fixture_id: int, resource: str, err: str) -> str:
+    row = fetch_one(
+        """
+        UPDATE postmatch_backfill_queue
+        SET state = CASE WHEN attempts >= %s THEN 'failed' ELSE 'pending' END,
+            last_error = %s,
+            updated_at = now()
+        WHERE fixture_id = %s AND resource = %s
+        RETURNING state
+        """,
+        (POSTMATCH_BACKFILL_MAX_ATTEMPTS, err[:1000], int(fixture_id), resource),
+    )
+    return str((row or {}).get("state") or "pending")
+
+
+def queue_counts() -> Dict[str, int]:
+    rows = fetch_all("SELECT state, COUNT(*) AS n FROM postmatch_backfill_queue GROUP BY state") or []
+    return {str(r["state"]): int(r["n"]) for r in rows}
+
+
+# ─────────────────────────────────────
+#  러너
+# ─────────────────────────────────────
+
+def run_postmatch_backfill_queue(
+    handler: TaskHandler,
+    *,
+    workers: int = POSTMATCH_BACKFILL_WORKERS,
+    producer_done: Optional[threading.Event] = None,
+) -> Dict[str, Any]:
+    """
+    큐가 빌 때까지 처리 (producer_done 이 주어지면 그게 set 된 뒤에 빌 때까지).
+    반환: 통계 dict (tasks_done / tasks_failed / tasks_retry / fixtures_done / fixtures_per_min / elapsed_sec)
+    """
+    workers = max(1, int(workers))
+    started = time.time()
+    stats: Dict[str, Any] = {"tasks_done": 0, "tasks_failed": 0, "tasks_retry": 0, "fixtures_done": 0}
+    # fixture -> 이 러너가 claim 했고 아직 끝나지 않은(실행 중 / 재시도 대기) resource
+    # 비면 fixtures_done 에 넣고, 같은 fixture 가 다시 claim 되면 뺀다 (DB 재조회 / 중복 집계 없음)
+    open_resources: Dict[int, Set[str]] = {}
+    fixtures_done: Set[int] = set()
+    last_progress = started
+
+    def _run(task: Dict[str, Any]) -> Tuple[Dict[str, Any], Optional[str]]:
+        try:
+            handler(int(task["fixture_id"]), str(task["resource"]), bool(task["do_main"]), bool(task["do_raw"]))
+            return task, None
+        except Exception as e:
+            return task, f"{type(e).__name__}: {e}"
+
+    def _progress(final: bool = False) -> None:
+        elapsed = max(1e-6, time.time() - started)
+        stats["elapsed_sec"] = round(elapsed, 1)
+        stats["fixtures_done"] = len(fixtures_done)
+        stats["fixtures_per_min"] = round(stats["fixtures_done"] / (elapsed / 60.0), 1)
+        try:
+            counts = queue_counts()
+        except Exception:
+            counts = {}
+        print(
+            f"[backfill_queue] {'done' if final else 'progress'} "
+            f"fixtures={stats['fixtures_done']} ({stats['fixtures_per_min']}/min) "
+            f"tasks_done={stats['tasks_done']} retry={stats['tasks_retry']} failed={stats['tasks_failed']} "
+            f"queue={counts} elapsed={stats['elapsed_sec']}s",
+            flush=True,
+        )
+
+    inflight: Set[Future] = set()
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="pm-backfill") as ex:
+        while True:
+            claimed: List[Dict[str, Any]] = []
+            try:
+                claimed = _claim(workers * 2 - len(inflight))
+            except Exception as e:
+                print(f"[backfill_queue] claim err: {e}", file=sys.stderr, flush=True)
+            for task in claimed:
+                fid = int(task["fixture_id"])
+                open_resources.setdefault(fid, set()).add(str(task["resource"]))
+                fixtures_done.discard(fid)
+                inflight.add(ex.submit(_run, task))
+
+            if not inflight:
+                if producer_done is None or producer_done.is_set():
+                    # producer 가 끝난 뒤 마지막으로 한 번 더 확인하고 종료
+                    try:
+                        if not _claim_peek():
+                            break
+                    except Exception:
+                        break
+                time.sleep(1.0)
+                continue
+
+            done, inflight = wait(inflight, timeout=1.0, return_when=FIRST_COMPLETED)
+            for fut in done:
+                task, err = fut.result()
+                fid, resource = int(task["fixture_id"]), str(task["resource"])
+                try:
+                    if err is None:
+                        _mark_done(fid, resource)
+                        stats["tasks_done"] += 1
+                        state = "done"
+                    else:
+                        state = _mark_failed(fid, resource, err)
+                        stats["tasks_failed" if state == "failed" else "tasks_retry"] += 1
+                        print(
+                            f"    ! fixture {fid}: {resource} 실패 (attempt={task.get('attempts')}, → {state}): {err}",
+                            file=sys.stderr,
+                        )
+                    if state != "pending":
+                        left = open_resources.get(fid, set())
+                        left.discard(resource)
+                        if not left:
+                            fixtures_done.add(fid)
+                except Exception as e:
+                    print(f"[backfill_queue] result write err fixture={fid} {resource}: {e}", file=sys.stderr)
+
+            if time.time() - last_progress >= POSTMATCH_BACKFILL_PROGRESS_SEC:
+                last_progress = time.time()
+                _progress()
+
+    _progress(final=True)
+    return stats
+
+
+def _claim_peek() -> bool:
+    """
+    지금 잡을 수 있는 작업이 남아 있는지 (상태는 바꾸지 않음).
+    """
+    row = fetch_one(
+        """
+        SELECT 1 FROM postmatch_backfill_queue
+        WHERE state = 'pending'
+           OR (state = 'running' AND updated_at < now() - make_interval(secs => %s))
+        LIMIT 1
+        """,
+        (POSTMATCH_BACKFILL_STALE_SEC,),
+    )
+    return row is not None
+
+
+def start_postmatch_backfill_queue(handler: TaskHandler, *, workers: int = POSTMATCH_BACKFILL_WORKERS):
+    """
+    백그라운드 러너 시작. 반환: finish() — producer 종료를 알리고 큐가 빌 때까지 기다린 뒤 통계 반환.
+    """
+    producer_done = threading.Event()
+    result: Dict[str, Any] = {}
+
+    def _target() -> None:
+        try:
+            result.update(run_postmatch_backfill_queue(handler, workers=workers, producer_done=producer_done))
+        except Exception as e:
+            print(f"[backfill_queue] runner crashed: {e}", file=sys.stderr, flush=True)
+
+    t = threading.Thread(target=_target, name="pm-backfill-runner", daemon=True)
+    t.start()
+
+    def finish() -> Dict[str, Any]:
+        producer_done.set()
+        t.join()
+        return result
+
+    return finish
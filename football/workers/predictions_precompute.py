@@ -0,0 +1,124 @@
+# src/football/workers/predictions_precompute.py
+#
+# 역할(예정 경기 예측 미리 계산):
+# - 앞으로 PREDICTIONS_PRECOMPUTE_DAYS(기본 7일) 안에 킥오프하는 UPCOMING 경기를 스캔
+# - 경기마다 매치디테일 기본 필터 기준 insights_overall + ai_predictions 를 계산해서
+#   match_prediction_snapshots 에 버전과 함께 저장 (services/match_predictions_store.py)
+# - 이미 유효한 스냅샷(fixture / league / 두 팀 버전 동일)은 건너뛴다 → 반복 실행해도 가벼움
+# - 번들 API 는 유효한 스냅샷을 그대로 내려주므로 경기 전 화면 지연이 일정해진다
+#
+# 실행: 크론(예: 10~15분 간격) 또는 수동
+#   python -m football.workers.predictions_precompute
+
+import os
+import sys
+import time
+from typing import Any, Dict, List
+
+print("[predictions_precompute] module import start", flush=True)
+
+from db import fetch_all
+from football.workers.postmatch_backfill import parse_live_leagues
+from matchdetail.bundle_service import get_match_detail_bundle
+from services.match_data_version import ensure_match_data_versions_table
+from services.match_predictions_store import (
+    delete_stale_match_prediction_snapshots,
+    ensure_match_prediction_snapshots_table,
+)
+from services.matches_kickoff import kickoff_sql
+
+print("[predictions_precompute] module import done", flush=True)
+
+
+PREDICTIONS_PRECOMPUTE_DAYS = int(os.environ.get("PREDICTIONS_PRECOMPUTE_DAYS", "7"))
+PREDICTIONS_PRECOMPUTE_LIMIT = int(os.environ.get("PREDICTIONS_PRECOMPUTE_LIMIT", "2000"))
+
+
+def _get_precompute_leagues() -> List[int]:
+    """
+    우선순위 (schedule_sync 와 동일):
+    - SCHEDULE_LEAGUES (없으면)
+    - LIVE_LEAGUES
+    """
+    s = (os.environ.get("SCHEDULE_LEAGUES") or "").strip()
+    if s:
+        return parse_live_leagues(s)
+    return parse_live_leagues(os.environ.get("LIVE_LEAGUES", ""))
+
+
+def _select_upcoming_fixtures(leagues: List[int]) -> List[Dict[str, Any]]:
+    ko = kickoff_sql("m")
+    rows = fetch_all(
+        f"""
+        SELECT m.fixture_id, m.league_id, m.season
+        FROM matches m
+        WHERE m.league_id = ANY(%s)
+          AND m.status_group = 'UPCOMING'
+          AND {ko} >= now()
+          AND {ko} <  now() + (%s || ' days')::interval
+        ORDER BY {ko} ASC, m.fixture_id ASC
+        LIMIT %s
+        """,
+        (leagues, str(PREDICTIONS_PRECOMPUTE_DAYS), PREDICTIONS_PRECOMPUTE_LIMIT),
+    )
+    return rows or []
+
+
+def main() -> None:
+    leagues = _get_precompute_leagues()
+    if not leagues:
+        print("[predictions_precompute] no leagues (set SCHEDULE_LEAGUES or LIVE_LEAGUES)", file=sys.stderr, flush=True)
+        return
+
+    ensure_match_data_versions_table()
+    ensure_match_prediction_snapshots_table()
+
+    rows = _select_upcoming_fixtures(leagues)
+    print(
+        f"[predictions_precompute] leagues={leagues} days={PREDICTIONS_PRECOMPUTE_DAYS} fixtures={len(rows)}",
+        flush=True,
+    )
+
+    t0 = time.perf_counter()
+    computed = 0
+    fresh = 0
+    failed = 0
+
+    for r in rows:
+        fid = r.get("fixture_id")
+        try:
+            bundle = get_match_detail_bundle(
+                int(fid),
+                int(r.get("league_id")),
+                int(r.get("season")),
+                parts=["insights_overall", "ai_predictions"],
+                precompute=True,
+            )
+            if bundle is None:
+                continue
+            if (bundle.get("_perf") or {}).get("precomputed"):
+                fresh += 1
+            else:
+                computed += 1
+        except Exception as e:
+            failed += 1
+            print(f"[predictions_precompute] fixture_id={fid} failed: {e}", file=sys.stderr, flush=True)
+
+    delete_stale_match_prediction_snapshots()
+
+    print(
+        f"[predictions_precompute] done computed={computed} still_fresh={fresh} failed={failed} "
+        f"elapsed={time.perf_counter() - t0:.1f}s",
+        flush=True,
+    )
+
+    # ✅ psycopg_pool 종료 경고 방지 (크론/짧은 프로세스에서 join 에러 방지)
+    try:
+        from db import close_pool
+        close_pool()
+    except Exception:
+        pass
+
+
+if __name__ == "__main__":
+    main()
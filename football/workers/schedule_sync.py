@@ -5,29 +5,42 @@
 # - KST 기준 "전날 09:00 ~ +7일" 구간에 해당하는 날짜들을 스캔
 # - fixtures/matches/match_fixtures_raw 를 upsert해서
 #   "미래 경기 일정이 DB에 항상 존재"하도록 보장
-# - 팀 메타(teams) 누락도 자동 백필(⚠️ /teams는 단건 호출)
+# - 팀 메타(teams) 누락도 자동 백필(/teams?league=&season= 묶음 우선, 안 걸리는 팀만 단건)
+#
+# 증분 모드(SCHEDULE_SYNC_INCREMENTAL=1, 매시 실행 전제):
+# - (league, KST 날짜) 창마다 목록 응답 해시 / 경기별 해시 / 다음 확인 시각을 schedule_sync_state 에 기억
+# - next_due_at 이 안 된 창은 API 를 아예 안 부름
+#   (어제~내일 · 연기/미정 경기가 있는 창은 1시간, 7일 이내 6시간, 그 밖은 24시간)
+# - 목록 해시가 같으면 DB 도 안 건드림, 달라지면 해시가 바뀐 경기만 ids= 로 full 조회
+# - full 응답이 match_fixtures_raw.data_hash 와 같으면 업서트도 생략
+#
+# 마이그레이션: db/migrate/add_schedule_sync_state.sql (실행 시 ensure 로도 동일 처리)
 
 import os
 import sys
+import json
+import hashlib
 import datetime as dt
-from typing import Any, Dict, List, Optional, Set
+from typing import Any, Dict, List, Optional, Set, Tuple
 
 print("[schedule_sync] module import start", flush=True)
 
 # 기존 postmatch_backfill의 함수 재사용
 from football.workers.postmatch_backfill import (
     fetch_fixtures_from_api,
-    fetch_fixture_by_id,
+    fetch_fixtures_by_ids_from_api,
     _extract_fixture_basic,
     upsert_match_fixtures_raw,
     upsert_fixture_row,
     upsert_match_row,
     now_utc,
-    _safe_get,
-    _upsert_team_from_api,
+    backfill_teams_meta,
     parse_live_leagues,
 )
 
+from db import execute, fetch_all
+from services.fixture_write_skip import fixture_raw_json, fixture_content_hash
+
 print("[schedule_sync] module import done", flush=True)
 
 # 레이스 방지 정책 공유
@@ -35,6 +48,14 @@ os.environ.setdefault("LIVE_WORKER_ROLE", "backfill")
 
 KST = dt.timezone(dt.timedelta(hours=9))
 
+SCHEDULE_SYNC_INCREMENTAL = (os.environ.get("SCHEDULE_SYNC_INCREMENTAL", "0") or "0").strip().lower() in ("1", "true", "yes")
+SCHEDULE_SYNC_NEAR_SEC = int(os.environ.get("SCHEDULE_SYNC_NEAR_SEC", "3600"))    # 어제~내일, 연기/미정 경기 있는 창
+SCHEDULE_SYNC_WEEK_SEC = int(os.environ.get("SCHEDULE_SYNC_WEEK_SEC", "21600"))   # 7일 이내
+SCHEDULE_SYNC_FAR_SEC = int(os.environ.get("SCHEDULE_SYNC_FAR_SEC", "86400"))     # 그 밖
+
+# 아직 날짜/상태가 확정 안 된 경기 → 곧 바뀔 가능성이 높음
+_UNSETTLED_STATUSES = {"TBD", "PST", "SUSP", "INT"}
+
 
 def _kst_now() -> dt.datetime:
     return now_utc().astimezone(KST)
@@ -68,44 +89,132 @@ def _get_schedule_leagues() -> List[int]:
 
 def _backfill_missing_teams_single(ids: Set[int]) -> None:
     """
-    teams 메타 누락을 /teams?id= 단건 호출로 채운다.
-    (/teams 콤마 다건 호출은 API가 에러 내는 케이스가 있어 단건이 안전)
+    teams 메타 누락 채우기.
+    ✅ /teams?league=&season= 묶음 호출 우선, 묶음에 안 걸리는 팀만 /teams?id= 단건
+    (services/team_meta — 프로세스 캐시 + set 기반 누락 조회, fixture_list_rows 재계산 포함)
     """
     if not ids:
         return
+    backfill_teams_meta(sorted(ids))
+
+
+# ─────────────────────────────────────
+#  증분 모드 상태 (league, date_kst)
+# ─────────────────────────────────────
+
+SCHEDULE_SYNC_STATE_DDL = """
+CREATE TABLE IF NOT EXISTS schedule_sync_state (
+    league_id      INTEGER     NOT NULL,
+    date_kst       TEXT        NOT NULL,
+    resp_hash      TEXT        NOT NULL,
+    fixture_hashes JSONB       NOT NULL DEFAULT '{}'::jsonb,
+    fixture_count  INTEGER     NOT NULL DEFAULT 0,
+    synced_at      TIMESTAMPTZ NOT NULL DEFAULT now(),
+    next_due_at    TIMESTAMPTZ NOT NULL DEFAULT now(),
+    PRIMARY KEY (league_id, date_kst)
+)
+"""
 
-    # DB에 이미 있는 팀은 제외
-    from db import fetch_all
 
-    id_list = sorted({int(x) for x in ids if x is not None})
-    rows = fetch_all("SELECT id FROM teams WHERE id = ANY(%s)", (id_list,))
-    existing = {int(r["id"]) for r in (rows or []) if r and r.get("id") is not None}
-    missing = [x for x in id_list if x not in existing]
+def ensure_schedule_sync_state_table() -> None:
+    execute(SCHEDULE_SYNC_STATE_DDL)
+    # 창 밖으로 지나간 날짜는 정리
+    execute("DELETE FROM schedule_sync_state WHERE synced_at < now() - interval '45 days'")
 
-    if not missing:
-        return
 
-    print(f"[schedule_sync][meta] missing teams={len(missing)}", flush=True)
+def _load_sync_state(leagues: List[int], dates: List[str]) -> Dict[Tuple[int, str], Dict[str, Any]]:
+    rows = fetch_all(
+        """
+        SELECT league_id, date_kst, resp_hash, fixture_hashes,
+               (next_due_at <= now()) AS is_due
+        FROM schedule_sync_state
+        WHERE league_id = ANY(%s) AND date_kst = ANY(%s)
+        """,
+        ([int(x) for x in leagues], list(dates)),
+    )
+    out: Dict[Tuple[int, str], Dict[str, Any]] = {}
+    for r in rows or []:
+        hashes = r.get("fixture_hashes") or {}
+        if isinstance(hashes, str):
+            hashes = json.loads(hashes)
+        out[(int(r["league_id"]), str(r["date_kst"]))] = {
+            "resp_hash": r.get("resp_hash"),
+            "fixture_hashes": hashes,
+            "is_due": bool(r.get("is_due")),
+        }
+    return out
 
-    ok = 0
-    fail = 0
-    for tid in missing:
-        try:
-            data = _safe_get("/teams", params={"id": int(tid)})
-            resp = data.get("response") or []
-            if resp and isinstance(resp, list):
-                for r in resp:
-                    if isinstance(r, dict):
-                        _upsert_team_from_api(r)
-                        ok += 1
-                        break
-            else:
-                fail += 1
-        except Exception as e:
-            fail += 1
-            print(f"[schedule_sync][meta] team id={tid} failed: {e}", file=sys.stderr, flush=True)
 
-    print(f"[schedule_sync][meta] done ok={ok} fail={fail}", flush=True)
+def _save_sync_state(
+    league_id: int,
+    date_kst: str,
+    resp_hash: str,
+    fixture_hashes: Dict[str, str],
+    next_due_sec: int,
+) -> None:
+    execute(
+        """
+        INSERT INTO schedule_sync_state (league_id, date_kst, resp_hash, fixture_hashes, fixture_count, synced_at, next_due_at)
+        VALUES (%s, %s, %s, %s::jsonb, %s, now(), now() + make_interval(secs => %s))
+        ON CONFLICT (league_id, date_kst) DO UPDATE SET
+            resp_hash      = EXCLUDED.resp_hash,
+            fixture_hashes = EXCLUDED.fixture_hashes,
+            fixture_count  = EXCLUDED.fixture_count,
+            synced_at      = EXCLUDED.synced_at,
+            next_due_at    = EXCLUDED.next_due_at
+        """,
+        (int(league_id), date_kst, resp_hash, json.dumps(fixture_hashes), len(fixture_hashes), int(next_due_sec)),
+    )
+
+
+def _list_hashes(fixtures: List[Dict[str, Any]]) -> Tuple[str, Dict[str, str]]:
+    """
+    (목록 응답 전체 해시, fixture_id(str) -> 경기 해시). 응답 순서와 무관.
+    """
+    per: Dict[str, str] = {}
+    for fx in fixtures:
+        b = _extract_fixture_basic(fx)
+        if b:
+            per[str(int(b["fixture_id"]))] = fixture_content_hash(fixture_raw_json(fx))
+    joined = ",".join(f"{k}:{per[k]}" for k in sorted(per, key=int))
+    return hashlib.md5(joined.encode("utf-8")).hexdigest(), per
+
+
+def _window_interval_sec(date_kst: str, today_kst: dt.date, fixtures: List[Dict[str, Any]]) -> int:
+    """
+    다음 확인까지 간격: 킥오프가 가깝거나 연기/미정 경기가 있으면 짧게.
+    """
+    days = abs((dt.date.fromisoformat(date_kst) - today_kst).days)
+    if days <= 1:
+        return SCHEDULE_SYNC_NEAR_SEC
+    for fx in fixtures:
+        short = (((fx.get("fixture") or {}).get("status") or {}).get("short") or "").upper()
+        if short in _UNSETTLED_STATUSES:
+            return SCHEDULE_SYNC_NEAR_SEC
+    if days <= 7:
+        return SCHEDULE_SYNC_WEEK_SEC
+    return SCHEDULE_SYNC_FAR_SEC
+
+
+def _stored_raw_hashes(fixture_ids: List[int]) -> Dict[int, str]:
+    """
+    match_fixtures_raw.data_hash (트리거가 채움, services/fixture_write_skip). 컬럼이 없으면 {} → 전부 씀.
+    """
+    if not fixture_ids:
+        return {}
+    try:
+        rows = fetch_all(
+            """
+            SELECT fixture_id, data_hash
+            FROM match_fixtures_raw
+            WHERE fixture_id = ANY(%s)
+              AND data_hash IS NOT NULL
+            """,
+            ([int(x) for x in fixture_ids],),
+        )
+    except Exception:
+        return {}
+    return {int(r["fixture_id"]): str(r["data_hash"]) for r in rows or []}
 
 
 def main() -> None:
@@ -137,17 +246,48 @@ def main() -> None:
     total_fixtures = 0
     total_upserts = 0
 
+    # ✅ 증분 모드: 창별 상태 한 번에 로드
+    incremental = SCHEDULE_SYNC_INCREMENTAL
+    sync_state: Dict[Tuple[int, str], Dict[str, Any]] = {}
+    if incremental:
+        try:
+            ensure_schedule_sync_state_table()
+            sync_state = _load_sync_state(leagues, dates)
+        except Exception as e:
+            print(f"[schedule_sync] incremental state unavailable → full scan: {e}", file=sys.stderr, flush=True)
+            incremental = False
+    inc_stats = {"not_due": 0, "unchanged": 0, "same_raw": 0}
+    today_kst = now_kst.date()
+
     for dstr in dates:
         print(f"[schedule_sync] start date={dstr}", flush=True)
 
         for lid in leagues:
             try:
+                prev_state = sync_state.get((int(lid), dstr)) if incremental else None
+                if prev_state is not None and not prev_state["is_due"]:
+                    inc_stats["not_due"] += 1
+                    continue
+
                 print(f"[schedule_sync] fetch date={dstr} league={lid}", flush=True)
 
                 # 날짜별 fixtures 수집(가벼운 호출)
                 fixtures = fetch_fixtures_from_api(int(lid), dstr, season=None)
+
+                resp_hash = ""
+                list_hashes: Dict[str, str] = {}
+                if incremental:
+                    resp_hash, list_hashes = _list_hashes(fixtures)
+                    next_due_sec = _window_interval_sec(dstr, today_kst, fixtures)
+                    if prev_state is not None and prev_state["resp_hash"] == resp_hash:
+                        inc_stats["unchanged"] += 1
+                        _save_sync_state(int(lid), dstr, resp_hash, list_hashes, next_due_sec)
+                        continue
+
                 if not fixtures:
                     print(f"[schedule_sync] empty date={dstr} league={lid}", flush=True)
+                    if incremental:
+                        _save_sync_state(int(lid), dstr, resp_hash, list_hashes, next_due_sec)
                     continue
 
                 total_fixtures += len(fixtures)
@@ -165,6 +305,10 @@ def main() -> None:
                     ids.append(int(b["fixture_id"]))
 
                 uniq_ids = sorted(set(ids))
+                if incremental and prev_state is not None:
+                    # 목록 해시가 바뀐(또는 새로 보이는) 경기만 full 조회
+                    prev_hashes = prev_state["fixture_hashes"]
+                    uniq_ids = [fid for fid in uniq_ids if prev_hashes.get(str(fid)) != list_hashes.get(str(fid))]
                 print(
                     f"[schedule_sync] fixture_ids date={dstr} league={lid} "
                     f"raw={len(ids)} unique={len(uniq_ids)}",
@@ -172,20 +316,26 @@ def main() -> None:
                 )
 
                 # fixture_id별로 full 조회 후 DB 업서트(정확도/일관성)
+                # ✅ /fixtures?ids= 20개 묶음 조회 (실패/누락 id 만 단건 재시도)
+                full_by_id = fetch_fixtures_by_ids_from_api(uniq_ids)
+                print(
+                    f"[schedule_sync] full_fetch date={dstr} league={lid} "
+                    f"requested={len(uniq_ids)} received={len(full_by_id)}",
+                    flush=True,
+                )
                 processed = 0
+                stored_hashes = _stored_raw_hashes(uniq_ids) if incremental else {}
 
                 for fid in uniq_ids:
-                    print(
-                        f"[schedule_sync] full_fetch start date={dstr} league={lid} fixture_id={fid}",
-                        flush=True,
-                    )
-
-                    fx_full = fetch_fixture_by_id(int(fid))
+                    fx_full = full_by_id.get(int(fid))
                     if not fx_full:
                         print(
                             f"[schedule_sync] full_fetch empty date={dstr} league={lid} fixture_id={fid}",
                             flush=True,
                         )
+                        # 증분: 다음 실행에서 다시 보도록 해시를 남기지 않음
+                        list_hashes.pop(str(fid), None)
+                        resp_hash = ""
                         continue
 
                     b = _extract_fixture_basic(fx_full)
@@ -212,6 +362,11 @@ def main() -> None:
                     if b.get("away_id") is not None:
                         seen_team_ids.add(int(b["away_id"]))
 
+                    # 증분: full 응답이 저장된 raw 와 같으면 쓰지 않음
+                    if stored_hashes and stored_hashes.get(int(fid)) == fixture_content_hash(fixture_raw_json(fx_full)):
+                        inc_stats["same_raw"] += 1
+                        continue
+
                     # DB upsert (상태 무관: UPCOMING/INPLAY/FINISHED 모두)
                     ts = now_utc()
                     upsert_match_fixtures_raw(int(fid), fx_full, ts)
@@ -226,6 +381,9 @@ def main() -> None:
                         flush=True,
                     )
 
+                if incremental:
+                    _save_sync_state(int(lid), dstr, resp_hash, list_hashes, next_due_sec)
+
                 print(
                     f"[schedule_sync] league_done date={dstr} league={lid} processed={processed}",
                     flush=True,
@@ -255,6 +413,12 @@ def main() -> None:
         f"[schedule_sync] done total_fixtures_seen={total_fixtures} total_upserts={total_upserts}",
         flush=True,
     )
+    if incremental:
+        print(
+            f"[schedule_sync] incremental windows_not_due={inc_stats['not_due']} "
+            f"windows_unchanged={inc_stats['unchanged']} fixtures_same_raw={inc_stats['same_raw']}",
+            flush=True,
+        )
 
     # ✅ psycopg_pool 종료 경고 방지 (크론/짧은 프로세스에서 join 에러 방지)
     try:
@@ -11,7 +11,8 @@ import requests
 # ✅ 중요: 실행 위치에 따라 import 경로가 깨질 수 있으니,
 # project/src 기준에서 실행하거나 PYTHONPATH를 잡아준다.
 # (Render shell에서 /opt/render/project/src 위치에서 실행 권장)
-from db import fetch_all, execute  # 프로젝트 공통 DB 헬퍼
+from db import fetch_all  # 프로젝트 공통 DB 헬퍼
+from services.team_meta import refresh_league_season_teams, resolve_team_meta
 
 BASE_URL = "https://v3.football.api-sports.io"
 
@@ -94,55 +95,15 @@ def get_needed_team_ids(league_ids: List[int], seasons: List[int]) -> List[int]:
     return out
 
 
-def upsert_team(team: Dict[str, Any]) -> None:
-    """
-    teams 테이블 스키마(확인 완료):
-      id integer PK
-      name text
-      country text
-      logo text
-    """
-    team_id = team.get("id")
-    if team_id is None:
-        return
-    execute(
-        """
-        INSERT INTO teams (id, name, country, logo)
-        VALUES (%s, %s, %s, %s)
-        ON CONFLICT (id) DO UPDATE SET
-          name = EXCLUDED.name,
-          country = EXCLUDED.country,
-          logo = EXCLUDED.logo
-        """,
-        (
-            int(team_id),
-            team.get("name"),
-            team.get("country"),
-            team.get("logo"),
-        ),
-    )
-
-
-def fetch_team_by_id(team_id: int) -> Optional[Dict[str, Any]]:
-    data = _safe_get("/teams", params={"id": int(team_id)})
-    resp = data.get("response") or []
-    if not isinstance(resp, list) or not resp:
-        return None
-    # API-Sports /teams 응답은 보통 resp[0].team
-    item = resp[0]
-    if not isinstance(item, dict):
-        return None
-    t = item.get("team")
-    if isinstance(t, dict):
-        return t
-    # 예외 케이스 fallback
-    return item if "id" in item else None
+def _get_teams(params: Dict[str, Any]) -> Dict[str, Any]:
+    return _safe_get("/teams", params=params)
 
 
 def main() -> None:
     # 사용 예:
     # export TARGET_LEAGUES="218,219,179,180,345,346,106,107,169"
     # export TARGET_SEASONS="2024,2025"
+    # export TEAMS_REFRESH=1   (선택: 리그×시즌 팀 전부 이름/로고 갱신, 조합당 /teams 1콜)
     leagues_s = (os.environ.get("TARGET_LEAGUES") or "").strip()
     seasons_s = (os.environ.get("TARGET_SEASONS") or "").strip()
 
@@ -153,27 +114,31 @@ def main() -> None:
     league_ids = [int(x.strip()) for x in leagues_s.split(",") if x.strip()]
     seasons = [int(x.strip()) for x in seasons_s.split(",") if x.strip()]
 
+    changed: List[int] = []
+
+    # ✅ 전체 갱신: 리그×시즌마다 /teams?league=&season= 1콜
+    if (os.environ.get("TEAMS_REFRESH") or "").strip().lower() in ("1", "true", "yes"):
+        for lid in league_ids:
+            for season in seasons:
+                seen, upd = refresh_league_season_teams(_get_teams, lid, season, tag="teams_backfill")
+                changed.extend(upd)
+                print(f"  ... league={lid} season={season} teams={len(seen)} changed={len(upd)}")
+
+    # ✅ 누락 팀: (league, season) 묶음 호출 우선, 안 걸리는 팀만 /teams?id= 단건
     needed = get_needed_team_ids(league_ids, seasons)
     print(f"[teams_backfill] missing teams: {len(needed)}")
+    changed.extend(resolve_team_meta(needed, _get_teams, tag="teams_backfill"))
 
-    ok = 0
-    fail = 0
-    for i, tid in enumerate(needed, 1):
+    if changed:
         try:
-            t = fetch_team_by_id(tid)
-            if not t:
-                print(f"  ! {tid}: empty response")
-                fail += 1
-                continue
-            upsert_team(t)
-            ok += 1
-            if i % 20 == 0:
-                print(f"  ... {i}/{len(needed)} done (ok={ok}, fail={fail})")
+            from services.fixture_list_rows import refresh_fixture_list_rows_for_teams
+
+            refresh_fixture_list_rows_for_teams(sorted(set(changed)))
         except Exception as e:
-            print(f"  ! {tid}: error {e}", file=sys.stderr)
-            fail += 1
+            print(f"  ! fixture_list_rows refresh failed: {e}", file=sys.stderr)
 
-    print(f"[teams_backfill] done. ok={ok}, fail={fail}")
+    still = get_needed_team_ids(league_ids, seasons)
+    print(f"[teams_backfill] done. changed={len(set(changed))}, still_missing={len(still)}")
 
 
 if __name__ == "__main__":
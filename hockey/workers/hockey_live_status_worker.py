@@ -11,6 +11,7 @@ from typing import Any, Dict, List, Optional, Tuple
 
 import requests
 
+from services.apisports_client import apisports_get
 from hockey.hockey_db import hockey_execute, hockey_fetch_all, hockey_fetch_one
 from hockey.workers.hockey_live_common import now_utc, hockey_live_leagues
 
@@ -917,7 +918,8 @@ def _headers() -> Dict[str, str]:
 
 
 def _get(path: str, params: Dict[str, Any]) -> Dict[str, Any]:
-    r = requests.get(
+    r = apisports_get(
+        "hockey",
         f"{BASE_URL}{path}",
         headers=_headers(),
         params=params,
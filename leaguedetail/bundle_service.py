@@ -3,6 +3,7 @@ from __future__ import annotations
 from typing import Any, Dict, Optional
 
 from db import fetch_one
+from services.matches_kickoff import kickoff_sql
 from leaguedetail.results_block import build_results_block
 from leaguedetail.fixtures_block import build_fixtures_block
 from leaguedetail.standings_block import build_standings_block
@@ -45,11 +46,12 @@ def get_league_detail_bundle(
 
     season_label: Optional[str] = None
     if resolved_season is not None:
+        kickoff_col = kickoff_sql("")
         row = fetch_one(
-            """
+            f"""
             SELECT
-              MIN(date_utc::timestamptz) AS min_dt,
-              MAX(date_utc::timestamptz) AS max_dt
+              MIN({kickoff_col}) AS min_dt,
+              MAX({kickoff_col}) AS max_dt
             FROM matches
             WHERE league_id = %s
               AND season = %s
@@ -23,13 +23,54 @@ import sys
 import time
 import json
 import re
+import threading
 import traceback
 import datetime as dt
-from typing import Any, Dict, List, Optional, Tuple, Set
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple, Set
 
 import requests
 
-from db import execute, fetch_all  # dev 스키마 확정 → 런타임 schema 조회 불필요
+from db import execute, execute_batches, fetch_all  # dev 스키마 확정 → 런타임 schema 조회 불필요
+from services.apisports_client import apisports_get, rate_limit_stats
+from services.fixture_write_skip import (
+    WRITE_SKIP_STATS,
+    ensure_match_fixtures_raw_hash_column,
+    fixture_content_hash,
+    fixture_raw_hash_available,
+    fixture_raw_json,
+    forget_fixture_hashes,
+    is_fixture_unchanged,
+    mark_fixture_written,
+    warm_fixture_hashes,
+)
+from services.match_events_sync import sync_match_events_for_fixture
+from services.live_all_parse import parse_live_all_watched, slim_fixture_item
+from services.fixtures_by_ids import fetch_fixtures_by_ids
+from services.live_poll_scheduler import PollScheduler, ensure_live_poll_state_table, live_poll_interval
+from services.live_change_notify import (
+    LiveChangeListener,
+    fixture_ids_for,
+    publish_live_changes,
+    red_cards_changed,
+    retain_red_cards,
+)
+from services.fixture_list_rows import (
+    ensure_fixture_list_rows_table,
+    refresh_fixture_list_rows,
+    repair_missing_fixture_list_rows,
+)
+from services.matches_kickoff import ensure_matches_kickoff_column, kickoff_sql
+from services.match_data_version import (
+    bump_match_data_versions,
+    ensure_match_data_versions_table,
+)
+from services.insights_snapshot import (
+    ensure_team_insights_snapshots_table,
+    prune_idle_team_insights_snapshots,
+    refresh_stale_team_insights_snapshots,
+    refresh_team_insights_snapshots_for_fixture,
+)
 
 
 
@@ -92,6 +133,8 @@ LIVE_HOTPATH_BUDGET_SEC = float(os.environ.get("LIVE_HOTPATH_BUDGET_SEC", "6.0")
 LIVE_SLOW_API_LOG_SEC = float(os.environ.get("LIVE_SLOW_API_LOG_SEC", "2.0"))       # slow api log threshold
 REQ_TIMEOUT = int(os.environ.get("LIVE_REQ_TIMEOUT_SEC", "12"))
 REQ_RETRIES = int(os.environ.get("LIVE_REQ_RETRIES", "2"))
+# ✅ events/stats 워커의 fixture 단위 API 호출 동시성 (1 이면 기존처럼 순차)
+LIVE_FETCH_CONCURRENCY = int(os.environ.get("LIVE_FETCH_CONCURRENCY", "8"))
 
 
 
@@ -100,8 +143,12 @@ REQ_RETRIES = int(os.environ.get("LIVE_REQ_RETRIES", "2"))
 # 런타임 캐시
 # ─────────────────────────────────────
 
-LAST_STATS_SYNC: Dict[int, float] = {}   # fixture_id -> last ts
-LAST_EVENTS_SYNC: Dict[int, float] = {}  # fixture_id -> last ts
+# ✅ fixture 별 next-due 스케줄 (services/live_poll_scheduler.py)
+#    EVENTS/STATS_INTERVAL_SEC 는 "보통 구간" 간격이고, 경기 상태에 따라 빠르게/느리게 조정된다
+EVENTS_SCHED = PollScheduler("events", persist=True)
+STATS_SCHED = PollScheduler("stats", persist=True)
+LINEUPS_SCHED = PollScheduler("lineups", persist=True)
+POSTMATCH_SCHED = PollScheduler("postmatch", persist=True)
 LINEUPS_STATE: Dict[int, Dict[str, Any]] = {}  # fixture_id -> {"slot60":bool,"slot10":bool,"success":bool}
 
 # ✅ 리그별 스캔 모드에서 /fixtures(league/date) 호출 간격 제어
@@ -182,13 +229,37 @@ def parse_fast_leagues(env: str) -> List[int]:
     return uniq
 
 
-def fetch_live_all(session: requests.Session) -> List[Dict[str, Any]]:
+def fetch_live_all_watched(
+    session: requests.Session,
+    watched: Set[int],
+) -> Tuple[List[Dict[str, Any]], Dict[int, str], int]:
     """
     ✅ live=all 지원 확인 완료.
     - 전세계 라이브를 1콜로 조회
+    - watched 리그 경기만 디코드(slim dict) + raw JSON 은 응답 원문 구간 그대로 (services/live_all_parse.py)
+    반환: (watched 경기 목록, fixture_id -> raw JSON, live=all 전체 경기 수)
     """
-    data = api_get(session, "/fixtures", {"live": "all"})
-    return (data.get("response") or []) if isinstance(data, dict) else []
+    body = api_get_bytes(session, "/fixtures", {"live": "all"})
+    parsed = parse_live_all_watched(body, watched)
+    if parsed is not None:
+        return parsed
+
+    # 응답 모양이 예상과 다름 → 예전처럼 전체 파싱
+    data = json.loads(body)
+    all_items = (data.get("response") or []) if isinstance(data, dict) else []
+    items: List[Dict[str, Any]] = []
+    raws: Dict[int, str] = {}
+    for it in all_items:
+        if not isinstance(it, dict):
+            continue
+        lid = safe_int((it.get("league") or {}).get("id"))
+        fid = safe_int((it.get("fixture") or {}).get("id"))
+        if lid not in watched or fid is None:
+            continue
+        items.append(slim_fixture_item(it))
+        raws[fid] = fixture_raw_json(it)
+    print(f"[live_detect] live_all fast parse unavailable → full parse ({len(all_items)})", flush=True)
+    return items, raws, len(all_items)
 
 
 
@@ -299,6 +370,49 @@ def _read_match_score_state(fixture_id: int) -> Optional[Dict[str, Any]]:
     }
 
 
+def _read_match_score_states(fixture_ids: List[int]) -> Dict[int, Dict[str, Any]]:
+    """
+    _read_match_score_state 의 다건 버전 (live tick 배치 쓰기에서 1회 조회).
+    """
+    ids = sorted({int(f) for f in fixture_ids})
+    if not ids:
+        return {}
+    rows = fetch_all(
+        """
+        SELECT
+            fixture_id,
+            status,
+            status_group,
+            status_short,
+            elapsed,
+            home_ft,
+            away_ft,
+            home_ht,
+            away_ht
+        FROM matches
+        WHERE fixture_id = ANY(%s)
+        """,
+        (ids,),
+    )
+    out: Dict[int, Dict[str, Any]] = {}
+    for r in rows or []:
+        fid = safe_int(r.get("fixture_id"))
+        if fid is None:
+            continue
+        out[fid] = {
+            "fixture_id": fid,
+            "status": safe_text(r.get("status")) or "",
+            "status_group": (safe_text(r.get("status_group")) or "").upper(),
+            "status_short": safe_text(r.get("status_short")) or "",
+            "elapsed": safe_int(r.get("elapsed")),
+            "home_ft": safe_int(r.get("home_ft")),
+            "away_ft": safe_int(r.get("away_ft")),
+            "home_ht": safe_int(r.get("home_ht")),
+            "away_ht": safe_int(r.get("away_ht")),
+        }
+    return out
+
+
 def _extract_incoming_match_score_state(fixture_obj: Dict[str, Any]) -> Dict[str, Any]:
     fx = fixture_obj.get("fixture") or {}
     goals = fixture_obj.get("goals") or {}
@@ -360,6 +474,27 @@ def _is_meaningful_match_state_change(
     return False
 
 
+def _timeline_change_reason(
+    before_state: Optional[Dict[str, Any]],
+    incoming_state: Optional[Dict[str, Any]],
+) -> Optional[str]:
+    """
+    events/stats 를 바로 다시 불러야 하는 변화 → "score" / "status" (elapsed 만 바뀐 건 None).
+    """
+    if incoming_state is None:
+        return None
+    if before_state is None:
+        return "status"
+    if (
+        before_state.get("home_ft") != incoming_state.get("home_ft")
+        or before_state.get("away_ft") != incoming_state.get("away_ft")
+    ):
+        return "score"
+    if before_state.get("status_short") != incoming_state.get("status_short"):
+        return "status"
+    return None
+
+
 def _log_match_score_decision(
     source: str,
     fixture_id: int,
@@ -486,79 +621,65 @@ def _session() -> requests.Session:
     return s
 
 
-def api_get(session: requests.Session, path: str, params: Dict[str, Any]) -> Dict[str, Any]:
-    """
-    API-Sports GET 호출 공통 함수.
+_THREAD_LOCAL = threading.local()
 
-    개선점(스키마 변경 없음):
-    - ENV 기반 레이트리밋(RATE_LIMIT_PER_MIN / RATE_LIMIT_BURST) 적용 (토큰버킷)
-    - 429(Too Many Requests) 대응: Retry-After 헤더 존중
-    - 기존 재시도(REQ_RETRIES) 유지
-    - ✅ 느린 API 호출 slow log 추가
-    """
-    url = f"{BASE}{path}"
 
-    if not hasattr(api_get, "_rl"):
-        try:
-            per_min = float(os.environ.get("RATE_LIMIT_PER_MIN", "0") or "0")
-        except Exception:
-            per_min = 0.0
-        try:
-            burst = float(os.environ.get("RATE_LIMIT_BURST", "0") or "0")
-        except Exception:
-            burst = 0.0
+def _thread_session() -> requests.Session:
+    """
+    fetch 스레드 전용 Session (requests.Session 은 스레드 간 공유를 보장하지 않음).
+    스레드가 재사용되는 동안 커넥션 풀도 같이 재사용된다.
+    """
+    s = getattr(_THREAD_LOCAL, "session", None)
+    if s is None:
+        s = _session()
+        _THREAD_LOCAL.session = s
+    return s
 
-        rate_per_sec = (per_min / 60.0) if per_min > 0 else 0.0
-        max_tokens = burst if burst > 0 else (max(1.0, rate_per_sec * 5) if rate_per_sec > 0 else 0.0)
 
-        api_get._rl = {
-            "rate": rate_per_sec,
-            "max": max_tokens,
-            "tokens": max_tokens,
-            "ts": time.time(),
-        }
+def current_worker_role() -> str:
+    """
+    지금 스레드가 돌리는 역할. 멀티 역할 모드(LIVE_WORKER_ROLE=all)에서는 역할 스레드마다 다르다.
+    """
+    role = getattr(_THREAD_LOCAL, "role", None)
+    if role:
+        return role
+    return (os.environ.get("LIVE_WORKER_ROLE") or "live").strip().lower()
 
-    rl = api_get._rl  # type: ignore[attr-defined]
 
-    def _acquire_token() -> None:
-        rate = float(rl.get("rate") or 0.0)
-        max_t = float(rl.get("max") or 0.0)
-        if rate <= 0 or max_t <= 0:
-            return
+def api_get(session: requests.Session, path: str, params: Dict[str, Any]) -> Dict[str, Any]:
+    return _api_call(session, path, params, lambda r: r.json())
 
-        now_ts = time.time()
-        last_ts = float(rl.get("ts") or now_ts)
-        elapsed = max(0.0, now_ts - last_ts)
 
-        tokens = float(rl.get("tokens") or 0.0) + elapsed * rate
-        if tokens > max_t:
-            tokens = max_t
-        rl["tokens"] = tokens
-        rl["ts"] = now_ts
+def api_get_bytes(session: requests.Session, path: str, params: Dict[str, Any]) -> bytes:
+    """
+    응답 본문 그대로 (dict 로 만들지 않음) — live=all 부분 파싱용 (services/live_all_parse.py)
+    """
+    return _api_call(session, path, params, lambda r: r.content)
 
-        if tokens >= 1.0:
-            rl["tokens"] = tokens - 1.0
-            return
 
-        need = 1.0 - tokens
-        wait_sec = need / rate if rate > 0 else 0.25
-        if wait_sec > 0:
-            time.sleep(wait_sec)
+def _api_call(
+    session: requests.Session,
+    path: str,
+    params: Dict[str, Any],
+    parse: Callable[[requests.Response], Any],
+) -> Any:
+    """
+    API-Sports GET 호출 공통 함수.
 
-        now_ts2 = time.time()
-        elapsed2 = max(0.0, now_ts2 - float(rl.get("ts") or now_ts2))
-        tokens2 = float(rl.get("tokens") or 0.0) + elapsed2 * rate
-        if tokens2 > max_t:
-            tokens2 = max_t
-        rl["tokens"] = max(0.0, tokens2 - 1.0)
-        rl["ts"] = now_ts2
+    개선점(스키마 변경 없음):
+    - ENV 기반 레이트리밋(RATE_LIMIT_PER_MIN / RATE_LIMIT_BURST) 적용
+      → services/apisports_client 공용 "football" 버킷 (스레드 안전, 선택적으로 프로세스 간 공유)
+    - 429(Too Many Requests) 대응: Retry-After 헤더 존중 (버킷 전체 정지)
+    - 기존 재시도(REQ_RETRIES) 유지
+    - ✅ 느린 API 호출 slow log 추가
+    """
+    url = f"{BASE}{path}"
 
     last_err: Optional[Exception] = None
     for attempt in range(REQ_RETRIES + 1):
         started = time.time()
         try:
-            _acquire_token()
-            r = session.get(url, params=params, timeout=REQ_TIMEOUT)
+            r = apisports_get("football", url, params=params, timeout=REQ_TIMEOUT, session=session)
             elapsed = time.time() - started
 
             if elapsed >= LIVE_SLOW_API_LOG_SEC:
@@ -568,17 +689,11 @@ def api_get(session: requests.Session, path: str, params: Dict[str, Any]) -> Dic
                 )
 
             if r.status_code == 429:
-                retry_after = r.headers.get("Retry-After")
-                try:
-                    wait = int(retry_after) if retry_after else 1
-                except Exception:
-                    wait = 1
-                time.sleep(max(1, min(wait, 60)))
+                # Retry-After 대기는 공용 버킷이 처리 (다음 시도의 토큰 획득이 그만큼 멈춤)
                 raise requests.HTTPError("429 Too Many Requests", response=r)
 
             r.raise_for_status()
-            data = r.json()
-            return data
+            return parse(r)
         except Exception as e:
             elapsed = time.time() - started
             last_err = e
@@ -612,6 +727,69 @@ def fetch_lineups(session: requests.Session, fixture_id: int) -> List[Dict[str,
     data = api_get(session, "/fixtures/lineups", {"fixture": fixture_id})
     return (data.get("response") or []) if isinstance(data, dict) else []
 
+
+# 역할별 fetch 스레드 풀 (처음 쓸 때 생성, 프로세스 동안 재사용)
+# → 풀 스레드가 살아 있으니 _thread_session() 의 keep-alive 커넥션도 tick 사이에 유지된다
+_FETCH_EXECUTORS: Dict[str, ThreadPoolExecutor] = {}
+_FETCH_EXECUTORS_LOCK = threading.Lock()
+
+
+def _set_thread_role(role: str) -> None:
+    _THREAD_LOCAL.role = role
+
+
+def _fetch_executor(role: str) -> ThreadPoolExecutor:
+    ex = _FETCH_EXECUTORS.get(role)
+    if ex is not None:
+        return ex
+    with _FETCH_EXECUTORS_LOCK:
+        ex = _FETCH_EXECUTORS.get(role)
+        if ex is None:
+            ex = ThreadPoolExecutor(
+                max_workers=max(1, LIVE_FETCH_CONCURRENCY),
+                thread_name_prefix=f"{role}_fetch",
+                initializer=_set_thread_role,
+                initargs=(role,),
+            )
+            _FETCH_EXECUTORS[role] = ex
+    return ex
+
+
+def fetch_per_fixture_concurrent(
+    fetch_fn: Callable[[requests.Session, int], List[Dict[str, Any]]],
+    fixture_ids: List[int],
+    tag: str,
+) -> List[Tuple[int, float, Optional[List[Dict[str, Any]]], Optional[Exception]]]:
+    """
+    fixture 단위 fetch 단계 (events/stats 워커 공용).
+
+    - LIVE_FETCH_CONCURRENCY 개 스레드로 동시에 호출 (역할별 풀 재사용, 스레드별 Session, 토큰버킷은 api_get 공유)
+    - DB 쓰기는 하지 않는다 → 호출 측이 결과를 받아 순차로 write 단계 수행
+    - 반환: [(fixture_id, fetch 시작 ts, 결과 또는 None, 에러 또는 None)] (입력 순서 유지)
+    """
+    def _one(fid: int) -> Tuple[int, float, Optional[List[Dict[str, Any]]], Optional[Exception]]:
+        started_ts = time.time()
+        try:
+            return fid, started_ts, fetch_fn(_thread_session(), fid), None
+        except Exception as e:
+            return fid, started_ts, None, e
+
+    if not fixture_ids:
+        return []
+
+    workers = max(1, min(LIVE_FETCH_CONCURRENCY, len(fixture_ids)))
+    t0 = time.time()
+    if workers == 1:
+        out = [_one(fid) for fid in fixture_ids]
+    else:
+        out = list(_fetch_executor(current_worker_role()).map(_one, fixture_ids))
+
+    print(
+        f"[{tag}] fetched={len(fixture_ids)} concurrency={workers} elapsed={time.time() - t0:.2f}s",
+        flush=True,
+    )
+    return out
+
 def fetch_fixture_by_id(session: requests.Session, fixture_id: int) -> Optional[Dict[str, Any]]:
     """
     ✅ 워치독용: fixture 단건 조회
@@ -624,6 +802,17 @@ def fetch_fixture_by_id(session: requests.Session, fixture_id: int) -> Optional[
     return None
 
 
+def fetch_fixtures_by_id_batch(session: requests.Session, fixture_ids: List[int], tag: str) -> Dict[int, Dict[str, Any]]:
+    """
+    ✅ 워치독/재검증용: /fixtures?ids= 20개 묶음 조회 (실패/누락 id 만 단건 재시도)
+    """
+    return fetch_fixtures_by_ids(
+        fixture_ids,
+        lambda params: api_get(session, "/fixtures", params),
+        tag=tag,
+    )
+
+
 def recheck_scheduled_fixtures(
     session: requests.Session,
     fetched_at: dt.datetime,
@@ -633,7 +822,7 @@ def recheck_scheduled_fixtures(
     ✅ 예정 경기 전체 순환 재검증
     목적:
     - 기존 date 기반 backfill만으로는 "미래로 멀리 밀린 경기"를 다시 못 잡는 문제 보완
-    - DB에 이미 저장된 예정 경기(NS/TBD/PST/UPCOMING)를 fixture_id 단건조회로 재확인
+    - DB에 이미 저장된 예정 경기(NS/TBD/PST/UPCOMING)를 /fixtures?ids= 묶음조회(20개)로 재확인
     - 전체를 한 번에 치지 않고, LIMIT씩 커서 순환
 
     주의:
@@ -648,13 +837,13 @@ def recheck_scheduled_fixtures(
 
     def _select_page(off: int) -> List[Dict[str, Any]]:
         return fetch_all(
-            """
+            f"""
             SELECT fixture_id, league_id, season
             FROM matches
             WHERE
                 status_group = 'UPCOMING'
                 OR status IN ('NS', 'TBD', 'PST')
-            ORDER BY NULLIF(date_utc,'')::timestamptz ASC NULLS LAST, fixture_id ASC
+            ORDER BY {kickoff_sql("")} ASC NULLS LAST, fixture_id ASC
             LIMIT %s OFFSET %s
             """,
             (page_size, off),
@@ -673,6 +862,16 @@ def recheck_scheduled_fixtures(
         return 0
 
     processed = 0
+    touched: List[int] = []
+
+    fetched = fetch_fixtures_by_id_batch(
+        session,
+        [fid for fid in (safe_int(r.get("fixture_id")) for r in rows) if fid is not None],
+        "schedule_recheck",
+    )
+    prev_states = load_prev_fixture_states(list(fetched.keys()))
+    league_touched: List[int] = []
+    unchanged = 0
 
     for r in rows:
         fid = safe_int(r.get("fixture_id"))
@@ -683,10 +882,18 @@ def recheck_scheduled_fixtures(
             continue
 
         try:
-            fx_obj = fetch_fixture_by_id(session, fid)
+            fx_obj = fetched.get(fid)
             if not fx_obj:
                 continue
 
+            # ✅ raw 해시가 같으면 쓰기 / list rows / 데이터 버전 bump 생략
+            prev = prev_states.get(fid)
+            raw_json = fixture_raw_json(fx_obj)
+            if fixture_unchanged(prev, raw_json):
+                unchanged += 1
+                processed += 1
+                continue
+
             lg = fx_obj.get("league") or {}
             fx = fx_obj.get("fixture") or {}
             st = fx.get("status") or {}
@@ -714,26 +921,34 @@ def recheck_scheduled_fixtures(
 
 
             try:
-                upsert_match_fixtures_raw(fid, fx_obj, fetched_at)
+                upsert_match_fixtures_raw(fid, fx_obj, fetched_at, raw_json)
             except Exception:
                 pass
 
+            touched.append(fid)
+            if league_version_changed(prev, status_group, fx_obj):
+                league_touched.append(fid)
             processed += 1
 
         except Exception as e:
             print(f"      [schedule_recheck] fixture_id={fid} err: {e}", file=sys.stderr)
 
+    refresh_list_rows_safe(touched, "schedule_recheck", league_touched)
+
     next_offset = offset + len(rows)
     SCHEDULE_RECHECK_CURSOR = next_offset
 
-    print(f"      [schedule_recheck] scanned={len(rows)} processed={processed} next_offset={SCHEDULE_RECHECK_CURSOR}")
+    print(
+        f"      [schedule_recheck] scanned={len(rows)} processed={processed} unchanged={unchanged} "
+        f"next_offset={SCHEDULE_RECHECK_CURSOR}"
+    )
     return processed
 
 
 def watchdog_fix_stale_inplay(session: requests.Session, now: dt.datetime) -> int:
     """
     ✅ 60초마다 1회:
-    - DB에는 INPLAY인데, 실제 API는 FT(또는 OTHER)로 끝난 경기들을 단건 조회로 보정
+    - DB에는 INPLAY인데, 실제 API는 FT(또는 OTHER)로 끝난 경기들을 ids= 묶음 조회로 보정
     - 호출량 폭발 방지: LIMIT + 워치독 주기
     반환: 처리한 fixture 수(시도 기준)
     """
@@ -746,19 +961,20 @@ def watchdog_fix_stale_inplay(session: requests.Session, now: dt.datetime) -> in
 
     # "오래된 INPLAY" 후보를 DB에서 뽑는다
     # - elapsed>=85 OR kickoff 기준 WATCHDOG_STALE_HOURS 이상 지난 경우
-    # - date_utc는 text라 NULLIF 후 timestamptz 캐스팅
+    # - date_utc는 text라 kickoff_utc(트리거 동기화 컬럼) 사용 (없으면 NULLIF 캐스팅 fallback)
+    kickoff_col = kickoff_sql("")
     rows = fetch_all(
-        """
+        f"""
         SELECT fixture_id, league_id, season, date_utc, elapsed
         FROM matches
         WHERE status_group = 'INPLAY'
           AND (
             (elapsed IS NOT NULL AND elapsed >= 85)
             OR (
-              NULLIF(date_utc,'')::timestamptz < (NOW() - (%s || ' hours')::interval)
+              {kickoff_col} < (NOW() - (%s || ' hours')::interval)
             )
           )
-        ORDER BY NULLIF(date_utc,'')::timestamptz ASC NULLS LAST
+        ORDER BY {kickoff_col} ASC NULLS LAST
         LIMIT %s
         """,
         (str(WATCHDOG_STALE_HOURS), int(WATCHDOG_LIMIT)),
@@ -770,6 +986,13 @@ def watchdog_fix_stale_inplay(session: requests.Session, now: dt.datetime) -> in
 
     fixed = 0
     tried = 0
+    touched: List[int] = []
+
+    fetched = fetch_fixtures_by_id_batch(
+        session,
+        [fid for fid in (safe_int(r.get("fixture_id")) for r in rows) if fid is not None],
+        "watchdog",
+    )
 
     for r in rows:
         fid = safe_int(r.get("fixture_id"))
@@ -779,7 +1002,7 @@ def watchdog_fix_stale_inplay(session: requests.Session, now: dt.datetime) -> in
         tried += 1
 
         try:
-            fx_obj = fetch_fixture_by_id(session, fid)
+            fx_obj = fetched.get(fid)
             if not fx_obj:
                 continue
 
@@ -821,6 +1044,8 @@ def watchdog_fix_stale_inplay(session: requests.Session, now: dt.datetime) -> in
             except Exception:
                 pass
 
+            touched.append(fixture_id)
+
             # ✅ FT로 바뀐 경우: postmatch timeline 정책 실행(60초/30분은 state로 제어됨)
             if sg2 == "FINISHED":
                 try:
@@ -840,6 +1065,8 @@ def watchdog_fix_stale_inplay(session: requests.Session, now: dt.datetime) -> in
         except Exception as e:
             print(f"      [watchdog] fixture_id={fid} err: {e}", file=sys.stderr)
 
+    refresh_list_rows_safe(touched, "watchdog")
+
     print(f"      [watchdog] candidates={len(rows)} tried={tried} fixed_to_finished={fixed}")
     return tried
 
@@ -874,28 +1101,27 @@ def ensure_match_live_state_table() -> None:
     )
 
 
+UPSERT_MATCH_LIVE_STATE_SQL = """
+    INSERT INTO match_live_state (fixture_id, home_red, away_red, updated_utc)
+    VALUES (%s, %s, %s, %s)
+    ON CONFLICT (fixture_id) DO UPDATE SET
+        home_red    = EXCLUDED.home_red,
+        away_red    = EXCLUDED.away_red,
+        updated_utc = EXCLUDED.updated_utc
+    WHERE
+        match_live_state.home_red IS DISTINCT FROM EXCLUDED.home_red OR
+        match_live_state.away_red IS DISTINCT FROM EXCLUDED.away_red OR
+        match_live_state.updated_utc IS DISTINCT FROM EXCLUDED.updated_utc
+"""
+
+
 def upsert_match_live_state(
     fixture_id: int,
     home_red: int,
     away_red: int,
     updated_at: dt.datetime,
 ) -> None:
-    updated_utc = iso_utc(updated_at)
-    execute(
-        """
-        INSERT INTO match_live_state (fixture_id, home_red, away_red, updated_utc)
-        VALUES (%s, %s, %s, %s)
-        ON CONFLICT (fixture_id) DO UPDATE SET
-            home_red    = EXCLUDED.home_red,
-            away_red    = EXCLUDED.away_red,
-            updated_utc = EXCLUDED.updated_utc
-        WHERE
-            match_live_state.home_red IS DISTINCT FROM EXCLUDED.home_red OR
-            match_live_state.away_red IS DISTINCT FROM EXCLUDED.away_red OR
-            match_live_state.updated_utc IS DISTINCT FROM EXCLUDED.updated_utc
-        """,
-        (fixture_id, int(home_red), int(away_red), updated_utc),
-    )
+    execute(UPSERT_MATCH_LIVE_STATE_SQL, (fixture_id, int(home_red), int(away_red), iso_utc(updated_at)))
 
 
 def calc_red_cards_from_events(
@@ -942,6 +1168,87 @@ def calc_red_cards_from_events(
 
     return home_red, away_red
 
+
+def refresh_list_rows_safe(
+    fixture_ids: List[int],
+    tag: str,
+    league_fixture_ids: Optional[List[int]] = None,
+) -> None:
+    """
+    /api/fixtures 리스트 projection(fixture_list_rows) 갱신 + 매치디테일 데이터 버전 bump.
+    - 틱마다 건드린 fixture_id를 모아 1번의 set-based 쿼리로 처리
+    - 실패해도 워커 본 작업에는 영향 없게 best-effort
+    - league_fixture_ids: 리그 버전을 올릴 fixture (None 이면 FINISHED 전부, bump_match_data_versions 참고)
+    """
+    if not fixture_ids:
+        return
+    try:
+        refresh_fixture_list_rows(fixture_ids)
+    except Exception as e:
+        print(f"[fixture_list_rows] tag={tag} n={len(fixture_ids)} err: {e}", file=sys.stderr)
+    bump_data_versions_safe(fixture_ids, tag, league_fixture_ids)
+
+
+def bump_data_versions_safe(
+    fixture_ids: List[int],
+    tag: str,
+    league_fixture_ids: Optional[List[int]] = None,
+) -> None:
+    """
+    매치디테일 블록 캐시 무효화용 데이터 버전 bump (best-effort).
+    """
+    if not fixture_ids:
+        return
+    try:
+        bump_match_data_versions(fixture_ids, league_fixture_ids)
+    except Exception as e:
+        print(f"[match_data_versions] tag={tag} n={len(fixture_ids)} err: {e}", file=sys.stderr)
+
+
+def load_prev_fixture_states(fixture_ids: List[int]) -> Dict[int, Dict[str, Any]]:
+    """
+    주기 스캔(fixtures scan / 예정 경기 재검증)용 변경 감지: fixture_id -> {status_group, home_ft, away_ft, data_hash}
+    - data_hash 는 match_fixtures_raw 트리거 값 (컬럼이 없으면 None → 전부 "변경"으로 취급)
+    - 한 번의 쿼리, 실패하면 {} (예전처럼 전부 쓰기)
+    """
+    ids = sorted({int(f) for f in fixture_ids})
+    if not ids:
+        return {}
+    hash_col = "r.data_hash" if fixture_raw_hash_available() else "NULL::text"
+    try:
+        rows = fetch_all(
+            f"""
+            SELECT f.fixture_id, m.status_group, m.home_ft, m.away_ft, {hash_col} AS data_hash
+            FROM unnest(%s::int[]) AS f(fixture_id)
+            LEFT JOIN matches m ON m.fixture_id = f.fixture_id
+            LEFT JOIN match_fixtures_raw r ON r.fixture_id = f.fixture_id
+            """,
+            (ids,),
+        )
+    except Exception as e:
+        print(f"[prev_fixture_states] err: {e}", file=sys.stderr)
+        return {}
+    return {int(r["fixture_id"]): r for r in rows or []}
+
+
+def fixture_unchanged(prev: Optional[Dict[str, Any]], raw_json: str) -> bool:
+    return bool(prev and prev.get("data_hash") and prev.get("data_hash") == fixture_content_hash(raw_json))
+
+
+def league_version_changed(prev: Optional[Dict[str, Any]], status_group: str, item: Dict[str, Any]) -> bool:
+    """
+    리그 버전(standings/h2h/insights)은 FINISHED 전환 또는 종료 경기 스코어 변경 때만 올린다.
+    """
+    if status_group != "FINISHED":
+        return False
+    if not prev or prev.get("status_group") != "FINISHED":
+        return True
+    goals = item.get("goals") or {}
+    return (safe_int(prev.get("home_ft")), safe_int(prev.get("away_ft"))) != (
+        safe_int(goals.get("home")),
+        safe_int(goals.get("away")),
+    )
+
 # ─────────────────────────────────────
 # FT 이후 타임라인 채우기 (정책: FT 감지 후 +60초 1회, +30분 1회)
 # - 기존 INPLAY 수집 방식은 건드리지 않음
@@ -979,6 +1286,11 @@ FT_TRIGGER_TTL_DAYS = int(os.environ.get("FT_TRIGGER_TTL_DAYS", "90"))
 STANDINGS_LOOP_SEC = int(os.environ.get("STANDINGS_LOOP_SEC", "1800"))  # 30분
 TRIGGER_POLL_SEC   = int(os.environ.get("FT_TRIGGER_POLL_SEC", "10"))   # standings 트리거 폴링 간격(짧게)
 
+# insights 스냅샷 워커
+INSIGHTS_TRIGGER_BATCH_LIMIT = int(os.environ.get("INSIGHTS_TRIGGER_BATCH_LIMIT", "30"))
+INSIGHTS_STALE_BATCH_LIMIT = int(os.environ.get("INSIGHTS_STALE_BATCH_LIMIT", "20"))
+INSIGHTS_SWEEP_SEC = int(os.environ.get("INSIGHTS_SWEEP_SEC", "300"))
+
 
 def ensure_ft_triggers_table() -> None:
     execute(
@@ -996,6 +1308,8 @@ def ensure_ft_triggers_table() -> None:
     )
     execute("CREATE INDEX IF NOT EXISTS idx_ft_triggers_created_utc ON ft_triggers (created_utc)")
     execute("CREATE INDEX IF NOT EXISTS idx_ft_triggers_league_season ON ft_triggers (league_id, season)")
+    # ✅ insights 스냅샷 워커 소비 마킹 (standings 와 독립)
+    execute("ALTER TABLE ft_triggers ADD COLUMN IF NOT EXISTS insights_consumed_utc text")
 
 
 def ensure_competition_structure_tables() -> None:
@@ -1885,10 +2199,39 @@ def _mark_triggers_consumed(fixture_ids: List[int]) -> None:
         (nowi, nowi, fixture_ids),
     )
 
+def _select_unconsumed_insights_triggers(limit: int = 50) -> List[Dict[str, Any]]:
+    rows = fetch_all(
+        """
+        SELECT fixture_id, league_id, season, finished_utc
+        FROM ft_triggers
+        WHERE insights_consumed_utc IS NULL
+        ORDER BY NULLIF(finished_utc,'')::timestamptz ASC NULLS LAST, fixture_id ASC
+        LIMIT %s
+        """,
+        (int(limit),),
+    )
+    return rows or []
+
+
+def _mark_insights_triggers_consumed(fixture_ids: List[int]) -> None:
+    if not fixture_ids:
+        return
+    nowi = _now_iso_utc()
+    execute(
+        """
+        UPDATE ft_triggers
+        SET insights_consumed_utc = %s, updated_utc = %s
+        WHERE fixture_id = ANY(%s)
+          AND insights_consumed_utc IS NULL
+        """,
+        (nowi, nowi, fixture_ids),
+    )
+
 def _select_inplay_matches(limit: int = 100) -> List[Dict[str, Any]]:
     rows = fetch_all(
         """
-        SELECT fixture_id, league_id, season, home_id, away_id, date_utc, elapsed
+        SELECT fixture_id, league_id, season, home_id, away_id, date_utc, elapsed,
+               status_short, home_ft, away_ft
         FROM matches
         WHERE status_group = 'INPLAY'
         ORDER BY
@@ -1906,11 +2249,11 @@ def _select_inplay_matches(limit: int = 100) -> List[Dict[str, Any]]:
 
 def _select_recent_finished_for_postmatch(limit: int = 60) -> List[Dict[str, Any]]:
     rows = fetch_all(
-        """
+        f"""
         SELECT fixture_id, league_id, season, date_utc, status_group
         FROM matches
         WHERE status_group = 'FINISHED'
-        ORDER BY NULLIF(date_utc,'')::timestamptz DESC NULLS LAST, fixture_id DESC
+        ORDER BY {kickoff_sql("")} DESC NULLS LAST, fixture_id DESC
         LIMIT %s
         """,
         (int(limit),),
@@ -1931,21 +2274,78 @@ def process_due_postmatch_fixtures(
     if not rows:
         return 0
 
+    fids = [fid for fid in (safe_int(r.get("fixture_id")) for r in rows) if fid is not None]
+    POSTMATCH_SCHED.retain(fids)
+
     processed = 0
-    for r in rows:
-        fid = safe_int(r.get("fixture_id"))
-        if fid is None:
-            continue
+    for fid in POSTMATCH_SCHED.due_ids(fids):
         try:
-            maybe_sync_postmatch_timeline(session, fid, "FINISHED", now)
+            next_in = maybe_sync_postmatch_timeline(session, fid, "FINISHED", now)
+            # 다음 단계 시각까지는 state 조회도 건너뜀, 끝난 경기는 목록에서 빠질 때까지 재확인 안 함
+            POSTMATCH_SCHED.schedule(fid, next_in if next_in is not None else POSTMATCH_DONE_RECHECK_SEC)
+            POSTMATCH_SCHED.reset_failures(fid)
             processed += 1
         except Exception as e:
-            print(f"[postmatch_worker] fixture_id={fid} err: {e}", file=sys.stderr)
+            delay = POSTMATCH_SCHED.schedule_failure(fid, 60)
+            print(f"[postmatch_worker] fixture_id={fid} err: {e} (retry in {delay:.0f}s)", file=sys.stderr)
 
+    POSTMATCH_SCHED.flush_persisted()
     return processed
 
 
 
+def run_once_insights_snapshots(do_sweep: bool = True) -> int:
+    """
+    ✅ Insights 스냅샷 워커:
+    - FT 트리거(insights_consumed_utc) 소비 → 그 경기 두 팀의 team_insights_snapshots 재계산
+    - do_sweep=True: 오래 조회되지 않은 스냅샷 삭제 → league 데이터 버전이 바뀐 스냅샷 재계산 (FT 이후 이벤트/스탯 보정)
+    - 재계산이 실패한 트리거는 소비하지 않는다 (다음 poll 에서 재시도)
+    """
+    if not hasattr(run_once_insights_snapshots, "_ddl_done"):
+        ensure_ft_triggers_table()
+        ensure_match_data_versions_table()
+        ensure_team_insights_snapshots_table()
+        run_once_insights_snapshots._ddl_done = True  # type: ignore[attr-defined]
+
+    triggers = _select_unconsumed_insights_triggers(limit=INSIGHTS_TRIGGER_BATCH_LIMIT)
+
+    refreshed = 0
+    ok_fids: List[int] = []
+    for t in triggers or []:
+        fid = safe_int(t.get("fixture_id"))
+        lid = safe_int(t.get("league_id"))
+        season = safe_int(t.get("season"))
+        if fid is None or lid is None or season is None:
+            continue
+        try:
+            refreshed += refresh_team_insights_snapshots_for_fixture(fid, lid, season)
+            ok_fids.append(int(fid))
+        except Exception as e:
+            print(f"[insights_worker] fixture_id={fid} err: {e} -> keep trigger", file=sys.stderr)
+
+    if ok_fids:
+        try:
+            _mark_insights_triggers_consumed(ok_fids)
+        except Exception:
+            pass
+
+    if do_sweep:
+        try:
+            pruned = prune_idle_team_insights_snapshots()
+            if pruned:
+                print(f"[insights_worker] pruned idle snapshots={pruned}")
+        except Exception as e:
+            print(f"[insights_worker] prune err: {e}", file=sys.stderr)
+        try:
+            refreshed += refresh_stale_team_insights_snapshots(limit=INSIGHTS_STALE_BATCH_LIMIT)
+        except Exception as e:
+            print(f"[insights_worker] stale sweep err: {e}", file=sys.stderr)
+
+    if triggers or refreshed:
+        print(f"[insights_worker] triggers={len(triggers or [])} consumed={len(ok_fids)} snapshots_refreshed={refreshed}")
+    return refreshed
+
+
 def run_once_standings(do_periodic: bool = True) -> int:
     """
     ✅ Standings 워커:
@@ -1971,7 +2371,7 @@ def run_once_standings(do_periodic: bool = True) -> int:
         ensure_competition_structure_tables()
         run_once_standings._ddl_done = True  # type: ignore[attr-defined]
 
-    s = _session()
+    s = _thread_session()  # 역할(스레드)별 Session 재사용 → keep-alive 유지
 
    
     triggers = _select_unconsumed_triggers(limit=60)
@@ -2265,160 +2665,53 @@ def upsert_match_events_raw(fixture_id: int, events: List[Dict[str, Any]], fetch
 
 def replace_match_events_for_fixture(fixture_id: int, events: List[Dict[str, Any]]) -> int:
     """
-    match_events를 fixture_id 단위로 '싹 교체'한다. (API 스냅샷 미러링)
+    match_events를 fixture_id 단위로 API 스냅샷과 맞춘다. (services/match_events_sync.py)
 
     ✅ 변경 정책:
     - events가 빈 배열([])이면 DB를 건드리지 않는다(삭제/삽입 모두 안 함).
-      → 다음 틱에 데이터가 들어오면 그때 교체(insert)한다.
+      → 다음 틱에 데이터가 들어오면 그때 반영한다.
     - ✅ 레이스 차단: DB의 matches.status_group 이 아직 'INPLAY'면
       postmatch/backfill/watchdog 경로에서 match_events를 건드리지 않는다.
       (라이브중 이벤트는 live=all 경로가 전담)
-    - ✅ DELETE + INSERT를 하나의 트랜잭션으로 묶는다.
-    반환: insert된 row 수
+    - ✅ 전체 DELETE + INSERT 대신 기존 row 와 diff → 사라진 것만 DELETE, 새 것만 INSERT (한 트랜잭션)
+    반환: 새로 insert된 row 수
     """
-    cols = set(_get_table_columns("match_events"))
-    if not cols:
-        return 0
-
-    if not events:
-        return 0
+    role = current_worker_role()
+    inserted, deleted = sync_match_events_for_fixture(
+        fixture_id,
+        events,
+        skip_if_inplay=(role not in ("live", "events")),
+    )
+    if deleted:
+        print(f"[match_events] fixture_id={fixture_id} removed={deleted}", flush=True)
+    return inserted
 
-    try:
-        role = (os.environ.get("LIVE_WORKER_ROLE") or "live").strip().lower()
 
-        rows = fetch_all(
-            """
-            SELECT status_group
-            FROM matches
-            WHERE fixture_id = %s
-            LIMIT 1
-            """,
-            (fixture_id,),
-        )
-        if rows:
-            sg = (rows[0].get("status_group") or "").strip().upper()
-            if (role not in ("live", "events")) and (sg == "INPLAY"):
-                return 0
-    except Exception:
-        pass
+def maybe_sync_postmatch_timeline(
+    session: requests.Session,
+    fixture_id: int,
+    status_group: str,
+    now: dt.datetime,
+) -> Optional[float]:
+    """
+    정책 고정:
+    - status_group == FINISHED 일 때만 동작
+    - FT 최초 감지 시각 기준
+      * +60초 1회
+      * +30분 1회
 
-    def has(c: str) -> bool:
-        return c.lower() in cols
+    ✅ 추가(복구용):
+    - stats / lineups 가 DB에 비어있으면(또는 부족하면) postmatch 시점에 1회 보강
+      * 호출 폭발 방지: +60s, +30m 실행 구간에서만 / 그리고 DB에 이미 있으면 스킵
 
-    col_extra = "extra" if has("extra") else ("time_extra" if has("time_extra") else None)
+    반환: 다음 단계(+60s / +30m)까지 남은 초, 둘 다 끝났으면 None (POSTMATCH_SCHED 용)
+    """
+    if status_group != "FINISHED":
+        return None
 
-    inserted = 0
-    tx_started = False
+    st = _init_postmatch_state_if_missing(fixture_id, now)
 
-    try:
-        execute("BEGIN")
-        tx_started = True
-
-        execute("DELETE FROM match_events WHERE fixture_id = %s", (fixture_id,))
-
-        for ev in events:
-            time_obj = ev.get("time") or {}
-            team_obj = ev.get("team") or {}
-            player_obj = ev.get("player") or {}
-            assist_obj = ev.get("assist") or {}
-
-            minute = safe_int(time_obj.get("elapsed")) or 0
-            extra = safe_int(time_obj.get("extra"))
-            type_raw = safe_text(ev.get("type"))
-            detail_raw = safe_text(ev.get("detail"))
-            comments_raw = safe_text(ev.get("comments"))
-
-            team_id = safe_int(team_obj.get("id"))
-            player_id = safe_int(player_obj.get("id"))
-            player_name = safe_text(player_obj.get("name"))
-
-            assist_id = safe_int(assist_obj.get("id"))
-            assist_name = safe_text(assist_obj.get("name"))
-
-            player_in_id = assist_id
-            player_in_name = assist_name
-
-            ins_cols: List[str] = []
-            ins_vals: List[Any] = []
-
-            def add(c: str, v: Any) -> None:
-                if has(c):
-                    ins_cols.append(c)
-                    ins_vals.append(v)
-
-            add("fixture_id", fixture_id)
-            add("minute", minute)
-
-            if col_extra:
-                ins_cols.append(col_extra)
-                ins_vals.append(extra)
-
-            add("type", type_raw)
-            add("detail", detail_raw)
-            add("comments", comments_raw)
-
-            add("team_id", team_id)
-
-            add("player_id", player_id)
-            add("player_name", player_name)
-
-            add("assist_player_id", assist_id)
-            add("assist_name", assist_name)
-
-            add("player_in_id", player_in_id)
-            add("player_in_name", player_in_name)
-
-            if not ins_cols:
-                continue
-
-            col_sql = ", ".join(ins_cols)
-            ph_sql = ", ".join(["%s"] * len(ins_cols))
-
-            execute(
-                f"INSERT INTO match_events ({col_sql}) VALUES ({ph_sql})",
-                tuple(ins_vals),
-            )
-            inserted += 1
-
-        execute("COMMIT")
-        tx_started = False
-        return inserted
-
-    except Exception:
-        if tx_started:
-            try:
-                execute("ROLLBACK")
-            except Exception:
-                pass
-        raise
-
-
-
-
-
-def maybe_sync_postmatch_timeline(
-    session: requests.Session,
-    fixture_id: int,
-    status_group: str,
-    now: dt.datetime,
-) -> None:
-    """
-    정책 고정:
-    - status_group == FINISHED 일 때만 동작
-    - FT 최초 감지 시각 기준
-      * +60초 1회
-      * +30분 1회
-
-    ✅ 추가(복구용):
-    - stats / lineups 가 DB에 비어있으면(또는 부족하면) postmatch 시점에 1회 보강
-      * 호출 폭발 방지: +60s, +30m 실행 구간에서만 / 그리고 DB에 이미 있으면 스킵
-    """
-    if status_group != "FINISHED":
-        return
-
-    st = _init_postmatch_state_if_missing(fixture_id, now)
-
-    ft_seen = st.get("ft_first_seen_utc")
+    ft_seen = st.get("ft_first_seen_utc")
     try:
         base = dt.datetime.fromisoformat(str(ft_seen).replace("Z", "+00:00"))
         if base.tzinfo is None:
@@ -2488,6 +2781,8 @@ def maybe_sync_postmatch_timeline(
 
         return filled_stats, filled_lineups
 
+    events_synced = False
+
     # 1) +60초 1회
     if (not done_60) and (nowu >= (base + dt.timedelta(seconds=60))):
         events = fetch_events(session, fixture_id)
@@ -2502,10 +2797,13 @@ def maybe_sync_postmatch_timeline(
         except Exception:
             ins = 0
 
+        events_synced = True
+
         # ✅ stats/lineups 보강(비어있으면)
         _try_fill_stats_and_lineups(tag="60s")
 
         _mark_postmatch_done(fixture_id, "60", nowu)
+        done_60 = True
         print(f"      [postmatch_timeline] fixture_id={fixture_id} +60s events={len(events)} inserted={ins}")
 
     # 2) +30분 1회
@@ -2522,12 +2820,25 @@ def maybe_sync_postmatch_timeline(
         except Exception:
             ins = 0
 
+        events_synced = True
+
         # ✅ stats/lineups 보강(비어있으면)
         _try_fill_stats_and_lineups(tag="30m")
 
         _mark_postmatch_done(fixture_id, "30m", nowu)
+        done_30m = True
         print(f"      [postmatch_timeline] fixture_id={fixture_id} +30m events={len(events)} inserted={ins}")
 
+    # 이벤트가 교체됐으면 리스트 레드카드 집계도 갱신
+    if events_synced:
+        refresh_list_rows_safe([fixture_id], "postmatch_timeline")
+
+    if not done_60:
+        return max(0.0, (base + dt.timedelta(seconds=60) - nowu).total_seconds())
+    if not done_30m:
+        return max(0.0, (base + dt.timedelta(minutes=30) - nowu).total_seconds())
+    return None
+
 
 
 
@@ -2536,6 +2847,25 @@ def maybe_sync_postmatch_timeline(
 # DB Upsert
 # ─────────────────────────────────────
 
+# 변경이 있을 때만 UPDATE (DB write/bloat 감소)
+UPSERT_FIXTURE_SQL = """
+    INSERT INTO fixtures (fixture_id, league_id, season, date_utc, status, status_group)
+    VALUES (%s, %s, %s, %s, %s, %s)
+    ON CONFLICT (fixture_id) DO UPDATE SET
+        league_id     = EXCLUDED.league_id,
+        season        = EXCLUDED.season,
+        date_utc      = EXCLUDED.date_utc,
+        status        = EXCLUDED.status,
+        status_group  = EXCLUDED.status_group
+    WHERE
+        fixtures.league_id    IS DISTINCT FROM EXCLUDED.league_id OR
+        fixtures.season       IS DISTINCT FROM EXCLUDED.season OR
+        fixtures.date_utc     IS DISTINCT FROM EXCLUDED.date_utc OR
+        fixtures.status       IS DISTINCT FROM EXCLUDED.status OR
+        fixtures.status_group IS DISTINCT FROM EXCLUDED.status_group
+"""
+
+
 def upsert_fixture_row(
     fixture_id: int,
     league_id: Optional[int],
@@ -2544,37 +2874,101 @@ def upsert_fixture_row(
     status_short: Optional[str],
     status_group: Optional[str],
 ) -> None:
-    # 변경이 있을 때만 UPDATE (DB write/bloat 감소)
     execute(
-        """
-        INSERT INTO fixtures (fixture_id, league_id, season, date_utc, status, status_group)
-        VALUES (%s, %s, %s, %s, %s, %s)
-        ON CONFLICT (fixture_id) DO UPDATE SET
-            league_id     = EXCLUDED.league_id,
-            season        = EXCLUDED.season,
-            date_utc      = EXCLUDED.date_utc,
-            status        = EXCLUDED.status,
-            status_group  = EXCLUDED.status_group
-        WHERE
-            fixtures.league_id    IS DISTINCT FROM EXCLUDED.league_id OR
-            fixtures.season       IS DISTINCT FROM EXCLUDED.season OR
-            fixtures.date_utc     IS DISTINCT FROM EXCLUDED.date_utc OR
-            fixtures.status       IS DISTINCT FROM EXCLUDED.status OR
-            fixtures.status_group IS DISTINCT FROM EXCLUDED.status_group
-        """,
+        UPSERT_FIXTURE_SQL,
         (fixture_id, league_id, season, date_utc, status_short, status_group),
     )
 
 
-
-def upsert_match_row_from_fixture(
+UPSERT_MATCH_SQL = """
+    INSERT INTO matches (
+        fixture_id,
+        league_id,
+        season,
+        date_utc,
+        status,
+        status_group,
+        home_id,
+        away_id,
+        home_ft,
+        away_ft,
+        elapsed,
+        home_ht,
+        away_ht,
+        referee,
+        fixture_timezone,
+        fixture_timestamp,
+        status_short,
+        status_long,
+        status_elapsed,
+        status_extra,
+        venue_id,
+        venue_name,
+        venue_city,
+        league_round
+    )
+    VALUES (
+        %s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s
+    )
+    ON CONFLICT (fixture_id) DO UPDATE SET
+        league_id         = EXCLUDED.league_id,
+        season            = EXCLUDED.season,
+        date_utc          = EXCLUDED.date_utc,
+        status            = EXCLUDED.status,
+        status_group      = EXCLUDED.status_group,
+        home_id           = EXCLUDED.home_id,
+        away_id           = EXCLUDED.away_id,
+        home_ft           = EXCLUDED.home_ft,
+        away_ft           = EXCLUDED.away_ft,
+        elapsed           = EXCLUDED.elapsed,
+        home_ht           = EXCLUDED.home_ht,
+        away_ht           = EXCLUDED.away_ht,
+        referee           = EXCLUDED.referee,
+        fixture_timezone  = EXCLUDED.fixture_timezone,
+        fixture_timestamp = EXCLUDED.fixture_timestamp,
+        status_short      = EXCLUDED.status_short,
+        status_long       = EXCLUDED.status_long,
+        status_elapsed    = EXCLUDED.status_elapsed,
+        status_extra      = EXCLUDED.status_extra,
+        venue_id          = EXCLUDED.venue_id,
+        venue_name        = EXCLUDED.venue_name,
+        venue_city        = EXCLUDED.venue_city,
+        league_round      = EXCLUDED.league_round
+    WHERE
+        matches.league_id         IS DISTINCT FROM EXCLUDED.league_id OR
+        matches.season            IS DISTINCT FROM EXCLUDED.season OR
+        matches.date_utc          IS DISTINCT FROM EXCLUDED.date_utc OR
+        matches.status            IS DISTINCT FROM EXCLUDED.status OR
+        matches.status_group      IS DISTINCT FROM EXCLUDED.status_group OR
+        matches.home_id           IS DISTINCT FROM EXCLUDED.home_id OR
+        matches.away_id           IS DISTINCT FROM EXCLUDED.away_id OR
+        matches.home_ft           IS DISTINCT FROM EXCLUDED.home_ft OR
+        matches.away_ft           IS DISTINCT FROM EXCLUDED.away_ft OR
+        matches.elapsed           IS DISTINCT FROM EXCLUDED.elapsed OR
+        matches.home_ht           IS DISTINCT FROM EXCLUDED.home_ht OR
+        matches.away_ht           IS DISTINCT FROM EXCLUDED.away_ht OR
+        matches.referee           IS DISTINCT FROM EXCLUDED.referee OR
+        matches.fixture_timezone  IS DISTINCT FROM EXCLUDED.fixture_timezone OR
+        matches.fixture_timestamp IS DISTINCT FROM EXCLUDED.fixture_timestamp OR
+        matches.status_short      IS DISTINCT FROM EXCLUDED.status_short OR
+        matches.status_long       IS DISTINCT FROM EXCLUDED.status_long OR
+        matches.status_elapsed    IS DISTINCT FROM EXCLUDED.status_elapsed OR
+        matches.status_extra      IS DISTINCT FROM EXCLUDED.status_extra OR
+        matches.venue_id          IS DISTINCT FROM EXCLUDED.venue_id OR
+        matches.venue_name        IS DISTINCT FROM EXCLUDED.venue_name OR
+        matches.venue_city        IS DISTINCT FROM EXCLUDED.venue_city OR
+        matches.league_round      IS DISTINCT FROM EXCLUDED.league_round
+"""
+
+
+def _match_row_params(
     fixture_obj: Dict[str, Any],
     league_id: Optional[int],
     season: Optional[int],
-) -> Tuple[int, int, int, str, str]:
+) -> Tuple[Tuple[Any, ...], Tuple[int, int, int, str, str]]:
     """
-    dev 스키마(matches) 정확 매핑 업서트.
-    반환: (fixture_id, home_id, away_id, status_group, date_utc)
+    dev 스키마(matches) 정확 매핑 → (UPSERT_MATCH_SQL 파라미터, (fixture_id, home_id, away_id, status_group, date_utc))
+    (단건 업서트 / live tick 배치 쓰기 공용)
 
     matches 컬럼(확인됨):
       fixture_id(PK), league_id, season, date_utc, status, status_group,
@@ -2651,139 +3045,70 @@ def upsert_match_row_from_fixture(
 
     league_round = safe_text(league.get("round")) if isinstance(league, dict) else None
 
-    execute(
-        """
-        INSERT INTO matches (
-            fixture_id,
-            league_id,
-            season,
-            date_utc,
-            status,
-            status_group,
-            home_id,
-            away_id,
-            home_ft,
-            away_ft,
-            elapsed,
-            home_ht,
-            away_ht,
-            referee,
-            fixture_timezone,
-            fixture_timestamp,
-            status_short,
-            status_long,
-            status_elapsed,
-            status_extra,
-            venue_id,
-            venue_name,
-            venue_city,
-            league_round
-        )
-        VALUES (
-            %s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s
-        )
-        ON CONFLICT (fixture_id) DO UPDATE SET
-            league_id         = EXCLUDED.league_id,
-            season            = EXCLUDED.season,
-            date_utc          = EXCLUDED.date_utc,
-            status            = EXCLUDED.status,
-            status_group      = EXCLUDED.status_group,
-            home_id           = EXCLUDED.home_id,
-            away_id           = EXCLUDED.away_id,
-            home_ft           = EXCLUDED.home_ft,
-            away_ft           = EXCLUDED.away_ft,
-            elapsed           = EXCLUDED.elapsed,
-            home_ht           = EXCLUDED.home_ht,
-            away_ht           = EXCLUDED.away_ht,
-            referee           = EXCLUDED.referee,
-            fixture_timezone  = EXCLUDED.fixture_timezone,
-            fixture_timestamp = EXCLUDED.fixture_timestamp,
-            status_short      = EXCLUDED.status_short,
-            status_long       = EXCLUDED.status_long,
-            status_elapsed    = EXCLUDED.status_elapsed,
-            status_extra      = EXCLUDED.status_extra,
-            venue_id          = EXCLUDED.venue_id,
-            venue_name        = EXCLUDED.venue_name,
-            venue_city        = EXCLUDED.venue_city,
-            league_round      = EXCLUDED.league_round
-        WHERE
-            matches.league_id         IS DISTINCT FROM EXCLUDED.league_id OR
-            matches.season            IS DISTINCT FROM EXCLUDED.season OR
-            matches.date_utc          IS DISTINCT FROM EXCLUDED.date_utc OR
-            matches.status            IS DISTINCT FROM EXCLUDED.status OR
-            matches.status_group      IS DISTINCT FROM EXCLUDED.status_group OR
-            matches.home_id           IS DISTINCT FROM EXCLUDED.home_id OR
-            matches.away_id           IS DISTINCT FROM EXCLUDED.away_id OR
-            matches.home_ft           IS DISTINCT FROM EXCLUDED.home_ft OR
-            matches.away_ft           IS DISTINCT FROM EXCLUDED.away_ft OR
-            matches.elapsed           IS DISTINCT FROM EXCLUDED.elapsed OR
-            matches.home_ht           IS DISTINCT FROM EXCLUDED.home_ht OR
-            matches.away_ht           IS DISTINCT FROM EXCLUDED.away_ht OR
-            matches.referee           IS DISTINCT FROM EXCLUDED.referee OR
-            matches.fixture_timezone  IS DISTINCT FROM EXCLUDED.fixture_timezone OR
-            matches.fixture_timestamp IS DISTINCT FROM EXCLUDED.fixture_timestamp OR
-            matches.status_short      IS DISTINCT FROM EXCLUDED.status_short OR
-            matches.status_long       IS DISTINCT FROM EXCLUDED.status_long OR
-            matches.status_elapsed    IS DISTINCT FROM EXCLUDED.status_elapsed OR
-            matches.status_extra      IS DISTINCT FROM EXCLUDED.status_extra OR
-            matches.venue_id          IS DISTINCT FROM EXCLUDED.venue_id OR
-            matches.venue_name        IS DISTINCT FROM EXCLUDED.venue_name OR
-            matches.venue_city        IS DISTINCT FROM EXCLUDED.venue_city OR
-            matches.league_round      IS DISTINCT FROM EXCLUDED.league_round
-        """,
-        (
-            fixture_id,
-            league_id,
-            season,
-            date_utc,
-            status,
-            status_group,
-            home_id,
-            away_id,
-            home_ft,
-            away_ft,
-            elapsed,
-            home_ht,
-            away_ht,
-            referee,
-            fixture_timezone,
-            fixture_timestamp,
-            status_short or None,
-            status_long or None,
-            status_elapsed,
-            status_extra,
-            venue_id,
-            venue_name,
-            venue_city,
-            league_round,
-        ),
+    params = (
+        fixture_id,
+        league_id,
+        season,
+        date_utc,
+        status,
+        status_group,
+        home_id,
+        away_id,
+        home_ft,
+        away_ft,
+        elapsed,
+        home_ht,
+        away_ht,
+        referee,
+        fixture_timezone,
+        fixture_timestamp,
+        status_short or None,
+        status_long or None,
+        status_elapsed,
+        status_extra,
+        venue_id,
+        venue_name,
+        venue_city,
+        league_round,
     )
-
-    return fixture_id, home_id, away_id, status_group, date_utc
-
-
-
+    return params, (fixture_id, home_id, away_id, status_group, date_utc)
 
 
+def upsert_match_row_from_fixture(
+    fixture_obj: Dict[str, Any],
+    league_id: Optional[int],
+    season: Optional[int],
+) -> Tuple[int, int, int, str, str]:
+    """
+    dev 스키마(matches) 정확 매핑 업서트.
+    반환: (fixture_id, home_id, away_id, status_group, date_utc)
+    """
+    params, result = _match_row_params(fixture_obj, league_id, season)
+    execute(UPSERT_MATCH_SQL, params)
+    return result
 
 
+UPSERT_MATCH_FIXTURES_RAW_SQL = """
+    INSERT INTO match_fixtures_raw (fixture_id, data_json, fetched_at, updated_at)
+    VALUES (%s, %s, %s, %s)
+    ON CONFLICT (fixture_id) DO UPDATE SET
+        data_json   = EXCLUDED.data_json,
+        fetched_at  = EXCLUDED.fetched_at,
+        updated_at  = EXCLUDED.updated_at
+    WHERE
+        match_fixtures_raw.data_json IS DISTINCT FROM EXCLUDED.data_json
+"""
 
 
-def upsert_match_fixtures_raw(fixture_id: int, fixture_obj: Dict[str, Any], fetched_at: dt.datetime) -> None:
-    raw = json.dumps(fixture_obj, ensure_ascii=False, separators=(",", ":"))
-    execute(
-        """
-        INSERT INTO match_fixtures_raw (fixture_id, data_json, fetched_at, updated_at)
-        VALUES (%s, %s, %s, %s)
-        ON CONFLICT (fixture_id) DO UPDATE SET
-            data_json   = EXCLUDED.data_json,
-            fetched_at  = EXCLUDED.fetched_at,
-            updated_at  = EXCLUDED.updated_at
-        WHERE
-            match_fixtures_raw.data_json IS DISTINCT FROM EXCLUDED.data_json
-        """,
-        (fixture_id, raw, fetched_at, fetched_at),
-    )
+def upsert_match_fixtures_raw(
+    fixture_id: int,
+    fixture_obj: Dict[str, Any],
+    fetched_at: dt.datetime,
+    raw_json: Optional[str] = None,
+) -> None:
+    # raw_json: 호출 측이 이미 직렬화했으면(변경 해시 계산용) 그대로 재사용
+    raw = raw_json if raw_json is not None else fixture_raw_json(fixture_obj)
+    execute(UPSERT_MATCH_FIXTURES_RAW_SQL, (fixture_id, raw, fetched_at, fetched_at))
 
 
 
@@ -2933,6 +3258,8 @@ def upsert_match_lineups(fixture_id: int, lineups_resp: List[Dict[str, Any]], up
     if not ok_any_write:
         return False
 
+    bump_data_versions_safe([fixture_id], "lineups")
+
     # ✅ 반환은 "유의미하게 준비됨" 여부
     return bool(ready_any)
 
@@ -2980,7 +3307,7 @@ def maybe_sync_lineups(
 
     # ---- 과호출 방지 쿨다운(초) ----
     # - UPCOMING(-60/-10)은 1회성 슬롯이므로 여기서는 쿨다운으로 막지 않는다.
-    # - INPLAY 재시도 구간에서만(last_try_ts 기반) 쿨다운을 적용한다.
+    # - INPLAY 재시도 구간에서만(LINEUPS_SCHED 기반) 쿨다운을 적용한다.
     COOLDOWN_SEC = 20
 
 
@@ -2994,7 +3321,7 @@ def maybe_sync_lineups(
         if (59 <= mins <= 61) and not st.get("slot60"):
             st["slot60"] = True
             try:
-                # ✅ UPCOMING 슬롯은 INPLAY 쿨다운을 막지 않도록 last_try_ts를 찍지 않는다
+                # ✅ UPCOMING 슬롯은 INPLAY 쿨다운을 막지 않도록 LINEUPS_SCHED 에 등록하지 않는다
                 resp = fetch_lineups(session, fixture_id)
                 ready = upsert_match_lineups(fixture_id, resp, nowu)
 
@@ -3011,7 +3338,7 @@ def maybe_sync_lineups(
         if (9 <= mins <= 11) and not st.get("slot10"):
             st["slot10"] = True
             try:
-                # ✅ UPCOMING 슬롯은 INPLAY 쿨다운을 막지 않도록 last_try_ts를 찍지 않는다
+                # ✅ UPCOMING 슬롯은 INPLAY 쿨다운을 막지 않도록 LINEUPS_SCHED 에 등록하지 않는다
                 resp = fetch_lineups(session, fixture_id)
                 ready = upsert_match_lineups(fixture_id, resp, nowu)
 
@@ -3035,12 +3362,11 @@ def maybe_sync_lineups(
         # ✅ 기존 5분 → 15분까지 확장
         if 0 <= el <= 15:
             # 쿨다운 체크 (UPCOMING 슬롯과 달리 여기서는 적용)
-            last_try = float(st.get("last_try_ts") or 0.0)
-            if (time.time() - last_try) < COOLDOWN_SEC:
+            if not LINEUPS_SCHED.is_due(fixture_id):
                 return
 
             try:
-                st["last_try_ts"] = time.time()
+                LINEUPS_SCHED.schedule(fixture_id, COOLDOWN_SEC)
                 resp = fetch_lineups(session, fixture_id)
                 ready = upsert_match_lineups(fixture_id, resp, nowu)
 
@@ -3056,6 +3382,94 @@ def maybe_sync_lineups(
 # 메인 1회 실행
 # ─────────────────────────────────────
 
+class LiveTickWriteBatch:
+    """
+    live tick 한 번의 fixtures / matches / match_fixtures_raw 업서트를 모았다가
+    테이블별 executemany 로 한 트랜잭션에 flush (db.execute_batches).
+
+    - 예전: 경기마다 execute() 3번 (+ before-state SELECT 1번) → 80경기면 수백 번 왕복
+    - 지금: before-state SELECT 1번 + flush 1번
+    - flush 가 실패하면(한 row 라도 에러) 롤백 후 경기 단위로 예전처럼 하나씩 다시 쓴다
+      (한 경기 문제로 tick 전체가 안 써지는 일 방지)
+    """
+
+    def __init__(self) -> None:
+        self.items: List[Dict[str, Any]] = []
+
+    def add(
+        self,
+        *,
+        fixture_id: int,
+        fixture_params: Tuple[Any, ...],
+        match_params: Optional[Tuple[Any, ...]],
+        raw_params: Optional[Tuple[Any, ...]],
+        content_hash: Optional[str],
+    ) -> None:
+        self.items.append(
+            {
+                "fixture_id": fixture_id,
+                "fixture": fixture_params,
+                "match": match_params,
+                "raw": raw_params,
+                "hash": content_hash,
+            }
+        )
+
+    def _write_one(self, it: Dict[str, Any]) -> bool:
+        # 예전 단건 경로와 같은 순서/에러 처리: fixtures → matches (실패 시 중단) → raw (실패 무시)
+        try:
+            execute(UPSERT_FIXTURE_SQL, it["fixture"])
+            if it["match"] is None:
+                return False
+            execute(UPSERT_MATCH_SQL, it["match"])
+        except Exception as e:
+            print(f"  ! live_all item 처리 중 에러: fixture_id={it['fixture_id']} {e}", file=sys.stderr)
+            return False
+        if it["raw"] is not None:
+            try:
+                execute(UPSERT_MATCH_FIXTURES_RAW_SQL, it["raw"])
+            except Exception:
+                return True
+        if it["hash"]:
+            mark_fixture_written(it["fixture_id"], it["hash"])
+        return True
+
+    def flush(self) -> List[int]:
+        """
+        반환: matches 까지 기록된 fixture_id 목록 (list rows / data version 갱신 대상)
+        """
+        if not self.items:
+            return []
+
+        t0 = time.time()
+        try:
+            execute_batches(
+                [
+                    (UPSERT_FIXTURE_SQL, [it["fixture"] for it in self.items]),
+                    (UPSERT_MATCH_SQL, [it["match"] for it in self.items if it["match"] is not None]),
+                    (UPSERT_MATCH_FIXTURES_RAW_SQL, [it["raw"] for it in self.items if it["raw"] is not None]),
+                ]
+            )
+        except Exception as e:
+            print(f"[live_write_batch] flush failed → per-fixture fallback: {e}", file=sys.stderr, flush=True)
+            return [it["fixture_id"] for it in self.items if self._write_one(it)]
+
+        written: List[int] = []
+        for it in self.items:
+            if it["match"] is None:
+                continue
+            written.append(it["fixture_id"])
+            if it["hash"] and it["raw"] is not None:
+                mark_fixture_written(it["fixture_id"], it["hash"])
+
+        print(
+            f"[live_write_batch] fixtures={len(self.items)} matches={len(written)} "
+            f"elapsed={time.time() - t0:.3f}s",
+            flush=True,
+        )
+        return written
+
+
 def run_once() -> int:
     """
     ✅ LIVE 전용(핫패스):
@@ -3081,16 +3495,23 @@ def run_once() -> int:
 
         ensure_ft_triggers_table()
         ensure_competition_structure_tables()
+        ensure_matches_kickoff_column()
+        ensure_fixture_list_rows_table()
+        ensure_match_data_versions_table()
+        ensure_match_fixtures_raw_hash_column()
+        ensure_live_poll_state_table()
+        LINEUPS_SCHED.warm_load()
 
         run_once._ddl_done = True  # type: ignore[attr-defined]
 
 
     now = now_utc()
     fetched_at = now
-    s = _session()
+    s = _thread_session()  # 역할(스레드)별 Session 재사용 → keep-alive 유지
     run_started_ts = time.time()
 
     total_inplay = 0
+    touched: List[int] = []
 
     print(
         f"[live_worker] tick start detect_interval={DETECT_INTERVAL_SEC}s "
@@ -3099,18 +3520,20 @@ def run_once() -> int:
     )
 
     # ─────────────────────────────────────
-    # (0) live=all 감지
+    # (0) live=all 감지 (watched 리그만 디코드)
     # ─────────────────────────────────────
+    watched = set(league_ids)
+
     live_items: List[Dict[str, Any]] = []
+    live_raws: Dict[int, str] = {}
+    live_all_total = 0
     try:
-        live_items = fetch_live_all(s)
+        live_items, live_raws, live_all_total = fetch_live_all_watched(s, watched)
     except Exception as e:
         print(f"[live_detect] err: {e}", file=sys.stderr)
         live_items = []
 
-    print(f"[live_worker] live_all fetched={len(live_items)}", flush=True)
-
-    watched = set(league_ids)
+    print(f"[live_worker] live_all fetched={live_all_total} watched_fixtures={len(live_items)}", flush=True)
 
     # ✅ live=all에서 "현재 라이브가 있는 watched 리그"만 추출
     live_lids: Set[int] = set()
@@ -3123,13 +3546,33 @@ def run_once() -> int:
             live_lids.add(lid)
 
     if len(live_lids) == 0:
-        print(f"[live_detect] watched_live=0 (live_all={len(live_items)})")
+        print(f"[live_detect] watched_live=0 (live_all={live_all_total})")
     else:
-        print(f"[live_detect] watched_live={len(live_lids)} (live_all={len(live_items)})")
+        print(f"[live_detect] watched_live={len(live_lids)} (live_all={live_all_total})")
+
+    # ✅ 변경 없는 경기는 fixtures/matches/raw 업서트 skip (services/fixture_write_skip.py)
+    live_fids: List[int] = []
+    for it in live_items or []:
+        lid = safe_int((it.get("league") or {}).get("id"))
+        fid = safe_int((it.get("fixture") or {}).get("id"))
+        if lid in watched and fid is not None:
+            live_fids.append(fid)
+    warm_fixture_hashes(live_fids)
+    skipped_writes = 0
 
     # ─────────────────────────────────────
     # (0-1) ✅ LIVE 아이템 즉시 처리
+    #   1) 변경된 경기만 배치에 모으고  2) 한 번에 flush  3) lineups / FT 트리거
     # ─────────────────────────────────────
+    batch = LiveTickWriteBatch()
+    post: List[Tuple[Dict[str, Any], int, int, str, str, bool]] = []  # (item, lid, season, sg, date_utc, written)
+
+    try:
+        before_states = _read_match_score_states(live_fids)
+    except Exception:
+        before_states = {}
+    kicked: List[Tuple[int, str]] = []  # 스코어/상태가 바뀐 경기 → events/stats 즉시 호출 + NOTIFY
+
     for item in live_items or []:
         try:
             lg = item.get("league") or {}
@@ -3152,28 +3595,80 @@ def run_once() -> int:
             status_short = safe_text(st.get("short")) or safe_text(st.get("code")) or ""
             sg = map_status_group(status_short)
 
-            upsert_fixture_row(
-                fixture_id=fid,
-                league_id=lid,
-                season=season,
-                date_utc=safe_text(fx.get("date")),
-                status_short=status_short,
-                status_group=sg,
-            )
+            # raw 는 응답 원문 구간 (item 은 slim dict 라 다시 직렬화하면 안 됨)
+            raw_json = live_raws.get(fid) or fixture_raw_json(item)
+            content_hash = fixture_content_hash(raw_json)
+            written = not is_fixture_unchanged(fid, content_hash)
 
-            fixture_id, home_id, away_id, sg2, date_utc = upsert_match_row_from_fixture_logged(
-                item,
-                league_id=lid,
-                season=season,
-                source="live_all",
+            if not written:
+                # 직전에 기록한 내용과 동일 → DB 그대로, 이후 정책(lineups 등)에 필요한 값만 채움
+                skipped_writes += 1
+                post.append((item, lid, season, sg, safe_text(fx.get("date")) or "", False))
+                continue
+
+            fixture_params = (fid, lid, season, safe_text(fx.get("date")), status_short, sg)
+            try:
+                match_params, (fixture_id, _home_id, _away_id, sg2, date_utc) = _match_row_params(
+                    item, league_id=lid, season=season
+                )
+            except Exception as e:
+                # 예전과 동일: fixtures row 는 쓰고 matches 는 건너뜀
+                batch.add(
+                    fixture_id=fid,
+                    fixture_params=fixture_params,
+                    match_params=None,
+                    raw_params=None,
+                    content_hash=None,
+                )
+                print(f"  ! live_all item 처리 중 에러: {e}", file=sys.stderr)
+                continue
+
+            incoming_state = _extract_incoming_match_score_state(item)
+            before_state = before_states.get(fixture_id)
+            if _is_meaningful_match_state_change(before_state, incoming_state):
+                _log_match_score_decision(
+                    source="live_all",
+                    fixture_id=fixture_id,
+                    action="apply",
+                    before_state=before_state,
+                    incoming_state=incoming_state,
+                )
+            change_reason = _timeline_change_reason(before_state, incoming_state)
+            if change_reason:
+                kicked.append((fixture_id, change_reason))
+
+            batch.add(
+                fixture_id=fixture_id,
+                fixture_params=fixture_params,
+                match_params=match_params,
+                raw_params=(fixture_id, raw_json, fetched_at, fetched_at),
+                content_hash=content_hash,
             )
+            post.append((item, lid, season, sg2, date_utc, True))
 
+        except Exception as e:
+            print(f"  ! live_all item 처리 중 에러: {e}", file=sys.stderr)
 
-            try:
-                upsert_match_fixtures_raw(fixture_id, item, fetched_at)
-            except Exception:
-                pass
+    touched.extend(batch.flush())
+    touched_set = set(touched)
+
+    # ✅ 골/상태 변경 → events/stats 의 다음 호출을 지금으로 당기고 깨운다
+    #    - 같은 프로세스(멀티 역할 모드): 스케줄러 직접 + wake_roles
+    #    - 다른 프로세스(events/stats 워커, match_event_worker): 커밋 후 pg_notify
+    kicked = [(f, reason) for f, reason in kicked if f in touched_set]
+    if kicked:
+        _schedule_timeline_now([f for f, _ in kicked])
+        publish_live_changes(kicked)
+    ft_enqueued = 0
 
+    for item, lid, season, sg2, date_utc, written in post:
+        fixture_id = safe_int((item.get("fixture") or {}).get("id"))
+        if fixture_id is None:
+            continue
+        if written and fixture_id not in touched_set:
+            # flush 에서 matches 기록 실패 → 예전처럼 이 경기의 후속 처리 생략
+            continue
+        try:
             try:
                 elapsed = safe_int((item.get("fixture") or {}).get("status", {}).get("elapsed"))
                 maybe_sync_lineups(s, fixture_id, date_utc, sg2, elapsed, now)
@@ -3182,9 +3677,10 @@ def run_once() -> int:
 
             # postmatch timeline 처리는 fixtures worker가 담당
 
-            if sg2 == "FINISHED":
+            if sg2 == "FINISHED" and written:
                 try:
                     enqueue_ft_trigger(fixture_id, lid, season, finished_iso_utc=iso_utc(now))
+                    ft_enqueued += 1
                 except Exception:
                     pass
 
@@ -3194,10 +3690,50 @@ def run_once() -> int:
         except Exception as e:
             print(f"  ! live_all item 처리 중 에러: {e}", file=sys.stderr)
 
+    if ft_enqueued:
+        wake_roles("fixtures", "standings", "insights")
+
+    refresh_list_rows_safe(touched, "live_all")
+    forget_fixture_hashes(live_fids)
+    LINEUPS_SCHED.retain(live_fids)
+    LINEUPS_SCHED.flush_persisted()
+
+    WRITE_SKIP_STATS["skipped"] += skipped_writes
+    WRITE_SKIP_STATS["written"] += len(touched)
+
     run_sec = time.time() - run_started_ts
-    print(f"[live_status_worker] done. inplay={total_inplay}, run_sec={run_sec:.2f}")
+    print(
+        f"[live_status_worker] done. inplay={total_inplay}, run_sec={run_sec:.2f} "
+        f"writes={len(touched)} skipped_unchanged={skipped_writes} "
+        f"(total written={WRITE_SKIP_STATS['written']} skipped={WRITE_SKIP_STATS['skipped']})"
+    )
     return total_inplay
 
+def _live_poll_delay(sched: PollScheduler, base_sec: float, row: Dict[str, Any]) -> float:
+    """
+    INPLAY row(_select_inplay_matches) → 다음 호출까지 초 (골 직후/추가시간 빠르게, HT 느리게).
+    """
+    fid = safe_int(row.get("fixture_id")) or 0
+    since_goal = sched.note_score(fid, safe_int(row.get("home_ft")), safe_int(row.get("away_ft")))
+    return live_poll_interval(
+        base_sec,
+        status_short=row.get("status_short"),
+        elapsed=row.get("elapsed"),
+        league_id=row.get("league_id"),
+        since_score_change_sec=since_goal,
+    )
+
+
+def _schedule_timeline_now(fixture_ids: List[int]) -> None:
+    # events/stats 역할이 이 프로세스에 없으면 스케줄러는 건드리지 않는다 (retain/flush 할 주체가 없음)
+    for role, sched in (("events", EVENTS_SCHED), ("stats", STATS_SCHED)):
+        if role not in _ROLE_WAKE:
+            continue
+        for f in fixture_ids:
+            sched.schedule(f, 0)
+    wake_roles("events", "stats")
+
+
 def run_once_events_worker() -> int:
     """
     ✅ EVENTS 전용:
@@ -3210,23 +3746,31 @@ def run_once_events_worker() -> int:
 
     if not hasattr(run_once_events_worker, "_ddl_done"):
         ensure_match_live_state_table()
+        ensure_live_poll_state_table()
+        # 재시작 직후 모든 라이브 경기를 한꺼번에 부르지 않도록 저장된 next-due 로 시작
+        EVENTS_SCHED.warm_load(spread_sec=EVENTS_INTERVAL_SEC)
         run_once_events_worker._ddl_done = True  # type: ignore[attr-defined]
 
-    s = _session()
     now = now_utc()
 
     rows = _select_inplay_matches(limit=EVENTS_BATCH_LIMIT)
     print(
         f"[events_worker] tick candidates={len(rows)} batch_limit={EVENTS_BATCH_LIMIT} "
-        f"cooldown={EVENTS_INTERVAL_SEC}s",
+        f"base_interval={EVENTS_INTERVAL_SEC}s",
         flush=True,
     )
     if not rows:
         print("[events_worker] inplay=0")
+        EVENTS_SCHED.retain([])
+        EVENTS_SCHED.flush_persisted()
         return 0
 
     processed = 0
+    touched: List[int] = []
 
+    # ── 1) next-due 가 지난 fixture 만 고르기 (EVENTS_SCHED)
+    teams: Dict[int, Tuple[int, int]] = {}
+    by_fid: Dict[int, Dict[str, Any]] = {}
     for r in rows:
         fixture_id = safe_int(r.get("fixture_id"))
         home_id = safe_int(r.get("home_id"))
@@ -3235,15 +3779,24 @@ def run_once_events_worker() -> int:
         if fixture_id is None or home_id is None or away_id is None:
             continue
 
-        try:
-            now_ts_events = time.time()
-            last_events_ts = LAST_EVENTS_SYNC.get(fixture_id)
+        teams[fixture_id] = (home_id, away_id)
+        by_fid[fixture_id] = r
 
-            if (last_events_ts is not None) and ((now_ts_events - last_events_ts) < EVENTS_INTERVAL_SEC):
-                continue
+    EVENTS_SCHED.retain(by_fid.keys())
+    retain_red_cards(by_fid.keys())
+    due = EVENTS_SCHED.due_ids(by_fid.keys())
 
-            events = fetch_events(s, fixture_id)
+    # ── 2) fetch 단계 (동시) → 3) DB write 단계 (순차, match_live_state 는 마지막에 한 번에)
+    live_state_rows: List[Tuple[int, int, int, str]] = []
+    red_changed: List[Tuple[int, str]] = []
+    for fixture_id, fetched_ts, events, err in fetch_per_fixture_concurrent(fetch_events, due, "events_worker"):
+        if err is not None or events is None:
+            delay = EVENTS_SCHED.schedule_failure(fixture_id, EVENTS_INTERVAL_SEC, fetched_ts)
+            print(f"[events_worker] fixture_id={fixture_id} err: {err} (retry in {delay:.0f}s)", file=sys.stderr)
+            continue
 
+        home_id, away_id = teams[fixture_id]
+        try:
             try:
                 upsert_match_events_raw(fixture_id, events, now)
             except Exception:
@@ -3257,18 +3810,45 @@ def run_once_events_worker() -> int:
 
             try:
                 h_red, a_red = calc_red_cards_from_events(events, home_id, away_id)
-                upsert_match_live_state(fixture_id, h_red, a_red, now)
+                live_state_rows.append((fixture_id, int(h_red), int(a_red), iso_utc(now)))
+                if red_cards_changed(fixture_id, h_red, a_red):
+                    red_changed.append((fixture_id, "redcard"))
             except Exception:
                 pass
 
-            LAST_EVENTS_SYNC[fixture_id] = now_ts_events
+            # 다음 호출 시각 기준은 fetch 시작 시각 (동시 fetch 라도 fixture 별 신선도 유지)
+            EVENTS_SCHED.schedule(
+                fixture_id,
+                _live_poll_delay(EVENTS_SCHED, EVENTS_INTERVAL_SEC, by_fid[fixture_id]),
+                fetched_ts,
+            )
+            EVENTS_SCHED.reset_failures(fixture_id)
+            touched.append(fixture_id)
             processed += 1
             print(f"[events_worker] fixture_id={fixture_id} events={len(events)} inserted={inserted}")
 
         except Exception as e:
-            print(f"[events_worker] fixture_id={fixture_id} err: {e}", file=sys.stderr)
+            delay = EVENTS_SCHED.schedule_failure(fixture_id, EVENTS_INTERVAL_SEC, fetched_ts)
+            print(f"[events_worker] fixture_id={fixture_id} err: {e} (retry in {delay:.0f}s)", file=sys.stderr)
+
+    if live_state_rows:
+        try:
+            execute_batches([(UPSERT_MATCH_LIVE_STATE_SQL, live_state_rows)])
+        except Exception as e:
+            print(f"[events_worker] live_state batch err → per-fixture: {e}", file=sys.stderr)
+            for row in live_state_rows:
+                try:
+                    execute(UPSERT_MATCH_LIVE_STATE_SQL, row)
+                except Exception:
+                    pass
+
+    # 레드카드는 match_live_state 가 기준 → 커밋 후 푸시 워커에 알림
+    publish_live_changes(red_changed)
+    EVENTS_SCHED.flush_persisted()
 
-    print(f"[events_worker] done. processed={processed}")
+    refresh_list_rows_safe(touched, "events")
+
+    print(f"[events_worker] done. processed={processed} rl={rate_limit_stats().get('football')}")
     return processed
 
 def run_once_stats_worker() -> int:
@@ -3281,41 +3861,63 @@ def run_once_stats_worker() -> int:
         print("[stats_worker] APIFOOTBALL_KEY(env) 가 비어있습니다. 종료.", file=sys.stderr)
         return 0
 
-    s = _session()
+    if not hasattr(run_once_stats_worker, "_ddl_done"):
+        ensure_live_poll_state_table()
+        STATS_SCHED.warm_load(spread_sec=STATS_INTERVAL_SEC)
+        run_once_stats_worker._ddl_done = True  # type: ignore[attr-defined]
+
     rows = _select_inplay_matches(limit=STATS_BATCH_LIMIT)
     print(
         f"[stats_worker] tick candidates={len(rows)} batch_limit={STATS_BATCH_LIMIT} "
-        f"cooldown={STATS_INTERVAL_SEC}s",
+        f"base_interval={STATS_INTERVAL_SEC}s",
         flush=True,
     )
     if not rows:
         print("[stats_worker] inplay=0")
+        STATS_SCHED.retain([])
+        STATS_SCHED.flush_persisted()
         return 0
 
     processed = 0
+    touched: List[int] = []
 
+    by_fid: Dict[int, Dict[str, Any]] = {}
     for r in rows:
         fixture_id = safe_int(r.get("fixture_id"))
         if fixture_id is None:
             continue
+        by_fid[fixture_id] = r
 
-        try:
-            now_ts_stats = time.time()
-            last_ts = LAST_STATS_SYNC.get(fixture_id)
-            if (last_ts is not None) and ((now_ts_stats - last_ts) < STATS_INTERVAL_SEC):
-                continue
+    STATS_SCHED.retain(by_fid.keys())
+    due = STATS_SCHED.due_ids(by_fid.keys())
 
-            stats = fetch_team_stats(s, fixture_id)
+    for fixture_id, fetched_ts, stats, err in fetch_per_fixture_concurrent(fetch_team_stats, due, "stats_worker"):
+        if err is not None or stats is None:
+            delay = STATS_SCHED.schedule_failure(fixture_id, STATS_INTERVAL_SEC, fetched_ts)
+            print(f"[stats_worker] fixture_id={fixture_id} err: {err} (retry in {delay:.0f}s)", file=sys.stderr)
+            continue
+
+        try:
             upsert_match_team_stats(fixture_id, stats)
-            LAST_STATS_SYNC[fixture_id] = now_ts_stats
+            STATS_SCHED.schedule(
+                fixture_id,
+                _live_poll_delay(STATS_SCHED, STATS_INTERVAL_SEC, by_fid[fixture_id]),
+                fetched_ts,
+            )
+            STATS_SCHED.reset_failures(fixture_id)
+            touched.append(fixture_id)
 
             processed += 1
             print(f"[stats_worker] fixture_id={fixture_id} updated")
 
         except Exception as e:
-            print(f"[stats_worker] fixture_id={fixture_id} err: {e}", file=sys.stderr)
+            delay = STATS_SCHED.schedule_failure(fixture_id, STATS_INTERVAL_SEC, fetched_ts)
+            print(f"[stats_worker] fixture_id={fixture_id} err: {e} (retry in {delay:.0f}s)", file=sys.stderr)
+
+    bump_data_versions_safe(touched, "stats")
+    STATS_SCHED.flush_persisted()
 
-    print(f"[stats_worker] done. processed={processed}")
+    print(f"[stats_worker] done. processed={processed} rl={rate_limit_stats().get('football')}")
     return processed
 
 def run_once_fixtures_worker() -> int:
@@ -3340,13 +3942,22 @@ def run_once_fixtures_worker() -> int:
         ensure_match_postmatch_timeline_state_table()
         ensure_ft_triggers_table()
         ensure_competition_structure_tables()
+        ensure_matches_kickoff_column()
+        ensure_fixture_list_rows_table()
+        ensure_match_data_versions_table()
+        ensure_match_fixtures_raw_hash_column()
+        ensure_live_poll_state_table()
+        POSTMATCH_SCHED.warm_load(spread_sec=60)
         run_once_fixtures_worker._ddl_done = True  # type: ignore[attr-defined]
 
     now = now_utc()
     fetched_at = now
-    s = _session()
+    s = _thread_session()  # 역할(스레드)별 Session 재사용 → keep-alive 유지
 
     total_fixtures = 0
+    touched: List[int] = []
+    league_touched: List[int] = []
+    unchanged = 0
 
     if not hasattr(run_once_fixtures_worker, "_fixtures_cache"):
         run_once_fixtures_worker._fixtures_cache = {}  # type: ignore[attr-defined]
@@ -3417,6 +4028,11 @@ def run_once_fixtures_worker() -> int:
         total_fixtures += len(fixtures)
         print(f"[fixtures_worker:scan] league={lid} date={date_str} season={used_season} count={len(fixtures)} interval={forced_interval}s")
 
+        # ✅ 변경 감지: raw 해시가 같으면 upsert / list rows / 데이터 버전 bump 모두 생략
+        prev_states = load_prev_fixture_states(
+            [fid for fid in (safe_int((it.get("fixture") or {}).get("id")) for it in fixtures) if fid is not None]
+        )
+
         for item in fixtures:
             try:
                 fx = item.get("fixture") or {}
@@ -3434,6 +4050,23 @@ def run_once_fixtures_worker() -> int:
                 if status_group == "INPLAY":
                     continue
 
+                prev = prev_states.get(fid)
+                raw_json = fixture_raw_json(item)
+                if fixture_unchanged(prev, raw_json):
+                    unchanged += 1
+                    try:
+                        elapsed = safe_int(st.get("elapsed"))
+                        maybe_sync_lineups(s, fid, safe_text(fx.get("date")), status_group, elapsed, now)
+                    except Exception:
+                        pass
+                    # FT 트리거는 PK 중복 방지라 그대로 유지 (raw 를 다른 writer 가 먼저 썼을 수 있음)
+                    if status_group == "FINISHED":
+                        try:
+                            enqueue_ft_trigger(fid, lid, used_season, finished_iso_utc=iso_utc(now))
+                        except Exception:
+                            pass
+                    continue
+
                 skip_overwrite, skip_reason = _should_skip_fixtures_scan_nonlive_overwrite(
                     fid,
                     incoming_state,
@@ -3472,10 +4105,14 @@ def run_once_fixtures_worker() -> int:
                 )
 
                 try:
-                    upsert_match_fixtures_raw(fixture_id, item, fetched_at)
+                    upsert_match_fixtures_raw(fixture_id, item, fetched_at, raw_json)
                 except Exception:
                     pass
 
+                touched.append(fixture_id)
+                if league_version_changed(prev, sg, item):
+                    league_touched.append(fixture_id)
+
                 try:
                     elapsed = safe_int((item.get("fixture") or {}).get("status", {}).get("elapsed"))
                     maybe_sync_lineups(s, fixture_id, date_utc, sg, elapsed, now)
@@ -3492,6 +4129,9 @@ def run_once_fixtures_worker() -> int:
             except Exception as e:
                 print(f"  ! fixtures_worker fixture 처리 중 에러: {e}", file=sys.stderr)
 
+    refresh_list_rows_safe(touched, "fixtures_scan", league_touched)
+    print(f"[fixtures_worker:scan] changed={len(touched)} unchanged={unchanged} league_bump={len(league_touched)}")
+
     try:
         rechecked = recheck_scheduled_fixtures(
             s,
@@ -3534,15 +4174,206 @@ def run_once_fixtures_worker() -> int:
 
 # 역할 분기(파일 1개로 워커 여러 개 실행)
 LIVE_WORKER_ROLE = (os.environ.get("LIVE_WORKER_ROLE") or "live").strip().lower()
-# live | events | stats | fixtures | standings
+# live | events | stats | fixtures | standings | insights | all | "live,events,..."
 
 EVENTS_LOOP_SEC = int(os.environ.get("LIVE_EVENTS_LOOP_SEC", "5"))
 STATS_LOOP_SEC = int(os.environ.get("LIVE_STATS_LOOP_SEC", "10"))
 FIXTURES_LOOP_SEC = int(os.environ.get("LIVE_FIXTURES_LOOP_SEC", "30"))
+# fixture_list_rows 누락 보정 주기 (fixtures 역할)
+FIXTURE_LIST_REPAIR_SEC = int(os.environ.get("FIXTURE_LIST_REPAIR_SEC", "900"))
 
 EVENTS_BATCH_LIMIT = int(os.environ.get("LIVE_EVENTS_BATCH_LIMIT", "80"))
 STATS_BATCH_LIMIT = int(os.environ.get("LIVE_STATS_BATCH_LIMIT", "80"))
 POSTMATCH_BATCH_LIMIT = int(os.environ.get("LIVE_POSTMATCH_BATCH_LIMIT", "60"))
+POSTMATCH_DONE_RECHECK_SEC = int(os.environ.get("LIVE_POSTMATCH_DONE_RECHECK_SEC", "21600"))
+# ─────────────────────────────────────
+# 역할 러너 (단일 역할 / 멀티 역할 공용)
+# ─────────────────────────────────────
+#
+# LIVE_WORKER_ROLE=all (또는 "live,events,stats" 처럼 콤마 목록) 이면 한 프로세스에서 역할마다 스레드 1개.
+# - DB 풀 / API 레이트리미터 / PollScheduler(EVENTS_SCHED 등) / fixture 해시 캐시 / DDL 을 모두 공유
+# - live tick 이 골·상태 변경을 보면 wake_roles() 로 events/stats 를 바로 깨운다 (다음 DB 폴링까지 안 기다림)
+# - 역할마다 한 tick 의 시간 예산(LIVE_ROLE_BUDGET_SEC_<ROLE>), 넘기면 로그 + 그만큼 다음 tick 을 늦춰
+#   공유 레이트리밋/DB 풀을 다른 역할에게 양보한다
+# - db.py 풀 max_size(10) 안에서 동작: 역할 6개가 동시에 잡는 커넥션은 보통 1개씩
+
+ALL_WORKER_ROLES = ("live", "events", "stats", "fixtures", "standings", "insights")
+
+_ROLE_WAKE: Dict[str, threading.Event] = {}
+_ROLE_STATE: Dict[str, Dict[str, float]] = {}
+
+# 멀티 역할 모드에서 역할별 첫 tick(DDL 부트스트랩)끼리 겹치지 않게
+_BOOTSTRAP_LOCK = threading.Lock()
+
+
+def parse_worker_roles(value: str) -> List[str]:
+    v = (value or "").strip().lower()
+    if v in ("all", "*"):
+        return list(ALL_WORKER_ROLES)
+    out: List[str] = []
+    for part in v.replace(";", ",").split(","):
+        part = part.strip()
+        if not part:
+            continue
+        # 알 수 없는 값은 예전처럼 live
+        role = part if part in ALL_WORKER_ROLES else "live"
+        if role not in out:
+            out.append(role)
+    return out or ["live"]
+
+
+def wake_roles(*roles: str) -> None:
+    """
+    해당 역할이 이 프로세스에서 돌고 있으면 sleep 을 끊고 바로 다음 tick 실행.
+    """
+    for r in roles:
+        ev = _ROLE_WAKE.get(r)
+        if ev is not None:
+            ev.set()
+
+
+def _role_budget_sec(role: str) -> float:
+    """
+    기본 예산 = 그 역할의 루프 간격 × 2 (최소 10초). 0 이하면 예산 체크 끔.
+    """
+    interval = {
+        "live": DETECT_INTERVAL_SEC,
+        "events": EVENTS_LOOP_SEC,
+        "stats": STATS_LOOP_SEC,
+        "fixtures": FIXTURES_LOOP_SEC,
+        "standings": TRIGGER_POLL_SEC,
+        "insights": TRIGGER_POLL_SEC,
+    }.get(role, DETECT_INTERVAL_SEC)
+    default = max(10.0, float(interval) * 2)
+    try:
+        return float(os.environ.get(f"LIVE_ROLE_BUDGET_SEC_{role.upper()}", str(default)) or default)
+    except Exception:
+        return default
+
+
+def _sched_sleep_sec(sched: PollScheduler, max_sec: float) -> float:
+    nxt = sched.seconds_until_next_due()
+    if nxt is None:
+        return float(max_sec)
+    return max(1.0, min(float(max_sec), nxt))
+
+
+def _step_live() -> float:
+    run_once()
+    return float(DETECT_INTERVAL_SEC)
+
+
+def _step_events() -> float:
+    run_once_events_worker()
+    # 가장 이른 next-due 까지만 쉰다 (새로 INPLAY 된 경기 감지를 위해 최대 EVENTS_LOOP_SEC)
+    return _sched_sleep_sec(EVENTS_SCHED, max(3, EVENTS_LOOP_SEC))
+
+
+def _step_stats() -> float:
+    run_once_stats_worker()
+    return _sched_sleep_sec(STATS_SCHED, max(5, STATS_LOOP_SEC))
+
+
+def _step_fixtures() -> float:
+    st = _ROLE_STATE.setdefault("fixtures", {"last_repair": 0.0})
+    run_once_fixtures_worker()
+    now_ts = time.time()
+    if (now_ts - st["last_repair"]) >= float(FIXTURE_LIST_REPAIR_SEC):
+        st["last_repair"] = now_ts
+        try:
+            repair_missing_fixture_list_rows()
+        except Exception as e:
+            print(f"[fixture_list_rows] repair err: {e}", file=sys.stderr)
+    return float(max(10, FIXTURES_LOOP_SEC))
+
+
+def _step_standings() -> float:
+    st = _ROLE_STATE.setdefault("standings", {"last_periodic": 0.0})
+    now_ts = time.time()
+    run_once_standings(do_periodic=False)
+    if (now_ts - st["last_periodic"]) >= float(STANDINGS_LOOP_SEC):
+        st["last_periodic"] = now_ts
+        run_once_standings(do_periodic=True)
+    return float(max(5, int(TRIGGER_POLL_SEC)))
+
+
+def _step_insights() -> float:
+    st = _ROLE_STATE.setdefault("insights", {"last_sweep": 0.0})
+    now_ts = time.time()
+    do_sweep = (now_ts - st["last_sweep"]) >= float(INSIGHTS_SWEEP_SEC)
+    if do_sweep:
+        st["last_sweep"] = now_ts
+    run_once_insights_snapshots(do_sweep=do_sweep)
+    return float(max(5, int(TRIGGER_POLL_SEC)))
+
+
+# role -> (tick 함수, 시작 로그)
+_ROLE_STEPS: Dict[str, Tuple[Callable[[], float], Callable[[], str]]] = {
+    "live": (
+        _step_live,
+        lambda: f"detect_interval={DETECT_INTERVAL_SEC}s, fast_leagues_env='{FAST_LEAGUES_ENV}'",
+    ),
+    "events": (_step_events, lambda: f"loop_sec={EVENTS_LOOP_SEC}s"),
+    "stats": (_step_stats, lambda: f"loop_sec={STATS_LOOP_SEC}s"),
+    "fixtures": (_step_fixtures, lambda: f"loop_sec={FIXTURES_LOOP_SEC}s"),
+    "standings": (_step_standings, lambda: f"periodic={STANDINGS_LOOP_SEC}s, poll={TRIGGER_POLL_SEC}s"),
+    "insights": (_step_insights, lambda: f"poll={TRIGGER_POLL_SEC}s, sweep={INSIGHTS_SWEEP_SEC}s"),
+}
+
+
+def _run_role(role: str, serialize_bootstrap: bool = False) -> None:
+    step, describe = _ROLE_STEPS[role]
+    _THREAD_LOCAL.role = role
+    wake = _ROLE_WAKE.setdefault(role, threading.Event())
+    print(f"[live_status_worker] start role={role} ({describe()})", flush=True)
+
+    first = True
+    budget = _role_budget_sec(role)
+    while True:
+        started = time.time()
+        sleep_sec = 5.0
+        try:
+            if first and serialize_bootstrap:
+                with _BOOTSTRAP_LOCK:
+                    sleep_sec = step()
+            else:
+                sleep_sec = step()
+        except Exception:
+            traceback.print_exc()
+        first = False
+
+        run_sec = time.time() - started
+        if budget > 0 and run_sec > budget:
+            print(
+                f"[role_runner] role={role} over budget run_sec={run_sec:.1f} budget={budget:.1f}s "
+                f"→ next tick +{min(run_sec - budget, budget):.1f}s",
+                flush=True,
+            )
+            sleep_sec += min(run_sec - budget, budget)
+
+        # wake_roles() 가 오면 바로 다음 tick
+        wake.wait(max(0.0, sleep_sec))
+        wake.clear()
+
+
+def _live_change_listener_loop() -> None:
+    """
+    다른 프로세스의 live 역할이 보낸 NOTIFY(score/status) → events/stats 즉시 스케줄.
+    주기 스캔(_select_inplay_matches)은 그대로 fallback.
+    """
+    listener = LiveChangeListener()
+    while True:
+        try:
+            changes = listener.wait(30.0)
+            fids = fixture_ids_for(changes, ("score", "status"))
+            if fids:
+                print(f"[live_notify] wake events/stats fixtures={fids}", flush=True)
+                _schedule_timeline_now(fids)
+        except Exception:
+            traceback.print_exc()
+            time.sleep(5)
+
+
 def loop() -> None:
     """
     역할별 워커 루프
@@ -3551,62 +4382,38 @@ def loop() -> None:
     - stats      : INPLAY stats
     - fixtures   : fixtures scan + schedule recheck + watchdog + postmatch
     - standings  : FT trigger + periodic standings/bracket sync
-    """
-    role = LIVE_WORKER_ROLE
+    - insights   : FT trigger → team_insights_snapshots 재계산 + stale sweep
 
-    if role == "events":
-        print(f"[live_status_worker] start role=events (loop_sec={EVENTS_LOOP_SEC}s)")
-        while True:
-            try:
-                run_once_events_worker()
-            except Exception:
-                traceback.print_exc()
-            time.sleep(max(3, EVENTS_LOOP_SEC))
+    LIVE_WORKER_ROLE=all / 콤마 목록 → 한 프로세스에서 역할별 스레드로 동시 실행
+    """
+    roles = parse_worker_roles(LIVE_WORKER_ROLE)
 
-    elif role == "stats":
-        print(f"[live_status_worker] start role=stats (loop_sec={STATS_LOOP_SEC}s)")
-        while True:
-            try:
-                run_once_stats_worker()
-            except Exception:
-                traceback.print_exc()
-            time.sleep(max(5, STATS_LOOP_SEC))
+    # wake 이벤트를 먼저 만들어 둬야 다른 역할의 첫 tick / NOTIFY 에서 온 wake 도 놓치지 않는다
+    for r in roles:
+        _ROLE_WAKE.setdefault(r, threading.Event())
 
-    elif role == "fixtures":
-        print(f"[live_status_worker] start role=fixtures (loop_sec={FIXTURES_LOOP_SEC}s)")
-        while True:
-            try:
-                run_once_fixtures_worker()
-            except Exception:
-                traceback.print_exc()
-            time.sleep(max(10, FIXTURES_LOOP_SEC))
+    # events/stats 가 live 와 다른 프로세스면 LISTEN (같은 프로세스면 run_once 가 직접 깨움)
+    if "live" not in roles and ("events" in roles or "stats" in roles):
+        threading.Thread(target=_live_change_listener_loop, name="live-notify", daemon=True).start()
 
-    elif role == "standings":
-        print(f"[live_status_worker] start role=standings (periodic={STANDINGS_LOOP_SEC}s, poll={TRIGGER_POLL_SEC}s)")
-        last_periodic = 0.0
-        while True:
-            try:
-                now_ts = time.time()
-                run_once_standings(do_periodic=False)
-                if (now_ts - last_periodic) >= float(STANDINGS_LOOP_SEC):
-                    last_periodic = now_ts
-                    run_once_standings(do_periodic=True)
-            except Exception:
-                traceback.print_exc()
-            time.sleep(max(5, int(TRIGGER_POLL_SEC)))
-
-    else:
-        print(
-            f"[live_status_worker] start role=live "
-            f"(detect_interval={DETECT_INTERVAL_SEC}s, fast_leagues_env='{FAST_LEAGUES_ENV}')"
-        )
-        while True:
-            try:
-                run_once()
-            except Exception:
-                traceback.print_exc()
-            time.sleep(DETECT_INTERVAL_SEC)
+    if len(roles) == 1:
+        _run_role(roles[0])
+        return
 
+    print(f"[live_status_worker] start multi-role roles={roles}", flush=True)
+    threads: List[threading.Thread] = []
+    for r in roles:
+        t = threading.Thread(target=_run_role, args=(r, True), name=f"role-{r}", daemon=True)
+        t.start()
+        threads.append(t)
+
+    while True:
+        for t in threads:
+            if not t.is_alive():
+                # _run_role 은 예외를 삼키므로 여기 오면 치명적 상황 → 프로세스 재시작에 맡김
+                print(f"[live_status_worker] role thread died: {t.name}", file=sys.stderr, flush=True)
+                sys.exit(1)
+        time.sleep(5)
 
 
 
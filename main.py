@@ -49,6 +49,19 @@ from prometheus_client import (
 )
 
 from db import fetch_all, fetch_one, execute
+from services.fixture_list_rows import (
+    fixture_list_rows_ready,
+    FIXTURE_LIST_ROW_SELECT_SQL,
+)
+from services.matches_kickoff import kickoff_sql
+from services.response_cache import (
+    RESPONSE_CACHE_TTL_LIVE,
+    cache_get,
+    cache_set,
+    invalidate_fixtures,
+    make_cache_key,
+    ttl_for_fixture_rows,
+)
 from services.home_service import (
     get_home_leagues,
     get_home_league_directory,
@@ -221,6 +234,106 @@ def _match_live_state_available() -> bool:
         return False
 
 
+def _fixture_list_legacy_sql(where_sql: str, order_sql: str) -> str:
+    """
+    fixture_list_rows(projection)가 없거나 projection 에 아직 없는 fixture 용 fallback.
+    - /api/fixtures, /api/fixtures_by_ids 에서 원래 쓰던 JOIN 쿼리 그대로
+    """
+    use_mls = _match_live_state_available()
+    red_detail_sql = "('Red Card','Second Yellow card','Second Yellow Card')"
+
+    if use_mls:
+        home_red_sql = f"""
+            COALESCE(
+                mls.home_red,
+                (
+                    SELECT COUNT(*) FROM match_events e
+                    WHERE e.fixture_id = m.fixture_id
+                      AND e.team_id = m.home_id
+                      AND e.type = 'Card'
+                      AND e.detail IN {red_detail_sql}
+                )
+            ) AS home_red_cards
+        """
+        away_red_sql = f"""
+            COALESCE(
+                mls.away_red,
+                (
+                    SELECT COUNT(*) FROM match_events e
+                    WHERE e.fixture_id = m.fixture_id
+                      AND e.team_id = m.away_id
+                      AND e.type = 'Card'
+                      AND e.detail IN {red_detail_sql}
+                )
+            ) AS away_red_cards
+        """
+        mls_join = "LEFT JOIN match_live_state mls ON mls.fixture_id = m.fixture_id"
+    else:
+        home_red_sql = f"""
+            (
+                SELECT COUNT(*) FROM match_events e
+                WHERE e.fixture_id = m.fixture_id
+                  AND e.team_id = m.home_id
+                  AND e.type = 'Card'
+                  AND e.detail IN {red_detail_sql}
+            ) AS home_red_cards
+        """
+        away_red_sql = f"""
+            (
+                SELECT COUNT(*) FROM match_events e
+                WHERE e.fixture_id = m.fixture_id
+                  AND e.team_id = m.away_id
+                  AND e.type = 'Card'
+                  AND e.detail IN {red_detail_sql}
+            ) AS away_red_cards
+        """
+        mls_join = ""
+
+    return f"""
+        SELECT
+            m.fixture_id,
+            m.league_id,
+            m.season,
+            m.date_utc,
+            m.status_group,
+            m.status,
+            m.elapsed,
+            m.status_long,
+            m.home_id,
+            m.away_id,
+            m.home_ft,
+            m.away_ft,
+            m.home_ht,
+            m.away_ht,
+            m.venue_name,
+            m.league_round,
+            th.name AS home_name,
+            ta.name AS away_name,
+            th.logo AS home_logo,
+            ta.logo AS away_logo,
+            l.name AS league_name,
+            l.logo AS league_logo,
+            l.country AS league_country,
+            c.flag AS league_country_flag,
+            (rf.data_json::jsonb->'score'->'extratime'->>'home') AS home_et,
+            (rf.data_json::jsonb->'score'->'extratime'->>'away') AS away_et,
+            (rf.data_json::jsonb->'score'->'penalty'->>'home') AS home_pen,
+            (rf.data_json::jsonb->'score'->'penalty'->>'away') AS away_pen,
+            {home_red_sql},
+            {away_red_sql}
+        FROM matches m
+        JOIN teams th ON th.id = m.home_id
+        JOIN teams ta ON ta.id = m.away_id
+        JOIN leagues l ON l.id = m.league_id
+        LEFT JOIN countries c
+          ON LOWER(TRIM(c.name)) = LOWER(TRIM(l.country))
+        LEFT JOIN match_fixtures_raw rf ON rf.fixture_id = m.fixture_id
+        {mls_join}
+        WHERE {where_sql}
+        ORDER BY {order_sql}
+    """
+
+
 
 # ─────────────────────────────────────────
 # Prometheus 메트릭
@@ -466,109 +579,54 @@ def fixtures_by_ids():
     if len(ordered_ids) > 200:
         return jsonify({"ok": False, "error": "too many ids (max 200)"}), 400
 
-    placeholders = ", ".join(["%s"] * len(ordered_ids))
-    params: List[Any] = list(ordered_ids)
+    # ✅ 응답 캐시 (입력 순서가 응답 순서라 ids 는 문자열 그대로 키에 넣는다)
+    cache_key = make_cache_key(
+        "fixtures_by_ids",
+        ids=",".join(str(x) for x in ordered_ids),
+        live=int(live_only),
+        apply_override=int(apply_override),
+        include_hidden=int(include_hidden),
+    )
+    cached = cache_get(cache_key)
+    if cached is not None:
+        return jsonify(cached)
+
+    rows: List[Dict[str, Any]] = []
+    fallback_ids: List[int] = list(ordered_ids)
+
+    # ✅ projection(fixture_list_rows) 우선: 워커가 미리 계산해 둔 리스트 row를 PK로 바로 읽는다
+    # - status 필터는 Python에서 적용(라이브 아닌 id가 "projection 누락"으로 오인되지 않게)
+    # - projection에 아직 없는 id만 기존 JOIN 쿼리로 fallback
+    if fixture_list_rows_ready():
+        placeholders = ", ".join(["%s"] * len(ordered_ids))
+        proj_rows = fetch_all(
+            f"""
+            SELECT
+                {FIXTURE_LIST_ROW_SELECT_SQL}
+            FROM fixture_list_rows m
+            WHERE m.fixture_id IN ({placeholders})
+            """,
+            tuple(ordered_ids),
+        )
+        found: set[int] = set()
+        for r in proj_rows:
+            found.add(int(r["fixture_id"]))
+            if live_only and r.get("status_group") != "INPLAY":
+                continue
+            rows.append(r)
+        fallback_ids = [fid for fid in ordered_ids if fid not in found]
 
-    where_clauses = [f"m.fixture_id IN ({placeholders})"]
-    if live_only:
-        where_clauses.append("m.status_group = 'INPLAY'")
-    where_sql = " AND ".join(where_clauses)
+    if fallback_ids:
+        placeholders = ", ".join(["%s"] * len(fallback_ids))
+        params: List[Any] = list(fallback_ids)
 
-    use_mls = _match_live_state_available()
-    red_detail_sql = "('Red Card','Second Yellow card','Second Yellow Card')"
+        where_clauses = [f"m.fixture_id IN ({placeholders})"]
+        if live_only:
+            where_clauses.append("m.status_group = 'INPLAY'")
+        where_sql = " AND ".join(where_clauses)
 
-    if use_mls:
-        home_red_sql = f"""
-            COALESCE(
-                mls.home_red,
-                (
-                    SELECT COUNT(*) FROM match_events e
-                    WHERE e.fixture_id = m.fixture_id
-                      AND e.team_id = m.home_id
-                      AND e.type = 'Card'
-                      AND e.detail IN {red_detail_sql}
-                )
-            ) AS home_red_cards
-        """
-        away_red_sql = f"""
-            COALESCE(
-                mls.away_red,
-                (
-                    SELECT COUNT(*) FROM match_events e
-                    WHERE e.fixture_id = m.fixture_id
-                      AND e.team_id = m.away_id
-                      AND e.type = 'Card'
-                      AND e.detail IN {red_detail_sql}
-                )
-            ) AS away_red_cards
-        """
-        mls_join = "LEFT JOIN match_live_state mls ON mls.fixture_id = m.fixture_id"
-    else:
-        home_red_sql = f"""
-            (
-                SELECT COUNT(*) FROM match_events e
-                WHERE e.fixture_id = m.fixture_id
-                  AND e.team_id = m.home_id
-                  AND e.type = 'Card'
-                  AND e.detail IN {red_detail_sql}
-            ) AS home_red_cards
-        """
-        away_red_sql = f"""
-            (
-                SELECT COUNT(*) FROM match_events e
-                WHERE e.fixture_id = m.fixture_id
-                  AND e.team_id = m.away_id
-                  AND e.type = 'Card'
-                  AND e.detail IN {red_detail_sql}
-            ) AS away_red_cards
-        """
-        mls_join = ""
-
-    sql = f"""
-        SELECT
-            m.fixture_id,
-            m.league_id,
-            m.season,
-            m.date_utc,
-            m.status_group,
-            m.status,
-            m.elapsed,
-            m.status_long,
-            m.home_id,
-            m.away_id,
-            m.home_ft,
-            m.away_ft,
-            m.home_ht,
-            m.away_ht,
-            m.venue_name,
-            m.league_round,
-            th.name AS home_name,
-            ta.name AS away_name,
-            th.logo AS home_logo,
-            ta.logo AS away_logo,
-            l.name AS league_name,
-            l.logo AS league_logo,
-            l.country AS league_country,
-            c.flag AS league_country_flag,
-            (rf.data_json::jsonb->'score'->'extratime'->>'home') AS home_et,
-            (rf.data_json::jsonb->'score'->'extratime'->>'away') AS away_et,
-            (rf.data_json::jsonb->'score'->'penalty'->>'home') AS home_pen,
-            (rf.data_json::jsonb->'score'->'penalty'->>'away') AS away_pen,
-            {home_red_sql},
-            {away_red_sql}
-        FROM matches m
-        JOIN teams th ON th.id = m.home_id
-        JOIN teams ta ON ta.id = m.away_id
-        JOIN leagues l ON l.id = m.league_id
-        LEFT JOIN countries c
-          ON LOWER(TRIM(c.name)) = LOWER(TRIM(l.country))
-        LEFT JOIN match_fixtures_raw rf ON rf.fixture_id = m.fixture_id
-        {mls_join}
-        WHERE {where_sql}
-        ORDER BY m.date_utc ASC
-    """
-
-    rows = fetch_all(sql, tuple(params))
+        sql = _fixture_list_legacy_sql(where_sql, "m.date_utc ASC")
+        rows.extend(fetch_all(sql, tuple(params)))
 
     base_map: Dict[int, Dict[str, Any]] = {}
     for r in rows:
@@ -650,7 +708,12 @@ def fixtures_by_ids():
             continue
         out_rows.append(f)
 
-    return jsonify({"ok": True, "count": len(out_rows), "rows": out_rows})
+    payload = {"ok": True, "count": len(out_rows), "rows": out_rows}
+    # live=1 은 "아직 라이브가 아님"도 곧 바뀔 수 있는 결과라 항상 짧게,
+    # 그 외는 hidden 으로 빠지기 전 전체 row 기준 (빠진 경기가 라이브여도 TTL 이 길어지지 않게)
+    ttl = RESPONSE_CACHE_TTL_LIVE if live_only else ttl_for_fixture_rows(list(merged_map.values()))
+    cache_set(cache_key, payload, ttl, fixture_ids=ordered_ids)
+    return jsonify(payload)
 
 
 
@@ -870,6 +933,28 @@ def _admin_sync_header_from_timeline_patch(patch: Dict[str, Any]) -> None:
 
 
 
+def _override_kickoffs(fixture_id: int, *patches: Any) -> List[Any]:
+    """
+    override 변경 전/후로 날짜 목록에 걸릴 수 있는 킥오프 (원본 date_utc + 각 patch 의 date_utc/kickoff_utc)
+    → 응답 캐시에서 이전 날짜 / 새 날짜 목록 모두 무효화
+    """
+    out: List[Any] = []
+    try:
+        row = fetch_one("SELECT date_utc FROM matches WHERE fixture_id = %s", (fixture_id,))
+        if row and row.get("date_utc"):
+            out.append(row["date_utc"])
+    except Exception:
+        pass
+    for patch in patches:
+        if not isinstance(patch, dict):
+            continue
+        src = patch.get("header") if isinstance(patch.get("header"), dict) else patch
+        for k in ("date_utc", "kickoff_utc"):
+            if src.get(k):
+                out.append(src.get(k))
+    return out
+
+
 @app.route(f"/{ADMIN_PATH}/api/overrides/<int:fixture_id>", methods=["PUT"])
 @require_admin
 def admin_upsert_override(fixture_id: int):
@@ -887,6 +972,8 @@ def admin_upsert_override(fixture_id: int):
     # ✅ 옵션1(표시 레이어 동기화): timeline -> header(ft/ht/score/red_cards) 자동 생성/갱신
     _admin_sync_header_from_timeline_patch(patch)
 
+    prev_patch = _load_match_overrides([fixture_id]).get(fixture_id)
+
     execute(
         """
         INSERT INTO match_overrides (fixture_id, patch, updated_at)
@@ -896,6 +983,7 @@ def admin_upsert_override(fixture_id: int):
         """,
         (fixture_id, json.dumps(patch, ensure_ascii=False)),
     )
+    invalidate_fixtures([fixture_id], kickoffs=_override_kickoffs(fixture_id, prev_patch, patch))
 
     _admin_log(
         "override_upsert",
@@ -911,7 +999,9 @@ def admin_upsert_override(fixture_id: int):
 @app.route(f"/{ADMIN_PATH}/api/overrides/<int:fixture_id>", methods=["DELETE"])
 @require_admin
 def admin_delete_override(fixture_id: int):
+    prev_patch = _load_match_overrides([fixture_id]).get(fixture_id)
     execute("DELETE FROM match_overrides WHERE fixture_id = %s", (fixture_id,))
+    invalidate_fixtures([fixture_id], kickoffs=_override_kickoffs(fixture_id, prev_patch))
     _admin_log("override_delete", ok=True, status_code=200, fixture_id=fixture_id)
     return jsonify({"ok": True, "fixture_id": fixture_id})
 
@@ -1383,7 +1473,8 @@ def admin_list_fixtures_merged():
     utc_end = local_end.astimezone(timezone.utc)
 
     params: List[Any] = [utc_start, utc_end]
-    where_clauses = ["(m.date_utc::timestamptz BETWEEN %s AND %s)"]
+    kickoff_col = kickoff_sql("m")
+    where_clauses = [f"({kickoff_col} BETWEEN %s AND %s)"]
 
     if league_ids:
         placeholders = ", ".join(["%s"] * len(league_ids))
@@ -1479,7 +1570,7 @@ def admin_list_fixtures_merged():
         JOIN leagues l ON l.id = m.league_id
         {mls_join}
         WHERE {where_sql}
-        ORDER BY m.date_utc ASC
+        ORDER BY {kickoff_col} ASC
     """
 
     rows = fetch_all(sql, tuple(params))
@@ -1608,7 +1699,8 @@ def admin_fixtures_raw():
     utc_end = local_end.astimezone(timezone.utc)
 
     params: List[Any] = [utc_start, utc_end]
-    where_clauses = ["(m.date_utc::timestamptz BETWEEN %s AND %s)"]
+    kickoff_col = kickoff_sql("m")
+    where_clauses = [f"({kickoff_col} BETWEEN %s AND %s)"]
 
     if league_ids:
         placeholders = ", ".join(["%s"] * len(league_ids))
@@ -1703,7 +1795,7 @@ def admin_fixtures_raw():
         JOIN leagues l ON l.id = m.league_id
         {mls_join}
         WHERE {where_sql}
-        ORDER BY m.date_utc ASC
+        ORDER BY {kickoff_col} ASC
     """
 
     rows = fetch_all(sql, tuple(params))
@@ -1805,8 +1897,29 @@ def list_fixtures():
     utc_start = local_start.astimezone(timezone.utc)
     utc_end = local_next_day_start.astimezone(timezone.utc)
 
+    # ✅ 응답 캐시: 같은 (date, timezone, league 필터) 폴링은 DB까지 안 내려간다
+    cache_key = make_cache_key(
+        "fixtures",
+        date=local_date.strftime("%Y-%m-%d"),
+        tz=user_tz.zone,
+        league_ids=sorted(set(league_ids)),
+        league_id=(league_id if (not league_ids and league_id is not None and league_id > 0) else 0),
+    )
+    cached = cache_get(cache_key)
+    if cached is not None:
+        return jsonify(cached)
+
+    # ✅ projection(fixture_list_rows)이 준비돼 있으면 kickoff_utc 인덱스 range scan 한 번으로 끝낸다
+    # - 누락은 워커(writer refresh + fixtures 역할의 repair)가 채운다 → 요청마다 보충 쿼리 없음
+    use_projection = fixture_list_rows_ready()
+
     params: List[Any] = [utc_start, utc_end]
-    where_clauses = ["m.date_utc::timestamptz >= %s AND m.date_utc::timestamptz < %s"]
+    if use_projection:
+        where_clauses = ["m.kickoff_utc >= %s AND m.kickoff_utc < %s"]
+    else:
+        # ✅ matches.kickoff_utc(인덱스) 준비돼 있으면 range scan, 아니면 캐스팅 fallback
+        kickoff_col = kickoff_sql("m")
+        where_clauses = [f"{kickoff_col} >= %s AND {kickoff_col} < %s"]
 
     if league_ids:
         placeholders = ", ".join(["%s"] * len(league_ids))
@@ -1818,99 +1931,16 @@ def list_fixtures():
 
     where_sql = " AND ".join(where_clauses)
 
-    use_mls = _match_live_state_available()
-    red_detail_sql = "('Red Card','Second Yellow card','Second Yellow Card')"
-
-    if use_mls:
-        home_red_sql = f"""
-            COALESCE(
-                mls.home_red,
-                (
-                    SELECT COUNT(*) FROM match_events e
-                    WHERE e.fixture_id = m.fixture_id
-                      AND e.team_id = m.home_id
-                      AND e.type = 'Card'
-                      AND e.detail IN {red_detail_sql}
-                )
-            ) AS home_red_cards
-        """
-        away_red_sql = f"""
-            COALESCE(
-                mls.away_red,
-                (
-                    SELECT COUNT(*) FROM match_events e
-                    WHERE e.fixture_id = m.fixture_id
-                      AND e.team_id = m.away_id
-                      AND e.type = 'Card'
-                      AND e.detail IN {red_detail_sql}
-                )
-            ) AS away_red_cards
+    if use_projection:
+        sql = f"""
+            SELECT
+                {FIXTURE_LIST_ROW_SELECT_SQL}
+            FROM fixture_list_rows m
+            WHERE {where_sql}
+            ORDER BY m.kickoff_utc ASC
         """
-        mls_join = "LEFT JOIN match_live_state mls ON mls.fixture_id = m.fixture_id"
     else:
-        home_red_sql = f"""
-            (
-                SELECT COUNT(*) FROM match_events e
-                WHERE e.fixture_id = m.fixture_id
-                  AND e.team_id = m.home_id
-                  AND e.type = 'Card'
-                  AND e.detail IN {red_detail_sql}
-            ) AS home_red_cards
-        """
-        away_red_sql = f"""
-            (
-                SELECT COUNT(*) FROM match_events e
-                WHERE e.fixture_id = m.fixture_id
-                  AND e.team_id = m.away_id
-                  AND e.type = 'Card'
-                  AND e.detail IN {red_detail_sql}
-            ) AS away_red_cards
-        """
-        mls_join = ""
-
-    sql = f"""
-        SELECT
-            m.fixture_id,
-            m.league_id,
-            m.season,
-            m.date_utc,
-            m.status_group,
-            m.status,
-            m.elapsed,
-            m.status_long,
-            m.home_id,
-            m.away_id,
-            m.home_ft,
-            m.away_ft,
-            m.home_ht,
-            m.away_ht,
-            m.venue_name,
-            m.league_round,
-            th.name AS home_name,
-            ta.name AS away_name,
-            th.logo AS home_logo,
-            ta.logo AS away_logo,
-            l.name AS league_name,
-            l.logo AS league_logo,
-            l.country AS league_country,
-            c.flag AS league_country_flag,
-            (rf.data_json::jsonb->'score'->'extratime'->>'home') AS home_et,
-            (rf.data_json::jsonb->'score'->'extratime'->>'away') AS away_et,
-            (rf.data_json::jsonb->'score'->'penalty'->>'home') AS home_pen,
-            (rf.data_json::jsonb->'score'->'penalty'->>'away') AS away_pen,
-            {home_red_sql},
-            {away_red_sql}
-        FROM matches m
-        JOIN teams th ON th.id = m.home_id
-        JOIN teams ta ON ta.id = m.away_id
-        JOIN leagues l ON l.id = m.league_id
-        LEFT JOIN countries c
-          ON LOWER(TRIM(c.name)) = LOWER(TRIM(l.country))
-        LEFT JOIN match_fixtures_raw rf ON rf.fixture_id = m.fixture_id
-        {mls_join}
-        WHERE {where_sql}
-        ORDER BY m.date_utc::timestamptz ASC
-    """
+        sql = _fixture_list_legacy_sql(where_sql, f"{kickoff_col} ASC")
 
     rows = fetch_all(sql, tuple(params))
 
@@ -1988,7 +2018,16 @@ def list_fixtures():
         else:
             merged.append(f)
 
-    return jsonify({"ok": True, "rows": merged})
+    # hidden 으로 빠진 경기도 override 변경 시 다시 보일 수 있으니 무효화 대상에 포함
+    payload = {"ok": True, "rows": merged}
+    cache_set(
+        cache_key,
+        payload,
+        ttl_for_fixture_rows(merged),
+        fixture_ids=fixture_ids,
+        kickoff_window=(utc_start, utc_end),
+    )
+    return jsonify(payload)
 
 
 
@@ -1,9 +1,15 @@
 # ai_predictions_engine.py
 from __future__ import annotations
 
+import heapq
+import os
 from dataclasses import dataclass
 from math import exp, factorial
-from typing import Any, Dict, List, Tuple
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+
+# 스코어 그리드 / PMF 메모이즈 최대 항목 수 (넘치면 통째로 비움)
+AI_GRID_MEMO_MAX = int(os.environ.get("AI_GRID_MEMO_MAX", "20000"))
 
 
 # ─────────────────────────────────────────────────────────────
@@ -101,41 +107,60 @@ def _normalize_1x2_pcts(hw: float, d: float, aw: float) -> Tuple[int, int, int]:
     return (hw_i, d_i, aw_i)
 
 
-def _scorelines_top3(lh: float, la: float, gmax: int = 10) -> Tuple[str, List[str]]:
-    ph = _poisson_pmf_list(lh, gmax)
-    pa = _poisson_pmf_list(la, gmax)
-
-    pairs: List[Tuple[float, int, int]] = []
-    for i in range(gmax + 1):
-        for j in range(gmax + 1):
-            pairs.append((ph[i] * pa[j], i, j))
-    pairs.sort(key=lambda x: x[0], reverse=True)
-
-    top = pairs[:3]
-    fmt = [f"{i}-{j}" for _, i, j in top]
-    most = fmt[0] if fmt else "0-0"
-    return most, fmt
-
-
 @dataclass
 class SectionInputs:
     lam_home: float
     lam_away: float
 
 
-def _section_core_1x2(lam_home: float, lam_away: float, gmax: int = 10) -> Tuple[float, float, float]:
+# ─────────────────────────────────────────────────────────────
+#  Score grid kernel (λ 쌍당 1회 계산 + 메모이즈)
+# ─────────────────────────────────────────────────────────────
+
+@dataclass(frozen=True)
+class ScoreGrid:
     """
-    Return (P(HW), P(D), P(AW)) from independent Pois(lh),Pois(la).
+    (λh, λa) 하나에 대한 결합 스코어 행렬(ph ⊗ pa)에서 한 번에 뽑은 값들.
     """
-    ph = _poisson_pmf_list(lam_home, gmax)
-    pa = _poisson_pmf_list(lam_away, gmax)
+    lam_home: float
+    lam_away: float
+    p_hw: float
+    p_d: float
+    p_aw: float
+    most_likely: str
+    top3: Tuple[str, ...]
+    probs: Dict[str, int]   # _derive_section_probs 결과 (1X2/DC/Over/TeamOver/BTTS/CleanSheet)
+
+
+_PMF_MEMO: Dict[Tuple[float, int], Tuple[float, ...]] = {}
+_GRID_MEMO: Dict[Tuple[float, float, int], ScoreGrid] = {}
+
+
+def _pmf_memo(lam: float, gmax: int) -> Tuple[float, ...]:
+    key = (lam, gmax)
+    pmf = _PMF_MEMO.get(key)
+    if pmf is None:
+        if len(_PMF_MEMO) >= AI_GRID_MEMO_MAX:
+            _PMF_MEMO.clear()
+        pmf = tuple(_poisson_pmf_list(lam, gmax))
+        _PMF_MEMO[key] = pmf
+    return pmf
+
+
+def _build_score_grid(lh: float, la: float, gmax: int) -> ScoreGrid:
+    ph = _pmf_memo(lh, gmax)
+    pa = _pmf_memo(la, gmax)
 
+    # 결합 행렬 outer product 를 한 번 훑으면서 1X2 누적 + 셀 목록 (i, j 순서 유지)
     hw = 0.0
     d = 0.0
     aw = 0.0
+    cells: List[Tuple[float, int, int]] = []
     for i in range(gmax + 1):
+        phi = ph[i]
         for j in range(gmax + 1):
-            p = ph[i] * pa[j]
+            p = phi * pa[j]
+            cells.append((p, i, j))
             if i > j:
                 hw += p
             elif i == j:
@@ -148,7 +173,47 @@ def _section_core_1x2(lam_home: float, lam_away: float, gmax: int = 10) -> Tuple
         hw /= s
         d /= s
         aw /= s
-    return (_clamp01(hw), _clamp01(d), _clamp01(aw))
+    hw, d, aw = _clamp01(hw), _clamp01(d), _clamp01(aw)
+
+    # nlargest == sorted(reverse=True)[:3] (동률이면 (i, j) 앞쪽 우선)
+    top = heapq.nlargest(3, cells, key=lambda c: c[0])
+    fmt = tuple(f"{i}-{j}" for _, i, j in top)
+
+    return ScoreGrid(
+        lam_home=lh,
+        lam_away=la,
+        p_hw=hw,
+        p_d=d,
+        p_aw=aw,
+        most_likely=fmt[0] if fmt else "0-0",
+        top3=fmt,
+        probs=_derive_section_probs(lh, la, hw, d, aw),
+    )
+
+
+def _score_grid(lam_home: float, lam_away: float, gmax: int = 10) -> ScoreGrid:
+    """
+    (λh, λa, gmax) 단위 메모이즈 (λ 는 반올림 없이 그대로 키 → 메모이즈 전과 출력 동일).
+    같은 경기/같은 λ 를 여러 섹션·요청에서 다시 계산하지 않는다.
+    """
+    key = (max(0.0, float(lam_home)), max(0.0, float(lam_away)), int(gmax))
+    g = _GRID_MEMO.get(key)
+    if g is None:
+        if len(_GRID_MEMO) >= AI_GRID_MEMO_MAX:
+            _GRID_MEMO.clear()
+        g = _build_score_grid(key[0], key[1], key[2])
+        _GRID_MEMO[key] = g
+    return g
+
+
+def score_lambda_pairs(
+    pairs: Iterable[Tuple[float, float]],
+    gmax: int = 10,
+) -> List[ScoreGrid]:
+    """
+    배치 API: 여러 (λh, λa) 를 한 번에. 중복 쌍은 한 번만 계산된다.
+    """
+    return [_score_grid(lh, la, gmax) for lh, la in pairs]
 
 
 
@@ -277,12 +342,6 @@ def _derive_section_probs(
 
 
 
-def _top_scorelines(lh: float, la: float, gmax: int = 10) -> Tuple[str, List[str]]:
-    # 너 파일에 이미 있는 _scorelines_top3를 그대로 사용
-    return _scorelines_top3(lh, la, gmax)
-
-
-
 def compute_ai_predictions_from_overall(insights_overall: Dict[str, Any]) -> Dict[str, Any]:
     """
     ✅ 설계서 기반(현재 DB/insights 구조에서 가능한 범위)
@@ -497,16 +556,16 @@ def compute_ai_predictions_from_overall(insights_overall: Dict[str, Any]) -> Dic
     # ─────────────────────────────────────
     # 6) 섹션별 확률 파생
     # ─────────────────────────────────────
-    ft_hw, ft_d, ft_aw = _section_core_1x2(lam_h_ft, lam_a_ft)
-    h1_hw, h1_d, h1_aw = _section_core_1x2(lam_h_1h, lam_a_1h)
-    h2_hw, h2_d, h2_aw = _section_core_1x2(lam_h_2h, lam_a_2h)
-
-    ft = _derive_section_probs(lam_h_ft, lam_a_ft, ft_hw, ft_d, ft_aw)
-    h1 = _derive_section_probs(lam_h_1h, lam_a_1h, h1_hw, h1_d, h1_aw)
-    h2 = _derive_section_probs(lam_h_2h, lam_a_2h, h2_hw, h2_d, h2_aw)
+    # ✅ 섹션마다 스코어 행렬 1회 (1X2/파생확률/점수라인 모두 같은 그리드에서)
+    g_ft, g_h1, g_h2 = score_lambda_pairs(
+        [(lam_h_ft, lam_a_ft), (lam_h_1h, lam_a_1h), (lam_h_2h, lam_a_2h)]
+    )
+    ft = g_ft.probs
+    h1 = g_h1.probs
+    h2 = g_h2.probs
 
     # 표시용 점수라인(FT)
-    most_likely, top3 = _top_scorelines(lam_h_ft, lam_a_ft)
+    most_likely, top3 = g_ft.most_likely, list(g_ft.top3)
 
     out: Dict[str, Any] = {
         "expected_goals_home": round(lam_h_ft, 3),
@@ -591,3 +650,22 @@ def compute_ai_predictions_from_overall(insights_overall: Dict[str, Any]) -> Dic
     }
     return out
 
+
+def compute_ai_predictions_batch(
+    insights_overall_list: Iterable[Optional[Dict[str, Any]]],
+) -> List[Optional[Dict[str, Any]]]:
+    """
+    배치 API: 리그 라운드의 여러 경기 insights_overall 을 한 번에 예측.
+    - 스코어 그리드 메모이즈를 공유하므로 같은 λ 쌍은 한 번만 계산된다.
+    - 입력이 비었거나 계산 실패한 항목은 None (입력 순서 유지)
+    """
+    out: List[Optional[Dict[str, Any]]] = []
+    for overall in insights_overall_list:
+        if not overall:
+            out.append(None)
+            continue
+        try:
+            out.append(compute_ai_predictions_from_overall(overall))
+        except Exception:
+            out.append(None)
+    return out
@@ -0,0 +1,124 @@
+# matchdetail/block_cache.py
+#
+# 매치디테일 블록 단위 캐시 (프로세스 내 LRU)
+#
+# 키: (fixture_id, block, header 시그니처, 필터(comp/last_n/bracket_round/meta), 데이터 버전)
+#   - 데이터 버전은 services/match_data_version.py (워커가 쓰기 시 bump)
+#   - header 시그니처에는 override 가 반영된 header 의 팀/킥오프/리그/시즌이 들어간다
+#     (관리자 override 로 header 가 바뀌면 키도 바뀜)
+#
+# 블록 분류:
+#   - fixture 블록 (timeline / lineups / stats)
+#       → 그 경기 데이터만 의존. FINISHED 일 때만 캐시, fixture 버전으로 키, TTL 사실상 무한
+#   - form
+#       → 킥오프 이전 경기만 봄. 모든 상태에서 캐시, 리그 버전으로 키
+#         (FINISHED 는 TTL 사실상 무한, 그 외는 리그 TTL)
+#   - 리그 블록 (h2h / standings / insights / ai)
+#       → 리그의 종료 경기 집합에 의존. 모든 상태에서 캐시, 리그 버전으로 키
+#         (FINISHED 는 fixture+리그 버전 키에 TTL 사실상 무한, 그 외는 리그 TTL 로
+#          다른 리그 경기/standings 워커 반영 지연 상한)
+#   - INPLAY 경기의 fixture 블록은 캐시하지 않는다.
+#
+# 환경변수:
+#   MATCHDETAIL_BLOCK_CACHE_MAX        (기본 500)
+#   MATCHDETAIL_BLOCK_TTL_FINISHED     (기본 7일)
+#   MATCHDETAIL_BLOCK_TTL_LEAGUE       (기본 1800초)
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+
+MATCHDETAIL_BLOCK_CACHE_MAX = int(os.environ.get("MATCHDETAIL_BLOCK_CACHE_MAX", "500"))
+MATCHDETAIL_BLOCK_TTL_FINISHED = int(os.environ.get("MATCHDETAIL_BLOCK_TTL_FINISHED", str(7 * 24 * 3600)))
+MATCHDETAIL_BLOCK_TTL_LEAGUE = int(os.environ.get("MATCHDETAIL_BLOCK_TTL_LEAGUE", "1800"))
+
+FIXTURE_BLOCKS = {"timeline", "lineups", "stats"}
+LEAGUE_BLOCKS = {"h2h", "standings", "insights", "ai"}
+
+
+# key -> (expires_ts, value)
+_CACHE: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+_LOCK = threading.Lock()
+
+
+def header_signature(header: Dict[str, Any]) -> str:
+    """
+    블록 결과에 영향을 주는 header 값만 뽑아서 짧은 해시로.
+    """
+    home = header.get("home") or {}
+    away = header.get("away") or {}
+    sig = {
+        "league_id": header.get("league_id"),
+        "season": header.get("season"),
+        "kickoff": header.get("kickoff_utc") or header.get("date_utc"),
+        "home": home.get("id") if isinstance(home, dict) else None,
+        "away": away.get("id") if isinstance(away, dict) else None,
+        "round": header.get("league_round"),
+        "filters": header.get("filters") or {},
+    }
+    raw = json.dumps(sig, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:16]
+
+
+def block_cache_policy(
+    block: str,
+    status_group: Optional[str],
+    versions: Tuple[int, int],
+) -> Optional[Tuple[str, int]]:
+    """
+    (키에 넣을 버전 문자열, TTL) 또는 캐시 금지면 None.
+    """
+    fv, lv = versions
+    finished = (status_group or "").upper() == "FINISHED"
+
+    if block in FIXTURE_BLOCKS:
+        if not finished:
+            return None
+        return f"f{fv}", MATCHDETAIL_BLOCK_TTL_FINISHED
+
+    if block == "form":
+        return f"l{lv}", (MATCHDETAIL_BLOCK_TTL_FINISHED if finished else MATCHDETAIL_BLOCK_TTL_LEAGUE)
+
+    if block in LEAGUE_BLOCKS:
+        if finished:
+            return f"f{fv}:l{lv}", MATCHDETAIL_BLOCK_TTL_FINISHED
+        return f"l{lv}", MATCHDETAIL_BLOCK_TTL_LEAGUE
+
+    return None
+
+
+def make_block_key(fixture_id: int, block: str, sig: str, version: str, **filters: Any) -> str:
+    parts = [f"{k}={filters[k]}" for k in sorted(filters.keys())]
+    return f"{fixture_id}|{block}|{sig}|{version}|" + "&".join(parts)
+
+
+def block_cache_get(key: str) -> Tuple[bool, Any]:
+    """
+    (hit 여부, 값). 값이 None 인 블록도 캐시될 수 있어서 hit 여부를 따로 돌려준다.
+    """
+    now_ts = time.time()
+    with _LOCK:
+        ent = _CACHE.get(key)
+        if ent is None:
+            return False, None
+        exp, value = ent
+        if exp <= now_ts:
+            _CACHE.pop(key, None)
+            return False, None
+        _CACHE.move_to_end(key)
+        return True, value
+
+
+def block_cache_set(key: str, value: Any, ttl: int) -> None:
+    if ttl <= 0 or MATCHDETAIL_BLOCK_CACHE_MAX <= 0:
+        return
+    with _LOCK:
+        _CACHE[key] = (time.time() + ttl, value)
+        _CACHE.move_to_end(key)
+        while len(_CACHE) > MATCHDETAIL_BLOCK_CACHE_MAX:
+            _CACHE.popitem(last=False)
@@ -0,0 +1,134 @@
+# matchdetail/block_executor.py
+#
+# 매치디테일 번들 블록 병렬 실행기
+#
+# - 블록(form/timeline/lineups/stats/h2h/standings/insights/ai ...)은 서로 독립적인
+#   fetch_all 묶음이라 순차 실행하면 총 시간 = 블록 시간 합.
+# - 의존성이 없는 블록은 공용 스레드풀에서 동시에 돌리고,
+#   의존 블록(ai_predictions ← insights_overall)은 선행 블록이 끝난 뒤에 "제출"한다.
+#   (풀 스레드 안에서 다른 future 를 기다리지 않으므로 풀이 꽉 차도 데드락 없음)
+# - 블록마다 wall time 과 db.pool 커넥션 대기 시간을 따로 기록한다.
+#
+# 환경변수:
+#   MATCHDETAIL_PARALLEL_WORKERS : 공용 풀 크기 (기본 4, db.pool max_size=10 보다 작게)
+#                                  0 이면 순차 실행(기존 동작)
+
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from db import conn_wait_seconds
+
+
+MATCHDETAIL_PARALLEL_WORKERS = int(os.environ.get("MATCHDETAIL_PARALLEL_WORKERS", "4"))
+
+# name -> (fn(results) -> Any, deps)
+BlockSpec = Tuple[Callable[[Dict[str, Any]], Any], Sequence[str]]
+
+_EXECUTOR: Optional[ThreadPoolExecutor] = None
+_EXECUTOR_LOCK = threading.Lock()
+
+
+def _get_executor() -> Optional[ThreadPoolExecutor]:
+    global _EXECUTOR
+    if MATCHDETAIL_PARALLEL_WORKERS <= 0:
+        return None
+    if _EXECUTOR is None:
+        with _EXECUTOR_LOCK:
+            if _EXECUTOR is None:
+                _EXECUTOR = ThreadPoolExecutor(
+                    max_workers=MATCHDETAIL_PARALLEL_WORKERS,
+                    thread_name_prefix="md-block",
+                )
+    return _EXECUTOR
+
+
+def _run_one(fn: Callable[[Dict[str, Any]], Any], deps_results: Dict[str, Any]) -> Tuple[Any, float, float]:
+    """
+    (결과, wall 초, 커넥션 대기 초)
+    """
+    w0 = conn_wait_seconds()
+    t0 = time.perf_counter()
+    out = fn(deps_results)
+    return out, time.perf_counter() - t0, conn_wait_seconds() - w0
+
+
+def run_blocks(
+    specs: Dict[str, BlockSpec],
+    initial: Optional[Dict[str, Any]] = None,
+) -> Tuple[Dict[str, Any], Dict[str, float], Dict[str, float]]:
+    """
+    specs 의 블록들을 의존성 순서대로 실행.
+    반환: (results, wall_times, conn_waits)
+
+    - initial: 이미 값이 있는 블록(예: 블록 캐시 hit). 의존 블록에 그대로 전달된다.
+    - deps 에 specs 에 없는 이름이 있으면 무시(이미 만족된 것으로 간주)
+    - 블록에서 예외가 나면 나머지 대기 중 블록은 제출하지 않고 첫 예외를 다시 던진다
+      (순차 실행 때와 동일하게 라우터가 500 처리)
+    """
+    results: Dict[str, Any] = dict(initial or {})
+    walls: Dict[str, float] = {}
+    waits: Dict[str, float] = {}
+
+    pending: Dict[str, List[str]] = {
+        name: [d for d in deps if d in specs] for name, (_fn, deps) in specs.items()
+    }
+
+    def _ready() -> List[str]:
+        return [n for n, deps in pending.items() if all(d in results for d in deps)]
+
+    executor = _get_executor()
+
+    # 순차 모드 (풀 비활성)
+    if executor is None or len(specs) <= 1:
+        while pending:
+            ready = _ready()
+            if not ready:
+                raise RuntimeError(f"block dependency cycle: {sorted(pending)}")
+            for name in ready:
+                fn, deps = specs[name]
+                pending.pop(name)
+                out, dt, dw = _run_one(fn, {d: results.get(d) for d in deps})
+                results[name] = out
+                walls[name] = dt
+                waits[name] = dw
+        return results, walls, waits
+
+    running: Dict[Future, str] = {}
+    error: Optional[BaseException] = None
+
+    while pending or running:
+        if error is None:
+            for name in _ready():
+                fn, deps = specs[name]
+                pending.pop(name)
+                fut = executor.submit(_run_one, fn, {d: results.get(d) for d in deps})
+                running[fut] = name
+
+        if not running:
+            if error is not None:
+                break
+            raise RuntimeError(f"block dependency cycle: {sorted(pending)}")
+
+        done, _ = wait(list(running.keys()), return_when=FIRST_COMPLETED)
+        for fut in done:
+            name = running.pop(fut)
+            try:
+                out, dt, dw = fut.result()
+            except BaseException as e:  # noqa: BLE001 - 블록 예외 그대로 전달
+                if error is None:
+                    error = e
+                continue
+            results[name] = out
+            walls[name] = dt
+            waits[name] = dw
+
+        if error is not None:
+            pending.clear()
+
+    if error is not None:
+        raise error
+
+    return results, walls, waits
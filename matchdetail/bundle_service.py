@@ -1,6 +1,7 @@
 # matchdetail/bundle_service.py
 
 from typing import Any, Dict, Optional
+from datetime import datetime, timezone
 import json
 import time
 
@@ -16,6 +17,19 @@ from .h2h_block import build_h2h_block
 from .standings_block import build_standings_block
 from .insights_block import build_insights_overall_block
 from .ai_predictions_block import build_ai_predictions_block
+from .block_executor import run_blocks
+from .block_cache import (
+    block_cache_get,
+    block_cache_policy,
+    block_cache_set,
+    header_signature,
+    make_block_key,
+)
+from services.match_data_version import load_match_data_versions, load_team_version_sum
+from services.match_predictions_store import (
+    load_match_prediction_snapshot,
+    save_match_prediction_snapshot,
+)
 
 
 def _deep_merge(base: Any, patch: Any) -> Any:
@@ -102,6 +116,7 @@ def get_match_detail_bundle(
     bracket_round: Optional[str] = None,
     apply_override: bool = True,
     parts: Optional[list[str]] = None,
+    precompute: bool = False,
 ) -> Optional[Dict[str, Any]]:
 
 
@@ -113,6 +128,10 @@ def get_match_detail_bundle(
     - match_overrides.patch.hidden=true 면 None 리턴 (디테일 숨김)
     - header 관련 키는 header에 먼저 merge (다른 블록 생성에 영향 주기 위해)
     - 그 외 키(예: timeline/insights_overall 같은 블록 override)는 bundle 완성 후 최종 merge
+
+    ✅ precompute=True (football/workers/predictions_precompute.py 전용)
+    - 예측 스냅샷이 유효하면 아무것도 계산하지 않고, 아니면 insights/ai 를 새로 계산해서 저장
+    - insights/ai 는 블록 캐시를 건너뛴다 (TTL 로 허용된 지연이 스냅샷에 고정되지 않게)
     """
 
     t0 = time.perf_counter()
@@ -216,62 +235,143 @@ def get_match_detail_bundle(
     def _need(name: str) -> bool:
         return (parts_set is None) or (name in parts_set)
 
-    # 기본값
-    form = timeline = lineups = stats = h2h = standings = insights_overall = ai_predictions = None
-    dt_form = dt_timeline = dt_lineups = dt_stats = dt_h2h = dt_standings = dt_insights = dt_ai = 0.0
+    # ✅ 블록 정의: name -> (builder, deps)
+    # - 의존성 없는 블록은 block_executor 가 공용 풀에서 동시에 실행
+    # - ai_predictions 는 full insights_overall 이 끝난 뒤에 실행
+    specs: Dict[str, Any] = {}
 
-    # 블록 생성 (override 반영된 header 기반) + 타이밍
     if _need("form"):
-        t_form0 = time.perf_counter()
-        form = build_form_block(header)
-        dt_form = time.perf_counter() - t_form0
-
+        specs["form"] = (lambda _r: build_form_block(header), ())
     if _need("timeline"):
-        t_timeline0 = time.perf_counter()
-        timeline = build_timeline_block(header)
-        dt_timeline = time.perf_counter() - t_timeline0
-
+        specs["timeline"] = (lambda _r: build_timeline_block(header), ())
     if _need("lineups"):
-        t_lineups0 = time.perf_counter()
-        lineups = build_lineups_block(header)
-        dt_lineups = time.perf_counter() - t_lineups0
-
+        specs["lineups"] = (lambda _r: build_lineups_block(header), ())
     if _need("stats"):
-        t_stats0 = time.perf_counter()
-        stats = build_stats_block(header)
-        dt_stats = time.perf_counter() - t_stats0
-
+        specs["stats"] = (lambda _r: build_stats_block(header), ())
     if _need("h2h"):
-        t_h2h0 = time.perf_counter()
-        h2h = build_h2h_block(header)
-        dt_h2h = time.perf_counter() - t_h2h0
-
+        specs["h2h"] = (lambda _r: build_h2h_block(header), ())
     if _need("standings"):
-        t_stand0 = time.perf_counter()
-        standings = build_standings_block(
-            header,
-            bracket_round=bracket_round,
+        specs["standings"] = (
+            lambda _r: build_standings_block(header, bracket_round=bracket_round),
+            (),
         )
-        dt_standings = time.perf_counter() - t_stand0
 
     # ✅ ai_predictions 의존성: ai를 원하면 full insights_overall 이 반드시 먼저 생성
     if _need("insights_overall") or _need("ai_predictions"):
-        t_ins0 = time.perf_counter()
-        insights_overall = build_insights_overall_block(header, meta_only=False)
-        dt_insights = time.perf_counter() - t_ins0
+        specs["insights"] = (lambda _r: build_insights_overall_block(header, meta_only=False), ())
 
     # ✅ 초기 진입용 가벼운 메타 전용
     elif _need("insights_overall_meta"):
-        t_ins0 = time.perf_counter()
-        insights_overall = build_insights_overall_block(header, meta_only=True)
-        dt_insights = time.perf_counter() - t_ins0
+        specs["insights"] = (lambda _r: build_insights_overall_block(header, meta_only=True), ())
 
     if _need("ai_predictions"):
-        t_ai0 = time.perf_counter()
-        ai_predictions = build_ai_predictions_block(header, insights_overall)
-        dt_ai = time.perf_counter() - t_ai0
-
+        specs["ai"] = (
+            lambda r: build_ai_predictions_block(header, r.get("insights")),
+            ("insights",),
+        )
 
+    # ✅ 블록 캐시: (fixture, block, header 시그니처, 필터, 데이터 버전) 단위
+    # - FINISHED: 전 블록 / 그 외: form + 리그 블록만 (block_cache.py 정책)
+    # - 버전 테이블이 없으면 캐시 안 함 (무효화 수단이 없으니)
+    cached: Dict[str, Any] = {}
+    cache_plan: Dict[str, Any] = {}
+    started_utc = datetime.now(timezone.utc)
+    versions = load_match_data_versions(fixture_id, league_id) if specs else None
+    sig = header_signature(header)
+    status_group = header.get("status_group")
+    full_insights = _need("insights_overall") or _need("ai_predictions")
+
+    # ✅ 예정 경기 예측 스냅샷 (predictions_precompute 잡이 미리 계산, 유효할 때만)
+    precomputed = False
+    if (
+        versions is not None
+        and full_insights
+        and (status_group or "").upper() == "UPCOMING"
+        and ("insights" in specs or "ai" in specs)
+    ):
+        snap = load_match_prediction_snapshot(fixture_id, sig, versions)
+        if snap is not None:
+            for name in ("insights", "ai"):
+                if name in specs:
+                    cached[name] = snap.get(name)
+                    specs.pop(name)
+            precomputed = True
+
+    if versions is not None:
+        for name in list(specs.keys()):
+            if precompute and name in ("insights", "ai"):
+                continue
+            policy = block_cache_policy(name, status_group, versions)
+            if policy is None:
+                continue
+            ver, ttl = policy
+            key = make_block_key(
+                fixture_id,
+                name,
+                sig,
+                ver,
+                bracket_round=bracket_round if name == "standings" else None,
+                meta=(name == "insights" and not full_insights),
+            )
+            hit, value = block_cache_get(key)
+            if hit:
+                cached[name] = value
+                specs.pop(name)
+            else:
+                cache_plan[name] = (key, ttl)
+
+    # 예측 스냅샷 저장용 팀 버전 (계산 "전에" 읽음)
+    home_id = away_id = None
+    team_version = 0
+    if precompute and not precomputed and versions is not None and full_insights:
+        home = header.get("home") or {}
+        away = header.get("away") or {}
+        home_id = home.get("id") if isinstance(home, dict) else None
+        away_id = away.get("id") if isinstance(away, dict) else None
+        team_version = load_team_version_sum([home_id, away_id])
+
+    t_blocks0 = time.perf_counter()
+    results, walls, waits = run_blocks(specs, initial=cached)
+    dt_blocks = time.perf_counter() - t_blocks0
+
+    for name, (key, ttl) in cache_plan.items():
+        if name in results:
+            block_cache_set(key, results[name], ttl)
+
+    if precompute and not precomputed and versions is not None and full_insights and results.get("insights"):
+        try:
+            save_match_prediction_snapshot(
+                fixture_id=fixture_id,
+                header_sig=sig,
+                versions=versions,
+                team_version=team_version,
+                home_id=home_id,
+                away_id=away_id,
+                insights=results.get("insights"),
+                ai=results.get("ai"),
+                started_utc=started_utc,
+            )
+        except Exception as e:
+            print(f"[match_detail_bundle] prediction snapshot save failed fixture_id={fixture_id}: {e}")
+
+    form = results.get("form")
+    timeline = results.get("timeline")
+    lineups = results.get("lineups")
+    stats = results.get("stats")
+    h2h = results.get("h2h")
+    standings = results.get("standings")
+    insights_overall = results.get("insights")
+    ai_predictions = results.get("ai")
+
+    dt_form = walls.get("form", 0.0)
+    dt_timeline = walls.get("timeline", 0.0)
+    dt_lineups = walls.get("lineups", 0.0)
+    dt_stats = walls.get("stats", 0.0)
+    dt_h2h = walls.get("h2h", 0.0)
+    dt_standings = walls.get("standings", 0.0)
+    dt_insights = walls.get("insights", 0.0)
+    dt_ai = walls.get("ai", 0.0)
+    dt_conn_wait = sum(waits.values())
 
     # ✅ total 먼저 확정
     dt_total = time.perf_counter() - t0
@@ -288,6 +388,12 @@ def get_match_detail_bundle(
         "standings": float(dt_standings),
         "insights": float(dt_insights),
         "ai": float(dt_ai),
+        # 블록 구간 실제 경과(병렬이면 가장 느린 경로에 수렴) / 블록별 커넥션 대기
+        "blocks": float(dt_blocks),
+        "conn_wait": float(dt_conn_wait),
+        "conn_wait_by_block": {k: float(v) for k, v in waits.items()},
+        "cache_hits": sorted(cached.keys()),
+        "precomputed": precomputed,
     }
 
     bundle = {
@@ -322,6 +428,10 @@ def get_match_detail_bundle(
             f" standings={dt_standings:.3f}s"
             f" insights={dt_insights:.3f}s"
             f" ai={dt_ai:.3f}s"
+            f" blocks={dt_blocks:.3f}s"
+            f" conn_wait={dt_conn_wait:.3f}s"
+            f" cache_hits={','.join(sorted(cached.keys())) or '-'}"
+            f" precomputed={int(precomputed)}"
         )
     except Exception:
         pass
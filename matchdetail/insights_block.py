@@ -1,11 +1,23 @@
 # matchdetail/insights_block.py
 
 from __future__ import annotations
-from typing import Any, Dict, Optional, List
+from typing import Any, Dict, Optional, List, Tuple
 
 import json
+from datetime import datetime, timezone
 
 from db import fetch_all
+from services.insights_snapshot import load_team_insights_snapshot, save_team_insights_snapshot
+from services.match_data_version import load_league_version_sum
+
+from .insights_kernels import (
+    RawEventColumns,
+    build_raw_event_columns,
+    cards_and_first_goal_by_half,
+    corner_counts_by_half,
+    goals_by_time_buckets,
+)
+from .insights_sample import InsightsSample, _parse_events_raw_to_list
 
 
 # ─────────────────────────────────────
@@ -194,6 +206,7 @@ def enrich_overall_outcome_totals(
     matches_total_api: int = 0,
     last_n: int = 0,
     ref_date_utc: Any = None,   # ✅ NEW
+    sample: Optional[InsightsSample] = None,
 ) -> None:
 
     """
@@ -258,7 +271,8 @@ def enrich_overall_outcome_totals(
     if ref_date_utc is not None:
         params.append(ref_date_utc)
 
-    rows = fetch_all(base_sql, tuple(params))
+    # ✅ 공용 샘플이 있으면 같은 조건의 row 를 메모리에서 받는다
+    rows = sample.matches() if sample is not None else fetch_all(base_sql, tuple(params))
 
     if not rows:
         return
@@ -329,7 +343,7 @@ def enrich_overall_outcome_totals(
             WHERE fixture_id IN ({in_fix})
               AND name IN ('Corner Kicks','Yellow Cards','Red Cards')
         """
-        s_rows = fetch_all(stats_sql, tuple(fixture_ids))
+        s_rows = sample.team_stats(fixture_ids) if sample is not None else fetch_all(stats_sql, tuple(fixture_ids))
         for sr in s_rows or []:
             try:
                 fx = int(sr.get("fixture_id"))
@@ -363,7 +377,7 @@ def enrich_overall_outcome_totals(
               AND e.minute <= 90
             ORDER BY e.fixture_id, e.minute, COALESCE(e.extra,0), e.id
         """
-        ev_rows = fetch_all(ev_sql, tuple(fixture_ids))
+        ev_rows = sample.goal_card_events(fixture_ids) if sample is not None else fetch_all(ev_sql, tuple(fixture_ids))
         for ev in ev_rows or []:
             try:
                 fx = int(ev.get("fixture_id"))
@@ -724,36 +738,16 @@ def enrich_overall_outcome_totals(
 #  ✅ 추가: 1H / 2H Performance (HT/2H 지표)
 # ─────────────────────────────────────
 
-def _parse_events_raw_to_list(data_json: str) -> List[Dict[str, Any]]:
-    """match_events_raw.data_json을 최대한 관대하게 파싱해서 '이벤트 리스트'만 뽑는다."""
-    if not data_json:
-        return []
-    try:
-        obj = json.loads(data_json)
-    except Exception:
-        return []
-
-    # API-Sports 형태: {"response":[...]} / {"events":[...]} / 혹은 바로 [...]
-    if isinstance(obj, list):
-        return [e for e in obj if isinstance(e, dict)]
-    if isinstance(obj, dict):
-        if isinstance(obj.get("response"), list):
-            return [e for e in obj.get("response") if isinstance(e, dict)]
-        if isinstance(obj.get("events"), list):
-            return [e for e in obj.get("events") if isinstance(e, dict)]
-    return []
-
-
-def _load_corner_counts_by_half(fixture_ids: List[int]) -> Dict[tuple, Dict[str, int]]:
+def _load_raw_events(
+    fixture_ids: List[int],
+    sample: Optional[InsightsSample] = None,
+) -> List[tuple]:
     """
-    코너는 match_team_stats에 '전/후반 분리'가 없으니, 가능하면 match_events_raw에서 코너 이벤트를 찾아서
-    1H/2H 코너 수를 계산한다.
-
-    반환:
-      {(fixture_id, team_id): {"h1": int, "h2": int}}
+    [(fixture_id, 파싱된 raw 이벤트 리스트)]
+    - sample 이 있으면 side 당 1회만 읽고 파싱한 결과를 재사용
     """
-    if not fixture_ids:
-        return {}
+    if sample is not None:
+        return sample.raw_events(fixture_ids)
 
     in_fix = ",".join(["%s"] * len(fixture_ids))
     raw_sql = f"""
@@ -763,61 +757,46 @@ def _load_corner_counts_by_half(fixture_ids: List[int]) -> Dict[tuple, Dict[str,
     """
     raw_rows = fetch_all(raw_sql, tuple(fixture_ids)) or []
 
-    out: Dict[tuple, Dict[str, int]] = {}
-
+    out: List[tuple] = []
     for r in raw_rows:
         try:
             fx = int(r.get("fixture_id"))
         except Exception:
             continue
+        out.append((fx, _parse_events_raw_to_list(r.get("data_json") or "")))
+    return out
 
-        events = _parse_events_raw_to_list(r.get("data_json") or "")
-        for ev in events:
-            typ = str(ev.get("type") or ev.get("Type") or "").strip().lower()
-            det = str(ev.get("detail") or ev.get("Detail") or "").strip().lower()
-
-            # 코너 판정(가능한 폭넓게)
-            is_corner = (typ == "corner") or (det.startswith("corner")) or ("corner kick" in det)
-            if not is_corner:
-                continue
-
-            team_obj = ev.get("team") if isinstance(ev.get("team"), dict) else {}
-            team_id = team_obj.get("id") if isinstance(team_obj, dict) else None
-            if team_id is None:
-                continue
-            try:
-                tid = int(team_id)
-            except Exception:
-                continue
 
-            time_obj = ev.get("time") if isinstance(ev.get("time"), dict) else {}
-            elapsed = None
-            if isinstance(time_obj, dict):
-                elapsed = time_obj.get("elapsed")
-            if elapsed is None:
-                elapsed = ev.get("elapsed")
+def _load_raw_columns(
+    fixture_ids: List[int],
+    sample: Optional[InsightsSample] = None,
+) -> RawEventColumns:
+    if sample is not None:
+        return sample.raw_columns(fixture_ids)
+    return build_raw_event_columns(_load_raw_events(fixture_ids))
 
-            try:
-                minute = int(elapsed)
-            except Exception:
-                continue
 
-            # 1H: <=45 (45+extra 포함), 2H: 46~90
-            if minute <= 45:
-                half = "h1"
-            elif 46 <= minute <= 90:
-                half = "h2"
-            else:
-                continue
+def _load_corner_counts_by_half(
+    fixture_ids: List[int],
+    sample: Optional[InsightsSample] = None,
+) -> Dict[tuple, Dict[str, int]]:
+    """
+    코너는 match_team_stats에 '전/후반 분리'가 없으니, 가능하면 match_events_raw에서 코너 이벤트를 찾아서
+    1H/2H 코너 수를 계산한다.
 
-            k = (fx, tid)
-            if k not in out:
-                out[k] = {"h1": 0, "h2": 0}
-            out[k][half] += 1
+    반환:
+      {(fixture_id, team_id): {"h1": int, "h2": int}}
+    """
+    if not fixture_ids:
+        return {}
 
-    return out
+    # ✅ 컬럼 변환 + 벡터화 커널 (insights_kernels)
+    return corner_counts_by_half(_load_raw_columns(fixture_ids, sample))
 
-def _load_cards_and_first_goal_by_half(fixture_ids: List[int]) -> Dict[str, Any]:
+def _load_cards_and_first_goal_by_half(
+    fixture_ids: List[int],
+    sample: Optional[InsightsSample] = None,
+) -> Dict[str, Any]:
     """
     match_events_raw에서 1H/2H 기준으로:
       - 팀별 카드(옐/레) 카운트
@@ -833,111 +812,8 @@ def _load_cards_and_first_goal_by_half(fixture_ids: List[int]) -> Dict[str, Any]
     if not fixture_ids:
         return {"cards": {}, "first_goal": {}}
 
-    in_fix = ",".join(["%s"] * len(fixture_ids))
-    raw_sql = f"""
-        SELECT fixture_id, data_json
-        FROM match_events_raw
-        WHERE fixture_id IN ({in_fix})
-    """
-    raw_rows = fetch_all(raw_sql, tuple(fixture_ids)) or []
-
-    cards_map: Dict[tuple, Dict[str, int]] = {}
-    first_goal_map: Dict[int, Dict[str, Optional[int]]] = {}
-
-    def _get_time(ev: Dict[str, Any]) -> tuple:
-        time_obj = ev.get("time") if isinstance(ev.get("time"), dict) else {}
-        elapsed = None
-        extra = None
-
-        if isinstance(time_obj, dict):
-            elapsed = time_obj.get("elapsed")
-            extra = time_obj.get("extra")
-
-        if elapsed is None:
-            elapsed = ev.get("elapsed")
-        if extra is None:
-            extra = ev.get("extra")
-
-        try:
-            m = int(elapsed)
-        except Exception:
-            m = 999999
-        try:
-            x = int(extra) if extra is not None else 0
-        except Exception:
-            x = 0
-
-        return (m, x)
-
-    def _half_from_elapsed(minute: int) -> Optional[str]:
-        # raw elapsed 기준: 1H=1~45(+extra), 2H=46~90(+extra)
-        if 0 <= minute <= 45:
-            return "h1"
-        if 46 <= minute <= 90:
-            return "h2"
-        return None
-
-    for r in raw_rows:
-        try:
-            fx = int(r.get("fixture_id"))
-        except Exception:
-            continue
-
-        events = _parse_events_raw_to_list(r.get("data_json") or "")
-        if fx not in first_goal_map:
-            first_goal_map[fx] = {"h1": None, "h2": None}
-
-        # goal/card만 시간순으로 정렬해서 처리
-        filtered: List[Dict[str, Any]] = []
-        for ev in events:
-            typ = str(ev.get("type") or ev.get("Type") or "").strip().lower()
-            if typ in ("goal", "card"):
-                filtered.append(ev)
-
-        filtered.sort(key=_get_time)
-
-        for ev in filtered:
-            typ = str(ev.get("type") or ev.get("Type") or "").strip().lower()
-            det = str(ev.get("detail") or ev.get("Detail") or "").strip().lower()
-
-            minute, extra = _get_time(ev)
-            half = _half_from_elapsed(minute)
-            if half is None:
-                continue
-
-            # team id
-            team_obj = ev.get("team") if isinstance(ev.get("team"), dict) else {}
-            team_id = team_obj.get("id") if isinstance(team_obj, dict) else None
-            if team_id is None:
-                continue
-            try:
-                tid = int(team_id)
-            except Exception:
-                continue
-
-            if typ == "goal":
-                # 1H/2H 첫 골 팀 기록
-                if first_goal_map[fx].get(half) is None:
-                    first_goal_map[fx][half] = tid
-
-            elif typ == "card":
-                # 옐/레만 카운트
-                k = (fx, tid)
-                if k not in cards_map:
-                    cards_map[k] = {"y1": 0, "r1": 0, "y2": 0, "r2": 0}
-
-                if "yellow" in det:
-                    if half == "h1":
-                        cards_map[k]["y1"] += 1
-                    else:
-                        cards_map[k]["y2"] += 1
-                elif "red" in det:
-                    if half == "h1":
-                        cards_map[k]["r1"] += 1
-                    else:
-                        cards_map[k]["r2"] += 1
-
-    return {"cards": cards_map, "first_goal": first_goal_map}
+    # ✅ 컬럼 변환 + 벡터화 커널 (insights_kernels)
+    return cards_and_first_goal_by_half(_load_raw_columns(fixture_ids, sample))
 
 
 
@@ -948,6 +824,7 @@ def enrich_overall_1h_performance(
     season_int: int,
     last_n: Optional[int] = None,
     ref_date_utc: Any = None,   # ✅ NEW
+    sample: Optional[InsightsSample] = None,
 ) -> None:
     """1H Performance 섹션(HT 스코어/전반 이벤트 기반)"""
     insights = stats.setdefault("insights_overall", {})
@@ -991,7 +868,10 @@ def enrich_overall_1h_performance(
     if ref_date_utc is not None:
         params.append(ref_date_utc)
 
-    rows = fetch_all(base_sql, tuple(params)) or []
+    if sample is not None:
+        rows = sample.matches(require_ht=True)
+    else:
+        rows = fetch_all(base_sql, tuple(params)) or []
 
     if not rows:
         return
@@ -1019,7 +899,10 @@ def enrich_overall_1h_performance(
           AND e.minute <= 90
         ORDER BY e.fixture_id, e.minute, COALESCE(e.extra,0), e.id
     """
-    ev_rows = fetch_all(ev_sql, tuple(fixture_ids)) or []
+    if sample is not None:
+        ev_rows = sample.goal_card_events(fixture_ids)
+    else:
+        ev_rows = fetch_all(ev_sql, tuple(fixture_ids)) or []
     events_by_fixture: Dict[int, List[Dict[str, Any]]] = {}
     for ev in ev_rows:
         try:
@@ -1029,10 +912,10 @@ def enrich_overall_1h_performance(
         events_by_fixture.setdefault(fx, []).append(ev)
 
     # 코너(전/후반) — 가능하면 raw에서
-    corner_counts = _load_corner_counts_by_half(fixture_ids)
+    corner_counts = _load_corner_counts_by_half(fixture_ids, sample)
 
     # 카드 + 1H/2H 첫 골 팀 — raw에서 (match_events 시간컷 오류 방지)
-    raw_pack = _load_cards_and_first_goal_by_half(fixture_ids)
+    raw_pack = _load_cards_and_first_goal_by_half(fixture_ids, sample)
     cards_by_fx_team = raw_pack.get("cards", {}) or {}
     first_goal_by_fx = raw_pack.get("first_goal", {}) or {}
 
@@ -1238,6 +1121,7 @@ def enrich_overall_2h_performance(
     season_int: int,
     last_n: Optional[int] = None,
     ref_date_utc: Any = None,   # ✅ NEW
+    sample: Optional[InsightsSample] = None,
 ) -> None:
     """2H Performance 섹션(후반 득점 = FT - HT)"""
     insights = stats.setdefault("insights_overall", {})
@@ -1280,7 +1164,10 @@ def enrich_overall_2h_performance(
     if ref_date_utc is not None:
         params.append(ref_date_utc)
 
-    rows = fetch_all(base_sql, tuple(params)) or []
+    if sample is not None:
+        rows = sample.matches(require_ht=True)
+    else:
+        rows = fetch_all(base_sql, tuple(params)) or []
 
     if not rows:
         return
@@ -1307,7 +1194,10 @@ def enrich_overall_2h_performance(
           AND e.minute <= 90
         ORDER BY e.fixture_id, e.minute, COALESCE(e.extra,0), e.id
     """
-    ev_rows = fetch_all(ev_sql, tuple(fixture_ids)) or []
+    if sample is not None:
+        ev_rows = sample.goal_card_events(fixture_ids)
+    else:
+        ev_rows = fetch_all(ev_sql, tuple(fixture_ids)) or []
     events_by_fixture: Dict[int, List[Dict[str, Any]]] = {}
     for ev in ev_rows:
         try:
@@ -1316,10 +1206,10 @@ def enrich_overall_2h_performance(
             continue
         events_by_fixture.setdefault(fx, []).append(ev)
 
-    corner_counts = _load_corner_counts_by_half(fixture_ids)
+    corner_counts = _load_corner_counts_by_half(fixture_ids, sample)
 
     # 카드 + 1H/2H 첫 골 팀 — raw에서 (match_events 시간컷 오류 방지)
-    raw_pack = _load_cards_and_first_goal_by_half(fixture_ids)
+    raw_pack = _load_cards_and_first_goal_by_half(fixture_ids, sample)
     cards_by_fx_team = raw_pack.get("cards", {}) or {}
     first_goal_by_fx = raw_pack.get("first_goal", {}) or {}
 
@@ -1531,6 +1421,7 @@ def enrich_overall_game_state(
     team_id: int,
     last_n: Optional[int] = None,
     ref_date_utc: Any = None,   # ✅ NEW
+    sample: Optional[InsightsSample] = None,
 ) -> None:
 
     """
@@ -1580,7 +1471,10 @@ def enrich_overall_game_state(
         params.append(ref_date_utc)
 
 
-    rows = fetch_all(base_sql, tuple(params)) or []
+    if sample is not None:
+        rows = sample.matches(require_ht=True)
+    else:
+        rows = fetch_all(base_sql, tuple(params)) or []
     if not rows:
         return
 
@@ -1606,7 +1500,10 @@ def enrich_overall_game_state(
           AND e.minute <= 90
         ORDER BY e.fixture_id, e.minute, COALESCE(e.extra,0), e.id
     """
-    g_rows = fetch_all(goals_sql, tuple(fixture_ids)) or []
+    if sample is not None:
+        g_rows = sample.goal_events(fixture_ids, max_minute=90)
+    else:
+        g_rows = fetch_all(goals_sql, tuple(fixture_ids)) or []
     goals_by_fixture: Dict[int, List[Dict[str, Any]]] = {}
     for g in g_rows:
         try:
@@ -1620,9 +1517,8 @@ def enrich_overall_game_state(
     #        - match_events에 정상 데이터가 있으면 그대로 사용
     #        - fixture 단위로 goal 리스트가 비어있거나 team_id가 전부 None이면 raw로 채운다.
 
-    def _raw_goals_for_fixture(data_json: str) -> List[Dict[str, Any]]:
+    def _raw_goals_for_fixture(events: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         out: List[Dict[str, Any]] = []
-        events = _parse_events_raw_to_list(data_json or "")
         for ev in events:
             typ = str(ev.get("type") or ev.get("Type") or "").strip().lower()
             if typ != "goal":
@@ -1667,19 +1563,9 @@ def enrich_overall_game_state(
         return out
 
     # match_events_raw에서 fixture별 goal 로딩
-    raw_sql = f"""
-        SELECT fixture_id, data_json
-        FROM match_events_raw
-        WHERE fixture_id IN ({in_fix})
-    """
-    raw_rows = fetch_all(raw_sql, tuple(fixture_ids)) or []
     raw_goals_by_fx: Dict[int, List[Dict[str, Any]]] = {}
-    for rr in raw_rows:
-        try:
-            fx = int(rr.get("fixture_id"))
-        except Exception:
-            continue
-        raw_goals_by_fx[fx] = _raw_goals_for_fixture(rr.get("data_json") or "")
+    for fx, raw_events in _load_raw_events(fixture_ids, sample):
+        raw_goals_by_fx[fx] = _raw_goals_for_fixture(raw_events)
 
     # fixture 단위로 폴백 적용
     for fx in fixture_ids:
@@ -2169,6 +2055,7 @@ def enrich_overall_goals_by_time(
     team_id: int,
     last_n: Optional[int] = None,  # Last N (없으면 시즌 전체)
     ref_date_utc: Any = None,      # ✅ NEW
+    sample: Optional[InsightsSample] = None,
 ) -> None:
 
     """
@@ -2229,7 +2116,7 @@ def enrich_overall_goals_by_time(
         params.append(ref_date_utc)
 
 
-    rows = fetch_all(matches_sql, tuple(params))
+    rows = sample.matches() if sample is not None else fetch_all(matches_sql, tuple(params))
     if not rows:
         return
 
@@ -2263,7 +2150,10 @@ def enrich_overall_goals_by_time(
           AND lower(e.type) = 'goal'
     """
 
-    ev_rows = fetch_all(events_sql, tuple(fixture_ids))
+    if sample is not None:
+        ev_rows = sample.goal_events(fixture_ids, max_minute=None)
+    else:
+        ev_rows = fetch_all(events_sql, tuple(fixture_ids))
     if not ev_rows:
         return
 
@@ -2271,85 +2161,11 @@ def enrich_overall_goals_by_time(
     # 3) 버킷 집계
     # ─────────────────────────────────────
     # ✅ UI(Goals by Time)용 6버킷은 기존 그대로 유지
-    for_buckets = [0, 0, 0, 0, 0, 0]
-    against_buckets = [0, 0, 0, 0, 0, 0]
-
     # ✅ AI Predictions(전/후반/구간골)용 10버킷 추가
     #   - 1H: [0-9],[10-19],[20-29],[30-34],[35-45(+)]
     #   - 2H: [46-55],[56-65],[66-75],[76-79],[80-90(+)]
-    for_buckets10 = [0] * 10
-    against_buckets10 = [0] * 10
-
-    def bucket_idx(minute: int) -> int:
-        if minute <= 15:
-            return 0
-        if minute <= 30:
-            return 1
-        if minute <= 45:
-            return 2
-        if minute <= 60:
-            return 3
-        if minute <= 75:
-            return 4
-        return 5
-
-    def bucket_idx10(minute: int) -> Optional[int]:
-        # 연장(>90) 제외 (정규시간 기반)
-        if minute < 0:
-            return None
-        if minute > 90:
-            return None
-
-        if minute <= 9:
-            return 0
-        if minute <= 19:
-            return 1
-        if minute <= 29:
-            return 2
-        if minute <= 34:
-            return 3
-        if minute <= 45:
-            return 4
-        if minute <= 55:
-            return 5
-        if minute <= 65:
-            return 6
-        if minute <= 75:
-            return 7
-        if minute <= 79:
-            return 8
-        return 9
-
-    for ev in ev_rows:
-        try:
-            m = ev.get("minute")
-            if m is None:
-                continue
-            minute = int(m)
-        except Exception:
-            continue
-
-        idx6 = bucket_idx(minute)
-        idx10 = bucket_idx10(minute)
-        if idx10 is None:
-            continue
-
-        try:
-            ev_team_id = ev.get("team_id")
-            if ev_team_id is None:
-                continue
-            ev_team_id = int(ev_team_id)
-        except Exception:
-            continue
-
-        is_for = (ev_team_id == team_id)
-
-        if is_for:
-            for_buckets[idx6] += 1
-            for_buckets10[idx10] += 1
-        else:
-            against_buckets[idx6] += 1
-            against_buckets10[idx10] += 1
+    #   - 연장(>90) 제외 (정규시간 기반)
+    for_buckets, against_buckets, for_buckets10, against_buckets10 = goals_by_time_buckets(ev_rows, team_id)
 
     insights["goals_by_time_for"] = for_buckets
     insights["goals_by_time_against"] = against_buckets
@@ -2797,6 +2613,7 @@ def _compute_events_sample_home_away(
     filters: Dict[str, Any],
     events_sample: Optional[int],
     ref_date_utc: Any = None,   # ✅ NEW
+    sample: Optional[InsightsSample] = None,
 ) -> Dict[str, Optional[int]]:
 
     """
@@ -2852,7 +2669,7 @@ def _compute_events_sample_home_away(
     if ref_date_utc is not None:
         params.append(ref_date_utc)
 
-    rows = fetch_all(sql, tuple(params))
+    rows = sample.matches() if sample is not None else fetch_all(sql, tuple(params))
 
     raw_home = 0
     raw_away = 0
@@ -2976,7 +2793,6 @@ def _build_side_insights(
     ref_date_utc: Any = None,   # ✅ NEW
 ):
     stats: Dict[str, Any] = {}
-    insights: Dict[str, Any] = {}
 
 
     # Competition + Last N 기준 league_id 집합 생성
@@ -2994,6 +2810,90 @@ def _build_side_insights(
     # 섹션들에서 공통으로 사용할 필터 정보
     stats["insights_filters"] = merged_filters
 
+    league_ids = build_league_ids_for_query(stats, league_id) or [league_id]
+
+    # ✅ 스냅샷(team_insights_snapshots): FT 트리거 워커가 미리 계산해 둔 값이 유효하면 그대로 사용
+    snap = load_team_insights_snapshot(
+        team_id=team_id,
+        season=season_int,
+        league_ids=league_ids,
+        last_n=last_n,
+        ref_date_utc=ref_date_utc,
+    )
+    if snap is not None:
+        return snap["insights"]
+
+    version_sum = load_league_version_sum(league_ids)
+
+    # ✅ 공용 샘플: matches / events / stats / raw 를 side 당 1회만 읽고 모든 enricher 가 공유
+    sample = InsightsSample(
+        league_ids=league_ids,
+        season_int=season_int,
+        team_id=team_id,
+        ref_date_utc=ref_date_utc,
+    )
+
+    insights, sections = _compute_side_sections(
+        stats,
+        league_id=league_id,
+        season_int=season_int,
+        team_id=team_id,
+        last_n=last_n,
+        ref_date_utc=ref_date_utc,
+        sample=sample,
+    )
+
+    # ✅ 킥오프 전 경기(컷오프가 샘플을 자르지 않음)면 스냅샷으로 등록 → 이후 갱신은 워커 담당
+    if _is_future_ref_date(ref_date_utc):
+        try:
+            rows = sample.matches()
+            save_team_insights_snapshot(
+                team_id=team_id,
+                season=season_int,
+                base_league_id=league_id,
+                league_ids=league_ids,
+                last_n=last_n,
+                payload={"insights": insights, "sections": sections},
+                latest_date_utc=(rows[0].get("date_utc") if rows else None),
+                version_sum=version_sum,
+            )
+        except Exception as e:
+            print(f"[insights_snapshot] save failed team={team_id} season={season_int}: {e}", flush=True)
+
+    return insights
+
+
+def _is_future_ref_date(ref_date_utc: Any) -> bool:
+    if ref_date_utc is None:
+        return False
+    if isinstance(ref_date_utc, datetime):
+        ref = ref_date_utc
+    else:
+        try:
+            ref = datetime.fromisoformat(str(ref_date_utc).strip().replace("Z", "+00:00"))
+        except Exception:
+            return False
+    if ref.tzinfo is None:
+        ref = ref.replace(tzinfo=timezone.utc)
+    return ref > datetime.now(timezone.utc)
+
+
+def _compute_side_sections(
+    stats: Dict[str, Any],
+    *,
+    league_id: int,
+    season_int: int,
+    team_id: int,
+    last_n: int,
+    ref_date_utc: Any,
+    sample: InsightsSample,
+) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """
+    side insights 전체 + 홈 탭(Last N)에서 덮어쓰는 섹션 값.
+    반환: (insights, {"outcome_totals": {...}, "goals_by_time": {...}})
+    """
+    insights: Dict[str, Any] = {}
+
     # ✅ 유지: Outcome + Totals
     enrich_overall_outcome_totals(
         stats,
@@ -3004,7 +2904,9 @@ def _build_side_insights(
         matches_total_api=0,
         last_n=last_n,
         ref_date_utc=ref_date_utc,   # ✅ NEW
+        sample=sample,
     )
+    outcome_totals = dict(insights)
 
 
 
@@ -3016,6 +2918,7 @@ def _build_side_insights(
         season_int=season_int,
         last_n=last_n,
         ref_date_utc=ref_date_utc,   # ✅ NEW
+        sample=sample,
     )
     enrich_overall_2h_performance(
         stats,
@@ -3024,6 +2927,7 @@ def _build_side_insights(
         season_int=season_int,
         last_n=last_n,
         ref_date_utc=ref_date_utc,   # ✅ NEW
+        sample=sample,
     )
 
 
@@ -3033,6 +2937,7 @@ def _build_side_insights(
             insights[k] = v
 
     # ✅ 유지: Goals by Time
+    before_gbt = dict(insights)
     enrich_overall_goals_by_time(
         stats,
         insights,
@@ -3041,7 +2946,9 @@ def _build_side_insights(
         team_id=team_id,
         last_n=last_n,
         ref_date_utc=ref_date_utc,   # ✅ NEW
+        sample=sample,
     )
+    goals_by_time = {k: v for k, v in insights.items() if k not in before_gbt or before_gbt[k] is not v}
 
 
     # ✅ NEW: Game State (First Score Impact / HT State / Clutch)
@@ -3053,6 +2960,7 @@ def _build_side_insights(
         team_id=team_id,
         last_n=last_n,
         ref_date_utc=ref_date_utc,   # ✅ NEW
+        sample=sample,
     )
 
 
@@ -3073,6 +2981,7 @@ def _build_side_insights(
             filters=stats.get("insights_filters", {}),
             events_sample=int(events_sample),
             ref_date_utc=ref_date_utc,   # ✅ NEW
+            sample=sample,
         )
 
         if "events_sample_home" not in insights and sample_split.get("events_sample_home") is not None:
@@ -3081,7 +2990,40 @@ def _build_side_insights(
             insights["events_sample_away"] = sample_split["events_sample_away"]
 
 
-    return insights
+    return insights, {"outcome_totals": outcome_totals, "goals_by_time": goals_by_time}
+
+
+def compute_side_insights_snapshot(
+    *,
+    league_id: int,
+    season_int: int,
+    team_id: int,
+    last_n: int,
+    league_ids: List[int],
+) -> Tuple[Dict[str, Any], Any]:
+    """
+    스냅샷 워커용: 컷오프 없이(현재까지의 종료 경기 전체) side insights 계산.
+    반환: (payload, 샘플의 가장 최근 경기 date_utc)
+    """
+    stats: Dict[str, Any] = {"insights_filters": {"target_league_ids_last_n": list(league_ids)}}
+    sample = InsightsSample(
+        league_ids=list(league_ids),
+        season_int=season_int,
+        team_id=team_id,
+        ref_date_utc=None,
+    )
+    insights, sections = _compute_side_sections(
+        stats,
+        league_id=league_id,
+        season_int=season_int,
+        team_id=team_id,
+        last_n=last_n,
+        ref_date_utc=None,
+        sample=sample,
+    )
+    rows = sample.matches()
+    latest = rows[0].get("date_utc") if rows else None
+    return {"insights": insights, "sections": sections}, latest
 
 
 # ─────────────────────────────────────
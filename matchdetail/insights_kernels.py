@@ -0,0 +1,403 @@
+# matchdetail/insights_kernels.py
+#
+# Insights 집계 커널 (컬럼 형태 + NumPy 벡터화)
+#
+# 배경:
+# - 코너/카드/첫 골(전·후반), Goals by Time 버킷은 이벤트 dict 를 하나씩 도는 Python 루프라
+#   last_n 이 커지면 row 로딩보다 이 루프에서 CPU 를 더 쓴다.
+# - 이벤트를 한 번만 컬럼 배열(fixture / minute / extra / team / type·detail 코드)로 바꾸고
+#   집계는 배열 연산으로 처리한다.
+# - numpy 가 없으면 같은 규칙의 순수 Python 경로로 계산한다. (두 경로 결과 동일)
+#
+# 규칙은 insights_block 의 기존 루프 그대로:
+# - raw 이벤트 type/detail: str(type or Type).strip().lower()
+# - 코너: type == 'corner' or detail 이 'corner' 로 시작 or 'corner kick' 포함
+#         1H: elapsed <= 45, 2H: 46~90
+# - 카드/첫 골: goal/card 만 (elapsed, extra, 원래 순서) 로 정렬
+#         1H: 0~45, 2H: 46~90, elapsed 파싱 실패는 제외
+# - team.id 가 없거나 int 변환이 안 되면 제외
+
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np  # type: ignore
+except Exception:  # pragma: no cover - 선택 의존성
+    np = None  # type: ignore
+
+
+HAS_NUMPY = np is not None
+
+# elapsed 파싱 실패 시 값 (어느 half 에도 속하지 않음)
+_BAD_MINUTE = 999999
+
+# type 코드
+T_OTHER = 0
+T_GOAL = 1
+T_CARD = 2
+
+# detail 플래그 (bit)
+F_CORNER = 1
+F_YELLOW = 2
+F_RED = 4
+
+
+# ─────────────────────────────────────
+#  컬럼 변환 (raw 이벤트)
+# ─────────────────────────────────────
+
+class RawEventColumns:
+    """
+    match_events_raw 파싱 결과를 컬럼으로 펼친 것.
+    (fixture_id, 이벤트 리스트) 순서를 그대로 유지한다.
+    """
+
+    def __init__(self, fixture_ids_with_raw: List[int]) -> None:
+        # raw row 가 있는 fixture (이벤트가 0개여도 포함)
+        self.fixture_ids_with_raw = fixture_ids_with_raw
+        self.fx: List[int] = []
+        self.minute: List[int] = []
+        self.extra: List[int] = []
+        self.team: List[int] = []
+        self.has_team: List[bool] = []
+        self.typ: List[int] = []
+        self.flags: List[int] = []
+
+    def __len__(self) -> int:
+        return len(self.fx)
+
+
+def _ev_team(ev: Dict[str, Any]) -> Optional[int]:
+    team_obj = ev.get("team") if isinstance(ev.get("team"), dict) else {}
+    team_id = team_obj.get("id") if isinstance(team_obj, dict) else None
+    if team_id is None:
+        return None
+    try:
+        return int(team_id)
+    except Exception:
+        return None
+
+
+def _ev_time(ev: Dict[str, Any]) -> Tuple[int, int]:
+    time_obj = ev.get("time") if isinstance(ev.get("time"), dict) else {}
+    elapsed = None
+    extra = None
+    if isinstance(time_obj, dict):
+        elapsed = time_obj.get("elapsed")
+        extra = time_obj.get("extra")
+    if elapsed is None:
+        elapsed = ev.get("elapsed")
+    if extra is None:
+        extra = ev.get("extra")
+
+    try:
+        m = int(elapsed)
+    except Exception:
+        m = _BAD_MINUTE
+    try:
+        x = int(extra) if extra is not None else 0
+    except Exception:
+        x = 0
+    return m, x
+
+
+def build_raw_event_columns(raw: Sequence[Tuple[int, List[Dict[str, Any]]]]) -> RawEventColumns:
+    """
+    [(fixture_id, 파싱된 raw 이벤트)] → RawEventColumns
+    dict 접근/문자열 판정은 여기서 이벤트당 1회만 한다.
+    """
+    cols = RawEventColumns([int(fx) for fx, _ in raw])
+    for fx, events in raw:
+        fx = int(fx)
+        for ev in events or []:
+            typ = str(ev.get("type") or ev.get("Type") or "").strip().lower()
+            det = str(ev.get("detail") or ev.get("Detail") or "").strip().lower()
+
+            flags = 0
+            if (typ == "corner") or det.startswith("corner") or ("corner kick" in det):
+                flags |= F_CORNER
+            if "yellow" in det:
+                flags |= F_YELLOW
+            if "red" in det:
+                flags |= F_RED
+
+            if typ == "goal":
+                code = T_GOAL
+            elif typ == "card":
+                code = T_CARD
+            else:
+                code = T_OTHER
+
+            # 관심 없는 이벤트는 버린다 (subst / var 등)
+            if code == T_OTHER and not (flags & F_CORNER):
+                continue
+
+            tid = _ev_team(ev)
+            m, x = _ev_time(ev)
+
+            cols.fx.append(fx)
+            cols.minute.append(m)
+            cols.extra.append(x)
+            cols.team.append(tid if tid is not None else 0)
+            cols.has_team.append(tid is not None)
+            cols.typ.append(code)
+            cols.flags.append(flags)
+    return cols
+
+
+# ─────────────────────────────────────
+#  코너 (전/후반)
+# ─────────────────────────────────────
+
+def corner_counts_by_half(cols: RawEventColumns) -> Dict[tuple, Dict[str, int]]:
+    """
+    {(fixture_id, team_id): {"h1": int, "h2": int}}
+    """
+    if not len(cols):
+        return {}
+    if HAS_NUMPY:
+        return _corner_counts_np(cols)
+    return _corner_counts_py(cols)
+
+
+def _corner_counts_py(cols: RawEventColumns) -> Dict[tuple, Dict[str, int]]:
+    out: Dict[tuple, Dict[str, int]] = {}
+    for i in range(len(cols)):
+        if not (cols.flags[i] & F_CORNER) or not cols.has_team[i]:
+            continue
+        minute = cols.minute[i]
+        if minute <= 45:
+            half = "h1"
+        elif 46 <= minute <= 90:
+            half = "h2"
+        else:
+            continue
+        k = (cols.fx[i], cols.team[i])
+        if k not in out:
+            out[k] = {"h1": 0, "h2": 0}
+        out[k][half] += 1
+    return out
+
+
+def _corner_counts_np(cols: RawEventColumns) -> Dict[tuple, Dict[str, int]]:
+    fx = np.asarray(cols.fx, dtype=np.int64)
+    team = np.asarray(cols.team, dtype=np.int64)
+    minute = np.asarray(cols.minute, dtype=np.int64)
+    flags = np.asarray(cols.flags, dtype=np.int64)
+    has_team = np.asarray(cols.has_team, dtype=bool)
+
+    h1 = minute <= 45
+    h2 = (minute >= 46) & (minute <= 90)
+    sel = ((flags & F_CORNER) != 0) & has_team & (h1 | h2)
+    if not sel.any():
+        return {}
+
+    keys = np.stack([fx[sel], team[sel]], axis=1)
+    uniq, inv = np.unique(keys, axis=0, return_inverse=True)
+    inv = inv.reshape(-1)
+    c1 = np.bincount(inv, weights=h1[sel].astype(np.int64), minlength=len(uniq))
+    c2 = np.bincount(inv, weights=h2[sel].astype(np.int64), minlength=len(uniq))
+
+    out: Dict[tuple, Dict[str, int]] = {}
+    for (f, t), a, b in zip(uniq.tolist(), c1.tolist(), c2.tolist()):
+        out[(int(f), int(t))] = {"h1": int(a), "h2": int(b)}
+    return out
+
+
+# ─────────────────────────────────────
+#  카드 + 첫 골 (전/후반)
+# ─────────────────────────────────────
+
+def cards_and_first_goal_by_half(cols: RawEventColumns) -> Dict[str, Any]:
+    """
+    {
+      "cards": {(fixture_id, team_id): {"y1","r1","y2","r2"}},
+      "first_goal": {fixture_id: {"h1": team_id|None, "h2": team_id|None}}
+    }
+    """
+    first_goal: Dict[int, Dict[str, Optional[int]]] = {
+        fx: {"h1": None, "h2": None} for fx in cols.fixture_ids_with_raw
+    }
+    if not len(cols):
+        return {"cards": {}, "first_goal": first_goal}
+    if HAS_NUMPY:
+        cards = _cards_first_goal_np(cols, first_goal)
+    else:
+        cards = _cards_first_goal_py(cols, first_goal)
+    return {"cards": cards, "first_goal": first_goal}
+
+
+def _half_of(minute: int) -> Optional[str]:
+    if 0 <= minute <= 45:
+        return "h1"
+    if 46 <= minute <= 90:
+        return "h2"
+    return None
+
+
+def _cards_first_goal_py(
+    cols: RawEventColumns,
+    first_goal: Dict[int, Dict[str, Optional[int]]],
+) -> Dict[tuple, Dict[str, int]]:
+    cards: Dict[tuple, Dict[str, int]] = {}
+
+    # (fixture, elapsed, extra, 원래 순서) — 기존 fixture 별 stable sort 와 같은 순서
+    order = sorted(
+        (i for i in range(len(cols)) if cols.typ[i] in (T_GOAL, T_CARD)),
+        key=lambda i: (cols.fx[i], cols.minute[i], cols.extra[i], i),
+    )
+    for i in order:
+        half = _half_of(cols.minute[i])
+        if half is None or not cols.has_team[i]:
+            continue
+        fx = cols.fx[i]
+        tid = cols.team[i]
+
+        if cols.typ[i] == T_GOAL:
+            fg = first_goal.setdefault(fx, {"h1": None, "h2": None})
+            if fg.get(half) is None:
+                fg[half] = tid
+            continue
+
+        k = (fx, tid)
+        if k not in cards:
+            cards[k] = {"y1": 0, "r1": 0, "y2": 0, "r2": 0}
+        fl = cols.flags[i]
+        if fl & F_YELLOW:
+            cards[k]["y1" if half == "h1" else "y2"] += 1
+        elif fl & F_RED:
+            cards[k]["r1" if half == "h1" else "r2"] += 1
+    return cards
+
+
+def _cards_first_goal_np(
+    cols: RawEventColumns,
+    first_goal: Dict[int, Dict[str, Optional[int]]],
+) -> Dict[tuple, Dict[str, int]]:
+    fx = np.asarray(cols.fx, dtype=np.int64)
+    team = np.asarray(cols.team, dtype=np.int64)
+    minute = np.asarray(cols.minute, dtype=np.int64)
+    extra = np.asarray(cols.extra, dtype=np.int64)
+    typ = np.asarray(cols.typ, dtype=np.int64)
+    flags = np.asarray(cols.flags, dtype=np.int64)
+    has_team = np.asarray(cols.has_team, dtype=bool)
+
+    h1 = (minute >= 0) & (minute <= 45)
+    h2 = (minute >= 46) & (minute <= 90)
+    base = has_team & (h1 | h2)
+
+    # ── 첫 골: (fixture, half) 그룹에서 (elapsed, extra, 원래 순서) 최소
+    g = base & (typ == T_GOAL)
+    if g.any():
+        idx = np.nonzero(g)[0]
+        half_code = np.where(h1[idx], 0, 1)
+        # lexsort: 마지막 키가 1순위
+        order = np.lexsort((idx, extra[idx], minute[idx], half_code, fx[idx]))
+        s_fx = fx[idx][order]
+        s_half = half_code[order]
+        first = np.ones(len(order), dtype=bool)
+        first[1:] = (s_fx[1:] != s_fx[:-1]) | (s_half[1:] != s_half[:-1])
+        s_team = team[idx][order]
+        for f, hc, t in zip(s_fx[first].tolist(), s_half[first].tolist(), s_team[first].tolist()):
+            fg = first_goal.setdefault(int(f), {"h1": None, "h2": None})
+            fg["h1" if hc == 0 else "h2"] = int(t)
+
+    # ── 카드: (fixture, team) 별 옐/레 × 전/후반
+    c = base & (typ == T_CARD)
+    cards: Dict[tuple, Dict[str, int]] = {}
+    if not c.any():
+        return cards
+
+    keys = np.stack([fx[c], team[c]], axis=1)
+    uniq, inv = np.unique(keys, axis=0, return_inverse=True)
+    inv = inv.reshape(-1)
+    n = len(uniq)
+
+    is_y = (flags[c] & F_YELLOW) != 0
+    is_r = ((flags[c] & F_RED) != 0) & ~is_y   # 기존: yellow 우선 (elif)
+    c_h1 = h1[c]
+    c_h2 = h2[c]
+
+    y1 = np.bincount(inv, weights=(is_y & c_h1).astype(np.int64), minlength=n)
+    r1 = np.bincount(inv, weights=(is_r & c_h1).astype(np.int64), minlength=n)
+    y2 = np.bincount(inv, weights=(is_y & c_h2).astype(np.int64), minlength=n)
+    r2 = np.bincount(inv, weights=(is_r & c_h2).astype(np.int64), minlength=n)
+
+    for (f, t), a, b, cc, d in zip(uniq.tolist(), y1.tolist(), r1.tolist(), y2.tolist(), r2.tolist()):
+        cards[(int(f), int(t))] = {"y1": int(a), "r1": int(b), "y2": int(cc), "r2": int(d)}
+    return cards
+
+
+# ─────────────────────────────────────
+#  Goals by Time (6 / 10 버킷)
+# ─────────────────────────────────────
+
+# 6버킷: ≤15, ≤30, ≤45, ≤60, ≤75, 그 외
+_EDGES6 = (15, 30, 45, 60, 75)
+# 10버킷: [0-9],[10-19],[20-29],[30-34],[35-45],[46-55],[56-65],[66-75],[76-79],[80-90]
+_EDGES10 = (9, 19, 29, 34, 45, 55, 65, 75, 79)
+
+
+def _bucket(minute: int, edges: Tuple[int, ...]) -> int:
+    for i, e in enumerate(edges):
+        if minute <= e:
+            return i
+    return len(edges)
+
+
+def goals_by_time_buckets(
+    ev_rows: Sequence[Dict[str, Any]],
+    team_id: int,
+) -> Tuple[List[int], List[int], List[int], List[int]]:
+    """
+    match_events goal row (minute, team_id) → (for6, against6, for10, against10)
+    - minute 이 없거나 0 미만 / 90 초과(연장) 인 골은 제외
+    - team_id 가 없거나 int 변환 실패면 제외
+    """
+    minutes: List[int] = []
+    is_for: List[bool] = []
+    for ev in ev_rows or []:
+        try:
+            m = ev.get("minute")
+            if m is None:
+                continue
+            minute = int(m)
+        except Exception:
+            continue
+        if minute < 0 or minute > 90:
+            continue
+        try:
+            t = ev.get("team_id")
+            if t is None:
+                continue
+            t = int(t)
+        except Exception:
+            continue
+        minutes.append(minute)
+        is_for.append(t == team_id)
+
+    if HAS_NUMPY and minutes:
+        mm = np.asarray(minutes, dtype=np.int64)
+        ff = np.asarray(is_for, dtype=bool)
+        i6 = np.searchsorted(np.asarray(_EDGES6), mm, side="left")
+        i10 = np.searchsorted(np.asarray(_EDGES10), mm, side="left")
+        return (
+            np.bincount(i6[ff], minlength=6).tolist(),
+            np.bincount(i6[~ff], minlength=6).tolist(),
+            np.bincount(i10[ff], minlength=10).tolist(),
+            np.bincount(i10[~ff], minlength=10).tolist(),
+        )
+
+    for6 = [0] * 6
+    against6 = [0] * 6
+    for10 = [0] * 10
+    against10 = [0] * 10
+    for minute, f in zip(minutes, is_for):
+        i6 = _bucket(minute, _EDGES6)
+        i10 = _bucket(minute, _EDGES10)
+        if f:
+            for6[i6] += 1
+            for10[i10] += 1
+        else:
+            against6[i6] += 1
+            against10[i10] += 1
+    return for6, against6, for10, against10
@@ -0,0 +1,272 @@
+# matchdetail/insights_sample.py
+#
+# Insights 공용 샘플 로더 (한 팀 side 기준, 요청 1회용)
+#
+# 배경:
+# - enrich_overall_outcome_totals / 1h / 2h / game_state / goals_by_time 가
+#   같은 "시즌 종료 경기(last N)" 집합을 각자 다시 SELECT 하고,
+#   그 fixture_id 들에 대해 match_events / match_team_stats / match_events_raw(JSON 파싱)를
+#   각자 또 읽어서 side 당 수십 번의 쿼리가 나갔다.
+# - 이 샘플은 matches 1회 + (필요해질 때) events / stats / raw 를 fixture 단위로 1회만 읽고,
+#   각 enricher 가 예전 쿼리와 "같은 모양/순서"의 row 를 메모리에서 걸러 받도록 한다.
+#   (결과 동일성 유지가 목적이라 필터/정렬은 기존 SQL 조건을 그대로 Python 으로 옮김)
+
+import json
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from db import fetch_all
+
+from .insights_kernels import RawEventColumns, build_raw_event_columns
+
+
+def _parse_events_raw_to_list(data_json: str) -> List[Dict[str, Any]]:
+    """match_events_raw.data_json을 최대한 관대하게 파싱해서 '이벤트 리스트'만 뽑는다."""
+    if not data_json:
+        return []
+    try:
+        obj = json.loads(data_json)
+    except Exception:
+        return []
+
+    # API-Sports 형태: {"response":[...]} / {"events":[...]} / 혹은 바로 [...]
+    if isinstance(obj, list):
+        return [e for e in obj if isinstance(e, dict)]
+    if isinstance(obj, dict):
+        if isinstance(obj.get("response"), list):
+            return [e for e in obj.get("response") if isinstance(e, dict)]
+        if isinstance(obj.get("events"), list):
+            return [e for e in obj.get("events") if isinstance(e, dict)]
+    return []
+
+
+def _lower(v: Any) -> str:
+    return str(v or "").lower()
+
+
+class InsightsSample:
+    """
+    한 팀의 insights 샘플.
+
+    - matches(): FINISHED + FT 스코어 존재 경기 (date_utc DESC)  ← 모든 enricher 공통 베이스
+    - goal_card_events() / goal_events(): match_events (fixture_id, minute, extra, id 순)
+    - team_stats(): match_team_stats (코너/카드)
+    - raw_events(): match_events_raw 파싱 결과 (raw_columns(): 컬럼 형태)
+    """
+
+    def __init__(
+        self,
+        *,
+        league_ids: List[int],
+        season_int: int,
+        team_id: int,
+        ref_date_utc: Any = None,
+    ) -> None:
+        self.league_ids = list(league_ids)
+        self.season_int = season_int
+        self.team_id = team_id
+        self.ref_date_utc = ref_date_utc
+
+        self._matches: Optional[List[Dict[str, Any]]] = None
+        self._events: Dict[int, List[Dict[str, Any]]] = {}
+        self._stats: Dict[int, List[Dict[str, Any]]] = {}
+        self._raw: Dict[int, Optional[List[Dict[str, Any]]]] = {}
+        self._raw_cols: Dict[Tuple[int, ...], RawEventColumns] = {}
+
+    # ─────────────────────────────────────
+    #  matches
+    # ─────────────────────────────────────
+
+    def _load_matches(self) -> List[Dict[str, Any]]:
+        if self._matches is not None:
+            return self._matches
+
+        if not self.league_ids:
+            self._matches = []
+            return self._matches
+
+        placeholders = ",".join(["%s"] * len(self.league_ids))
+        cutoff_sql = " AND m.date_utc < %s" if self.ref_date_utc is not None else ""
+
+        sql = f"""
+            SELECT
+                m.fixture_id,
+                m.home_id,
+                m.away_id,
+                m.home_ht,
+                m.away_ht,
+                m.home_ft,
+                m.away_ft,
+                m.status_group,
+                m.date_utc
+            FROM matches m
+            WHERE m.league_id IN ({placeholders})
+              AND m.season    = %s
+              AND (m.home_id = %s OR m.away_id = %s)
+              AND lower(m.status_group) = 'finished'
+              AND m.home_ft IS NOT NULL
+              AND m.away_ft IS NOT NULL
+              {cutoff_sql}
+            ORDER BY m.date_utc DESC
+        """
+
+        params: List[Any] = []
+        params.extend(self.league_ids)
+        params.extend([self.season_int, self.team_id, self.team_id])
+        if self.ref_date_utc is not None:
+            params.append(self.ref_date_utc)
+
+        self._matches = fetch_all(sql, tuple(params)) or []
+        return self._matches
+
+    def matches(self, *, require_ht: bool = False) -> List[Dict[str, Any]]:
+        """
+        require_ht=True 면 HT 스코어까지 있는 경기만 (1H/2H/Game State 기준).
+        last_n 슬라이스는 호출 측에서 (필터 후 슬라이스 순서 유지).
+        """
+        rows = self._load_matches()
+        if not require_ht:
+            return list(rows)
+        return [r for r in rows if r.get("home_ht") is not None and r.get("away_ht") is not None]
+
+    # ─────────────────────────────────────
+    #  match_events
+    # ─────────────────────────────────────
+
+    def _ensure_events(self, fixture_ids: Iterable[int]) -> None:
+        missing = [int(fx) for fx in fixture_ids if int(fx) not in self._events]
+        if not missing:
+            return
+        for fx in missing:
+            self._events[fx] = []
+
+        in_fix = ",".join(["%s"] * len(missing))
+        ev_rows = fetch_all(
+            f"""
+            SELECT
+                e.id,
+                e.fixture_id,
+                e.team_id,
+                e.type,
+                e.detail,
+                e.minute,
+                COALESCE(e.extra, 0) AS extra
+            FROM match_events e
+            WHERE e.fixture_id IN ({in_fix})
+              AND lower(e.type) IN ('goal','card')
+            ORDER BY e.fixture_id, e.minute, COALESCE(e.extra,0), e.id
+            """,
+            tuple(missing),
+        ) or []
+        for ev in ev_rows:
+            try:
+                fx = int(ev.get("fixture_id"))
+            except Exception:
+                continue
+            self._events.setdefault(fx, []).append(ev)
+
+    def _events_for(
+        self,
+        fixture_ids: List[int],
+        *,
+        types: Tuple[str, ...],
+        max_minute: Optional[int],
+    ) -> List[Dict[str, Any]]:
+        self._ensure_events(fixture_ids)
+        out: List[Dict[str, Any]] = []
+        # 기존 SQL 의 ORDER BY e.fixture_id 와 같도록 fixture_id 오름차순
+        for fx in sorted(set(int(x) for x in fixture_ids)):
+            for ev in self._events.get(fx) or []:
+                if _lower(ev.get("type")) not in types:
+                    continue
+                if max_minute is not None:
+                    m = ev.get("minute")
+                    if m is None or int(m) > max_minute:
+                        continue
+                out.append(ev)
+        return out
+
+    def goal_card_events(self, fixture_ids: List[int]) -> List[Dict[str, Any]]:
+        """lower(type) IN ('goal','card') AND minute <= 90"""
+        return self._events_for(fixture_ids, types=("goal", "card"), max_minute=90)
+
+    def goal_events(self, fixture_ids: List[int], *, max_minute: Optional[int] = 90) -> List[Dict[str, Any]]:
+        """lower(type) = 'goal' (max_minute=None 이면 연장 포함 전체)"""
+        return self._events_for(fixture_ids, types=("goal",), max_minute=max_minute)
+
+    # ─────────────────────────────────────
+    #  match_team_stats
+    # ─────────────────────────────────────
+
+    def team_stats(self, fixture_ids: List[int]) -> List[Dict[str, Any]]:
+        """name IN ('Corner Kicks','Yellow Cards','Red Cards')"""
+        missing = [int(fx) for fx in fixture_ids if int(fx) not in self._stats]
+        if missing:
+            for fx in missing:
+                self._stats[fx] = []
+            in_fix = ",".join(["%s"] * len(missing))
+            s_rows = fetch_all(
+                f"""
+                SELECT fixture_id, team_id, name, value
+                FROM match_team_stats
+                WHERE fixture_id IN ({in_fix})
+                  AND name IN ('Corner Kicks','Yellow Cards','Red Cards')
+                """,
+                tuple(missing),
+            ) or []
+            for sr in s_rows:
+                try:
+                    fx = int(sr.get("fixture_id"))
+                except Exception:
+                    continue
+                self._stats.setdefault(fx, []).append(sr)
+
+        out: List[Dict[str, Any]] = []
+        for fx in fixture_ids:
+            out.extend(self._stats.get(int(fx)) or [])
+        return out
+
+    # ─────────────────────────────────────
+    #  match_events_raw (파싱 1회)
+    # ─────────────────────────────────────
+
+    def raw_events(self, fixture_ids: List[int]) -> List[Tuple[int, List[Dict[str, Any]]]]:
+        """
+        [(fixture_id, 파싱된 이벤트 리스트)] — raw row 가 있는 fixture 만.
+        """
+        missing = [int(fx) for fx in fixture_ids if int(fx) not in self._raw]
+        if missing:
+            for fx in missing:
+                self._raw[fx] = None
+            in_fix = ",".join(["%s"] * len(missing))
+            raw_rows = fetch_all(
+                f"""
+                SELECT fixture_id, data_json
+                FROM match_events_raw
+                WHERE fixture_id IN ({in_fix})
+                """,
+                tuple(missing),
+            ) or []
+            for r in raw_rows:
+                try:
+                    fx = int(r.get("fixture_id"))
+                except Exception:
+                    continue
+                self._raw[fx] = _parse_events_raw_to_list(r.get("data_json") or "")
+
+        out: List[Tuple[int, List[Dict[str, Any]]]] = []
+        for fx in fixture_ids:
+            evs = self._raw.get(int(fx))
+            if evs is not None:
+                out.append((int(fx), evs))
+        return out
+
+    def raw_columns(self, fixture_ids: List[int]) -> RawEventColumns:
+        """
+        raw_events() 의 컬럼 형태 (insights_kernels). 같은 fixture 집합이면 1회만 변환.
+        """
+        key = tuple(int(fx) for fx in fixture_ids)
+        cols = self._raw_cols.get(key)
+        if cols is None:
+            cols = build_raw_event_columns(self.raw_events(list(key)))
+            self._raw_cols[key] = cols
+        return cols
@@ -11,6 +11,7 @@ from typing import Any, Dict, List, Tuple
 
 from db import fetch_all, fetch_one, execute
 from notifications.fcm_client import FCMClient
+from services.live_change_notify import LiveChangeListener
 
 log = logging.getLogger("match_event_worker")
 logging.basicConfig(level=logging.INFO)
@@ -1275,14 +1276,31 @@ def run_forever(interval_seconds: int = 10) -> None:
 
     # --------------------------
     # NORMAL LOOP
+    # - interval_seconds 마다 전체 스캔 (fallback)
+    # - 그 사이엔 live 워커의 NOTIFY(score/status/redcard)를 기다렸다가 해당 경기만 바로 처리
     # --------------------------
+    listener = LiveChangeListener()
+    next_full_scan = 0.0
     while True:
+        if time.time() >= next_full_scan:
+            try:
+                run_once(fcm)
+            except Exception:
+                log.exception("Error while processing matches in worker loop")
+            next_full_scan = time.time() + interval_seconds
+
+        changes = listener.wait(max(0.5, next_full_scan - time.time()))
+        if not changes:
+            continue
         try:
-            run_once(fcm)
+            subscribed = set(get_subscribed_matches())
+            for match_id, reason in changes.items():
+                if match_id not in subscribed:
+                    continue
+                log.info("Live change match_id=%s reason=%s → processing now", match_id, reason)
+                process_match(fcm, match_id)
         except Exception:
-            log.exception("Error while processing matches in worker loop")
-
-        time.sleep(interval_seconds)
+            log.exception("Error while processing notified matches")
 
 
 
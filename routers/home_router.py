@@ -11,6 +11,12 @@ from services.home_service import (
     get_team_insights_overall_with_filters,
     get_team_seasons,
 )
+from services.response_cache import (
+    RESPONSE_CACHE_TTL_IDLE,
+    cache_get,
+    cache_set,
+    make_cache_key,
+)
 
 # /api/home 로 시작하는 모든 엔드포인트
 home_bp = Blueprint("home", __name__, url_prefix="/api/home")
@@ -72,12 +78,25 @@ def route_home_leagues():
         if parsed:
             league_ids = parsed
 
+    # 리그 탭 목록은 경기 상태와 무관(그날 경기 유무만) → 긴 TTL 로 캐시
+    cache_key = make_cache_key(
+        "home_leagues",
+        date=date_str.strip(),
+        tz=timezone_str.strip(),
+        league_ids=sorted(set(league_ids or [])),
+    )
+    cached = cache_get(cache_key)
+    if cached is not None:
+        return jsonify(cached)
+
     rows = get_home_leagues(
         date_str=date_str,
         timezone_str=timezone_str,
         league_ids=league_ids,
     )
-    return jsonify({"ok": True, "rows": rows})
+    payload = {"ok": True, "rows": rows}
+    cache_set(cache_key, payload, RESPONSE_CACHE_TTL_IDLE)
+    return jsonify(payload)
 
 
 # ─────────────────────────────────────
@@ -101,7 +101,7 @@ def match_detail_bundle():
                     # 문자열로 축약해서 헤더 1개에 담기
                     # 예: total=1.05;header=0.12;stats=0.40...
                     parts = []
-                    for k in ("total","header","form","timeline","lineups","stats","h2h","standings","insights","ai"):
+                    for k in ("total","header","form","timeline","lineups","stats","h2h","standings","insights","ai","blocks","conn_wait"):
                         v = perf.get(k)
                         if isinstance(v, (int, float)):
                             parts.append(f"{k}={v:.3f}")
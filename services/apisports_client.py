@@ -0,0 +1,307 @@
+# services/apisports_client.py
+#
+# API-Sports 공용 레이트리밋 HTTP 헬퍼 (football / hockey / nba 워커 공용)
+#
+# 배경:
+# - live_status_worker.api_get 의 토큰버킷은 함수 속성에 있었고,
+#   hockey/nba/postmatch/bootstrap 클라이언트는 각자 재시도/백오프만 있고 "예산"을 공유하지 않았다.
+#   → 여러 워커가 같이 돌면 429 가 몰려서 터짐
+#
+# 제공:
+# - apisports_get(bucket, url, ...) : 토큰 획득 → GET → 429 면 Retry-After 만큼 "버킷 전체"를 멈춤
+#   (재시도/응답 파싱/에러 분류는 호출 측 기존 로직 그대로)
+# - 버킷은 이름 단위 (API-Sports 는 종목별 API 마다 쿼터가 따로라서 "football" / "hockey" / "nba")
+# - 프로세스 내: threading.Lock 으로 보호되는 토큰버킷 (스레드 안전)
+# - 프로세스 간 (선택): RATE_LIMIT_SHARED=1 이면 Postgres 테이블(api_rate_limit_buckets)의
+#   한 행을 UPDATE ... RETURNING 으로 원자적으로 차감해서 여러 워커 프로세스가 같은 예산을 나눠 씀
+#   (DB 오류 시 프로세스 로컬 버킷으로 자동 폴백)
+# - 지표: prometheus 카운터(있으면) + rate_limit_stats() 딕셔너리 (토큰 대기 시간 / 429 횟수)
+#
+# ENV:
+#   RATE_LIMIT_PER_MIN_<BUCKET> / RATE_LIMIT_BURST_<BUCKET>   (예: RATE_LIMIT_PER_MIN_HOCKEY)
+#   football 버킷은 기존 RATE_LIMIT_PER_MIN / RATE_LIMIT_BURST 도 그대로 읽는다 (하위 호환)
+#   값이 없거나 0 이면 해당 버킷은 제한 없음 (429 Retry-After 정지만 적용)
+#   RATE_LIMIT_SHARED=1, RATE_LIMIT_DATABASE_URL (없으면 DATABASE_URL)
+
+import os
+import threading
+import time
+from typing import Any, Dict, Optional
+
+import requests
+
+try:
+    from prometheus_client import Counter  # type: ignore
+
+    _API_REQUESTS = Counter(
+        "sportsstatsx_apisports_requests_total", "API-Sports requests by bucket", ["bucket"]
+    )
+    _API_RATE_LIMITED = Counter(
+        "sportsstatsx_apisports_rate_limited_total", "API-Sports 429 responses by bucket", ["bucket"]
+    )
+    _API_TOKEN_WAIT = Counter(
+        "sportsstatsx_apisports_token_wait_seconds_total", "Seconds spent waiting for rate limit tokens", ["bucket"]
+    )
+except Exception:  # prometheus_client 미설치 환경
+    _API_REQUESTS = None
+    _API_RATE_LIMITED = None
+    _API_TOKEN_WAIT = None
+
+
+# ─────────────────────────────────────
+#  설정
+# ─────────────────────────────────────
+
+def _env_float(name: str) -> float:
+    try:
+        return float(os.environ.get(name, "0") or "0")
+    except Exception:
+        return 0.0
+
+
+def _bucket_config(bucket: str) -> Dict[str, float]:
+    key = bucket.upper()
+    per_min = _env_float(f"RATE_LIMIT_PER_MIN_{key}")
+    burst = _env_float(f"RATE_LIMIT_BURST_{key}")
+    if bucket == "football":
+        per_min = per_min or _env_float("RATE_LIMIT_PER_MIN")
+        burst = burst or _env_float("RATE_LIMIT_BURST")
+
+    rate_per_sec = (per_min / 60.0) if per_min > 0 else 0.0
+    max_tokens = burst if burst > 0 else (max(1.0, rate_per_sec * 5) if rate_per_sec > 0 else 0.0)
+    return {"rate": rate_per_sec, "max": max_tokens}
+
+
+RATE_LIMIT_SHARED = (os.environ.get("RATE_LIMIT_SHARED", "0") or "0").strip() in ("1", "true", "yes")
+
+
+# ─────────────────────────────────────
+#  프로세스 간 공유 (Postgres, 선택)
+# ─────────────────────────────────────
+
+API_RATE_LIMIT_BUCKETS_DDL = """
+CREATE TABLE IF NOT EXISTS api_rate_limit_buckets (
+    bucket        TEXT PRIMARY KEY,
+    tokens        DOUBLE PRECISION NOT NULL,
+    ts            DOUBLE PRECISION NOT NULL,
+    blocked_until DOUBLE PRECISION NOT NULL DEFAULT 0
+)
+"""
+
+_SHARED: Dict[str, Any] = {"conn": None, "disabled_until": 0.0}
+_SHARED_LOCK = threading.Lock()
+
+
+def _shared_conn():
+    """
+    autocommit 커넥션 1개를 프로세스에서 재사용 (_SHARED_LOCK 안에서만 사용).
+    db.py 풀을 쓰지 않는 이유: hockey/nba 워커는 다른 DB 를 쓰므로 import 하면 안 됨.
+    """
+    conn = _SHARED.get("conn")
+    if conn is not None and not conn.closed:
+        return conn
+
+    import psycopg  # 공유 모드에서만 필요
+
+    dsn = os.environ.get("RATE_LIMIT_DATABASE_URL") or os.environ.get("DATABASE_URL")
+    if not dsn:
+        raise RuntimeError("RATE_LIMIT_DATABASE_URL (or DATABASE_URL) is not set")
+    conn = psycopg.connect(dsn, autocommit=True, connect_timeout=5)
+    conn.execute(API_RATE_LIMIT_BUCKETS_DDL)
+    _SHARED["conn"] = conn
+    return conn
+
+
+def _shared_reserve(bucket: str, cfg: Dict[str, float]) -> Optional[float]:
+    """
+    공유 버킷에서 토큰 1개 예약 → 기다려야 할 초 (0 이면 바로). 실패하면 None (로컬 폴백).
+    """
+    if time.time() < float(_SHARED.get("disabled_until") or 0.0):
+        return None
+    rate, max_t = cfg["rate"], cfg["max"]
+    try:
+        with _SHARED_LOCK:
+            conn = _shared_conn()
+            row = conn.execute(
+                """
+                INSERT INTO api_rate_limit_buckets AS b (bucket, tokens, ts)
+                VALUES (%s, %s::float8 - 1, extract(epoch from clock_timestamp()))
+                ON CONFLICT (bucket) DO UPDATE SET
+                    tokens = LEAST(
+                        %s::float8,
+                        b.tokens + GREATEST(0, extract(epoch from clock_timestamp()) - b.ts) * %s::float8
+                    ) - 1,
+                    ts = extract(epoch from clock_timestamp())
+                RETURNING tokens, blocked_until, ts
+                """,
+                (bucket, max_t, max_t, rate),
+            ).fetchone()
+    except Exception as e:
+        # DB 문제로 API 호출까지 막히면 안 됨 → 1분간 로컬 버킷 사용
+        _SHARED["disabled_until"] = time.time() + 60.0
+        _SHARED["conn"] = None
+        print(f"[apisports_client] shared rate limit disabled for 60s: {e}", flush=True)
+        return None
+
+    tokens, blocked_until, now_db = float(row[0]), float(row[1] or 0.0), float(row[2])
+    wait = (-tokens / rate) if (tokens < 0 and rate > 0) else 0.0
+    return max(wait, blocked_until - now_db)
+
+
+def _shared_block(bucket: str, seconds: float) -> None:
+    if time.time() < float(_SHARED.get("disabled_until") or 0.0):
+        return
+    try:
+        with _SHARED_LOCK:
+            _shared_conn().execute(
+                """
+                UPDATE api_rate_limit_buckets
+                SET blocked_until = GREATEST(blocked_until, extract(epoch from clock_timestamp()) + %s::float8)
+                WHERE bucket = %s
+                """,
+                (float(seconds), bucket),
+            )
+    except Exception:
+        _SHARED["conn"] = None
+
+
+# ─────────────────────────────────────
+#  프로세스 로컬 토큰버킷
+# ─────────────────────────────────────
+
+class TokenBucket:
+    """
+    스레드 안전 토큰버킷.
+    - 락 안에서는 토큰 예약만 하고(음수 허용) 대기는 락 밖에서 → 동시 호출이 1/rate 간격으로 풀림
+    - block(sec): 429 Retry-After 동안 버킷 전체 정지 (rate 0 인 버킷에도 적용)
+    """
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        cfg = _bucket_config(name)
+        self.rate = cfg["rate"]
+        self.max_tokens = cfg["max"]
+        self.tokens = self.max_tokens
+        self.ts = time.time()
+        self.blocked_until = 0.0
+        self.waited_sec = 0.0
+        self.requests = 0
+        self.rate_limited = 0
+        self._lock = threading.Lock()
+
+    def _reserve_local(self) -> float:
+        with self._lock:
+            now_ts = time.time()
+            wait = max(0.0, self.blocked_until - now_ts)
+            if self.rate > 0 and self.max_tokens > 0:
+                elapsed = max(0.0, now_ts - self.ts)
+                tokens = min(self.max_tokens, self.tokens + elapsed * self.rate) - 1.0
+                self.tokens = tokens
+                self.ts = now_ts
+                if tokens < 0:
+                    wait = max(wait, -tokens / self.rate)
+            return wait
+
+    def acquire(self) -> float:
+        """
+        토큰 1개 획득 (필요하면 sleep). 반환: 기다린 초.
+        """
+        wait: Optional[float] = None
+        if RATE_LIMIT_SHARED and self.rate > 0 and self.max_tokens > 0:
+            wait = _shared_reserve(self.name, {"rate": self.rate, "max": self.max_tokens})
+            if wait is not None:
+                # 공유 예약이 성공해도 이 프로세스에서 받은 429 정지는 지킨다
+                with self._lock:
+                    wait = max(wait, self.blocked_until - time.time())
+        if wait is None:
+            wait = self._reserve_local()
+
+        if wait > 0:
+            time.sleep(wait)
+        with self._lock:
+            self.requests += 1
+            self.waited_sec += max(0.0, wait)
+
+        if _API_REQUESTS is not None:
+            _API_REQUESTS.labels(bucket=self.name).inc()
+            if wait > 0:
+                _API_TOKEN_WAIT.labels(bucket=self.name).inc(wait)
+        return max(0.0, wait)
+
+    def block(self, seconds: float) -> None:
+        seconds = max(0.0, float(seconds))
+        with self._lock:
+            self.rate_limited += 1
+            self.blocked_until = max(self.blocked_until, time.time() + seconds)
+        if RATE_LIMIT_SHARED:
+            _shared_block(self.name, seconds)
+        if _API_RATE_LIMITED is not None:
+            _API_RATE_LIMITED.labels(bucket=self.name).inc()
+
+
+_BUCKETS: Dict[str, TokenBucket] = {}
+_BUCKETS_LOCK = threading.Lock()
+
+
+def get_bucket(name: str) -> TokenBucket:
+    b = _BUCKETS.get(name)
+    if b is not None:
+        return b
+    with _BUCKETS_LOCK:
+        b = _BUCKETS.get(name)
+        if b is None:
+            b = TokenBucket(name)
+            _BUCKETS[name] = b
+        return b
+
+
+def rate_limit_stats() -> Dict[str, Dict[str, Any]]:
+    """
+    버킷별 누적 지표 (워커 로그용): requests / waited_sec / rate_limited
+    """
+    out: Dict[str, Dict[str, Any]] = {}
+    for name, b in list(_BUCKETS.items()):
+        out[name] = {
+            "requests": b.requests,
+            "waited_sec": round(b.waited_sec, 2),
+            "rate_limited": b.rate_limited,
+        }
+    return out
+
+
+# ─────────────────────────────────────
+#  GET
+# ─────────────────────────────────────
+
+def parse_retry_after(resp: requests.Response, default: float = 1.0) -> float:
+    ra = resp.headers.get("Retry-After")
+    try:
+        return float(ra) if ra else float(default)
+    except Exception:
+        return float(default)
+
+
+def apisports_get(
+    bucket: str,
+    url: str,
+    *,
+    params: Optional[Dict[str, Any]] = None,
+    headers: Optional[Dict[str, str]] = None,
+    timeout: float = 30,
+    session: Optional[requests.Session] = None,
+    retry_after_default: float = 1.0,
+    retry_after_max: float = 60.0,
+) -> requests.Response:
+    """
+    토큰 획득 후 GET 1회. 재시도는 하지 않는다 (호출 측 기존 재시도/백오프 유지).
+
+    429 면 Retry-After(없으면 retry_after_default, 최대 retry_after_max) 동안
+    같은 버킷을 쓰는 모든 스레드(공유 모드면 모든 프로세스)를 멈추고, 응답은 그대로 반환한다.
+    """
+    b = get_bucket(bucket)
+    b.acquire()
+    getter = session.get if session is not None else requests.get
+    r = getter(url, params=params, headers=headers, timeout=timeout)
+    if r.status_code == 429:
+        b.block(min(parse_retry_after(r, retry_after_default), retry_after_max))
+    return r
@@ -0,0 +1,357 @@
+# services/fixture_list_rows.py
+#
+# 목적:
+# - /api/fixtures, /api/fixtures_by_ids 의 "리스트 1줄"을 미리 계산해 두는 projection 테이블
+#   (fixture_list_rows) 관리
+# - 요청마다 teams x2 / leagues / countries(LOWER(TRIM)) 조인 + raw jsonb 파싱(ET/PEN)
+#   + match_events 레드카드 상관 서브쿼리를 하던 것을 "쓰기 시점"으로 옮긴다.
+#
+# 갱신 주체(워커):
+# - live_status_worker.py  : live / events / fixtures(scan, recheck, watchdog, postmatch)
+# - football/workers/postmatch_backfill.py / schedule_sync.py : matches upsert 직후
+# - 누락 보정: fixtures 역할이 FIXTURE_LIST_REPAIR_SEC 마다 최근 구간에서 projection 에 없는 경기만 채움
+#
+# 생성 / 초기 채움 (오프라인, 1회):
+# - python db/migrate/fill_fixture_list_rows.py
+#   테이블 → matches 전체 채움 → 마지막에 idx_fixture_list_rows_kickoff 생성 ("채움 완료" 표시)
+# - 워커 시작 시 ensure 는 테이블 DDL 만 (전체 채움은 하지 않음)
+#
+# 읽기 주체(API):
+# - main.py list_fixtures / fixtures_by_ids
+#   * fixture_list_rows_ready() (kickoff 인덱스 존재) 일 때만 projection, 아니면 기존 JOIN 쿼리
+#   * override(match_overrides) 병합은 여전히 읽기 시점에 수행(관리자 수정 즉시 반영)
+
+import os
+import time
+from typing import Any, Dict, Iterable, List
+
+from db import execute, fetch_one
+
+from .matches_kickoff import kickoff_sql
+
+
+# ─────────────────────────────────────
+#  DDL
+# ─────────────────────────────────────
+
+FIXTURE_LIST_ROWS_DDL = """
+CREATE TABLE IF NOT EXISTS fixture_list_rows (
+    fixture_id           BIGINT PRIMARY KEY,
+    league_id            INTEGER NOT NULL,
+    season               INTEGER,
+    date_utc             TEXT,
+    kickoff_utc          TIMESTAMPTZ,
+    status_group         TEXT,
+    status               TEXT,
+    elapsed              INTEGER,
+    status_long          TEXT,
+    home_id              INTEGER,
+    away_id              INTEGER,
+    home_ft              INTEGER,
+    away_ft              INTEGER,
+    home_ht              INTEGER,
+    away_ht              INTEGER,
+    venue_name           TEXT,
+    league_round         TEXT,
+    home_name            TEXT,
+    away_name            TEXT,
+    home_logo            TEXT,
+    away_logo            TEXT,
+    league_name          TEXT,
+    league_logo          TEXT,
+    league_country       TEXT,
+    league_country_flag  TEXT,
+    home_et              INTEGER,
+    away_et              INTEGER,
+    home_pen             INTEGER,
+    away_pen             INTEGER,
+    home_red_cards       INTEGER,
+    away_red_cards       INTEGER,
+    updated_utc          TIMESTAMPTZ DEFAULT now()
+)
+"""
+
+# idx_fixture_list_rows_kickoff 는 "초기 채움까지 끝났다"는 표시로도 쓰이므로 항상 마지막에 만든다.
+FIXTURE_LIST_ROWS_INDEXES = (
+    "CREATE INDEX IF NOT EXISTS idx_fixture_list_rows_league_kickoff ON fixture_list_rows (league_id, kickoff_utc)",
+    "CREATE INDEX IF NOT EXISTS idx_fixture_list_rows_kickoff ON fixture_list_rows (kickoff_utc)",
+)
+
+# 아직 준비 안 됨(False)도 이 시간 동안은 캐시 → 마이그레이션 전에도 요청마다 카탈로그 조회하지 않음
+FIXTURE_LIST_ROWS_RECHECK_SEC = float(os.environ.get("FIXTURE_LIST_ROWS_RECHECK_SEC", "60"))
+# 누락 보정 구간 (킥오프 기준 과거/미래 일수)
+FIXTURE_LIST_REPAIR_DAYS_BACK = int(os.environ.get("FIXTURE_LIST_REPAIR_DAYS_BACK", "3"))
+FIXTURE_LIST_REPAIR_DAYS_AHEAD = int(os.environ.get("FIXTURE_LIST_REPAIR_DAYS_AHEAD", "14"))
+
+# projection 컬럼 순서 (INSERT / SELECT / UPDATE SET 공용)
+_COLUMNS = (
+    "fixture_id",
+    "league_id",
+    "season",
+    "date_utc",
+    "kickoff_utc",
+    "status_group",
+    "status",
+    "elapsed",
+    "status_long",
+    "home_id",
+    "away_id",
+    "home_ft",
+    "away_ft",
+    "home_ht",
+    "away_ht",
+    "venue_name",
+    "league_round",
+    "home_name",
+    "away_name",
+    "home_logo",
+    "away_logo",
+    "league_name",
+    "league_logo",
+    "league_country",
+    "league_country_flag",
+    "home_et",
+    "away_et",
+    "home_pen",
+    "away_pen",
+    "home_red_cards",
+    "away_red_cards",
+)
+
+# 읽기(API)에서 쓰는 컬럼 목록 (main.py SELECT 용)
+FIXTURE_LIST_ROW_SELECT_SQL = ",\n            ".join(f"m.{c}" for c in _COLUMNS)
+
+_RED_DETAIL_SQL = "('Red Card','Second Yellow card','Second Yellow Card')"
+
+# date_utc(TEXT) → kickoff_utc. 형식이 깨진 row 하나 때문에 set-based refresh 전체가 실패하지 않도록
+# ISO-8601 모양(월/일/시/분 범위 포함)일 때만 캐스팅, 아니면 NULL
+_KICKOFF_FROM_DATE_SQL = r"""CASE
+                WHEN m.date_utc::text ~ '^\d{4}-(0[1-9]|1[0-2])-(0[1-9]|[12]\d|3[01])([T ]([01]\d|2[0-3]):[0-5]\d(:[0-5]\d(\.\d+)?)?)?(Z|[+-]\d{2}(:?\d{2})?)?$'
+                THEN m.date_utc::text::timestamptz
+            END"""
+
+
+# ─────────────────────────────────────
+#  테이블 존재 확인 (프로세스 캐시)
+# ─────────────────────────────────────
+
+_TABLE_OK: Dict[str, bool] = {}
+# False 판정 시각 (name -> ts), FIXTURE_LIST_ROWS_RECHECK_SEC 동안 재조회 안 함
+_TABLE_MISS_TS: Dict[str, float] = {}
+
+
+def _table_exists(name: str) -> bool:
+    """
+    to_regclass 로 존재 확인. True 는 영구, False 는 FIXTURE_LIST_ROWS_RECHECK_SEC 동안 캐시.
+    (워커 / 마이그레이션이 나중에 만들 수 있으니 False 는 짧게만)
+    """
+    if _TABLE_OK.get(name):
+        return True
+    miss_ts = _TABLE_MISS_TS.get(name)
+    if miss_ts is not None and time.time() - miss_ts < FIXTURE_LIST_ROWS_RECHECK_SEC:
+        return False
+    try:
+        row = fetch_one("SELECT to_regclass(%s) AS t", (f"public.{name}",))
+        ok = bool(row and row.get("t"))
+    except Exception:
+        ok = False
+    if ok:
+        _TABLE_OK[name] = True
+        _TABLE_MISS_TS.pop(name, None)
+    else:
+        _TABLE_MISS_TS[name] = time.time()
+    return ok
+
+
+def fixture_list_rows_available() -> bool:
+    """
+    테이블 존재 (워커 쓰기용). 초기 채움 전이라도 쓰기는 해 둔다.
+    """
+    return _table_exists("fixture_list_rows")
+
+
+def fixture_list_rows_ready() -> bool:
+    """
+    API 읽기용: 초기 채움이 끝나 kickoff 인덱스까지 있는 상태.
+    """
+    return _table_exists("idx_fixture_list_rows_kickoff")
+
+
+def ensure_fixture_list_rows_table() -> None:
+    """
+    워커 시작 시 1회 호출: 테이블 DDL 만 (빈 테이블이면 O(1)).
+    - matches 전체 채움과 인덱스는 db/migrate/fill_fixture_list_rows.py
+      (여러 역할/프로세스가 동시에 떠도 무거운 작업을 반복하지 않음)
+    - 채움 전에는 fixture_list_rows_ready() 가 False 라 API 는 기존 JOIN 쿼리를 쓴다
+    """
+    execute(FIXTURE_LIST_ROWS_DDL)
+    _TABLE_OK["fixture_list_rows"] = True
+    _TABLE_MISS_TS.pop("fixture_list_rows", None)
+
+
+# ─────────────────────────────────────
+#  갱신 (INSERT ... SELECT ... ON CONFLICT)
+# ─────────────────────────────────────
+
+def _build_refresh_sql(where_sql: str) -> str:
+    use_mls = _table_exists("match_live_state")
+
+    def _red_count(team_col: str) -> str:
+        return f"""(
+                SELECT COUNT(*) FROM match_events e
+                WHERE e.fixture_id = m.fixture_id
+                  AND e.team_id = m.{team_col}
+                  AND e.type = 'Card'
+                  AND e.detail IN {_RED_DETAIL_SQL}
+            )"""
+
+    # /api/fixtures 기존 정책과 동일: match_live_state 우선, 없으면 events 집계
+    # (countries 는 이름 중복 시 fixture_id 가 2줄이 되어 ON CONFLICT 가 터지므로 LIMIT 1 서브쿼리)
+    if use_mls:
+        home_red_sql = f"COALESCE(mls.home_red, {_red_count('home_id')})"
+        away_red_sql = f"COALESCE(mls.away_red, {_red_count('away_id')})"
+        mls_join = "LEFT JOIN match_live_state mls ON mls.fixture_id = m.fixture_id"
+    else:
+        home_red_sql = _red_count("home_id")
+        away_red_sql = _red_count("away_id")
+        mls_join = ""
+
+    col_sql = ", ".join(_COLUMNS)
+    upd_sql = ",\n            ".join(f"{c} = EXCLUDED.{c}" for c in _COLUMNS if c != "fixture_id")
+    diff_sql = " OR\n            ".join(
+        f"fixture_list_rows.{c} IS DISTINCT FROM EXCLUDED.{c}" for c in _COLUMNS if c != "fixture_id"
+    )
+
+    return f"""
+        INSERT INTO fixture_list_rows ({col_sql}, updated_utc)
+        SELECT
+            m.fixture_id,
+            m.league_id,
+            m.season,
+            m.date_utc::text,
+            {_KICKOFF_FROM_DATE_SQL},
+            m.status_group,
+            m.status,
+            m.elapsed,
+            m.status_long,
+            m.home_id,
+            m.away_id,
+            m.home_ft,
+            m.away_ft,
+            m.home_ht,
+            m.away_ht,
+            m.venue_name,
+            m.league_round,
+            th.name,
+            ta.name,
+            th.logo,
+            ta.logo,
+            l.name,
+            l.logo,
+            l.country,
+            (
+                SELECT c.flag FROM countries c
+                WHERE LOWER(TRIM(c.name)) = LOWER(TRIM(l.country))
+                LIMIT 1
+            ),
+            NULLIF(rf.data_json::jsonb->'score'->'extratime'->>'home', '')::int,
+            NULLIF(rf.data_json::jsonb->'score'->'extratime'->>'away', '')::int,
+            NULLIF(rf.data_json::jsonb->'score'->'penalty'->>'home', '')::int,
+            NULLIF(rf.data_json::jsonb->'score'->'penalty'->>'away', '')::int,
+            {home_red_sql},
+            {away_red_sql},
+            now()
+        FROM matches m
+        JOIN teams th ON th.id = m.home_id
+        JOIN teams ta ON ta.id = m.away_id
+        JOIN leagues l ON l.id = m.league_id
+        LEFT JOIN match_fixtures_raw rf ON rf.fixture_id = m.fixture_id
+        {mls_join}
+        WHERE {where_sql}
+        ON CONFLICT (fixture_id) DO UPDATE SET
+            {upd_sql},
+            updated_utc = EXCLUDED.updated_utc
+        WHERE
+            {diff_sql}
+    """
+
+
+def _norm_ids(ids: Iterable[Any]) -> List[int]:
+    out: List[int] = []
+    seen = set()
+    for x in ids or []:
+        try:
+            v = int(x)
+        except Exception:
+            continue
+        if v in seen:
+            continue
+        seen.add(v)
+        out.append(v)
+    return out
+
+
+def refresh_fixture_list_rows(fixture_ids: Iterable[Any]) -> int:
+    """
+    fixture_id 목록의 projection 을 한 번의 set-based 쿼리로 재계산.
+    - matches 에 없는(또는 teams/leagues 메타가 아직 없는) fixture 는 건너뛴다.
+    - projection 테이블이 없으면 아무것도 하지 않는다.
+    반환: 대상 fixture 수
+    """
+    ids = _norm_ids(fixture_ids)
+    if not ids:
+        return 0
+    if not fixture_list_rows_available():
+        return 0
+
+    execute(_build_refresh_sql("m.fixture_id = ANY(%s)"), (ids,))
+    return len(ids)
+
+
+def refresh_fixture_list_rows_for_teams(team_ids: Iterable[Any]) -> int:
+    """
+    팀 메타(teams)가 새로 채워졌을 때 해당 팀 경기들의 projection 재계산.
+    (teams JOIN 이 안 돼서 projection 에서 빠져 있던 경기 복구용)
+    """
+    ids = _norm_ids(team_ids)
+    if not ids:
+        return 0
+    if not fixture_list_rows_available():
+        return 0
+
+    execute(
+        _build_refresh_sql("(m.home_id = ANY(%s) OR m.away_id = ANY(%s))"),
+        (ids, ids),
+    )
+    return len(ids)
+
+
+def refresh_all_fixture_list_rows() -> None:
+    """
+    matches 전체 재계산(최초 생성 / 수동 복구용). 무거우니 워커 루프에서 호출 금지.
+    (db/migrate/fill_fixture_list_rows.py 도 이 함수를 쓴다 → SELECT 정의는 여기 한 곳뿐)
+    """
+    if not fixture_list_rows_available():
+        return
+    execute(_build_refresh_sql("TRUE"))
+
+
+def repair_missing_fixture_list_rows(
+    days_back: int = FIXTURE_LIST_REPAIR_DAYS_BACK,
+    days_ahead: int = FIXTURE_LIST_REPAIR_DAYS_AHEAD,
+) -> None:
+    """
+    최근 구간(킥오프 기준)에서 projection 에 아직 없는 경기만 채운다 (워커 주기 작업).
+    refresh 를 부르지 않은 writer / 팀 메타가 늦게 들어온 경기 등 누락 보정용.
+    """
+    if not fixture_list_rows_ready():
+        return
+    ko = kickoff_sql("m")
+    execute(
+        _build_refresh_sql(
+            f"""{ko} >= now() - make_interval(days => %s)
+              AND {ko} <  now() + make_interval(days => %s)
+              AND NOT EXISTS (SELECT 1 FROM fixture_list_rows p WHERE p.fixture_id = m.fixture_id)"""
+        ),
+        (int(days_back), int(days_ahead)),
+    )
@@ -0,0 +1,161 @@
+# services/fixture_write_skip.py
+#
+# 목적:
+# - live_status_worker.run_once() 는 매 tick(기본 10초) live=all 의 모든 경기에 대해
+#   fixtures / matches / match_fixtures_raw 업서트를 3번씩 날렸다.
+#   (SQL 의 IS DISTINCT FROM 덕분에 실제 UPDATE 는 안 일어나도, row 마다 커넥션 체크아웃 + 왕복 + raw JSON 전송)
+# - 라이브 경기 응답은 대부분 tick 사이에 그대로라서, "내용 해시"가 같으면 DB 를 아예 건드리지 않는다.
+#
+# 해시:
+# - match_fixtures_raw.data_json 으로 저장되는 문자열 그대로의 md5
+#   → DB 쪽 match_fixtures_raw.data_hash 는 BEFORE INSERT/UPDATE 트리거가 md5(data_json) 로 채움
+#     (schedule_sync / postmatch_backfill / fixtures 워커 등 다른 writer 가 써도 항상 동기화)
+# - 메모리 캐시(fixture_id -> (hash, 마지막 write ts))를 먼저 보고, 없으면 DB 의 data_hash 로 워밍업
+#   (재시작 직후에도 전부 다시 쓰지 않음)
+# - 다른 writer 가 그 사이 덮어썼을 수 있으므로 LIVE_WRITE_SKIP_MAX_AGE_SEC 가 지나면 한 번은 다시 쓴다
+#
+# 마이그레이션: db/migrate/add_match_fixtures_raw_hash.sql (워커 시작 시 ensure 로도 동일 처리)
+
+import hashlib
+import json
+import os
+import time
+from typing import Any, Dict, List, Tuple
+
+from db import execute, fetch_all
+
+
+LIVE_WRITE_SKIP_MAX_AGE_SEC = float(os.environ.get("LIVE_WRITE_SKIP_MAX_AGE_SEC", "120"))
+
+
+# ─────────────────────────────────────
+#  DDL
+# ─────────────────────────────────────
+
+MATCH_FIXTURES_RAW_HASH_COLUMN_DDL = "ALTER TABLE match_fixtures_raw ADD COLUMN IF NOT EXISTS data_hash TEXT"
+
+MATCH_FIXTURES_RAW_HASH_TRIGGER_FUNCTION_SQL = """
+CREATE OR REPLACE FUNCTION match_fixtures_raw_set_data_hash()
+RETURNS TRIGGER AS $$
+BEGIN
+  NEW.data_hash := md5(NEW.data_json::text);
+  RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+"""
+
+MATCH_FIXTURES_RAW_HASH_TRIGGER_SQL = """
+DO $$
+BEGIN
+  IF NOT EXISTS (
+    SELECT 1 FROM pg_trigger WHERE tgname = 'trg_match_fixtures_raw_data_hash'
+  ) THEN
+    CREATE TRIGGER trg_match_fixtures_raw_data_hash
+    BEFORE INSERT OR UPDATE OF data_json ON match_fixtures_raw
+    FOR EACH ROW EXECUTE FUNCTION match_fixtures_raw_set_data_hash();
+  END IF;
+END$$;
+"""
+
+_HASH_COLUMN_OK: Dict[str, bool] = {}
+
+
+def ensure_match_fixtures_raw_hash_column() -> None:
+    """
+    컬럼(NULL 허용, 테이블 rewrite 없음) + 트리거. 기존 row 는 NULL → 처음 보는 tick 에 한 번 쓰면서 채워짐.
+    """
+    try:
+        execute(MATCH_FIXTURES_RAW_HASH_COLUMN_DDL)
+        execute(MATCH_FIXTURES_RAW_HASH_TRIGGER_FUNCTION_SQL)
+        execute(MATCH_FIXTURES_RAW_HASH_TRIGGER_SQL)
+        _HASH_COLUMN_OK["match_fixtures_raw"] = True
+    except Exception as e:
+        print(f"[fixture_write_skip] ensure data_hash failed (memory-only): {e}", flush=True)
+
+
+def fixture_raw_hash_available() -> bool:
+    return bool(_HASH_COLUMN_OK.get("match_fixtures_raw"))
+
+
+# ─────────────────────────────────────
+#  해시
+# ─────────────────────────────────────
+
+def fixture_raw_json(fixture_obj: Dict[str, Any]) -> str:
+    """
+    match_fixtures_raw.data_json 으로 저장하는 문자열 (upsert_match_fixtures_raw 와 같은 직렬화).
+    """
+    return json.dumps(fixture_obj, ensure_ascii=False, separators=(",", ":"))
+
+
+def fixture_content_hash(raw_json: str) -> str:
+    return hashlib.md5(raw_json.encode("utf-8")).hexdigest()
+
+
+# ─────────────────────────────────────
+#  변경 감지
+# ─────────────────────────────────────
+
+# fixture_id -> (hash, 마지막으로 "우리가 확인/기록한" ts)
+_LAST_HASH: Dict[int, Tuple[str, float]] = {}
+
+# 누적 지표 (워커 로그용)
+WRITE_SKIP_STATS: Dict[str, int] = {"skipped": 0, "written": 0}
+
+
+def warm_fixture_hashes(fixture_ids: List[int]) -> None:
+    """
+    메모리에 없는 fixture 의 해시를 DB(data_hash)에서 한 번에 읽어온다.
+    """
+    if not _HASH_COLUMN_OK.get("match_fixtures_raw"):
+        return
+    missing = sorted({int(f) for f in fixture_ids if int(f) not in _LAST_HASH})
+    if not missing:
+        return
+    try:
+        rows = fetch_all(
+            """
+            SELECT fixture_id, data_hash
+            FROM match_fixtures_raw
+            WHERE fixture_id = ANY(%s)
+              AND data_hash IS NOT NULL
+            """,
+            (missing,),
+        )
+    except Exception:
+        return
+    now_ts = time.time()
+    for r in rows or []:
+        try:
+            _LAST_HASH[int(r["fixture_id"])] = (str(r["data_hash"]), now_ts)
+        except Exception:
+            continue
+
+
+def is_fixture_unchanged(fixture_id: int, content_hash: str) -> bool:
+    """
+    True 면 이번 tick 의 fixtures/matches/raw 업서트를 건너뛰어도 된다.
+    """
+    prev = _LAST_HASH.get(int(fixture_id))
+    if prev is None or prev[0] != content_hash:
+        return False
+    if LIVE_WRITE_SKIP_MAX_AGE_SEC > 0 and (time.time() - prev[1]) >= LIVE_WRITE_SKIP_MAX_AGE_SEC:
+        return False
+    return True
+
+
+def mark_fixture_written(fixture_id: int, content_hash: str) -> None:
+    """
+    업서트가 "모두" 성공한 뒤에만 호출 (중간 실패면 다음 tick 에 다시 쓴다).
+    """
+    _LAST_HASH[int(fixture_id)] = (content_hash, time.time())
+
+
+def forget_fixture_hashes(keep_ids: List[int]) -> None:
+    """
+    live=all 에서 빠진 경기는 메모리에서 정리 (장기 실행 시 dict 증가 방지).
+    """
+    keep = {int(f) for f in keep_ids}
+    for fid in list(_LAST_HASH.keys()):
+        if fid not in keep:
+            _LAST_HASH.pop(fid, None)
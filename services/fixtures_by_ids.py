@@ -0,0 +1,108 @@
+# services/fixtures_by_ids.py
+#
+# /fixtures?ids= 묶음 조회 (schedule_sync / postmatch_backfill / live_status_worker.recheck_scheduled_fixtures /
+#                          tools/backfill/backfill_match_fixtures_raw_by_ids 공용)
+#
+# 배경:
+# - 위 경로들은 fixture 마다 /fixtures?id= 를 한 번씩 불렀다 (예정 경기 재검증 50경기 = 50콜, raw 백필 수만 콜).
+# - API-Sports 는 ids=1-2-3 형식으로 최대 20경기를 한 번에 준다 (응답 모양은 id= 단건과 동일).
+#
+# 여기서:
+# - fixture_id 를 FIXTURES_IDS_BATCH(20)개씩 묶어 한 번에 조회
+# - 묶음 호출이 실패하거나 응답에서 빠진 id 만 단건(id=)으로 다시 시도 → 한 경기 때문에 묶음 전체가 날아가지 않음
+# - HTTP 는 호출 측 함수 get_fixtures(params) -> API 응답 dict 를 그대로 씀
+#   (워커마다 세션 / 재시도 / 레이트리밋 버킷이 달라서)
+#
+# ENV:
+#   FIXTURES_IDS_BATCH (20, API-Sports 상한)
+
+import os
+import sys
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+
+FIXTURES_IDS_MAX = 20
+FIXTURES_IDS_BATCH = max(1, min(FIXTURES_IDS_MAX, int(os.environ.get("FIXTURES_IDS_BATCH", "20") or "20")))
+
+
+def _response_items(data: Any) -> List[Dict[str, Any]]:
+    rows = (data.get("response") or []) if isinstance(data, dict) else []
+    return [r for r in rows if isinstance(r, dict)]
+
+
+def _item_fixture_id(item: Dict[str, Any]) -> Optional[int]:
+    try:
+        return int((item.get("fixture") or {}).get("id"))
+    except Exception:
+        return None
+
+
+def _fetch_single(
+    get_fixtures: Callable[[Dict[str, Any]], Any],
+    fixture_id: int,
+    tag: str,
+) -> Optional[Dict[str, Any]]:
+    try:
+        for item in _response_items(get_fixtures({"id": fixture_id})):
+            return item
+    except Exception as e:
+        print(f"[{tag}] single fetch failed fixture_id={fixture_id}: {e}", file=sys.stderr, flush=True)
+    return None
+
+
+def iter_fixtures_by_ids(
+    fixture_ids: Iterable[int],
+    get_fixtures: Callable[[Dict[str, Any]], Any],
+    *,
+    batch_size: Optional[int] = None,
+    tag: str = "fixtures_ids",
+) -> Iterator[Tuple[int, Optional[Dict[str, Any]]]]:
+    """
+    (fixture_id, fixture 객체 또는 None) 을 입력 순서대로 묶음 단위로 내보낸다 (중복 id 는 한 번만).
+    None = 묶음/단건 모두 실패했거나 API 가 해당 경기를 주지 않음.
+    """
+    size = max(1, min(FIXTURES_IDS_MAX, int(batch_size or FIXTURES_IDS_BATCH)))
+
+    ids: List[int] = []
+    seen = set()
+    for f in fixture_ids:
+        fid = int(f)
+        if fid not in seen:
+            seen.add(fid)
+            ids.append(fid)
+
+    for i in range(0, len(ids), size):
+        chunk = ids[i:i + size]
+
+        got: Dict[int, Dict[str, Any]] = {}
+        if len(chunk) > 1:
+            try:
+                for item in _response_items(get_fixtures({"ids": "-".join(str(f) for f in chunk)})):
+                    fid = _item_fixture_id(item)
+                    if fid is not None:
+                        got[fid] = item
+            except Exception as e:
+                print(f"[{tag}] batch fetch failed ({len(chunk)} ids) → single fallback: {e}", file=sys.stderr, flush=True)
+
+        for fid in chunk:
+            item = got.get(fid)
+            if item is None:
+                item = _fetch_single(get_fixtures, fid, tag)
+            yield fid, item
+
+
+def fetch_fixtures_by_ids(
+    fixture_ids: Iterable[int],
+    get_fixtures: Callable[[Dict[str, Any]], Any],
+    *,
+    batch_size: Optional[int] = None,
+    tag: str = "fixtures_ids",
+) -> Dict[int, Dict[str, Any]]:
+    """
+    fixture_id -> fixture 객체 (받지 못한 id 는 빠짐).
+    """
+    return {
+        fid: item
+        for fid, item in iter_fixtures_by_ids(fixture_ids, get_fixtures, batch_size=batch_size, tag=tag)
+        if item is not None
+    }
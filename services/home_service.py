@@ -17,6 +17,8 @@ from matchdetail.insights_block import (
 
 
 from .league_directory_service import build_league_directory
+from .insights_snapshot import load_team_insights_snapshot
+from .matches_kickoff import kickoff_sql
 
 
 
@@ -451,7 +453,7 @@ def get_home_leagues(
         FROM matches m
         JOIN leagues l
           ON m.league_id = l.id
-        WHERE m.date_utc::timestamptz BETWEEN %s AND %s
+        WHERE {kickoff_sql('m')} BETWEEN %s AND %s
           AND m.league_id IN ({placeholders})
         GROUP BY
             m.league_id,
@@ -595,7 +597,7 @@ def get_home_league_directory(
         f"""
         SELECT DISTINCT m.league_id
         FROM matches m
-        WHERE m.date_utc::timestamptz BETWEEN %s AND %s
+        WHERE {kickoff_sql('m')} BETWEEN %s AND %s
           AND m.league_id IN ({placeholders})
         """,
         tuple(params),
@@ -989,7 +991,21 @@ def get_team_insights_overall_with_filters(
         matches_total_int = 0
 
    
+    snap = None
     if last_n_int and last_n_int > 0 and season_int_meta is not None:
+        # ✅ 스냅샷(team_insights_snapshots)이 유효하면 섹션 값만 그대로 덮어쓴다 (재계산 없음)
+        snap = load_team_insights_snapshot(
+            team_id=team_id,
+            season=season_int_meta,
+            league_ids=target_league_ids_last_n or [league_id],
+            last_n=last_n_int,
+        )
+        if snap is not None:
+            sections = snap.get("sections") or {}
+            insights.update(sections.get("outcome_totals") or {})
+            insights.update(sections.get("goals_by_time") or {})
+
+    if snap is None and last_n_int and last_n_int > 0 and season_int_meta is not None:
         season_int = season_int_meta
 
         # ✅ Outcome & Totals (Last N)
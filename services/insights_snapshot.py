@@ -0,0 +1,406 @@
+# services/insights_snapshot.py
+#
+# 목적:
+# - 팀 insights(Outcome/1H/2H/Goals by Time/Game State) 를 요청 때마다 raw 이벤트에서 다시 계산하지 않고,
+#   (team, league 집합, last_n, season) 단위 스냅샷 테이블에서 읽는다.
+# - 팀의 경기 이력은 "경기가 끝날 때"만 바뀌므로, 계산은 FT 트리거(ft_triggers)를 소비하는
+#   워커(live_status_worker.py role=insights) 쪽으로 옮긴다.
+#
+# 테이블:
+#   team_insights_snapshots
+#     - PK (team_id, season, league_key, last_n)   league_key = 정렬된 league_id 를 ',' 로 연결
+#     - payload_json : {"insights": side insights 전체, "sections": {"outcome_totals": {...}, "goals_by_time": {...}}}
+#     - latest_date_utc : 스냅샷 샘플의 가장 최근 경기 킥오프 (TIMESTAMPTZ, 컷오프 판정용)
+#     - version_sum : 계산 시점의 league 데이터 버전 합 (services/match_data_version.py)
+#     - last_requested_utc : API 가 마지막으로 이 조합을 조회한 시각 (하루 1회만 갱신)
+#
+# 스냅샷을 쓰는 조건 (아니면 기존처럼 즉시 계산):
+#   - version_sum 이 현재 league 버전 합과 같다 (그 사이 종료 경기/이벤트 재기록이 없음)
+#   - ref_date_utc 컷오프가 있으면 latest_date_utc < ref_date_utc (컷오프가 샘플을 자르지 않음)
+#
+# 스냅샷 생성:
+#   - 매치디테일에서 컷오프 없는(킥오프 전) 계산을 했을 때 write-through 로 등록 (실제로 조회되는 조합만)
+#   - 이후 갱신은 워커가: FT 트리거 → 해당 두 팀 + 그 리그를 포함하는 스냅샷만 재계산,
+#     그리고 version_sum 이 어긋난 스냅샷을 주기적으로 재계산 (postmatch 이벤트 보정 등)
+#   - last_requested_utc 가 INSIGHTS_SNAPSHOT_IDLE_DAYS 를 넘긴 조합은 워커가 삭제
+#     (더 이상 조회되지 않는 조합을 FT 마다 계속 재계산하지 않도록)
+
+import json
+import os
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional
+
+from db import execute, fetch_all, fetch_one
+
+from .match_data_version import load_league_version_sum
+
+
+# ─────────────────────────────────────
+#  DDL
+# ─────────────────────────────────────
+
+TEAM_INSIGHTS_SNAPSHOTS_DDL = """
+CREATE TABLE IF NOT EXISTS team_insights_snapshots (
+    team_id          INTEGER NOT NULL,
+    season           INTEGER NOT NULL,
+    league_key       TEXT NOT NULL,
+    last_n           INTEGER NOT NULL,
+    base_league_id   INTEGER NOT NULL,
+    league_ids       INTEGER[] NOT NULL,
+    payload_json     TEXT NOT NULL,
+    latest_date_utc  TIMESTAMPTZ,
+    version_sum      BIGINT NOT NULL DEFAULT 0,
+    updated_utc      TIMESTAMPTZ DEFAULT now(),
+    last_requested_utc TIMESTAMPTZ DEFAULT now(),
+    PRIMARY KEY (team_id, season, league_key, last_n)
+)
+"""
+
+# 이 일수 동안 API 조회가 없던 스냅샷은 삭제 (워커 sweep)
+INSIGHTS_SNAPSHOT_IDLE_DAYS = int(os.environ.get("INSIGHTS_SNAPSHOT_IDLE_DAYS", "14"))
+
+_TABLE_OK: Dict[str, bool] = {}
+
+
+def team_insights_snapshots_available() -> bool:
+    """
+    to_regclass 로 존재 확인. True 일 때만 캐시한다.
+    """
+    if _TABLE_OK.get("team_insights_snapshots"):
+        return True
+    try:
+        row = fetch_one("SELECT to_regclass(%s) AS t", ("public.team_insights_snapshots",))
+        ok = bool(row and row.get("t"))
+    except Exception:
+        ok = False
+    if ok:
+        _TABLE_OK["team_insights_snapshots"] = True
+    return ok
+
+
+def ensure_team_insights_snapshots_table() -> None:
+    execute(TEAM_INSIGHTS_SNAPSHOTS_DDL)
+    _TABLE_OK["team_insights_snapshots"] = True
+
+
+# ─────────────────────────────────────
+#  키
+# ─────────────────────────────────────
+
+def _norm_league_ids(league_ids: Iterable[Any]) -> List[int]:
+    out = set()
+    for x in league_ids or []:
+        try:
+            out.add(int(x))
+        except Exception:
+            continue
+    return sorted(out)
+
+
+def league_key(league_ids: Iterable[Any]) -> str:
+    return ",".join(str(x) for x in _norm_league_ids(league_ids))
+
+
+def _to_utc_datetime(v: Any) -> Optional[datetime]:
+    """
+    date_utc / ref_date_utc (datetime 또는 ISO 문자열) → tz-aware datetime. 해석 불가면 None.
+    """
+    if v is None:
+        return None
+    if isinstance(v, datetime):
+        dt = v
+    else:
+        s = str(v).strip()
+        if not s:
+            return None
+        try:
+            dt = datetime.fromisoformat(s.replace("Z", "+00:00"))
+        except Exception:
+            return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt
+
+
+# ─────────────────────────────────────
+#  조회 (API)
+# ─────────────────────────────────────
+
+def load_team_insights_snapshot(
+    *,
+    team_id: int,
+    season: int,
+    league_ids: List[int],
+    last_n: int,
+    ref_date_utc: Any = None,
+) -> Optional[Dict[str, Any]]:
+    """
+    유효한 스냅샷 payload({"insights", "sections"}) 또는 None.
+    """
+    ids = _norm_league_ids(league_ids)
+    if not ids or not team_insights_snapshots_available():
+        return None
+
+    ref_dt = _to_utc_datetime(ref_date_utc)
+    if ref_date_utc is not None and ref_dt is None:
+        # 컷오프를 해석할 수 없으면 스냅샷이 샘플을 넘는지 판단 불가 → 즉시 계산
+        return None
+
+    key = league_key(ids)
+    cutoff_sql = " AND (s.latest_date_utc IS NULL OR s.latest_date_utc < %s)" if ref_dt is not None else ""
+    params: List[Any] = [int(team_id), int(season), key, int(last_n or 0)]
+    if ref_dt is not None:
+        params.append(ref_dt)
+
+    try:
+        row = fetch_one(
+            f"""
+            SELECT
+                s.payload_json,
+                s.version_sum,
+                (s.last_requested_utc IS NULL
+                 OR s.last_requested_utc < now() - interval '1 day') AS touch_due
+            FROM team_insights_snapshots s
+            WHERE s.team_id = %s
+              AND s.season = %s
+              AND s.league_key = %s
+              AND s.last_n = %s
+              {cutoff_sql}
+            """,
+            tuple(params),
+        )
+    except Exception as e:
+        print(
+            f"[insights_snapshot] load failed team={team_id} season={season} leagues={key} last_n={last_n}: {e}",
+            flush=True,
+        )
+        return None
+    if not row:
+        return None
+
+    # stale 이어도 "아직 조회되는 조합" 이므로 먼저 표시 (prune 대상에서 제외)
+    if row.get("touch_due"):
+        _touch_requested(int(team_id), int(season), key, int(last_n or 0))
+
+    if int(row.get("version_sum") or 0) != load_league_version_sum(ids):
+        return None
+
+    try:
+        payload = json.loads(row.get("payload_json") or "")
+    except Exception as e:
+        print(f"[insights_snapshot] bad payload team={team_id} season={season} leagues={key}: {e}", flush=True)
+        return None
+    if not isinstance(payload, dict) or not isinstance(payload.get("insights"), dict):
+        return None
+    return payload
+
+
+def _touch_requested(team_id: int, season: int, key: str, last_n: int) -> None:
+    try:
+        execute(
+            """
+            UPDATE team_insights_snapshots
+            SET last_requested_utc = now()
+            WHERE team_id = %s AND season = %s AND league_key = %s AND last_n = %s
+            """,
+            (team_id, season, key, last_n),
+        )
+    except Exception as e:
+        print(f"[insights_snapshot] touch failed team={team_id} season={season} leagues={key}: {e}", flush=True)
+
+
+# ─────────────────────────────────────
+#  저장
+# ─────────────────────────────────────
+
+def save_team_insights_snapshot(
+    *,
+    team_id: int,
+    season: int,
+    base_league_id: int,
+    league_ids: List[int],
+    last_n: int,
+    payload: Dict[str, Any],
+    latest_date_utc: Any,
+    version_sum: int,
+) -> None:
+    """
+    version_sum 은 계산 "전에" 읽은 값을 넘긴다.
+    (계산 도중 bump 되면 다음 조회에서 stale 로 판정 → 안전한 쪽)
+    last_requested_utc 는 INSERT 때만 now() (워커 재계산은 조회로 치지 않음)
+    """
+    ids = _norm_league_ids(league_ids)
+    if not ids or not team_insights_snapshots_available():
+        return
+
+    execute(
+        """
+        INSERT INTO team_insights_snapshots (
+            team_id, season, league_key, last_n,
+            base_league_id, league_ids,
+            payload_json, latest_date_utc, version_sum, updated_utc
+        )
+        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, now())
+        ON CONFLICT (team_id, season, league_key, last_n) DO UPDATE SET
+            base_league_id  = EXCLUDED.base_league_id,
+            league_ids      = EXCLUDED.league_ids,
+            payload_json    = EXCLUDED.payload_json,
+            latest_date_utc = EXCLUDED.latest_date_utc,
+            version_sum     = EXCLUDED.version_sum,
+            updated_utc     = now()
+        """,
+        (
+            int(team_id),
+            int(season),
+            league_key(ids),
+            int(last_n or 0),
+            int(base_league_id),
+            ids,
+            json.dumps(payload, ensure_ascii=False, default=str),
+            _to_utc_datetime(latest_date_utc),
+            int(version_sum or 0),
+        ),
+    )
+
+
+def compute_and_save_team_insights_snapshot(
+    *,
+    team_id: int,
+    season: int,
+    base_league_id: int,
+    league_ids: List[int],
+    last_n: int,
+) -> Optional[Dict[str, Any]]:
+    """
+    컷오프 없이(현재까지의 종료 경기 전체) 계산해서 저장. 워커용.
+    """
+    from matchdetail.insights_block import compute_side_insights_snapshot
+
+    ids = _norm_league_ids(league_ids)
+    if not ids:
+        return None
+
+    version_sum = load_league_version_sum(ids)
+    payload, latest = compute_side_insights_snapshot(
+        league_id=int(base_league_id),
+        season_int=int(season),
+        team_id=int(team_id),
+        last_n=int(last_n or 0),
+        league_ids=ids,
+    )
+    save_team_insights_snapshot(
+        team_id=team_id,
+        season=season,
+        base_league_id=base_league_id,
+        league_ids=ids,
+        last_n=last_n,
+        payload=payload,
+        latest_date_utc=latest,
+        version_sum=version_sum,
+    )
+    return payload
+
+
+# ─────────────────────────────────────
+#  갱신 (워커)
+# ─────────────────────────────────────
+
+def _refresh_rows(rows: List[Dict[str, Any]], tag: str) -> int:
+    n = 0
+    for r in rows or []:
+        try:
+            compute_and_save_team_insights_snapshot(
+                team_id=int(r["team_id"]),
+                season=int(r["season"]),
+                base_league_id=int(r["base_league_id"]),
+                league_ids=list(r.get("league_ids") or []),
+                last_n=int(r.get("last_n") or 0),
+            )
+            n += 1
+        except Exception as e:
+            print(
+                f"[insights_snapshot] {tag} team={r.get('team_id')} season={r.get('season')} "
+                f"leagues={r.get('league_key')} last_n={r.get('last_n')} err: {e}",
+                flush=True,
+            )
+    return n
+
+
+def refresh_team_insights_snapshots_for_fixture(fixture_id: int, league_id: int, season: int) -> int:
+    """
+    FT 트리거 1건 → 그 경기 두 팀의 스냅샷 중 해당 리그를 포함하는 것만 재계산.
+    반환: 재계산한 스냅샷 수
+    """
+    if not team_insights_snapshots_available():
+        return 0
+
+    m = fetch_one(
+        "SELECT home_id, away_id FROM matches WHERE fixture_id = %s",
+        (int(fixture_id),),
+    )
+    if not m:
+        return 0
+    team_ids = [t for t in (m.get("home_id"), m.get("away_id")) if t is not None]
+    if not team_ids:
+        return 0
+
+    rows = fetch_all(
+        """
+        SELECT team_id, season, league_key, last_n, base_league_id, league_ids
+        FROM team_insights_snapshots
+        WHERE team_id = ANY(%s)
+          AND season = %s
+          AND %s = ANY(league_ids)
+        """,
+        ([int(t) for t in team_ids], int(season), int(league_id)),
+    )
+    return _refresh_rows(rows, f"fixture={fixture_id}")
+
+
+def refresh_stale_team_insights_snapshots(limit: int = 50) -> int:
+    """
+    version_sum 이 현재 league 버전 합과 다른 스냅샷 재계산
+    (FT 이후 postmatch 이벤트/스탯 보정, 트리거 없이 들어온 backfill 등)
+    """
+    if not team_insights_snapshots_available():
+        return 0
+
+    try:
+        rows = fetch_all(
+            """
+            SELECT s.team_id, s.season, s.league_key, s.last_n, s.base_league_id, s.league_ids
+            FROM team_insights_snapshots s
+            WHERE s.version_sum <> COALESCE((
+                SELECT SUM(v.version)
+                FROM match_data_versions v
+                WHERE v.scope = 'league'
+                  AND v.scope_id = ANY(s.league_ids)
+            ), 0)
+            ORDER BY s.updated_utc ASC
+            LIMIT %s
+            """,
+            (int(limit),),
+        )
+    except Exception:
+        # match_data_versions 가 없는 환경
+        return 0
+    return _refresh_rows(rows, "stale")
+
+
+def prune_idle_team_insights_snapshots(idle_days: Optional[int] = None) -> int:
+    """
+    last_requested_utc 가 idle_days 보다 오래된 (더 이상 API 에서 조회되지 않는) 스냅샷 삭제.
+    반환: 삭제한 row 수
+    """
+    days = int(INSIGHTS_SNAPSHOT_IDLE_DAYS if idle_days is None else idle_days)
+    if days <= 0 or not team_insights_snapshots_available():
+        return 0
+    rows = fetch_all(
+        """
+        DELETE FROM team_insights_snapshots
+        WHERE last_requested_utc < now() - make_interval(days => %s)
+        RETURNING team_id
+        """,
+        (days,),
+    )
+    return len(rows or [])
@@ -0,0 +1,101 @@
+# services/live_all_parse.py
+#
+# /fixtures?live=all 응답의 "watched 리그만" 파싱 (live_status_worker.run_once 핫패스)
+#
+# 배경:
+# - live=all 은 전세계 라이브 경기 전부(피크 시간 수백 경기, events 배열 포함 수 MB)를 준다.
+# - 예전엔 r.json() 으로 전부 dict 로 만든 뒤 LIVE_LEAGUES 밖은 그냥 버렸다 (10초마다).
+# - match_fixtures_raw 에 넣을 raw JSON 은 그 dict 를 다시 json.dumps 해서 만들었다.
+#
+# 여기서 (응답 bytes 기준, 스캔은 bytes.find — C 레벨 부분 문자열 검색):
+# 1) "response":[ 안의 각 경기 시작 위치를 찾는다 (API-Sports 경기 객체는 항상 {"fixture":{"id": 로 시작)
+# 2) 경기 구간 안의 "league":{"id":N 만 보고 watched 가 아니면 디코드하지 않고 건너뜀
+# 3) watched 경기만 json.loads → slim dict(업서트에 쓰는 필드만), raw 는 원본 구간 문자열 그대로
+#
+# 응답 모양이 예상과 다르면(공백 포함 포맷, 키 순서 변경, results 개수 불일치 등) None → 호출 측이 전체 파싱 fallback.
+
+import json
+import re
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+
+_RESPONSE_KEY = b'"response":['
+_ITEM_START = b'{"fixture":{"id":'
+_LEAGUE_ID_KEY = b'"league":{"id":'
+_LEAGUE_ID_RE = re.compile(rb'\d+')
+_RESULTS_RE = re.compile(rb'"results":(\d+)')
+
+# 업서트/후속 정책(matches 행, 스코어 상태, lineups, FT 트리거)이 읽는 키만 남김
+_SLIM_KEYS = ("fixture", "league", "teams", "goals", "score")
+_SLIM_LEAGUE_KEYS = ("id", "season", "round")
+
+
+def slim_fixture_item(item: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    live=all 경기 객체 → 처리에 필요한 필드만 (events / league 로고·국기 등 제외).
+    """
+    out = {k: item.get(k) for k in _SLIM_KEYS if k in item}
+    lg = item.get("league")
+    if isinstance(lg, dict):
+        out["league"] = {k: lg.get(k) for k in _SLIM_LEAGUE_KEYS if k in lg}
+    return out
+
+
+def parse_live_all_watched(
+    body: bytes,
+    watched: Set[int],
+) -> Optional[Tuple[List[Dict[str, Any]], Dict[int, str], int]]:
+    """
+    반환: (watched 경기 slim dict 목록, fixture_id -> raw JSON 문자열, 전체 경기 수)
+    빠른 경로를 쓸 수 없으면 None.
+    """
+    head = body[:512]
+    m_results = _RESULTS_RE.search(head) or _RESULTS_RE.search(body)
+    if m_results is None:
+        return None
+    total = int(m_results.group(1))
+
+    pos = body.find(_RESPONSE_KEY)
+    if pos < 0:
+        return None
+    arr_start = pos + len(_RESPONSE_KEY) - 1  # '[' 위치
+
+    if total == 0:
+        return [], {}, 0
+
+    starts: List[int] = []
+    i = body.find(_ITEM_START, arr_start)
+    while i >= 0:
+        if body[i - 1:i] in (b"[", b","):
+            starts.append(i)
+        i = body.find(_ITEM_START, i + len(_ITEM_START))
+    if len(starts) != total:
+        return None
+
+    # 마지막 경기 끝 = response 배열의 닫는 ']' (API-Sports 는 response 가 마지막 키)
+    tail = body.rstrip()
+    if not tail.endswith(b"]}"):
+        return None
+    arr_end = len(tail) - 2
+
+    items: List[Dict[str, Any]] = []
+    raws: Dict[int, str] = {}
+    ends = [s - 1 for s in starts[1:]] + [arr_end]  # 다음 경기 앞의 ',' 직전까지
+    for start, end in zip(starts, ends):
+        k = body.find(_LEAGUE_ID_KEY, start, end)
+        m_lg = _LEAGUE_ID_RE.match(body, k + len(_LEAGUE_ID_KEY)) if k >= 0 else None
+        if m_lg is None:
+            return None
+        if int(m_lg.group(0)) not in watched:
+            continue
+        seg = body[start:end]
+        try:
+            item = json.loads(seg)
+        except ValueError:
+            return None
+        fid = (item.get("fixture") or {}).get("id")
+        if not isinstance(fid, int):
+            return None
+        items.append(slim_fixture_item(item))
+        raws[fid] = seg.decode("utf-8")
+    return items, raws, total
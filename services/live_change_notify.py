@@ -0,0 +1,152 @@
+# services/live_change_notify.py
+#
+# live_all 감지 → events/stats 워커 / 푸시 워커 이벤트 기반 handoff (Postgres LISTEN/NOTIFY)
+#
+# 배경:
+# - events/stats 역할은 matches 를 주기적으로 조회(_select_inplay_matches)해서 할 일을 찾고,
+#   notifications/match_event_worker 도 MATCH_WORKER_INTERVAL_SEC 마다 구독 경기 전체를 훑는다.
+#   → 골/상태 변경이 DB 에 들어가도 다음 루프까지 최대 한 주기를 기다림.
+#
+# 여기서:
+# - 발행(publish_live_changes): live 역할이 fixtures/matches 커밋 후 score/status 변경 fixture 를,
+#   events 역할이 match_live_state 커밋 후 레드카드 변경 fixture 를 pg_notify 로 알린다.
+#   payload = {"fixture_id": 123, "reason": "score" | "status" | "redcard"}
+# - 구독(LiveChangeListener): 풀과 별개인 전용 커넥션 1개로 LISTEN, wait(timeout) 으로 변경을 모아 받는다.
+#   연결이 끊기거나 LISTEN 이 안 되면 그냥 timeout 만큼 쉰다 → 기존 주기 스캔이 그대로 fallback.
+#
+# ENV:
+#   LIVE_NOTIFY_ENABLED (1)                  : 0 이면 발행/구독 모두 끔
+#   LIVE_NOTIFY_CHANNEL (live_fixture_change)
+
+import json
+import os
+import time
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from db import DATABASE_URL, execute
+
+
+LIVE_NOTIFY_ENABLED = (os.environ.get("LIVE_NOTIFY_ENABLED", "1") or "1").strip().lower() not in ("0", "false", "no")
+LIVE_NOTIFY_CHANNEL = (os.environ.get("LIVE_NOTIFY_CHANNEL") or "live_fixture_change").strip()
+
+
+# ─────────────────────────────────────
+#  발행
+# ─────────────────────────────────────
+
+def publish_live_changes(changes: Sequence[Tuple[int, str]]) -> int:
+    """
+    [(fixture_id, reason)] → pg_notify (한 번의 왕복). 반환: 발행 건수.
+    반드시 해당 변경이 커밋된 뒤에 호출 (구독자가 바로 DB 를 읽으므로).
+    """
+    if not LIVE_NOTIFY_ENABLED or not changes:
+        return 0
+    payloads = [
+        json.dumps({"fixture_id": int(fid), "reason": str(reason)}, separators=(",", ":"))
+        for fid, reason in changes
+    ]
+    try:
+        execute(
+            "SELECT pg_notify(%s, p) FROM unnest(%s::text[]) AS p",
+            (LIVE_NOTIFY_CHANNEL, payloads),
+        )
+    except Exception as e:
+        print(f"[live_notify] publish failed ({len(payloads)}): {e}", flush=True)
+        return 0
+    return len(payloads)
+
+
+# fixture_id -> (home_red, away_red) : events 역할이 마지막으로 본 레드카드 수
+_LAST_RED: Dict[int, Tuple[int, int]] = {}
+
+
+def red_cards_changed(fixture_id: int, home_red: int, away_red: int) -> bool:
+    """
+    직전에 본 값과 다르면 True. 처음 보는 경기는 레드카드가 있을 때만 True (재시작 직후 포함).
+    """
+    fid = int(fixture_id)
+    cur = (int(home_red), int(away_red))
+    prev = _LAST_RED.get(fid)
+    _LAST_RED[fid] = cur
+    if prev is None:
+        return cur != (0, 0)
+    return prev != cur
+
+
+def retain_red_cards(keep_ids: Iterable[int]) -> None:
+    keep = {int(f) for f in keep_ids}
+    for fid in list(_LAST_RED.keys()):
+        if fid not in keep:
+            _LAST_RED.pop(fid, None)
+
+
+# ─────────────────────────────────────
+#  구독
+# ─────────────────────────────────────
+
+class LiveChangeListener:
+    """
+    전용 커넥션으로 LISTEN. wait() 는 변경이 오면 바로, 아니면 timeout 뒤에 반환.
+    반환값: {fixture_id: reason} (같은 fixture 가 여러 번 오면 마지막 reason)
+    """
+
+    def __init__(self, channel: Optional[str] = None) -> None:
+        self.channel = channel or LIVE_NOTIFY_CHANNEL
+        self._conn = None
+
+    def _connect(self) -> None:
+        import psycopg
+        from psycopg import sql
+
+        conn = psycopg.connect(DATABASE_URL, autocommit=True)
+        conn.execute(sql.SQL("LISTEN {}").format(sql.Identifier(self.channel)))
+        self._conn = conn
+        print(f"[live_notify] listening channel={self.channel}", flush=True)
+
+    def close(self) -> None:
+        conn, self._conn = self._conn, None
+        if conn is not None:
+            try:
+                conn.close()
+            except Exception:
+                pass
+
+    @staticmethod
+    def _parse(payload: str) -> Optional[Tuple[int, str]]:
+        try:
+            obj = json.loads(payload)
+            return int(obj["fixture_id"]), str(obj.get("reason") or "")
+        except Exception:
+            return None
+
+    def wait(self, timeout: float) -> Dict[int, str]:
+        timeout = max(0.0, float(timeout))
+        if not LIVE_NOTIFY_ENABLED:
+            time.sleep(timeout)
+            return {}
+
+        out: Dict[int, str] = {}
+        try:
+            if self._conn is None or self._conn.closed:
+                self._connect()
+            # 첫 알림까지 기다렸다가, 같이 몰려온 것(한 tick 의 여러 경기)은 짧게 더 모은다
+            for n in self._conn.notifies(timeout=timeout, stop_after=1):
+                parsed = self._parse(n.payload)
+                if parsed:
+                    out[parsed[0]] = parsed[1]
+            if out:
+                for n in self._conn.notifies(timeout=0.2):
+                    parsed = self._parse(n.payload)
+                    if parsed:
+                        out[parsed[0]] = parsed[1]
+        except Exception as e:
+            # 연결 문제 → 주기 스캔 fallback (다음 wait 에서 재연결)
+            print(f"[live_notify] listen err (fallback to polling): {e}", flush=True)
+            self.close()
+            time.sleep(min(timeout, 5.0))
+        return out
+
+
+def fixture_ids_for(changes: Dict[int, str], reasons: Iterable[str]) -> List[int]:
+    allowed = set(reasons)
+    return [fid for fid, reason in changes.items() if reason in allowed]
@@ -0,0 +1,330 @@
+# services/live_poll_scheduler.py
+#
+# fixture 단위 적응형 폴링 스케줄러 (live_status_worker: events / stats / lineups / postmatch)
+#
+# 배경:
+# - 예전에는 고정 루프(LIVE_EVENTS_LOOP_SEC 등) + fixture 별 고정 쿨다운(LAST_EVENTS_SYNC 등)이라
+#   하프타임에도, 0:0 로 흘러가는 하위 리그에도 똑같이 15초마다 /fixtures/events 를 불렀다.
+# - 여기서는 fixture 마다 "다음 호출 시각(next-due)"을 경기 상태로 정한다.
+#     * 킥오프 직후 / 85분 이후(추가시간) / 연장·승부차기 / 방금 골이 난 경기 → 빠르게
+#     * 하프타임 / 브레이크 / 중단 → 느리게
+#     * LIVE_LOW_PRIORITY_LEAGUES → 배수만큼 느리게
+#   (hockey 워커의 _league_interval_sec 와 같은 "리그 등급" 개념 + 경기 상태)
+# - 우선순위 큐(heap)로 가장 이른 next-due 를 바로 알 수 있어서 루프 sleep 도 그에 맞춘다.
+# - persist=True 면 next-due 를 match_live_poll_state 에 저장 (hockey/nba 의 *_live_poll_state 와 같은 역할)
+#   → 재배포/크래시 직후 warm_load() 로 한 번에 읽어와서, 모든 라이브 경기를 동시에 다시 부르는 폭주를 막는다.
+#   쓰기는 tick 마다 flush_persisted() 한 번 (바뀐 fixture 만 배치 upsert).
+#
+# ENV:
+#   LIVE_POLL_MIN_SEC (5)            : 어떤 경우에도 이보다 자주 부르지 않음
+#   LIVE_POLL_FAST_FACTOR (0.5)      : 빠른 구간 = base × factor
+#   LIVE_POLL_BREAK_SEC (120)        : HT/BT/INT 구간 최소 간격
+#   LIVE_POLL_GOAL_BOOST_SEC (120)   : 스코어 변경 후 이 시간 동안은 빠른 구간
+#   LIVE_LOW_PRIORITY_LEAGUES        : 콤마 구분 league_id
+#   LIVE_LOW_PRIORITY_FACTOR (2.0)
+#   LIVE_POLL_STATE_PERSIST (1)      : 0 이면 메모리 전용 (예전처럼)
+#   LIVE_POLL_FAIL_BACKOFF_MAX_SEC (300) : fetch/write 연속 실패 시 backoff 상한 (base × 2^(n-1))
+#
+# 마이그레이션: db/migrate/add_match_live_poll_state.sql (워커 시작 시 ensure 로도 동일 처리)
+
+import heapq
+import os
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from db import execute, execute_batches, fetch_all
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.environ.get(name, str(default)) or default)
+    except Exception:
+        return default
+
+
+def _env_int_set(name: str) -> Set[int]:
+    out: Set[int] = set()
+    for part in (os.environ.get(name) or "").replace(";", ",").split(","):
+        part = part.strip()
+        if not part:
+            continue
+        try:
+            out.add(int(part))
+        except ValueError:
+            continue
+    return out
+
+
+LIVE_POLL_MIN_SEC = _env_float("LIVE_POLL_MIN_SEC", 5.0)
+LIVE_POLL_FAST_FACTOR = _env_float("LIVE_POLL_FAST_FACTOR", 0.5)
+LIVE_POLL_BREAK_SEC = _env_float("LIVE_POLL_BREAK_SEC", 120.0)
+LIVE_POLL_FAIL_BACKOFF_MAX_SEC = _env_float("LIVE_POLL_FAIL_BACKOFF_MAX_SEC", 300.0)
+LIVE_POLL_GOAL_BOOST_SEC = _env_float("LIVE_POLL_GOAL_BOOST_SEC", 120.0)
+LIVE_LOW_PRIORITY_LEAGUES = _env_int_set("LIVE_LOW_PRIORITY_LEAGUES")
+LIVE_LOW_PRIORITY_FACTOR = _env_float("LIVE_LOW_PRIORITY_FACTOR", 2.0)
+LIVE_POLL_STATE_PERSIST = (os.environ.get("LIVE_POLL_STATE_PERSIST", "1") or "1").strip() not in ("0", "false", "no")
+
+_BREAK_STATUSES = ("HT", "BT", "INT", "SUSP")
+_LATE_STATUSES = ("ET", "P")
+
+
+# ─────────────────────────────────────
+#  DDL (poll state)
+# ─────────────────────────────────────
+
+MATCH_LIVE_POLL_STATE_DDL = """
+CREATE TABLE IF NOT EXISTS match_live_poll_state (
+    fixture_id  INTEGER     NOT NULL,
+    kind        TEXT        NOT NULL,
+    next_due_at TIMESTAMPTZ NOT NULL,
+    updated_at  TIMESTAMPTZ NOT NULL DEFAULT now(),
+    PRIMARY KEY (fixture_id, kind)
+)
+"""
+
+UPSERT_POLL_STATE_SQL = """
+    INSERT INTO match_live_poll_state (fixture_id, kind, next_due_at, updated_at)
+    VALUES (%s, %s, to_timestamp(%s), now())
+    ON CONFLICT (fixture_id, kind) DO UPDATE SET
+        next_due_at = EXCLUDED.next_due_at,
+        updated_at  = now()
+"""
+
+DELETE_POLL_STATE_SQL = "DELETE FROM match_live_poll_state WHERE kind = %s AND fixture_id = ANY(%s)"
+
+_POLL_STATE_OK: Dict[str, bool] = {}
+
+
+def ensure_live_poll_state_table() -> None:
+    """
+    테이블 + 오래된 row 정리 (끝난 경기 row 가 retain 전에 프로세스가 죽어 남은 것).
+    실패하면 메모리 전용으로 동작.
+    """
+    if not LIVE_POLL_STATE_PERSIST:
+        return
+    try:
+        execute(MATCH_LIVE_POLL_STATE_DDL)
+        execute("DELETE FROM match_live_poll_state WHERE updated_at < now() - interval '2 days'")
+        _POLL_STATE_OK["match_live_poll_state"] = True
+    except Exception as e:
+        print(f"[live_poll_scheduler] ensure match_live_poll_state failed (memory-only): {e}", flush=True)
+
+
+class PollScheduler:
+    """
+    fixture_id -> next-due ts. heap 은 lazy deletion (재스케줄 시 옛 항목은 꺼낼 때 무시).
+    멀티 역할 모드에서는 live 스레드가 events/stats 스케줄을 당기므로 lock 으로 보호.
+    """
+
+    def __init__(self, name: str, persist: bool = False) -> None:
+        self.name = name
+        self.persist = persist
+        self._dirty: Set[int] = set()
+        self._dropped: Set[int] = set()
+        self._due: Dict[int, float] = {}
+        self._heap: List[Tuple[float, int]] = []
+        self._score: Dict[int, Tuple[Any, Any]] = {}
+        self._score_changed_ts: Dict[int, float] = {}
+        self._fails: Dict[int, int] = {}
+        self._lock = threading.RLock()
+
+    # ── 스케줄
+
+    def is_due(self, fixture_id: int, now_ts: Optional[float] = None) -> bool:
+        with self._lock:
+            due = self._due.get(int(fixture_id))
+        return due is None or due <= (now_ts if now_ts is not None else time.time())
+
+    def due_ids(self, fixture_ids: Iterable[int], now_ts: Optional[float] = None) -> List[int]:
+        """
+        후보 중 지금 호출할 fixture (처음 보는 것 → 오래 밀린 것 순).
+        """
+        now_ts = now_ts if now_ts is not None else time.time()
+        with self._lock:
+            due = [int(f) for f in fixture_ids if self.is_due(f, now_ts)]
+            due.sort(key=lambda f: self._due.get(f, 0.0))
+        return due
+
+    def schedule(self, fixture_id: int, delay_sec: float, now_ts: Optional[float] = None) -> None:
+        ts = (now_ts if now_ts is not None else time.time()) + max(0.0, float(delay_sec))
+        with self._lock:
+            self._due[int(fixture_id)] = ts
+            heapq.heappush(self._heap, (ts, int(fixture_id)))
+            if self.persist:
+                self._dirty.add(int(fixture_id))
+                self._dropped.discard(int(fixture_id))
+
+    def schedule_failure(self, fixture_id: int, base_sec: float, now_ts: Optional[float] = None) -> float:
+        """
+        fetch/write 실패 → 연속 실패 횟수만큼 늘어나는 backoff 로 재스케줄 (안 하면 next-due 가 과거라 매 루프 재호출).
+        반환: 적용한 delay.
+        """
+        fid = int(fixture_id)
+        with self._lock:
+            n = self._fails.get(fid, 0) + 1
+            self._fails[fid] = n
+            delay = min(max(LIVE_POLL_MIN_SEC, float(base_sec)) * (2 ** min(n - 1, 10)), max(float(base_sec), LIVE_POLL_FAIL_BACKOFF_MAX_SEC))
+            self.schedule(fid, delay, now_ts)
+        return delay
+
+    def reset_failures(self, fixture_id: int) -> None:
+        with self._lock:
+            self._fails.pop(int(fixture_id), None)
+
+    def seconds_until_next_due(self, now_ts: Optional[float] = None) -> Optional[float]:
+        now_ts = now_ts if now_ts is not None else time.time()
+        with self._lock:
+            while self._heap:
+                ts, fid = self._heap[0]
+                if self._due.get(fid) != ts:
+                    heapq.heappop(self._heap)
+                    continue
+                return max(0.0, ts - now_ts)
+        return None
+
+    def retain(self, keep_ids: Iterable[int]) -> None:
+        """
+        후보에서 빠진 fixture 정리 (INPLAY 목록에서 사라진 경기 등).
+        """
+        keep = {int(f) for f in keep_ids}
+        with self._lock:
+            if self.persist:
+                gone = [fid for fid in self._due if fid not in keep]
+                self._dropped.update(gone)
+                self._dirty.difference_update(gone)
+            for d in (self._due, self._score, self._score_changed_ts, self._fails):
+                for fid in list(d.keys()):
+                    if fid not in keep:
+                        d.pop(fid, None)
+            if len(self._heap) > 4 * max(1, len(self._due)):
+                self._heap = [(ts, fid) for fid, ts in self._due.items()]
+                heapq.heapify(self._heap)
+
+    # ── 영속화 (match_live_poll_state)
+
+    def _persist_ok(self) -> bool:
+        return self.persist and LIVE_POLL_STATE_PERSIST and bool(_POLL_STATE_OK.get("match_live_poll_state"))
+
+    def warm_load(self, spread_sec: float = 0.0) -> int:
+        """
+        시작 시 1회: 저장된 next-due 를 한 번에 읽어온다 (이미 메모리에 있는 fixture 는 그대로).
+        오래 죽어 있어서 이미 지난 next-due 들은 spread_sec 구간에 고르게 펼친다 (한꺼번에 due 방지).
+        반환: 읽어온 fixture 수
+        """
+        if not self._persist_ok():
+            return 0
+        try:
+            rows = fetch_all(
+                """
+                SELECT fixture_id, EXTRACT(EPOCH FROM next_due_at)::float8 AS due_ts
+                FROM match_live_poll_state
+                WHERE kind = %s
+                """,
+                (self.name,),
+            )
+        except Exception as e:
+            print(f"[live_poll_scheduler] {self.name} warm_load failed: {e}", flush=True)
+            return 0
+        now_ts = time.time()
+        parsed: List[Tuple[int, float]] = []
+        for r in rows or []:
+            try:
+                parsed.append((int(r["fixture_id"]), float(r["due_ts"])))
+            except Exception:
+                continue
+        overdue = sorted(fid for fid, ts in parsed if ts <= now_ts)
+        spread = {fid: now_ts + spread_sec * i / max(1, len(overdue)) for i, fid in enumerate(overdue)}
+
+        loaded = 0
+        with self._lock:
+            for fid, ts in parsed:
+                if fid in self._due:
+                    continue
+                ts = spread.get(fid, ts)
+                self._due[fid] = ts
+                heapq.heappush(self._heap, (ts, fid))
+                loaded += 1
+        print(f"[live_poll_scheduler] {self.name} warm_load fixtures={loaded} overdue={len(overdue)}", flush=True)
+        return loaded
+
+    def flush_persisted(self) -> None:
+        """
+        tick 끝에 1회: 바뀐 next-due upsert + retain 으로 빠진 fixture 삭제 (트랜잭션 1개).
+        실패하면 다음 tick 에 다시 시도.
+        """
+        if not self._persist_ok():
+            return
+        with self._lock:
+            upserts = [(fid, self.name, self._due[fid]) for fid in self._dirty if fid in self._due]
+            dropped = sorted(self._dropped)
+            self._dirty.clear()
+            self._dropped.clear()
+        if not upserts and not dropped:
+            return
+        batches: List[Tuple[str, List[Tuple[Any, ...]]]] = [(UPSERT_POLL_STATE_SQL, upserts)]
+        if dropped:
+            batches.append((DELETE_POLL_STATE_SQL, [(self.name, dropped)]))
+        try:
+            execute_batches(batches)
+        except Exception as e:
+            print(f"[live_poll_scheduler] {self.name} flush failed (retry next tick): {e}", flush=True)
+            with self._lock:
+                self._dirty.update(fid for fid, _, _ in upserts if fid in self._due)
+                self._dropped.update(f for f in dropped if f not in self._due)
+
+    # ── 스코어 변화 (골 직후 가속)
+
+    def note_score(self, fixture_id: int, home: Any, away: Any, now_ts: Optional[float] = None) -> Optional[float]:
+        """
+        스코어 기록 → 마지막 변경 후 경과 초 (변경 이력이 없으면 None).
+        """
+        fid = int(fixture_id)
+        now_ts = now_ts if now_ts is not None else time.time()
+        cur = (home, away)
+        with self._lock:
+            prev = self._score.get(fid)
+            if prev is not None and prev != cur:
+                self._score_changed_ts[fid] = now_ts
+            self._score[fid] = cur
+            changed = self._score_changed_ts.get(fid)
+        return (now_ts - changed) if changed is not None else None
+
+
+def live_poll_interval(
+    base_sec: float,
+    *,
+    status_short: Any = None,
+    elapsed: Any = None,
+    league_id: Any = None,
+    since_score_change_sec: Optional[float] = None,
+) -> float:
+    """
+    경기 상태 → 다음 호출까지 초.
+    """
+    base = max(LIVE_POLL_MIN_SEC, float(base_sec))
+    fast = max(LIVE_POLL_MIN_SEC, base * LIVE_POLL_FAST_FACTOR)
+    st = str(status_short or "").strip().upper()
+
+    try:
+        el = int(elapsed) if elapsed is not None else None
+    except Exception:
+        el = None
+
+    if st in _BREAK_STATUSES:
+        interval = max(base * 4, LIVE_POLL_BREAK_SEC)
+    elif (
+        st in _LATE_STATUSES
+        or (el is not None and (el <= 5 or el >= 85))
+        or (since_score_change_sec is not None and since_score_change_sec <= LIVE_POLL_GOAL_BOOST_SEC)
+    ):
+        interval = fast
+    else:
+        interval = base
+
+    try:
+        if league_id is not None and int(league_id) in LIVE_LOW_PRIORITY_LEAGUES:
+            interval *= LIVE_LOW_PRIORITY_FACTOR
+    except Exception:
+        pass
+    return interval
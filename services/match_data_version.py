@@ -0,0 +1,200 @@
+# services/match_data_version.py
+#
+# 목적:
+# - 매치디테일 블록 캐시(matchdetail/block_cache.py)의 "데이터 버전" 관리
+# - 워커가 fixture 의 matches / match_events / match_team_stats / match_lineups 를 쓰면
+#   해당 fixture 버전을 +1 → 캐시 키가 바뀌어 자연스럽게 무효화된다.
+# - FINISHED 경기가 (재)기록되면 그 리그 버전도 +1
+#   (standings / insights / h2h 처럼 리그의 종료 경기 집합에 의존하는 블록용)
+# - 같은 조건으로 두 팀의 팀 버전도 +1
+#   (예측 스냅샷처럼 "팀의 모든 대회 경기 이력"에 의존하는 값용, 컵/대륙컵 경기 포함)
+#
+# 테이블:
+#   match_data_versions(scope, scope_id, version)
+#     scope = 'fixture' | 'league' | 'team'
+#
+# 쓰기 주체(워커):
+# - live_status_worker.py  : refresh_list_rows_safe(틱 단위 묶음), stats / lineups upsert
+# - football/workers/postmatch_backfill.py : matches / events / stats / lineups upsert
+# - football/tools/backfill/backfill_match_fixtures_raw_by_ids.py
+
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from db import execute, fetch_all, fetch_one
+
+
+# ─────────────────────────────────────
+#  DDL
+# ─────────────────────────────────────
+
+MATCH_DATA_VERSIONS_DDL = """
+CREATE TABLE IF NOT EXISTS match_data_versions (
+    scope        TEXT NOT NULL,
+    scope_id     BIGINT NOT NULL,
+    version      BIGINT NOT NULL DEFAULT 1,
+    updated_utc  TIMESTAMPTZ DEFAULT now(),
+    PRIMARY KEY (scope, scope_id)
+)
+"""
+
+_TABLE_OK: Dict[str, bool] = {}
+
+
+def match_data_versions_available() -> bool:
+    """
+    to_regclass 로 존재 확인. True 일 때만 캐시한다.
+    """
+    if _TABLE_OK.get("match_data_versions"):
+        return True
+    try:
+        row = fetch_one("SELECT to_regclass(%s) AS t", ("public.match_data_versions",))
+        ok = bool(row and row.get("t"))
+    except Exception:
+        ok = False
+    if ok:
+        _TABLE_OK["match_data_versions"] = True
+    return ok
+
+
+def ensure_match_data_versions_table() -> None:
+    execute(MATCH_DATA_VERSIONS_DDL)
+    _TABLE_OK["match_data_versions"] = True
+
+
+# ─────────────────────────────────────
+#  bump (워커)
+# ─────────────────────────────────────
+
+def _norm_ids(ids: Iterable[Any]) -> List[int]:
+    out = set()
+    for x in ids or []:
+        try:
+            out.add(int(x))
+        except Exception:
+            continue
+    return sorted(out)
+
+
+def bump_match_data_versions(
+    fixture_ids: Iterable[Any],
+    league_fixture_ids: Optional[Iterable[Any]] = None,
+) -> int:
+    """
+    fixture 버전 +1, 그중 FINISHED 경기의 리그 / 두 팀 버전 +1 (한 번의 쿼리).
+    league_fixture_ids 를 주면 리그 / 팀 버전은 그 fixture 들(FINISHED 전환/스코어 변경 등)만 기준으로 올린다.
+    반환: 대상 fixture 수
+    """
+    ids = _norm_ids(fixture_ids)
+    if not ids:
+        return 0
+    if not match_data_versions_available():
+        return 0
+    league_ids_src = ids if league_fixture_ids is None else _norm_ids(league_fixture_ids)
+
+    execute(
+        """
+        WITH fin AS (
+            SELECT m.league_id, m.home_id, m.away_id
+            FROM matches m
+            WHERE m.fixture_id = ANY(%s)
+              AND m.status_group = 'FINISHED'
+        )
+        INSERT INTO match_data_versions (scope, scope_id, version, updated_utc)
+        SELECT 'fixture', x, 1, now()
+        FROM unnest(%s::bigint[]) AS x
+        UNION ALL
+        SELECT 'league', l.league_id, 1, now()
+        FROM (SELECT DISTINCT fin.league_id::bigint AS league_id FROM fin) l
+        UNION ALL
+        SELECT 'team', t.team_id, 1, now()
+        FROM (
+            SELECT DISTINCT v.team_id::bigint AS team_id
+            FROM fin
+            CROSS JOIN LATERAL (VALUES (fin.home_id), (fin.away_id)) AS v(team_id)
+            WHERE v.team_id IS NOT NULL
+        ) t
+        ON CONFLICT (scope, scope_id) DO UPDATE SET
+            version = match_data_versions.version + 1,
+            updated_utc = now()
+        """,
+        (league_ids_src, ids),
+    )
+    return len(ids)
+
+
+# ─────────────────────────────────────
+#  조회 (API)
+# ─────────────────────────────────────
+
+def load_match_data_versions(fixture_id: int, league_id: int) -> Optional[Tuple[int, int]]:
+    """
+    (fixture 버전, league 버전). 테이블이 없으면 None (→ 캐시 사용 안 함).
+    한 번도 bump 되지 않은 경우는 0.
+    """
+    if not match_data_versions_available():
+        return None
+    try:
+        rows = fetch_all(
+            """
+            SELECT scope, version
+            FROM match_data_versions
+            WHERE (scope = 'fixture' AND scope_id = %s)
+               OR (scope = 'league' AND scope_id = %s)
+            """,
+            (int(fixture_id), int(league_id)),
+        )
+    except Exception:
+        return None
+
+    fv = lv = 0
+    for r in rows or []:
+        if r.get("scope") == "fixture":
+            fv = int(r.get("version") or 0)
+        elif r.get("scope") == "league":
+            lv = int(r.get("version") or 0)
+    return fv, lv
+
+
+def load_league_version_sum(league_ids: Iterable[Any]) -> int:
+    """
+    여러 리그 버전의 합 (버전은 증가만 하므로 합이 같으면 전부 그대로).
+    테이블이 없으면 0.
+    """
+    ids = _norm_ids(league_ids)
+    if not ids or not match_data_versions_available():
+        return 0
+    try:
+        row = fetch_one(
+            """
+            SELECT COALESCE(SUM(version), 0) AS s
+            FROM match_data_versions
+            WHERE scope = 'league'
+              AND scope_id = ANY(%s)
+            """,
+            (ids,),
+        )
+    except Exception:
+        return 0
+    return int((row or {}).get("s") or 0)
+
+
+def load_team_version_sum(team_ids: Iterable[Any]) -> int:
+    """
+    여러 팀 버전의 합 (load_league_version_sum 과 같은 규칙). 테이블이 없으면 0.
+    """
+    ids = _norm_ids(team_ids)
+    if not ids or not match_data_versions_available():
+        return 0
+    try:
+        row = fetch_one(
+            """
+            SELECT COALESCE(SUM(version), 0) AS s
+            FROM match_data_versions
+            WHERE scope = 'team'
+              AND scope_id = ANY(%s)
+            """,
+            (ids,),
+        )
+    except Exception:
+        return 0
+    return int((row or {}).get("s") or 0)
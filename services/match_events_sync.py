@@ -0,0 +1,257 @@
+# services/match_events_sync.py
+#
+# match_events 동기화 (live_status_worker / football/workers/postmatch_backfill 공용)
+#
+# 배경:
+# - 예전 replace_match_events_for_fixture 는 events 워커가 돌 때마다 fixture 의 이벤트를
+#   전부 DELETE 하고 row 단위 INSERT 로 다시 넣었다 (라이브 경기마다 15초에 수십 row 재작성 + dead tuple).
+#   게다가 BEGIN/COMMIT 을 execute() 로 따로 보내서 실제로는 서로 다른 풀 커넥션 → 트랜잭션도 아니었다.
+#
+# 여기서:
+# - diff 동기화(sync_match_events_for_fixture): API 이벤트 → row 로 매핑한 값 자체를 "이벤트 키"로 보고
+#   (API-Sports 이벤트엔 id 가 없음) 기존 row 와 멀티셋 비교 → 사라진 row DELETE, 새 row INSERT 만.
+#   라이브 tick 대부분은 0~1 row 변경.
+# - 전체 재적재(copy_match_events_for_fixture): backfill 용, DELETE + COPY.
+# - 둘 다 커넥션 1개 / 트랜잭션 1개 + fixture 단위 advisory lock (events 워커 vs postmatch 경합 방지)
+# - INPLAY 레이스 차단(status check)도 같은 트랜잭션 안에서 한 번에 확인
+#
+# 컬럼은 환경마다 조금 달라서(extra / time_extra, comments, player_name 등) 존재하는 컬럼만 쓴다.
+
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+
+from db import fetch_all, get_connection
+
+
+# pg_advisory_xact_lock(int4, int4) 의 첫 키 (match_events 전용 네임스페이스)
+_EVENTS_LOCK_NS = 7301
+
+_COLUMNS_CACHE: Dict[str, List[str]] = {}
+
+
+def match_events_columns() -> List[str]:
+    """
+    match_events 컬럼(소문자) — 프로세스당 1회 조회.
+    """
+    cols = _COLUMNS_CACHE.get("match_events")
+    if cols is not None:
+        return cols
+    rows = fetch_all(
+        """
+        SELECT column_name
+        FROM information_schema.columns
+        WHERE table_schema = current_schema()
+          AND table_name = 'match_events'
+        ORDER BY ordinal_position
+        """,
+    )
+    cols = [str(r.get("column_name")).lower() for r in rows or [] if r.get("column_name")]
+    if cols:
+        _COLUMNS_CACHE["match_events"] = cols
+    return cols
+
+
+def _safe_int(x: Any) -> Optional[int]:
+    if x is None:
+        return None
+    try:
+        return int(x)
+    except Exception:
+        return None
+
+
+def _safe_text(x: Any) -> Optional[str]:
+    if x is None:
+        return None
+    try:
+        s = str(x).strip()
+        return s if s else None
+    except Exception:
+        return None
+
+
+# ─────────────────────────────────────
+#  API 이벤트 → row
+# ─────────────────────────────────────
+
+def build_match_event_rows(
+    fixture_id: int,
+    events: List[Dict[str, Any]],
+    cols: List[str],
+) -> Tuple[List[str], List[Tuple[Any, ...]]]:
+    """
+    (insert 컬럼 목록, row 튜플 목록). 매핑은 예전 replace_match_events_for_fixture 와 동일.
+    """
+    have = set(cols)
+    col_extra = "extra" if "extra" in have else ("time_extra" if "time_extra" in have else None)
+
+    ins_cols: List[str] = []
+    for c in ("fixture_id", "minute"):
+        if c in have:
+            ins_cols.append(c)
+    if col_extra:
+        ins_cols.append(col_extra)
+    for c in (
+        "type",
+        "detail",
+        "comments",
+        "team_id",
+        "player_id",
+        "player_name",
+        "assist_player_id",
+        "assist_name",
+        "player_in_id",
+        "player_in_name",
+    ):
+        if c in have:
+            ins_cols.append(c)
+
+    rows: List[Tuple[Any, ...]] = []
+    if not ins_cols:
+        return ins_cols, rows
+
+    for ev in events or []:
+        if not isinstance(ev, dict):
+            continue
+        time_obj = ev.get("time") or {}
+        team_obj = ev.get("team") or {}
+        player_obj = ev.get("player") or {}
+        assist_obj = ev.get("assist") or {}
+
+        assist_id = _safe_int(assist_obj.get("id"))
+        assist_name = _safe_text(assist_obj.get("name"))
+
+        values = {
+            "fixture_id": int(fixture_id),
+            "minute": _safe_int(time_obj.get("elapsed")) or 0,
+            "type": _safe_text(ev.get("type")),
+            "detail": _safe_text(ev.get("detail")),
+            "comments": _safe_text(ev.get("comments")),
+            "team_id": _safe_int(team_obj.get("id")),
+            "player_id": _safe_int(player_obj.get("id")),
+            "player_name": _safe_text(player_obj.get("name")),
+            "assist_player_id": assist_id,
+            "assist_name": assist_name,
+            # SUB: player=OUT, assist=IN 이 흔함
+            "player_in_id": assist_id,
+            "player_in_name": assist_name,
+        }
+        if col_extra:
+            values[col_extra] = _safe_int(time_obj.get("extra"))
+
+        rows.append(tuple(values[c] for c in ins_cols))
+    return ins_cols, rows
+
+
+# ─────────────────────────────────────
+#  공통 (트랜잭션 안)
+# ─────────────────────────────────────
+
+def _lock_and_check(cur, fixture_id: int, skip_if_inplay: bool) -> bool:
+    """
+    fixture 단위 advisory lock. skip_if_inplay 면 matches.status_group 이 INPLAY 일 때 False.
+    """
+    cur.execute("SELECT pg_advisory_xact_lock(%s, %s)", (_EVENTS_LOCK_NS, int(fixture_id) & 0x7FFFFFFF))
+    if not skip_if_inplay:
+        return True
+    cur.execute("SELECT status_group FROM matches WHERE fixture_id = %s LIMIT 1", (int(fixture_id),))
+    row = cur.fetchone()
+    if row and (str(row[0] or "").strip().upper() == "INPLAY"):
+        return False
+    return True
+
+
+def _insert_sql(ins_cols: List[str]) -> str:
+    return f"INSERT INTO match_events ({', '.join(ins_cols)}) VALUES ({', '.join(['%s'] * len(ins_cols))})"
+
+
+# ─────────────────────────────────────
+#  diff 동기화 (라이브 / postmatch)
+# ─────────────────────────────────────
+
+def sync_match_events_for_fixture(
+    fixture_id: int,
+    events: List[Dict[str, Any]],
+    *,
+    skip_if_inplay: bool = False,
+) -> Tuple[int, int]:
+    """
+    반환: (inserted, deleted)
+
+    - events 가 빈 배열이면 DB 를 건드리지 않는다 (예전 정책 유지: 다음 tick 에 들어오면 그때 반영)
+    - 같은 내용의 이벤트가 여러 개면 개수까지 맞춘다 (멀티셋)
+    """
+    if not events:
+        return 0, 0
+    cols = match_events_columns()
+    ins_cols, new_rows = build_match_event_rows(fixture_id, events, cols)
+    if not ins_cols or "id" not in cols:
+        return 0, 0
+
+    with get_connection() as conn:
+        with conn.transaction():
+            with conn.cursor() as cur:
+                if not _lock_and_check(cur, fixture_id, skip_if_inplay):
+                    return 0, 0
+
+                cur.execute(
+                    f"SELECT id, {', '.join(ins_cols)} FROM match_events WHERE fixture_id = %s ORDER BY id",
+                    (int(fixture_id),),
+                )
+                existing = cur.fetchall() or []
+
+                want = Counter(new_rows)
+                delete_ids: List[int] = []
+                for r in existing:
+                    key = tuple(r[1:])
+                    if want.get(key, 0) > 0:
+                        want[key] -= 1
+                    else:
+                        delete_ids.append(r[0])
+
+                # 남은 want = 새로 생긴 이벤트 (API 순서 유지)
+                to_insert: List[Tuple[Any, ...]] = []
+                for row in new_rows:
+                    if want.get(row, 0) > 0:
+                        want[row] -= 1
+                        to_insert.append(row)
+
+                if delete_ids:
+                    cur.execute("DELETE FROM match_events WHERE id = ANY(%s)", (delete_ids,))
+                if to_insert:
+                    cur.executemany(_insert_sql(ins_cols), to_insert)
+
+    return len(to_insert), len(delete_ids)
+
+
+# ─────────────────────────────────────
+#  전체 재적재 (backfill)
+# ─────────────────────────────────────
+
+def copy_match_events_for_fixture(
+    fixture_id: int,
+    events: List[Dict[str, Any]],
+    *,
+    skip_if_inplay: bool = False,
+) -> int:
+    """
+    DELETE + COPY 로 fixture 이벤트 전체 재적재. 반환: 적재 row 수.
+    (events 가 빈 배열이면 아무것도 안 함)
+    """
+    if not events:
+        return 0
+    cols = match_events_columns()
+    ins_cols, rows = build_match_event_rows(fixture_id, events, cols)
+    if not ins_cols:
+        return 0
+
+    with get_connection() as conn:
+        with conn.transaction():
+            with conn.cursor() as cur:
+                if not _lock_and_check(cur, fixture_id, skip_if_inplay):
+                    return 0
+                cur.execute("DELETE FROM match_events WHERE fixture_id = %s", (int(fixture_id),))
+                with cur.copy(f"COPY match_events ({', '.join(ins_cols)}) FROM STDIN") as cp:
+                    for row in rows:
+                        cp.write_row(row)
+    return len(rows)
@@ -0,0 +1,202 @@
+# services/match_predictions_store.py
+#
+# 목적:
+# - 예정 경기(킥오프 전)의 insights_overall + ai_predictions 를 배치 잡
+#   (football/workers/predictions_precompute.py)이 미리 계산해서 저장해 두고,
+#   매치디테일 번들은 "아직 유효하면" 저장된 값을 그대로 내려준다.
+#
+# 테이블:
+#   match_prediction_snapshots
+#     - fixture_id PK
+#     - header_sig : matchdetail/block_cache.header_signature (팀/킥오프/리그/시즌/필터, override 반영)
+#     - fixture_version / league_version : services/match_data_version 의 버전 (계산 시점)
+#     - team_version : 두 팀 팀 버전의 합 (계산 시점, 팀의 어떤 대회 경기든 끝나면 증가)
+#     - insights_json / ai_json
+#     - computed_utc
+#
+# 유효 조건 (하나라도 어긋나면 즉시 계산 → 기존 동작):
+#   - header_sig 동일 (기본 필터로 여는 요청만 해당, comp/last_n 을 바꾼 요청은 miss)
+#   - (fixture_version, league_version) 동일
+#   - team_version 동일 = 계산 이후 두 팀 중 누구의 경기도 끝나지 않음
+#     (컵/대륙컵 등 다른 리그 경기가 끝나도 무효화, match_data_versions PK 조회라 요청 경로에서 가벼움)
+
+import json
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+
+from db import execute, fetch_one
+
+
+# ─────────────────────────────────────
+#  DDL
+# ─────────────────────────────────────
+
+MATCH_PREDICTION_SNAPSHOTS_DDL = """
+CREATE TABLE IF NOT EXISTS match_prediction_snapshots (
+    fixture_id       BIGINT PRIMARY KEY,
+    header_sig       TEXT NOT NULL,
+    fixture_version  BIGINT NOT NULL DEFAULT 0,
+    league_version   BIGINT NOT NULL DEFAULT 0,
+    team_version     BIGINT NOT NULL DEFAULT 0,
+    home_id          INTEGER,
+    away_id          INTEGER,
+    insights_json    TEXT,
+    ai_json          TEXT,
+    computed_utc     TIMESTAMPTZ NOT NULL DEFAULT now()
+)
+"""
+
+_TABLE_OK: Dict[str, bool] = {}
+
+
+def match_prediction_snapshots_available() -> bool:
+    """
+    to_regclass 로 존재 확인. True 일 때만 캐시한다.
+    """
+    if _TABLE_OK.get("match_prediction_snapshots"):
+        return True
+    try:
+        row = fetch_one("SELECT to_regclass(%s) AS t", ("public.match_prediction_snapshots",))
+        ok = bool(row and row.get("t"))
+    except Exception:
+        ok = False
+    if ok:
+        _TABLE_OK["match_prediction_snapshots"] = True
+    return ok
+
+
+def ensure_match_prediction_snapshots_table() -> None:
+    execute(MATCH_PREDICTION_SNAPSHOTS_DDL)
+    _TABLE_OK["match_prediction_snapshots"] = True
+
+
+# ─────────────────────────────────────
+#  조회 (API)
+# ─────────────────────────────────────
+
+def _loads(raw: Any) -> Any:
+    if raw is None:
+        return None
+    try:
+        return json.loads(raw)
+    except Exception:
+        return None
+
+
+def load_match_prediction_snapshot(
+    fixture_id: int,
+    header_sig: str,
+    versions: Tuple[int, int],
+) -> Optional[Dict[str, Any]]:
+    """
+    유효하면 {"insights": ..., "ai": ...}, 아니면 None.
+    """
+    if not match_prediction_snapshots_available():
+        return None
+
+    fv, lv = versions
+    try:
+        row = fetch_one(
+            """
+            SELECT p.insights_json, p.ai_json
+            FROM match_prediction_snapshots p
+            WHERE p.fixture_id = %s
+              AND p.header_sig = %s
+              AND p.fixture_version = %s
+              AND p.league_version = %s
+              AND p.team_version = COALESCE((
+                  SELECT SUM(v.version)
+                  FROM match_data_versions v
+                  WHERE v.scope = 'team'
+                    AND v.scope_id IN (p.home_id, p.away_id)
+              ), 0)
+            """,
+            (int(fixture_id), header_sig, int(fv), int(lv)),
+        )
+    except Exception:
+        return None
+    if not row:
+        return None
+
+    insights = _loads(row.get("insights_json"))
+    if not isinstance(insights, dict):
+        return None
+    return {"insights": insights, "ai": _loads(row.get("ai_json"))}
+
+
+# ─────────────────────────────────────
+#  저장 (배치 잡)
+# ─────────────────────────────────────
+
+def save_match_prediction_snapshot(
+    *,
+    fixture_id: int,
+    header_sig: str,
+    versions: Tuple[int, int],
+    team_version: int,
+    home_id: Any,
+    away_id: Any,
+    insights: Dict[str, Any],
+    ai: Optional[Dict[str, Any]],
+    started_utc: datetime,
+) -> None:
+    """
+    versions / team_version / started_utc 는 계산 "전에" 잡은 값을 넘긴다.
+    (계산 도중 bump 되면 다음 조회에서 miss → 안전한 쪽)
+    """
+    if not match_prediction_snapshots_available():
+        return
+
+    fv, lv = versions
+    execute(
+        """
+        INSERT INTO match_prediction_snapshots (
+            fixture_id, header_sig, fixture_version, league_version, team_version,
+            home_id, away_id, insights_json, ai_json, computed_utc
+        )
+        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+        ON CONFLICT (fixture_id) DO UPDATE SET
+            header_sig      = EXCLUDED.header_sig,
+            fixture_version = EXCLUDED.fixture_version,
+            league_version  = EXCLUDED.league_version,
+            team_version    = EXCLUDED.team_version,
+            home_id         = EXCLUDED.home_id,
+            away_id         = EXCLUDED.away_id,
+            insights_json   = EXCLUDED.insights_json,
+            ai_json         = EXCLUDED.ai_json,
+            computed_utc    = EXCLUDED.computed_utc
+        """,
+        (
+            int(fixture_id),
+            header_sig,
+            int(fv),
+            int(lv),
+            int(team_version or 0),
+            int(home_id) if home_id is not None else None,
+            int(away_id) if away_id is not None else None,
+            json.dumps(insights, ensure_ascii=False, default=str),
+            json.dumps(ai, ensure_ascii=False, default=str) if ai is not None else None,
+            started_utc,
+        ),
+    )
+
+
+def delete_stale_match_prediction_snapshots(days: int = 3) -> None:
+    """
+    종료 후 며칠 지난 경기 스냅샷 정리 (best-effort).
+    """
+    if not match_prediction_snapshots_available():
+        return
+    try:
+        execute(
+            """
+            DELETE FROM match_prediction_snapshots p
+            USING matches m
+            WHERE m.fixture_id = p.fixture_id
+              AND m.status_group = 'FINISHED'
+              AND p.computed_utc < (now() - (%s || ' days')::interval)
+            """,
+            (str(int(days)),),
+        )
+    except Exception as e:
+        print(f"[match_prediction_snapshots] delete stale failed (days={days}): {e}", flush=True)
@@ -0,0 +1,192 @@
+# services/matches_kickoff.py
+#
+# 목적:
+# - matches.date_utc 는 운영 DB 에서 TEXT 라서 날짜 범위 조회 때마다
+#   date_utc::timestamptz 캐스팅이 row 마다 일어나고, 인덱스를 못 탄다(풀스캔).
+# - 타입이 있는 matches.kickoff_utc (TIMESTAMPTZ) 컬럼 + 인덱스를 두고,
+#   BEFORE INSERT/UPDATE 트리거로 date_utc 와 항상 동기화한다.
+#   (text -> timestamptz 캐스팅은 IMMUTABLE 이 아니라 expression index 불가 → 컬럼 방식)
+#
+# 사용처:
+# - main.py list_fixtures / admin_fixtures_raw / admin_list_fixtures_merged
+# - services/home_service.py, services/league_directory_service.py
+# - leaguedetail/bundle_service.py
+# - live_status_worker.py (워커 시작 시 ensure + 정렬/필터)
+#
+# 마이그레이션 (오프라인 / 배포 단계에서 1회):
+# - db/migrate/add_matches_kickoff_utc.sql          (컬럼/트리거)
+# - db/migrate/backfill_matches_kickoff_utc.py      (기존 row 배치 backfill + CREATE INDEX CONCURRENTLY)
+# 워커 시작 시 ensure 는 nullable 컬럼 추가만 한다 (full-table UPDATE / 인덱스 빌드가 matches 쓰기를 막지 않도록).
+
+from typing import Dict, Optional
+
+from db import execute, fetch_one
+
+
+# ─────────────────────────────────────
+#  DDL
+# ─────────────────────────────────────
+
+MATCHES_KICKOFF_COLUMN_DDL = "ALTER TABLE matches ADD COLUMN IF NOT EXISTS kickoff_utc TIMESTAMPTZ"
+
+# 잘못된 날짜 문자열이 들어와도 upsert 자체는 실패하지 않도록 NULL 로 둔다.
+MATCHES_KICKOFF_TRIGGER_FUNCTION_SQL = """
+CREATE OR REPLACE FUNCTION matches_set_kickoff_utc()
+RETURNS TRIGGER AS $$
+BEGIN
+  BEGIN
+    NEW.kickoff_utc := NULLIF(NEW.date_utc::text, '')::timestamptz;
+  EXCEPTION WHEN others THEN
+    NEW.kickoff_utc := NULL;
+  END;
+  RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+"""
+
+MATCHES_KICKOFF_TRIGGER_SQL = """
+DO $$
+BEGIN
+  IF NOT EXISTS (
+    SELECT 1 FROM pg_trigger WHERE tgname = 'trg_matches_kickoff_utc'
+  ) THEN
+    CREATE TRIGGER trg_matches_kickoff_utc
+    BEFORE INSERT OR UPDATE OF date_utc ON matches
+    FOR EACH ROW EXECUTE FUNCTION matches_set_kickoff_utc();
+  END IF;
+END$$;
+"""
+
+# idx_matches_kickoff_utc 는 "backfill 까지 끝났다"는 표시로도 쓰이므로 항상 마지막에 만든다.
+# CONCURRENTLY: 빌드 중에도 matches 쓰기(라이브 워커)를 막지 않음 (트랜잭션 밖 = autocommit 에서만 실행 가능)
+MATCHES_KICKOFF_INDEXES = (
+    ("idx_matches_league_season_kickoff", "matches (league_id, season, kickoff_utc)"),
+    ("idx_matches_league_kickoff", "matches (league_id, kickoff_utc)"),
+    ("idx_matches_kickoff_utc", "matches (kickoff_utc)"),
+)
+
+# date_utc 를 자기 자신으로 UPDATE → 트리거가 kickoff_utc 계산(잘못된 문자열은 NULL 처리까지 동일)
+BACKFILL_BATCH_SQL = """
+UPDATE matches m
+SET date_utc = m.date_utc
+WHERE m.fixture_id IN (
+    SELECT fixture_id
+    FROM matches
+    WHERE kickoff_utc IS NULL
+      AND NULLIF(date_utc::text, '') IS NOT NULL
+      AND fixture_id > %s
+    ORDER BY fixture_id
+    LIMIT %s
+)
+RETURNING m.fixture_id
+"""
+
+
+# ─────────────────────────────────────
+#  존재 확인 (프로세스 캐시)
+# ─────────────────────────────────────
+
+_KICKOFF_OK: Dict[str, bool] = {}
+
+
+def matches_kickoff_available() -> bool:
+    """
+    kickoff_utc 컬럼 + 마지막 인덱스(idx_matches_kickoff_utc)가 있으면 True.
+    True 일 때만 캐시한다. (워커/마이그레이션이 나중에 만들 수 있음)
+    """
+    if _KICKOFF_OK.get("ok"):
+        return True
+    try:
+        ok = _index_valid("idx_matches_kickoff_utc") is True
+    except Exception:
+        ok = False
+    if ok:
+        _KICKOFF_OK["ok"] = True
+    return ok
+
+
+def _index_valid(name: str) -> Optional[bool]:
+    """
+    None = 인덱스 없음, False = CONCURRENTLY 빌드가 중간에 실패해 INVALID 로 남은 상태.
+    """
+    row = fetch_one(
+        """
+        SELECT i.indisvalid AS valid
+        FROM pg_index i
+        WHERE i.indexrelid = to_regclass(%s)
+        """,
+        (f"public.{name}",),
+    )
+    if not row:
+        return None
+    return bool(row.get("valid"))
+
+
+def kickoff_sql(alias: str = "m") -> str:
+    """
+    날짜 범위/정렬용 SQL 식.
+    - kickoff_utc 가 준비돼 있으면 인덱스를 타는 컬럼 그대로
+    - 아니면 기존 캐스팅 식 fallback
+    """
+    prefix = f"{alias}." if alias else ""
+    if matches_kickoff_available():
+        return f"{prefix}kickoff_utc"
+    return f"NULLIF({prefix}date_utc::text, '')::timestamptz"
+
+
+# ─────────────────────────────────────
+#  ensure / backfill
+# ─────────────────────────────────────
+
+def backfill_matches_kickoff_utc(batch_size: int = 5000, verbose: bool = False) -> int:
+    """
+    kickoff_utc 가 비어 있는 기존 row 를 fixture_id 순으로 batch_size 씩 채운다.
+    (autocommit 이라 batch 마다 커밋 → 긴 락 없음)
+    반환: 채운 row 수
+    """
+    batch_size = max(1, int(batch_size or 5000))
+    last_id = 0
+    total = 0
+    while True:
+        row = fetch_one(
+            f"""
+            WITH upd AS ({BACKFILL_BATCH_SQL})
+            SELECT COUNT(*) AS n, MAX(fixture_id) AS last_id FROM upd
+            """,
+            (last_id, batch_size),
+        )
+        n = int((row or {}).get("n") or 0)
+        if n <= 0:
+            break
+        total += n
+        last_id = int(row.get("last_id") or last_id)
+        if verbose:
+            print(f"[matches_kickoff] backfill +{n} (total={total}, last_id={last_id})", flush=True)
+    return total
+
+
+def create_matches_kickoff_indexes(verbose: bool = False) -> None:
+    """
+    CREATE INDEX CONCURRENTLY (마이그레이션 스크립트 전용, autocommit 커넥션에서 호출).
+    이전 빌드가 실패해 INVALID 로 남은 인덱스는 지우고 다시 만든다.
+    """
+    for name, target in MATCHES_KICKOFF_INDEXES:
+        state = _index_valid(name)
+        if state is True:
+            continue
+        if state is False:
+            if verbose:
+                print(f"[matches_kickoff] drop invalid index {name}", flush=True)
+            execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
+        if verbose:
+            print(f"[matches_kickoff] CREATE INDEX CONCURRENTLY {name} ON {target}", flush=True)
+        execute(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {target}")
+
+
+def ensure_matches_kickoff_column() -> None:
+    """
+    워커 시작 시 1회 호출: nullable 컬럼 추가만 (메타데이터 변경, 테이블 rewrite 없음).
+    - 트리거 / 기존 row backfill / 인덱스는 db/migrate 단계에서 (matches 쓰기 락 방지)
+    - 인덱스가 생기기 전까지 kickoff_sql() 은 기존 캐스팅 식을 쓰므로 컬럼이 비어 있어도 안전
+    """
+    execute(MATCHES_KICKOFF_COLUMN_DDL)
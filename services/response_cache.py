@@ -0,0 +1,304 @@
+# services/response_cache.py
+#
+# 목적:
+# - /api/fixtures, /api/fixtures_by_ids, /api/home/leagues 처럼
+#   수천 클라이언트가 같은 (date, timezone, league_ids) 조합으로 폴링하는 응답을 캐시한다.
+# - 1차: 프로세스 내 LRU (항상)
+# - 2차: 공유 캐시 (REDIS_URL 이 있고 redis 패키지가 설치돼 있을 때만, 선택)
+#
+# TTL 정책 (live-aware):
+# - 응답에 INPLAY 경기가 있으면 짧게            (RESPONSE_CACHE_TTL_LIVE, 기본 10초)
+# - 곧 킥오프할(또는 킥오프 시각이 지났는데 아직 예정인) 경기가 있으면 중간  (RESPONSE_CACHE_TTL_SOON, 기본 30초)
+# - 종료/먼 예정 경기만 있으면 길게            (RESPONSE_CACHE_TTL_IDLE, 기본 300초)
+#
+# 무효화:
+# - 관리자 match_overrides PUT/DELETE → invalidate_fixtures([fixture_id], kickoffs=[이전 킥오프, 새 킥오프])
+#   * 로컬 LRU: 해당 fixture_id 가 들어있는 엔트리 + 킥오프 구간(날짜 목록)이 이전/새 킥오프를 덮는 엔트리 삭제
+#     (override 로 날짜를 옮기면 새 날짜 목록에는 아직 그 fixture_id 가 없으므로)
+#   * 공유 캐시: generation 카운터를 올려 공유 엔트리 전체를 한 번에 무효화
+#     (관리자 수정은 드물어서 전체 무효화로 충분)
+#   * generation 은 프로세스에서 RESPONSE_CACHE_GEN_TTL_SEC(기본 1초) 동안 재사용
+#     → 로컬 LRU hit 마다 Redis 왕복을 하지 않음, 다른 프로세스의 무효화는 최대 그 시간만큼 늦게 반영
+#   * 공유 캐시가 없으면 다른 프로세스의 로컬 LRU 는 TTL 만료까지 남는다 (최대 TTL_IDLE)
+
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+try:
+    import redis  # type: ignore
+except Exception:  # pragma: no cover - 선택 의존성
+    redis = None  # type: ignore
+
+
+RESPONSE_CACHE_ENABLED = os.environ.get("RESPONSE_CACHE_ENABLED", "1") not in ("0", "false", "False")
+RESPONSE_CACHE_MAX = int(os.environ.get("RESPONSE_CACHE_MAX", "2000"))
+
+RESPONSE_CACHE_TTL_LIVE = int(os.environ.get("RESPONSE_CACHE_TTL_LIVE", "10"))
+RESPONSE_CACHE_TTL_SOON = int(os.environ.get("RESPONSE_CACHE_TTL_SOON", "30"))
+RESPONSE_CACHE_TTL_IDLE = int(os.environ.get("RESPONSE_CACHE_TTL_IDLE", "300"))
+
+REDIS_URL = (os.environ.get("REDIS_URL") or "").strip()
+RESPONSE_CACHE_REDIS_PREFIX = os.environ.get("RESPONSE_CACHE_REDIS_PREFIX", "sportsapi:resp")
+RESPONSE_CACHE_GEN_TTL_SEC = float(os.environ.get("RESPONSE_CACHE_GEN_TTL_SEC", "1"))
+
+
+# ─────────────────────────────────────
+#  1차: 프로세스 내 LRU
+# ─────────────────────────────────────
+
+# key -> (expires_ts, generation, fixture_ids, kickoff 구간(epoch start, end) 또는 None, payload)
+_LOCAL: "OrderedDict[str, Tuple[float, int, frozenset, Optional[Tuple[float, float]], Dict[str, Any]]]" = OrderedDict()
+_LOCK = threading.Lock()
+
+
+def _local_get(key: str, gen: int) -> Optional[Dict[str, Any]]:
+    now_ts = time.time()
+    with _LOCK:
+        ent = _LOCAL.get(key)
+        if ent is None:
+            return None
+        exp, ent_gen, _ids, _window, payload = ent
+        if exp <= now_ts or ent_gen != gen:
+            _LOCAL.pop(key, None)
+            return None
+        _LOCAL.move_to_end(key)
+        return payload
+
+
+def _local_set(
+    key: str,
+    gen: int,
+    fixture_ids: Iterable[int],
+    window: Optional[Tuple[float, float]],
+    payload: Dict[str, Any],
+    ttl: int,
+) -> None:
+    with _LOCK:
+        _LOCAL[key] = (time.time() + ttl, gen, frozenset(fixture_ids), window, payload)
+        _LOCAL.move_to_end(key)
+        while len(_LOCAL) > max(1, RESPONSE_CACHE_MAX):
+            _LOCAL.popitem(last=False)
+
+
+# ─────────────────────────────────────
+#  2차: 공유 캐시 (선택)
+# ─────────────────────────────────────
+
+_REDIS: Dict[str, Any] = {}
+# 공유 generation 프로세스 캐시: {"value": int, "checked": 마지막 조회 ts}
+_GEN: Dict[str, Any] = {"value": 0, "checked": 0.0}
+
+
+def _redis_client():
+    if not REDIS_URL or redis is None:
+        return None
+    cli = _REDIS.get("client")
+    if cli is None:
+        try:
+            cli = redis.Redis.from_url(REDIS_URL, socket_timeout=0.2, socket_connect_timeout=0.2)
+        except Exception as e:
+            print(f"[response_cache] redis init failed: {e}", flush=True)
+            return None
+        _REDIS["client"] = cli
+    return cli
+
+
+def _gen_key() -> str:
+    return f"{RESPONSE_CACHE_REDIS_PREFIX}:gen"
+
+
+def _shared_generation() -> int:
+    """
+    공유 캐시 generation (없으면 0).
+    로컬 엔트리도 generation 을 같이 들고 있어서, 다른 프로세스가 무효화하면 로컬도 같이 miss 된다.
+    RESPONSE_CACHE_GEN_TTL_SEC 동안은 마지막으로 읽은 값을 그대로 쓴다 (Redis 장애 시에도 마지막 값 유지).
+    """
+    cli = _redis_client()
+    if cli is None:
+        return 0
+    now_ts = time.time()
+    if now_ts - float(_GEN["checked"]) < RESPONSE_CACHE_GEN_TTL_SEC:
+        return int(_GEN["value"])
+    try:
+        _GEN["value"] = int(cli.get(_gen_key()) or 0)
+    except Exception:
+        pass
+    _GEN["checked"] = now_ts
+    return int(_GEN["value"])
+
+
+def _shared_get(key: str, gen: int) -> Optional[Dict[str, Any]]:
+    cli = _redis_client()
+    if cli is None:
+        return None
+    try:
+        raw = cli.get(f"{RESPONSE_CACHE_REDIS_PREFIX}:{gen}:{key}")
+    except Exception:
+        return None
+    if not raw:
+        return None
+    try:
+        obj = json.loads(raw)
+    except Exception:
+        return None
+    return obj if isinstance(obj, dict) else None
+
+
+def _shared_set(key: str, gen: int, payload: Dict[str, Any], ttl: int) -> None:
+    cli = _redis_client()
+    if cli is None:
+        return
+    try:
+        cli.setex(
+            f"{RESPONSE_CACHE_REDIS_PREFIX}:{gen}:{key}",
+            ttl,
+            json.dumps(payload, ensure_ascii=False, default=str),
+        )
+    except Exception:
+        pass
+
+
+# ─────────────────────────────────────
+#  TTL 정책
+# ─────────────────────────────────────
+
+def _parse_kickoff(v: Any) -> Optional[datetime]:
+    if isinstance(v, datetime):
+        return v if v.tzinfo else v.replace(tzinfo=timezone.utc)
+    if isinstance(v, str) and v.strip():
+        try:
+            dt = datetime.fromisoformat(v.strip().replace("Z", "+00:00"))
+        except Exception:
+            return None
+        return dt if dt.tzinfo else dt.replace(tzinfo=timezone.utc)
+    return None
+
+
+def ttl_for_fixture_rows(rows: List[Dict[str, Any]]) -> int:
+    """
+    리스트 응답 row 들(fixture dict)을 보고 TTL 결정.
+    """
+    now = datetime.now(timezone.utc)
+    soon = False
+    for r in rows or []:
+        sg = (r.get("status_group") or "").upper()
+        if sg == "INPLAY":
+            return RESPONSE_CACHE_TTL_LIVE
+        if sg == "FINISHED":
+            continue
+        # 예정 경기: TTL_IDLE 안에 킥오프하거나 이미 킥오프 시각이 지났으면 짧게
+        ko = _parse_kickoff(r.get("date_utc"))
+        if ko is not None and (ko - now).total_seconds() <= RESPONSE_CACHE_TTL_IDLE:
+            soon = True
+    return RESPONSE_CACHE_TTL_SOON if soon else RESPONSE_CACHE_TTL_IDLE
+
+
+# ─────────────────────────────────────
+#  public API
+# ─────────────────────────────────────
+
+def make_cache_key(endpoint: str, **parts: Any) -> str:
+    """
+    정규화된 쿼리로 캐시 키 생성.
+    - list/tuple/set 값은 정렬해서 순서 무관하게
+      (순서가 의미 있는 값은 호출 측에서 문자열로 넘길 것)
+    """
+    items = []
+    for k in sorted(parts.keys()):
+        v = parts[k]
+        if isinstance(v, (set, frozenset)):
+            v = sorted(v)
+        elif isinstance(v, (list, tuple)):
+            v = sorted(v, key=lambda x: str(x))
+        items.append(f"{k}={v}")
+    return endpoint + "?" + "&".join(items)
+
+
+def cache_get(key: str) -> Optional[Dict[str, Any]]:
+    if not RESPONSE_CACHE_ENABLED:
+        return None
+    gen = _shared_generation()
+    payload = _local_get(key, gen)
+    if payload is not None:
+        return payload
+    return _shared_get(key, gen)
+
+
+def cache_set(
+    key: str,
+    payload: Dict[str, Any],
+    ttl: int,
+    fixture_ids: Optional[Iterable[Any]] = None,
+    kickoff_window: Optional[Tuple[Any, Any]] = None,
+) -> None:
+    """
+    fixture_ids: 이 응답에 포함된 fixture_id (override 무효화 대상 판별용)
+    kickoff_window: 날짜 목록 응답의 UTC 구간 [start, end) (override 로 킥오프가 이 구간에 들어오거나 나가면 무효화)
+    """
+    if not RESPONSE_CACHE_ENABLED or ttl <= 0:
+        return
+    ids: List[int] = []
+    for x in fixture_ids or []:
+        try:
+            ids.append(int(x))
+        except Exception:
+            continue
+    window: Optional[Tuple[float, float]] = None
+    if kickoff_window is not None:
+        start, end = (_parse_kickoff(x) for x in kickoff_window)
+        if start is not None and end is not None:
+            window = (start.timestamp(), end.timestamp())
+    gen = _shared_generation()
+    _local_set(key, gen, ids, window, payload, ttl)
+    _shared_set(key, gen, payload, ttl)
+
+
+def invalidate_fixtures(fixture_ids: Iterable[Any], kickoffs: Optional[Iterable[Any]] = None) -> int:
+    """
+    match_overrides 변경 시 호출.
+    - 로컬: 해당 fixture 가 포함된 엔트리 + kickoff_window 가 kickoffs(이전/새 킥오프) 중 하나를 덮는 엔트리 삭제
+    - 공유: generation 증가(공유 엔트리 전체 무효화)
+    반환: 삭제된 로컬 엔트리 수
+    """
+    ids = set()
+    for x in fixture_ids or []:
+        try:
+            ids.add(int(x))
+        except Exception:
+            continue
+    kos = [dt.timestamp() for dt in (_parse_kickoff(x) for x in kickoffs or []) if dt is not None]
+    if not ids and not kos:
+        return 0
+
+    def _hit(ent: Tuple[float, int, frozenset, Optional[Tuple[float, float]], Dict[str, Any]]) -> bool:
+        if ent[2] & ids:
+            return True
+        window = ent[3]
+        return window is not None and any(window[0] <= ts < window[1] for ts in kos)
+
+    removed = 0
+    with _LOCK:
+        for key in [k for k, ent in _LOCAL.items() if _hit(ent)]:
+            _LOCAL.pop(key, None)
+            removed += 1
+
+    cli = _redis_client()
+    if cli is not None:
+        try:
+            # 이 프로세스는 generation 캐시를 기다리지 않고 바로 새 값 사용
+            _GEN["value"] = int(cli.incr(_gen_key()))
+            _GEN["checked"] = time.time()
+        except Exception as e:
+            print(f"[response_cache] shared invalidate failed: {e}", flush=True)
+
+    return removed
+
+
+def cache_clear() -> None:
+    with _LOCK:
+        _LOCAL.clear()
@@ -0,0 +1,212 @@
+# services/team_meta.py
+#
+# 팀 메타(teams: name / country / logo) 일괄 해석 (postmatch_backfill / schedule_sync / teams_backfill 공용)
+#
+# 배경:
+# - 예전 팀 메타 backfill(postmatch_backfill 단건 경로 / teams_backfill)은 없는 팀마다 /teams?id= 를 한 번씩 불렀고,
+#   "teams 에 있나?" 조회도 호출 지점마다 다시 돌았다 (새 시즌 bootstrap 이면 수백 콜).
+#   지금은 세 경로 모두 resolve_team_meta 하나만 쓴다.
+#
+# 여기서:
+# - 프로세스 캐시(_KNOWN_TEAM_IDS): 한 번 teams 에 있다고 확인된 id 는 다시 조회하지 않음
+# - 없는 팀 → matches 에서 (league, season) 묶음을 set 기반 쿼리 1번으로 찾고,
+#   가장 많이 덮는 묶음부터 /teams?league=&season= 1콜로 그 리그 팀 전부를 받음
+#   (받은 팀은 이미 있던 팀도 이름/로고를 같이 갱신 → 로고/이름 결손 일괄 복구)
+# - 어느 묶음에도 안 걸리는 팀만 /teams?id= 단건 fallback
+# - upsert 는 unnest 배열로 한 번에, 실제로 바뀐 row 만 UPDATE (RETURNING 으로 바뀐 id 반환)
+#
+# HTTP 는 호출 측 get_teams(params) -> API 응답 dict 를 그대로 씀 (워커마다 세션/재시도/레이트리밋이 다름)
+
+import sys
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from db import execute, fetch_all
+
+
+# teams 에 있다고 확인된 id / 이번 프로세스에서 이미 받아온 (league, season)
+_KNOWN_TEAM_IDS: Set[int] = set()
+_FETCHED_LEAGUE_SEASONS: Set[Tuple[int, int]] = set()
+# 묶음/단건 모두 실패한 id (같은 프로세스에서 단건 재호출 반복 방지)
+_UNRESOLVED_TEAM_IDS: Set[int] = set()
+
+
+def _norm_ids(ids: Iterable[Any]) -> List[int]:
+    out: Set[int] = set()
+    for x in ids or []:
+        try:
+            out.add(int(x))
+        except Exception:
+            continue
+    return sorted(out)
+
+
+# ─────────────────────────────────────
+#  DB
+# ─────────────────────────────────────
+
+def missing_team_ids(team_ids: Iterable[Any]) -> List[int]:
+    """
+    teams 에 없는 id. 캐시에 없는 것만 DB 에 한 번 물어본다.
+    """
+    ids = [tid for tid in _norm_ids(team_ids) if tid not in _KNOWN_TEAM_IDS]
+    if not ids:
+        return []
+    rows = fetch_all("SELECT id FROM teams WHERE id = ANY(%s)", (ids,))
+    for r in rows or []:
+        if r and r.get("id") is not None:
+            _KNOWN_TEAM_IDS.add(int(r["id"]))
+    return [tid for tid in ids if tid not in _KNOWN_TEAM_IDS]
+
+
+def _team_league_seasons(team_ids: List[int]) -> List[Tuple[int, int, Set[int]]]:
+    """
+    [(league_id, season, 그 묶음에 나오는 대상 팀들)] — 많이 덮는 순, 같으면 최근 시즌 먼저.
+    """
+    if not team_ids:
+        return []
+    rows = fetch_all(
+        """
+        SELECT m.league_id, m.season, array_agg(DISTINCT v.team_id) AS team_ids
+        FROM matches m
+        CROSS JOIN LATERAL (VALUES (m.home_id), (m.away_id)) AS v(team_id)
+        WHERE (m.home_id = ANY(%s) OR m.away_id = ANY(%s))
+          AND v.team_id = ANY(%s)
+          AND m.league_id IS NOT NULL
+          AND m.season IS NOT NULL
+        GROUP BY m.league_id, m.season
+        """,
+        (team_ids, team_ids, team_ids),
+    )
+    out: List[Tuple[int, int, Set[int]]] = []
+    for r in rows or []:
+        try:
+            out.append((int(r["league_id"]), int(r["season"]), {int(t) for t in (r.get("team_ids") or [])}))
+        except Exception:
+            continue
+    out.sort(key=lambda g: (-len(g[2]), -g[1], g[0]))
+    return out
+
+
+def upsert_teams_bulk(items: List[Dict[str, Any]]) -> List[int]:
+    """
+    /teams 응답 원소({"team": {...}, "venue": {...}}) 목록 → teams 한 번에 upsert.
+    빈 값은 기존 값을 덮지 않음 (leagues upsert 와 같은 규칙). 반환: 새로 생기거나 바뀐 team id.
+    """
+    by_id: Dict[int, Tuple[Optional[str], Optional[str], Optional[str]]] = {}
+    for it in items or []:
+        t = (it.get("team") if isinstance(it, dict) else None) or {}
+        if t.get("id") is None:
+            continue
+        try:
+            by_id[int(t["id"])] = (t.get("name"), t.get("country"), t.get("logo"))
+        except Exception:
+            continue
+    if not by_id:
+        return []
+
+    ids = sorted(by_id)
+    rows = fetch_all(
+        """
+        INSERT INTO teams (id, name, country, logo)
+        SELECT * FROM unnest(%s::int[], %s::text[], %s::text[], %s::text[])
+        ON CONFLICT (id) DO UPDATE SET
+            name = COALESCE(NULLIF(EXCLUDED.name,''), teams.name),
+            country = COALESCE(NULLIF(EXCLUDED.country,''), teams.country),
+            logo = COALESCE(NULLIF(EXCLUDED.logo,''), teams.logo)
+        WHERE (teams.name, teams.country, teams.logo) IS DISTINCT FROM (
+            COALESCE(NULLIF(EXCLUDED.name,''), teams.name),
+            COALESCE(NULLIF(EXCLUDED.country,''), teams.country),
+            COALESCE(NULLIF(EXCLUDED.logo,''), teams.logo)
+        )
+        RETURNING id
+        """,
+        (
+            ids,
+            [by_id[i][0] for i in ids],
+            [by_id[i][1] for i in ids],
+            [by_id[i][2] for i in ids],
+        ),
+    )
+    _KNOWN_TEAM_IDS.update(ids)
+    return [int(r["id"]) for r in rows or [] if r and r.get("id") is not None]
+
+
+# ─────────────────────────────────────
+#  API
+# ─────────────────────────────────────
+
+def _response_items(data: Any) -> List[Dict[str, Any]]:
+    rows = (data.get("response") or []) if isinstance(data, dict) else []
+    return [r for r in rows if isinstance(r, dict)]
+
+
+def refresh_league_season_teams(
+    get_teams: Callable[[Dict[str, Any]], Any],
+    league_id: int,
+    season: int,
+    *,
+    tag: str = "team_meta",
+) -> Tuple[Set[int], List[int]]:
+    """
+    /teams?league=&season= 1콜 → 그 리그 팀 전부 upsert. 반환: (응답에 나온 team id, 새로 생기거나 바뀐 id)
+    """
+    key = (int(league_id), int(season))
+    _FETCHED_LEAGUE_SEASONS.add(key)
+    try:
+        items = _response_items(get_teams({"league": key[0], "season": key[1]}))
+    except Exception as e:
+        print(f"[{tag}] teams league={key[0]} season={key[1]} failed: {e}", file=sys.stderr, flush=True)
+        return set(), []
+    seen = {int((it.get("team") or {})["id"]) for it in items if (it.get("team") or {}).get("id") is not None}
+    return seen, upsert_teams_bulk(items)
+
+
+def resolve_team_meta(
+    team_ids: Iterable[Any],
+    get_teams: Callable[[Dict[str, Any]], Any],
+    *,
+    tag: str = "team_meta",
+) -> List[int]:
+    """
+    teams 에 없는 팀을 (league, season) 묶음 호출 → 단건 fallback 순으로 채운다.
+    반환: teams 에서 새로 생기거나 이름/로고가 바뀐 team id (fixture_list_rows 재계산 대상)
+    """
+    missing = [tid for tid in missing_team_ids(team_ids) if tid not in _UNRESOLVED_TEAM_IDS]
+    if not missing:
+        return []
+
+    remaining: Set[int] = set(missing)
+    changed: Set[int] = set()
+    league_calls = 0
+
+    for league_id, season, covers in _team_league_seasons(missing):
+        if not (covers & remaining):
+            continue
+        if (league_id, season) in _FETCHED_LEAGUE_SEASONS:
+            continue
+        seen, upd = refresh_league_season_teams(get_teams, league_id, season, tag=tag)
+        league_calls += 1
+        changed.update(upd)
+        remaining -= seen
+        if not remaining:
+            break
+
+    single_calls = 0
+    for tid in sorted(remaining):
+        single_calls += 1
+        try:
+            items = _response_items(get_teams({"id": int(tid)}))[:1]
+        except Exception as e:
+            print(f"[{tag}] team fetch failed id={tid}: {e}", file=sys.stderr, flush=True)
+            items = []
+        if not items:
+            _UNRESOLVED_TEAM_IDS.add(tid)
+            continue
+        changed.update(upsert_teams_bulk(items))
+
+    print(
+        f"[{tag}] teams missing={len(missing)} league_calls={league_calls} single_calls={single_calls} "
+        f"changed={len(changed)} unresolved={len(set(missing) & _UNRESOLVED_TEAM_IDS)}",
+        flush=True,
+    )
+    return sorted(changed)